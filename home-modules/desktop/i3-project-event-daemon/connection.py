@@ -8,6 +8,7 @@ Feature 121: Added socket health status for diagnostic CLI.
 import asyncio
 import logging
 import os
+import socket
 import struct
 import time
 from dataclasses import dataclass
@@ -19,6 +20,8 @@ from i3ipc._private import MessageType
 from i3ipc.events import IpcBaseEvent
 
 from .state import StateManager
+from .services.compact_tree import TreeNode, build_compact_tree, loads_tree
+from .services.tree_mirror import SwayTreeMirror
 from .worktree_utils import canonicalize_context_key
 
 logger = logging.getLogger(__name__)
@@ -57,6 +60,247 @@ async def _recv_exact(loop: asyncio.AbstractEventLoop, sock, n: int) -> bytes:
     return bytes(buf)
 
 
+class _PooledSocket:
+    """One command-socket slot in a SwayCommandPool."""
+
+    __slots__ = ("name", "sock", "requests", "reconnects")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.sock: Optional[socket.socket] = None
+        self.requests = 0
+        self.reconnects = 0
+
+
+class SwayCommandPool:
+    """Bounded pool of Sway command sockets with a priority lane.
+
+    Sway answers requests strictly in order per socket, so a single command
+    socket forces every caller into one queue: a 300 KB GET_TREE for a panel
+    refresh stalls a keypress-driven `focus` queued behind it. The pool opens
+    several command sockets against the same IPC path. Reads (GET_TREE,
+    GET_WORKSPACES, ...) share the general sockets; RUN_COMMAND and
+    SEND_TICK use a dedicated priority socket and may also borrow any idle
+    general socket, but never wait behind a read.
+
+    Each slot is exclusively owned for one request/response exchange and uses
+    the same full-body `_recv_exact` framing as the single-socket path. A slot
+    whose socket fails is reopened once and the request retried; a health
+    check pings every idle slot with GET_VERSION.
+    """
+
+    PRIORITY_MESSAGE_TYPES = frozenset({MessageType.COMMAND, MessageType.SEND_TICK})
+
+    def __init__(self, socket_path_provider: Callable[[], Optional[str]], general_size: int = 2) -> None:
+        """Initialize an unopened pool.
+
+        Args:
+            socket_path_provider: Returns the Sway IPC socket path to connect to
+            general_size: Number of general (read) sockets; one priority
+                socket is always added on top
+        """
+        self._socket_path_provider = socket_path_provider
+        self.general_size = max(1, int(general_size))
+        self._slots: List[_PooledSocket] = []
+        self._general_free: Optional[asyncio.Queue] = None
+        self._priority_free: Optional[asyncio.Queue] = None
+        self._waiting = {"priority": 0, "general": 0}
+        self._max_waiting = {"priority": 0, "general": 0}
+        self._wait_total_ms = {"priority": 0.0, "general": 0.0}
+        self._wait_max_ms = {"priority": 0.0, "general": 0.0}
+        self._requests = {"priority": 0, "general": 0}
+        self._borrowed = 0
+        self._failures = 0
+        self._last_health_check: Optional[float] = None
+        self._last_health_ok: Optional[bool] = None
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self._slots)
+
+    async def _open_socket(self) -> socket.socket:
+        path = self._socket_path_provider()
+        if not path:
+            raise ConnectionError("No Sway IPC socket path for command pool")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await asyncio.get_running_loop().sock_connect(sock, path)
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    async def open(self) -> None:
+        """Open every slot; raises if any socket cannot be connected."""
+        self.close()
+        general_free: asyncio.Queue = asyncio.Queue()
+        priority_free: asyncio.Queue = asyncio.Queue()
+        slots: List[_PooledSocket] = []
+        try:
+            for index in range(self.general_size):
+                slot = _PooledSocket(f"general-{index}")
+                slot.sock = await self._open_socket()
+                slots.append(slot)
+                general_free.put_nowait(slot)
+            priority = _PooledSocket("priority")
+            priority.sock = await self._open_socket()
+            slots.append(priority)
+            priority_free.put_nowait(priority)
+        except Exception:
+            for slot in slots:
+                self._close_slot(slot)
+            raise
+        self._slots = slots
+        self._general_free = general_free
+        self._priority_free = priority_free
+
+    @staticmethod
+    def _close_slot(slot: _PooledSocket) -> None:
+        if slot.sock is not None:
+            try:
+                slot.sock.close()
+            except Exception:
+                pass
+            slot.sock = None
+
+    def close(self) -> None:
+        """Close every pooled socket."""
+        for slot in self._slots:
+            self._close_slot(slot)
+        self._slots = []
+        self._general_free = None
+        self._priority_free = None
+
+    async def _acquire(self, lane: str) -> _PooledSocket:
+        general_free = self._general_free
+        priority_free = self._priority_free
+        if general_free is None or priority_free is None:
+            raise ConnectionError("Sway command pool is closed")
+        if lane == "priority":
+            try:
+                return priority_free.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+            try:
+                slot = general_free.get_nowait()
+                self._borrowed += 1
+                return slot
+            except asyncio.QueueEmpty:
+                pass
+            return await priority_free.get()
+        return await general_free.get()
+
+    def _release(self, slot: _PooledSocket) -> None:
+        queue = self._priority_free if slot.name == "priority" else self._general_free
+        if queue is not None and slot in self._slots:
+            queue.put_nowait(slot)
+
+    async def _exchange(self, slot: _PooledSocket, message_type: MessageType, payload: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        if slot.sock is None:
+            slot.sock = await self._open_socket()
+            slot.reconnects += 1
+        sock = slot.sock
+        await loop.sock_sendall(sock, _ipc_pack(message_type, payload))
+        header = await _recv_exact(loop, sock, _IPC_STRUCT_HEADER_SIZE)
+        magic, message_length, reply_type = _ipc_unpack_header(header)
+        assert magic == _IPC_MAGIC, f"Sway IPC framing error: magic={magic!r}"
+        assert reply_type == message_type.value, (
+            f"Sway IPC framing error: reply_type={reply_type} expected {message_type.value}"
+        )
+        if message_length == 0:
+            return b''
+        return await _recv_exact(loop, sock, message_length)
+
+    async def message(self, message_type: MessageType, payload: str = '') -> bytes:
+        """Send one request on a pooled socket and return its reply body."""
+        lane = "priority" if message_type in self.PRIORITY_MESSAGE_TYPES else "general"
+        self._waiting[lane] += 1
+        self._max_waiting[lane] = max(self._max_waiting[lane], self._waiting[lane])
+        wait_start = time.perf_counter()
+        try:
+            slot = await self._acquire(lane)
+        finally:
+            self._waiting[lane] -= 1
+        wait_ms = (time.perf_counter() - wait_start) * 1000
+        self._wait_total_ms[lane] += wait_ms
+        self._wait_max_ms[lane] = max(self._wait_max_ms[lane], wait_ms)
+        self._requests[lane] += 1
+        slot.requests += 1
+
+        try:
+            for attempt in range(2):
+                try:
+                    return await self._exchange(slot, message_type, payload)
+                except (ConnectionError, AssertionError, OSError) as e:
+                    # A half-read reply leaves the stream unusable either way,
+                    # so the slot is always reopened before any retry.
+                    self._failures += 1
+                    self._close_slot(slot)
+                    if attempt == 1 or isinstance(e, AssertionError):
+                        raise ConnectionError(
+                            f"Sway command pool {slot.name} failed: {type(e).__name__}: {e}"
+                        ) from e
+                    logger.debug("Command pool slot %s failed (%s); reopening", slot.name, e)
+            return b''
+        except asyncio.CancelledError:
+            # Cancelled mid-exchange: the reply may still arrive on this socket
+            # and would be read as the answer to the next request.
+            self._close_slot(slot)
+            raise
+        finally:
+            self._release(slot)
+
+    async def check_health(self, timeout: float = 2.0) -> bool:
+        """Ping every currently idle slot with GET_VERSION."""
+        healthy = True
+        idle: List[_PooledSocket] = []
+        for queue in (self._general_free, self._priority_free):
+            while queue is not None and not queue.empty():
+                idle.append(queue.get_nowait())
+        try:
+            for slot in idle:
+                try:
+                    await asyncio.wait_for(
+                        self._exchange(slot, MessageType.GET_VERSION, ''), timeout=timeout
+                    )
+                except Exception as e:
+                    healthy = False
+                    self._failures += 1
+                    self._close_slot(slot)
+                    logger.warning("Command pool slot %s failed health check: %s", slot.name, e)
+        finally:
+            for slot in idle:
+                self._release(slot)
+        self._last_health_check = time.time()
+        self._last_health_ok = healthy
+        return healthy
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait time and reconnect counters per lane."""
+        lanes: Dict[str, Any] = {}
+        for lane in ("priority", "general"):
+            requests = self._requests[lane]
+            lanes[lane] = {
+                "requests": requests,
+                "queue_depth": self._waiting[lane],
+                "max_queue_depth": self._max_waiting[lane],
+                "avg_wait_ms": round(self._wait_total_ms[lane] / requests, 3) if requests else 0.0,
+                "max_wait_ms": round(self._wait_max_ms[lane], 3),
+            }
+        return {
+            "open": self.is_open,
+            "size": len(self._slots),
+            "lanes": lanes,
+            "priority_borrowed_general": self._borrowed,
+            "failures": self._failures,
+            "reconnects": sum(slot.reconnects for slot in self._slots),
+            "last_health_check": self._last_health_check,
+            "last_health_ok": self._last_health_ok,
+        }
+
+
 @dataclass
 class SocketHealthStatus:
     """
@@ -165,11 +409,12 @@ class ResilientI3Connection:
         self.reconnect_delay = 0.1  # Initial delay: 100ms
         self.is_performing_startup_scan = False  # Flag to suppress event handlers during startup scan
 
-        # Serialize all IPC commands through a single lock to prevent
-        # concurrent requests from interleaving on the i3ipc command socket.
-        # i3ipc's _message() is not coroutine-safe: concurrent get_tree()
-        # calls cause response bytes to interleave, corrupting the stream.
-        self._ipc_lock = asyncio.Lock()
+        # Command-channel requests go through a pool of sockets, each owned
+        # exclusively for one request/response exchange. i3ipc's _message() is
+        # not coroutine-safe: concurrent get_tree() calls on one socket cause
+        # response bytes to interleave, corrupting the stream. The pool keeps
+        # that guarantee per socket while letting commands bypass slow reads.
+        self.command_pool = SwayCommandPool(self._current_socket_path)
 
         # Every (event_type, handler) passed to subscribe(), so they can be
         # replayed onto a replacement connection after a reconnect.
@@ -185,6 +430,12 @@ class ResilientI3Connection:
         # the event loop cannot rebuild the connection concurrently.
         self._reconnect_lock = asyncio.Lock()
 
+        # Event-maintained copy of the Sway tree. Installed as the connection's
+        # get_tree() so every reader (IPC tree, tree cache, mark manager,
+        # run-raise) shares one GET_TREE per structural change instead of one
+        # per call.
+        self.tree_mirror = SwayTreeMirror(self._fetch_raw_tree, self._build_con)
+
         # Feature 121: Socket health tracking
         self.reconnection_count = 0
         self.last_connection_time: Optional[float] = None  # time.time() when connected
@@ -313,8 +564,15 @@ class ResilientI3Connection:
             try:
                 if self.conn:
                     # Use get_tree() for health check - it's more likely to fail on stale connections
-                    # The _locked_message wrapper on conn serializes this automatically
-                    await self.conn.get_tree()
+                    # The _locked_message wrapper on conn serializes this automatically.
+                    # Bypass the tree mirror: this must be a real round trip.
+                    fetch_tree = getattr(self.conn, "fetch_tree", None) or self.conn.get_tree
+                    await fetch_tree()
+                    # The GET_TREE above exercised one general socket; ping the
+                    # other idle pool sockets so a dead one is reopened now
+                    # rather than on the next user-facing command.
+                    if self.command_pool.is_open:
+                        await self.command_pool.check_health()
                     return False
             except Exception as e:
                 logger.warning(f"Socket exists but connection health check failed: {type(e).__name__}: {e}")
@@ -382,13 +640,13 @@ class ResilientI3Connection:
                 # Create async connection
                 self.conn = await aio.Connection(auto_reconnect=True).connect()
 
-                # Replace the command-channel `_message` with a safe version.
+                # Replace the command-channel `_message` with a pooled version.
                 # Two upstream bugs are fixed here:
                 #
                 # 1. Concurrent send+recv interleaves on the cmd socket: two
                 #    parallel get_tree() calls corrupt the stream and raise
                 #    AssertionError on the magic/reply_type header check.
-                #    We serialize with `_ipc_lock`.
+                #    Each pooled socket serves one exchange at a time.
                 #
                 # 2. Partial reads: upstream calls
                 #    `sock_recv(sock, message_length)` once, but `sock_recv`
@@ -397,56 +655,25 @@ class ResilientI3Connection:
                 #    body is truncated and json.loads raises "Unterminated
                 #    string" / "Expecting value". We loop until message_length
                 #    bytes are received via `_recv_exact`.
-                lock = self._ipc_lock
-                conn = self.conn
+                pool = self.command_pool
+                await pool.open()
+
+                mirror = self.tree_mirror
 
                 async def _safe_message(message_type: MessageType, payload: str = '') -> bytes:
                     if message_type is MessageType.SUBSCRIBE:
                         raise Exception('cannot subscribe on the command socket')
-
-                    async with lock:
-                        loop = conn._loop
-                        sock = conn._cmd_socket
-                        for _tries in range(5):
-                            try:
-                                await loop.sock_sendall(
-                                    sock, _ipc_pack(message_type, payload)
-                                )
-                                header = await _recv_exact(
-                                    loop, sock, _IPC_STRUCT_HEADER_SIZE
-                                )
-                                break
-                            except ConnectionError as e:
-                                if not conn._auto_reconnect:
-                                    raise e
-                                await conn._reconnect()
-                                sock = conn._cmd_socket
-                        else:
-                            return b''
-
-                        if not header:
-                            return b''
-
-                        magic, message_length, reply_type = _ipc_unpack_header(header)
-                        assert magic == _IPC_MAGIC, (
-                            f"Sway IPC framing error: magic={magic!r}"
-                        )
-                        assert reply_type == message_type.value, (
-                            f"Sway IPC framing error: reply_type={reply_type} "
-                            f"expected {message_type.value}"
-                        )
-
-                        if message_length == 0:
-                            return b''
-
-                        try:
-                            return await _recv_exact(loop, sock, message_length)
-                        except ConnectionError as e:
-                            if conn._auto_reconnect:
-                                asyncio.ensure_future(conn._reconnect())
-                            raise e
+                    if message_type is not MessageType.COMMAND:
+                        return await pool.message(message_type, payload)
+                    # layout/resize/move position change the tree without an
+                    # event; the mirror must not answer from before the command.
+                    try:
+                        return await pool.message(message_type, payload)
+                    finally:
+                        mirror.apply_command(payload)
 
                 self.conn._message = _safe_message
+                self._install_tree_mirror(self.conn)
 
                 # Test connection by getting version
                 version = await self.conn.get_version()
@@ -488,6 +715,82 @@ class ResilientI3Connection:
 
         raise ConnectionError(f"Failed to connect to i3 after {max_attempts} attempts")
 
+    def _current_socket_path(self) -> Optional[str]:
+        """Socket path the command pool should (re)connect to."""
+        conn_path = getattr(self.conn, "socket_path", None) if self.conn else None
+        return conn_path or os.environ.get("SWAYSOCK") or os.environ.get("I3SOCK")
+
+    async def _fetch_raw_tree(self) -> Dict[str, Any]:
+        """Issue one real GET_TREE on the command socket and decode it."""
+        conn = self.conn
+        if not conn:
+            raise ConnectionError("No i3 connection")
+        data = await conn._message(MessageType.GET_TREE)
+        return loads_tree(data)
+
+    def _build_con(self, raw: Dict[str, Any]) -> aio.Con:
+        """Build the i3ipc container graph readers expect from a raw tree."""
+        return aio.Con(raw, None, self.conn)
+
+    def _install_tree_mirror(self, conn: aio.Connection) -> None:
+        """Serve conn.get_tree() from the tree mirror and feed it events.
+
+        The mirror handlers are registered on the connection before any daemon
+        handler, and i3ipc schedules handlers in registration order, so each
+        event is applied to the mirror before a handler that reads the tree
+        runs. The original get_tree stays reachable as conn.fetch_tree for
+        callers that need a real round trip (health checks), and
+        conn.get_compact_tree serves the same mirror as a TreeNode graph.
+        """
+        mirror = self.tree_mirror
+        mirror.reset()
+        conn.fetch_tree = conn.get_tree
+
+        async def _mirrored_get_tree() -> aio.Con:
+            return await mirror.get_tree()
+
+        conn.get_tree = _mirrored_get_tree
+        conn.get_compact_tree = mirror.get_compact_tree
+
+        def _on_window(_conn: aio.Connection, event: IpcBaseEvent) -> None:
+            try:
+                container = getattr(event, "container", None)
+                mirror.apply_window_event(
+                    str(getattr(event, "change", "") or ""),
+                    getattr(container, "ipc_data", None),
+                )
+            except Exception as e:
+                mirror.mark_dirty(f"window-event-error:{e}")
+
+        def _on_workspace(_conn: aio.Connection, event: IpcBaseEvent) -> None:
+            try:
+                current = getattr(event, "current", None)
+                old = getattr(event, "old", None)
+                mirror.apply_workspace_event(
+                    str(getattr(event, "change", "") or ""),
+                    getattr(current, "ipc_data", None),
+                    getattr(old, "ipc_data", None),
+                )
+            except Exception as e:
+                mirror.mark_dirty(f"workspace-event-error:{e}")
+
+        def _on_output(_conn: aio.Connection, event: IpcBaseEvent) -> None:
+            mirror.apply_output_event(str(getattr(event, "change", "") or ""))
+
+        conn.on("window", _on_window)
+        conn.on("workspace", _on_workspace)
+        conn.on("output", _on_output)
+
+    async def reconcile_tree_mirror(self) -> TreeNode:
+        """Checksum the tree mirror against a real GET_TREE, reseeding on drift.
+
+        Returns:
+            Compact tree built from the fresh GET_TREE
+        """
+        if not self.conn:
+            raise ConnectionError("No i3 connection")
+        return await self.tree_mirror.reconcile(build_compact_tree)
+
     async def subscribe_events(self) -> None:
         """Subscribe to all required i3 IPC events.
 
@@ -586,8 +889,9 @@ class ResilientI3Connection:
         try:
             logger.info("Rebuilding state from i3 tree...")
 
-            # Get entire window tree (async)
-            tree = await self.conn.get_tree()
+            # Get entire window tree (async). Reseeds the tree mirror, which
+            # must not carry anything over from a previous connection.
+            tree = await self.tree_mirror.get_compact_tree(force_refresh=True)
 
             # Rebuild window_map from marks
             await self.state_manager.rebuild_from_marks(tree)
@@ -937,13 +1241,24 @@ class ResilientI3Connection:
     async def get_tree(self) -> 'aio.Con':
         """Get the i3/Sway window tree.
 
-        Serialization is handled by the _locked_message wrapper installed
-        on the connection in connect_with_retry().
+        Served from the tree mirror installed on the connection in
+        connect_with_retry(); a real GET_TREE (serialized by the
+        _locked_message wrapper) only happens when the mirror is dirty.
         """
         if not self.conn:
             raise ConnectionError("No i3 connection")
         return await self.conn.get_tree()
 
+    async def get_compact_tree(self, force_refresh: bool = False) -> TreeNode:
+        """Get the window tree as a compact read-only TreeNode graph.
+
+        Same mirror and freshness as get_tree(); for readers that only need
+        the Con read API (no per-node command()).
+        """
+        if not self.conn:
+            raise ConnectionError("No i3 connection")
+        return await self.tree_mirror.get_compact_tree(force_refresh=force_refresh)
+
     async def get_workspaces(self):
         """Get workspace list."""
         if not self.conn:
@@ -964,6 +1279,7 @@ class ResilientI3Connection:
 
     def close(self) -> None:
         """Close the i3 connection."""
+        self.command_pool.close()
         if self.conn:
             conn = self.conn
             self.conn = None
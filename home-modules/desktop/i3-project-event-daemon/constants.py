@@ -50,6 +50,9 @@ class ConfigPaths:
     # Layouts
     LAYOUTS_DIR: Final[Path] = LOCAL_SHARE_DIR / "layouts"
 
+    # Persistent event history (SQLite, WAL mode)
+    EVENT_STORE_FILE: Final[Path] = LOCAL_SHARE_DIR / "events.db"
+
     # IPC socket
     IPC_SOCKET_PATH: Final[Path] = Path("/tmp/i3-project-daemon.sock")
 
@@ -45,6 +45,7 @@ from .connection import ResilientI3Connection
 from .ipc_server import IPCServer
 from .event_buffer import EventBuffer
 from .window_rules import WindowRule
+from .pattern_resolver import get_classification_cache
 from .models import EventEntry
 from .handlers import (
     on_tick,
@@ -65,6 +66,8 @@ from .services.run_raise_manager import RunRaiseManager  # Feature 051: Run-rais
 from .services.mark_manager import MarkManager  # Feature 076: Mark-based app identification
 from .services.tree_cache import initialize_tree_cache  # Feature 091: Tree caching
 from .services.performance_tracker import initialize_performance_tracker  # Feature 091: Performance tracking
+from .services.title_coalescer import WindowTitleCoalescer  # window::title storm coalescing
+from .services.event_store import EventStore  # Persistent SQLite event history
 from .monitor_profile_service import MonitorProfileService  # Feature 083: Monitor profile management
 from .constants import ConfigPaths  # Feature 101: Centralized paths
 from datetime import datetime
@@ -197,6 +200,7 @@ class I3ProjectDaemon:
         self.connection: Optional[ResilientI3Connection] = None
         self.ipc_server: Optional[IPCServer] = None
         self.event_buffer: Optional[EventBuffer] = None  # Feature 017: Event storage
+        self.event_store: Optional[EventStore] = None  # On-disk history behind event_buffer
         self.health_monitor: Optional[DaemonHealthMonitor] = None
         self.shutdown_event = asyncio.Event()
         self.window_rules: List[WindowRule] = []  # Feature 021: Window rules cache
@@ -213,6 +217,7 @@ class I3ProjectDaemon:
         self.monitor_profiles_directory_watcher: Optional[MonitorProfilesDirectoryWatcher] = None
         self.tree_cache: Optional[Any] = None  # Feature 091: Tree cache service
         self.performance_tracker: Optional[Any] = None  # Feature 091: Performance tracker
+        self.title_coalescer: Optional[WindowTitleCoalescer] = None  # Per-window window::title coalescing
 
     async def initialize(self) -> None:
         """Initialize daemon components."""
@@ -246,8 +251,20 @@ class I3ProjectDaemon:
             logger.info("Pruned stale project state on startup: %s", cleanup_stats)
 
         # Create event buffer with broadcast callback (Feature 017: T019)
-        self.event_buffer = EventBuffer(max_size=500, broadcast_callback=self.ipc_server.broadcast_event_entry)
-        logger.info("Event buffer initialized (500 events)")
+        self.event_buffer = EventBuffer(max_size=5000, broadcast_callback=self.ipc_server.broadcast_event_entry)
+        logger.info("Event buffer initialized (5000 events)")
+
+        # Persist events to SQLite so history queries reach past the ring.
+        # Opt in with I3PM_EVENT_STORE=1.
+        if os.environ.get("I3PM_EVENT_STORE", "").lower() in ("1", "on", "true", "yes"):
+            store = EventStore(ConfigPaths.EVENT_STORE_FILE, retention_days=self.event_buffer.retention_days)
+            try:
+                await store.start()
+                self.event_buffer.store = self.event_store = store
+                logger.info(f"Event store opened: {ConfigPaths.EVENT_STORE_FILE}")
+            except Exception as e:
+                await store.close()
+                logger.warning(f"Event store unavailable, history limited to memory: {e}")
 
         # Update IPC server with event buffer
         self.ipc_server.event_buffer = self.event_buffer
@@ -506,6 +523,7 @@ class I3ProjectDaemon:
         def on_rules_reload():
             """Callback for window rules file changes."""
             self.window_rules = reload_window_rules(window_rules_file, self.window_rules)
+            get_classification_cache().invalidate()
 
         self.rules_watcher = WindowRulesWatcher(
             config_file=window_rules_file,
@@ -748,7 +766,13 @@ class I3ProjectDaemon:
         )
 
         # USER STORY 2: Title change re-classification (T033)
-        self.connection.subscribe("window::title", get_window_rules_wrapper_title)
+        # Title storms (tail -f panes, prompt redraws) are coalesced per window
+        # so they cannot delay focus/workspace events queued behind them.
+        self.title_coalescer = WindowTitleCoalescer(get_window_rules_wrapper_title)
+        if self.ipc_server:
+            self.ipc_server.title_coalescer = self.title_coalescer
+        self.connection.subscribe("window::title", self.title_coalescer.submit)
+        self.connection.subscribe("window::close", self.title_coalescer.on_window_close)
 
         # USER STORY 3: Workspace monitoring
         self.connection.subscribe(
@@ -872,6 +896,8 @@ class I3ProjectDaemon:
         # only reconciled with reality at startup/reconnect, so any drift
         # persisted until a daemon restart. The on_output UNSPECIFIED coalescing
         # already throttles output storms, so a steady 10s cadence is cheap.
+        # The same tick doubles as the tree mirror's checksum reconcile, so the
+        # one GET_TREE it costs both heals window_map and catches mirror drift.
         reconcile_task = None
         if self.connection and self.state_manager:
             async def run_window_reconcile():
@@ -881,7 +907,7 @@ class I3ProjectDaemon:
                         await asyncio.sleep(10)
                         conn = self.connection.conn if self.connection else None
                         if conn and not self.connection.is_shutting_down:
-                            tree = await conn.get_tree()
+                            tree = await self.connection.reconcile_tree_mirror()
                             await self.state_manager.reconcile_from_tree(tree, allow_subtract=False)
                     except asyncio.CancelledError:
                         break
@@ -973,6 +999,19 @@ class I3ProjectDaemon:
                 except Exception as e:
                     logger.error(f"Error stopping output states watcher: {e}")
 
+            if self.title_coalescer:
+                self.title_coalescer.close()
+
+            # Flush and close the event store (3s timeout)
+            if self.event_store:
+                try:
+                    await asyncio.wait_for(self.event_store.close(), timeout=3.0)
+                    logger.info("Event store closed")
+                except asyncio.TimeoutError:
+                    logger.warning("Event store close timed out after 3s (continuing)")
+                except Exception as e:
+                    logger.error(f"Error closing event store: {e}")
+
             # Stop IPC server (5s timeout)
             if self.ipc_server:
                 try:
@@ -6,15 +6,30 @@ enabling event history queries and event stream subscriptions.
 Feature 030: Added event persistence (T017-T018)
 Feature 102: Added copy-on-evict for active traces and tracer reference (T005-T006)
 Feature 102 T063: Added burst detection and collapsing (100 events/sec threshold)
+
+Queries are served from secondary indexes (event type, window_id, source,
+trace_id, correlation_id, event_id) maintained on insert and evict. Each
+index maps a key to the insertion sequence numbers of its events, oldest
+first, so a query walks only the rows of its most selective filter,
+newest-first, and stops at limit or since_id. Cost stays proportional to
+the result rather than the buffer, which keeps large buffers cheap to query.
+
+With an EventStore attached, every stored event is also queued for the
+on-disk SQLite log, and get_events_with_history() continues a query into
+that log once the ring runs out of matching events. event_id restarts at 0
+with every daemon run, so each event also carries the buffer's boot_id and
+(boot_id, event_id) identifies it across runs.
 """
 
 from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Callable, Deque, List, Optional, Awaitable, Any, TYPE_CHECKING
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Awaitable, Any, Set, Tuple, TYPE_CHECKING
+import heapq
 import json
 import logging
 import time
+import uuid
 
 try:
     from .models import EventEntry
@@ -23,10 +38,64 @@ except ImportError:
     from models import EventEntry
 
 if TYPE_CHECKING:
+    from .services.event_store import EventStore
     from .services.window_tracer import WindowTracer
 
 logger = logging.getLogger(__name__)
 
+# EventEntry fields with a secondary index (see EventBuffer._index_event)
+INDEXED_FIELDS: Tuple[str, ...] = (
+    "event_type",
+    "window_id",
+    "source",
+    "trace_id",
+    "correlation_id",
+    "event_id",
+)
+
+
+def events_matching(
+    event_buffer: Any,
+    *,
+    window_id: Optional[int] = None,
+    trace_id: Optional[str] = None,
+    correlation_id: Optional[str] = None,
+) -> List[EventEntry]:
+    """Events matching any of the given keys, oldest first.
+
+    Uses EventBuffer's indexes, and scans ``event_buffer.events`` for other
+    buffer-like objects.
+    """
+    lookup = getattr(event_buffer, "get_events_by", None)
+    if lookup is not None:
+        return lookup(window_id=window_id, trace_id=trace_id, correlation_id=correlation_id)
+    keys = [(name, key) for name, key in (
+        ("window_id", window_id), ("trace_id", trace_id), ("correlation_id", correlation_id)
+    ) if key is not None]
+    return [
+        event for event in event_buffer.events
+        if any(getattr(event, name, None) == key for name, key in keys)
+    ]
+
+
+async def query_events(
+    event_buffer: Any,
+    *,
+    limit: int = 100,
+    event_type: Optional[str] = None,
+    source: Optional[str] = None,
+    since_id: Optional[int] = None,
+) -> List[EventEntry]:
+    """Most recent events matching the filters, including persisted history.
+
+    Uses EventBuffer.get_events_with_history, and plain get_events for other
+    buffer-like objects.
+    """
+    with_history = getattr(event_buffer, "get_events_with_history", None)
+    query = with_history if with_history is not None else event_buffer.get_events
+    result = query(limit=limit, event_type=event_type, source=source, since_id=since_id)
+    return await result if with_history is not None else result
+
 
 class EventBuffer:
     """Circular buffer for event storage in daemon.
@@ -42,6 +111,7 @@ class EventBuffer:
         persistence_dir: Optional[Path] = None,
         retention_days: int = 7,
         tracer: Optional["WindowTracer"] = None,
+        store: Optional["EventStore"] = None,
     ) -> None:
         """Initialize event buffer.
 
@@ -51,9 +121,12 @@ class EventBuffer:
             persistence_dir: Directory for event persistence (Feature 030: T017)
             retention_days: Days to retain persisted events (default: 7, Feature 030: T018)
             tracer: Optional WindowTracer for copy-on-evict (Feature 102: T006)
+            store: Optional on-disk EventStore that receives every stored event
         """
         self.events: Deque[EventEntry] = deque(maxlen=max_size)
         self.event_counter: int = 0
+        # Namespaces event_id (which restarts at 0) for this daemon run
+        self.boot_id: str = uuid.uuid4().hex[:12]
         self.max_size: int = max_size
         self.broadcast_callback = broadcast_callback
 
@@ -66,6 +139,9 @@ class EventBuffer:
         self._tracer: Optional["WindowTracer"] = tracer
         self._evicted_to_trace: int = 0  # Counter for stats
 
+        # Persistent SQLite history (queried past the ring by get_events_with_history)
+        self.store: Optional["EventStore"] = store
+
         # Feature 102 T063: Burst detection (100 events/sec threshold)
         self._burst_threshold: int = 100  # events per second
         self._burst_window_seconds: float = 1.0  # sliding window for rate calculation
@@ -75,6 +151,22 @@ class EventBuffer:
         self._total_bursts: int = 0  # Total burst periods detected
         self._total_collapsed: int = 0  # Total events collapsed across all bursts
 
+        # Secondary indexes: field -> key -> insertion seqs (oldest first).
+        # events[i] has seq self._first_seq + i.
+        self._indexes: Dict[str, Dict[Any, Deque[int]]] = {name: {} for name in INDEXED_FIELDS}
+        self._by_seq: Dict[int, EventEntry] = {}
+        self._keys_by_seq: Dict[int, Tuple[Any, ...]] = {}
+        self._first_seq: int = 0
+        self._next_seq: int = 0
+        # event_ids are taken from event_counter when an event is built, so
+        # they are mostly non-decreasing in buffer order; handlers that await
+        # between stamping and add_event() (or persisted events mixed in) can
+        # break that. Seqs whose id is lower than the previous event's are
+        # tracked until they age out of the ring; while there are none,
+        # since_id queries can stop early.
+        self._out_of_order_seqs: Set[int] = set()
+        self._last_event_id: Optional[int] = None
+
     async def add_event(self, event: EventEntry) -> None:
         """Add event to buffer (FIFO, oldest evicted) and broadcast to subscribers.
 
@@ -129,17 +221,127 @@ class EventBuffer:
             evicted = self.events[0]  # Oldest event (will be evicted by append)
             self._preserve_if_traced(evicted)
 
+        if event.boot_id is None:
+            event.boot_id = self.boot_id
+
         # Feature 102 (T024): Set trace_id if event is part of an active trace
         if event.trace_id is None and event.window_id is not None:
             event.trace_id = self._get_active_trace_id(event.window_id)
 
-        self.events.append(event)
+        self._append(event)
         self.event_counter += 1
+        if self.store is not None:
+            self.store.enqueue(event)
 
         # Broadcast to subscribers if callback is set (Feature 017: T019)
         if self.broadcast_callback:
             await self.broadcast_callback(event)
 
+    # ========================================================================
+    # Secondary indexes
+    # ========================================================================
+
+    def _append(self, event: EventEntry) -> None:
+        """Append to the ring, evicting (and unindexing) the oldest when full."""
+        self._ensure_indexed()
+        if self.events.maxlen is not None and len(self.events) >= self.events.maxlen:
+            self._unindex_oldest()
+        self.events.append(event)
+        self._index_event(event)
+
+    def _index_event(self, event: EventEntry) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        keys = tuple(getattr(event, name, None) for name in INDEXED_FIELDS)
+        self._by_seq[seq] = event
+        self._keys_by_seq[seq] = keys
+        for name, key in zip(INDEXED_FIELDS, keys):
+            if key is not None:
+                index = self._indexes[name]
+                seqs = index.get(key)
+                if seqs is None:
+                    seqs = index[key] = deque()
+                seqs.append(seq)
+
+        event_id = event.event_id
+        if self._last_event_id is not None and event_id < self._last_event_id:
+            self._out_of_order_seqs.add(seq)
+        self._last_event_id = event_id
+
+    def _unindex_oldest(self) -> None:
+        seq = self._first_seq
+        self._first_seq += 1
+        # The new oldest event no longer has a predecessor to be out of order with.
+        self._out_of_order_seqs.discard(self._first_seq)
+        self._by_seq.pop(seq, None)
+        keys = self._keys_by_seq.pop(seq, ())
+        for name, key in zip(INDEXED_FIELDS, keys):
+            if key is None:
+                continue
+            index = self._indexes[name]
+            seqs = index.get(key)
+            if seqs:
+                seqs.popleft()
+                if not seqs:
+                    del index[key]
+
+    def _rebuild_indexes(self) -> None:
+        """Re-derive all indexes from self.events (after bulk replacement)."""
+        for index in self._indexes.values():
+            index.clear()
+        self._by_seq.clear()
+        self._keys_by_seq.clear()
+        self._first_seq = self._next_seq
+        self._out_of_order_seqs.clear()
+        self._last_event_id = None
+        for event in self.events:
+            self._index_event(event)
+
+    def _ensure_indexed(self) -> None:
+        # self.events is public; re-sync if it was replaced or appended to
+        # directly rather than through _append().
+        if len(self._by_seq) != len(self.events) or (
+            self.events and self._by_seq.get(self._next_seq - 1) is not self.events[-1]
+        ):
+            self._rebuild_indexes()
+
+    def _iter_newest(self, name: str, keys: List[Any]) -> Iterator[int]:
+        """Seqs of events whose `name` field is any of keys, newest first."""
+        index = self._indexes[name]
+        streams = [reversed(index[key]) for key in keys if key in index]
+        if len(streams) == 1:
+            return streams[0]
+        return heapq.merge(*streams, reverse=True)
+
+    def _count(self, name: str, keys: List[Any]) -> int:
+        index = self._indexes[name]
+        return sum(len(index[key]) for key in keys if key in index)
+
+    def get_event(self, event_id: int) -> Optional[EventEntry]:
+        """Oldest buffered event with this event_id, in O(1)."""
+        self._ensure_indexed()
+        seqs = self._indexes["event_id"].get(event_id)
+        return self._by_seq[seqs[0]] if seqs else None
+
+    def get_events_by(
+        self,
+        *,
+        window_id: Optional[int] = None,
+        trace_id: Optional[str] = None,
+        correlation_id: Optional[str] = None,
+    ) -> List[EventEntry]:
+        """Events matching any of the given keys, oldest first.
+
+        Example:
+            >>> buffer.get_events_by(trace_id=trace.trace_id, window_id=trace.window_id)
+        """
+        self._ensure_indexed()
+        seqs: set = set()
+        for name, key in (("window_id", window_id), ("trace_id", trace_id), ("correlation_id", correlation_id)):
+            if key is not None:
+                seqs.update(self._indexes[name].get(key, ()))
+        return [self._by_seq[seq] for seq in sorted(seqs)]
+
     def _get_active_trace_id(self, window_id: int) -> Optional[str]:
         """Get active trace ID for a window.
 
@@ -215,7 +417,8 @@ class EventBuffer:
         limit: int = 100,
         event_type: Optional[str] = None,
         source: Optional[str] = None,
-        since_id: Optional[int] = None
+        since_id: Optional[int] = None,
+        window_id: Optional[int] = None,
     ) -> List[EventEntry]:
         """Retrieve events with optional filtering.
 
@@ -224,27 +427,87 @@ class EventBuffer:
             event_type: Filter by event type prefix (e.g., "window", "workspace")
             source: Filter by event source ("i3", "ipc", "daemon")
             since_id: Only return events with ID greater than this value
+            window_id: Only return events for this window
 
         Returns:
             List of EventEntry objects (most recent first)
         """
-        # Start with all events
-        filtered = list(self.events)
+        self._ensure_indexed()
 
-        # Filter by event type if specified
+        # Drive the scan from the most selective indexed filter.
+        candidates: List[Tuple[int, str, List[Any]]] = []
         if event_type:
-            filtered = [e for e in filtered if e.event_type.startswith(event_type)]
-
-        # Filter by source if specified
+            types = [t for t in self._indexes["event_type"] if t.startswith(event_type)]
+            candidates.append((self._count("event_type", types), "event_type", types))
         if source:
-            filtered = [e for e in filtered if e.source == source]
+            candidates.append((self._count("source", [source]), "source", [source]))
+        if window_id is not None:
+            candidates.append((self._count("window_id", [window_id]), "window_id", [window_id]))
+
+        if candidates:
+            size, name, keys = min(candidates, key=lambda candidate: candidate[0])
+            if size == 0:
+                return []
+            by_seq = self._by_seq
+            rows: Iterator[EventEntry] = (by_seq[seq] for seq in self._iter_newest(name, keys))
+        else:
+            rows = reversed(self.events)
+
+        results: List[EventEntry] = []
+        for event in rows:
+            if since_id is not None and event.event_id <= since_id:
+                if not self._out_of_order_seqs:
+                    break  # Everything older has an id <= since_id too
+                continue
+            if event_type and not event.event_type.startswith(event_type):
+                continue
+            if source and event.source != source:
+                continue
+            if window_id is not None and event.window_id != window_id:
+                continue
+            results.append(event)
+            if len(results) == limit:
+                break
+
+        return results
+
+    async def get_events_with_history(
+        self,
+        limit: int = 100,
+        event_type: Optional[str] = None,
+        source: Optional[str] = None,
+        since_id: Optional[int] = None,
+        window_id: Optional[int] = None,
+    ) -> List[EventEntry]:
+        """Like get_events(), continued into the persistent store.
 
-        # Filter by since_id if specified
-        if since_id is not None:
-            filtered = [e for e in filtered if e.event_id > since_id]
+        When the ring holds fewer than limit matching events, the rest come
+        from stored events older than the oldest buffered one. since_id is a
+        cursor into this daemon run's ids, so those queries stay in memory.
+        Stored events already in the ring (same boot_id and event_id) are
+        skipped.
 
-        # Return most recent N events (reverse chronological order)
-        return list(filtered)[-limit:][::-1]
+        Returns:
+            List of EventEntry objects (most recent first)
+        """
+        events = self.get_events(
+            limit=limit, event_type=event_type, source=source, since_id=since_id, window_id=window_id
+        )
+        if self.store is None or not self.store.is_open or since_id is not None or len(events) >= limit:
+            return events
+        try:
+            older = await self.store.query(
+                limit=limit - len(events),
+                event_type=event_type,
+                source=source,
+                window_id=window_id,
+                before=self.events[0].timestamp if self.events else None,
+            )
+        except Exception as e:
+            logger.warning(f"Event store query failed: {e}")
+            return events
+        seen = {(event.boot_id, event.event_id) for event in events}
+        return events + [event for event in older if (event.boot_id, event.event_id) not in seen]
 
     def get_recent(
         self,
@@ -283,11 +546,13 @@ class EventBuffer:
             "burst_collapsed_current": self._burst_collapsed_count if self._burst_active else 0,
             "total_bursts": self._total_bursts,
             "total_collapsed": self._total_collapsed,
+            "store": self.store.get_stats() if self.store is not None else None,
         }
 
     def clear(self) -> None:
         """Clear all events from buffer."""
         self.events.clear()
+        self._rebuild_indexes()
 
     # ========================================================================
     # Feature 030: Event Persistence (T017-T018)
@@ -388,7 +653,7 @@ class EventBuffer:
 
                             # Add to buffer (skip if within retention period)
                             if event.timestamp >= cutoff_date:
-                                self.events.append(event)
+                                self._append(event)
                                 loaded_count += 1
 
                         except Exception as e:
@@ -424,6 +689,9 @@ class EventBuffer:
             maxlen=self.max_size
         )
 
+        self.buffer = self.events
+        self._rebuild_indexes()
+
         pruned_count = initial_count - len(self.events)
 
         if pruned_count > 0:
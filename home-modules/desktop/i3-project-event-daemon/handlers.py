@@ -15,7 +15,12 @@ from i3ipc import aio, TickEvent, WindowEvent, WorkspaceEvent, OutputEvent
 
 from .state import StateManager
 from .models import WindowInfo, WorkspaceInfo, ApplicationClassification, EventEntry
-from .pattern_resolver import classify_window, Classification
+from .pattern_resolver import (
+    classify_window,
+    Classification,
+    get_classification_cache,
+    title_can_affect_classification,
+)
 from .window_rules import WindowRule
 from .action_executor import apply_rule_actions  # Feature 024
 from .worktree_utils import extract_project_from_mark  # Feature 101
@@ -423,6 +428,7 @@ async def on_tick(
                 config_file = config_dir / "app-classes.json"
                 new_classification = load_app_classification(config_file)
                 await state_manager.update_app_classification(new_classification)
+                get_classification_cache().invalidate()
                 logger.info(
                     "✓ App classification reloaded: %s scoped, %s global",
                     len(new_classification.scoped_classes),
@@ -543,8 +549,9 @@ async def on_window_new(
             active_project_scoped_classes=active_project_scoped_classes,
             window_rules=window_rules,
             app_classification_patterns=None,  # TODO: Extract from app_classification
-            app_classification_scoped=list(app_classification.scoped_classes),
-            app_classification_global=list(app_classification.global_classes),
+            app_classification_scoped=app_classification.scoped_classes,
+            app_classification_global=app_classification.global_classes,
+            cache=get_classification_cache(),
         )
 
         logger.info(
@@ -573,13 +580,14 @@ async def on_window_new(
 
         # Feature 035: Read I3PM_* environment variables from /proc/<pid>/environ
         # Feature 046: Refactored to use PID directly instead of xprop-based lookup
-        from .services.window_filter import read_process_environ, parse_window_environment
+        from .services.window_filter import parse_window_environment
+        from .services.process_index import get_process_index
         window_env = None
         is_scratchpad_terminal = False
         mark_already_injected = False  # Feature 103: Track if mark was injected via mark_manager
         if window_pid:
             try:
-                env = read_process_environ(window_pid)
+                env = get_process_index().read_environ(window_pid)
 
                 # Feature 074: Apply restoration mark for layout restore
                 # Check if this window was launched with I3PM_RESTORE_MARK
@@ -1606,31 +1614,29 @@ async def on_window_title(
     )
 
     try:
-        # Get active project for classification
-        active_project_name = await state_manager.get_active_project()
-
-        # Feature 101: Per-project scoped_classes are deprecated
-        # All window classification now uses global app_classification only
-        active_project_scoped_classes = None
-
-        # Re-classify window with new title
-        from .pattern_resolver import classify_window
-
-        classification = classify_window(
-            window_class=window_class,
-            window_title=window_title,
-            active_project_scoped_classes=active_project_scoped_classes,
-            window_rules=window_rules,
-            app_classification_patterns=None,  # TODO: Add pattern support
-            app_classification_scoped=list(app_classification.scoped_classes) if app_classification else None,
-            app_classification_global=list(app_classification.global_classes) if app_classification else None,
-        )
+        # Title churn (tail -f panes, prompt redraws) can only change the
+        # outcome when a title-based window rule could apply to this class;
+        # otherwise the classification from window::new still stands.
+        classification = None
+        if title_can_affect_classification(window_class, window_rules):
+            # Feature 101: Per-project scoped_classes are deprecated
+            # All window classification now uses global app_classification only
+            classification = classify_window(
+                window_class=window_class,
+                window_title=window_title,
+                active_project_scoped_classes=None,
+                window_rules=window_rules,
+                app_classification_patterns=None,  # TODO: Add pattern support
+                app_classification_scoped=app_classification.scoped_classes if app_classification else None,
+                app_classification_global=app_classification.global_classes if app_classification else None,
+                cache=get_classification_cache(),
+            )
 
-        logger.debug(
-            f"Re-classified window {window_id} ({window_class}) "
-            f"with title '{window_title}': {classification.scope} "
-            f"(source: {classification.source}, workspace: {classification.workspace})"
-        )
+            logger.debug(
+                f"Re-classified window {window_id} ({window_class}) "
+                f"with title '{window_title}': {classification.scope} "
+                f"(source: {classification.source}, workspace: {classification.workspace})"
+            )
 
         # Update window state with new classification
         await state_manager.update_window(
@@ -1640,8 +1646,8 @@ async def on_window_title(
         )
 
         # If workspace changed, move window
-        if classification.workspace is not None:
-            current_workspace = container.workspace().name if container.workspace() else None
+        if classification is not None and classification.workspace is not None:
+            current_workspace = current_ws.name if current_ws else None
             target_workspace = str(classification.workspace)
 
             if current_workspace != target_workspace:
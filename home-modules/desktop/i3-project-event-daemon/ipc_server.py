@@ -16,6 +16,7 @@ import socket
 import shutil
 import subprocess
 import tempfile
+import inspect
 import time
 from datetime import datetime
 from pathlib import Path
@@ -32,7 +33,7 @@ except Exception:  # pragma: no cover
 
 from .state import StateManager
 from .window_rules import WindowRule
-from .pattern_resolver import classify_window
+from .pattern_resolver import classify_window, get_classification_cache
 from .models import EventEntry
 from . import window_filtering  # Feature 037: Window filtering utilities
 from .worktree_utils import (
@@ -47,7 +48,9 @@ from .services.window_filter import (
     parse_window_environment,
     read_process_environ_with_fallback,
 )
+from .services.process_index import get_process_index
 from .services.registry_loader import RegistryLoader, RegistryApp
+from .services.compact_tree import get_compact_tree
 from .services.dashboard_model import (
     DASHBOARD_EVENT_SCHEMA_VERSION,
     DASHBOARD_SCHEMA_VERSION,
@@ -61,10 +64,18 @@ from .services.dashboard_git_service import DashboardGitService
 from .services.daemon_status_service import DaemonStatusService
 from .services.diagnostic_service import DiagnosticService
 from .services.display_service import DisplayService
+from .services.event_fanout import SubscriberFanout, encode_event_entry, encode_line, event_notification
 from .services.event_query_service import EventQueryService
+from .services.event_subscriptions import EventFilter, EventSubscriptions
 from .services.focus_service import FocusService
 from .services.herdr_service import HerdrService
 from .services.launch_service import LaunchService
+from .services.request_pipeline import DEFAULT_MAX_IN_FLIGHT, MAX_IN_FLIGHT_LIMIT, RequestPipeline
+from .services.response_cache import CONDITIONAL_PARAM, REFRESH_PARAMS, ResponseCache, encode_response
+from .services.rpc_batch import batch_shared, run_batch
+from .services.rpc_registry import RpcMethod, RpcRegistry
+from .services.rpc_scheduler import SERVER_BUSY, RpcOverloaded, RpcScheduler
+from .services.snapshot_publisher import SNAPSHOT_FILENAME, SnapshotPublisher
 from .services.trace_service import TraceService
 
 logger = logging.getLogger(__name__)
@@ -474,6 +485,183 @@ FILE_IO_ERROR = 1004
 I3_IPC_ERROR = 1005
 
 
+# JSON-RPC methods served by IPCServer. Handlers are called as
+# handler(server, params, writer) and resolve server attributes per call.
+# intent=True methods advance the user-intent epoch (explicit user focus or
+# launch); mutates=True methods change daemon, Sway or herdr state and drop
+# the response cache; cached=True snapshots are served through it.
+# lane="bulk" marks heavy builds the RpcScheduler caps and queues behind
+# interactive (intent) calls.
+RPC_METHODS: Tuple[RpcMethod, ...] = (
+    RpcMethod("get_status", lambda s, p, w: s._get_status()),
+    RpcMethod("get_active_project", lambda s, p, w: s._get_active_project()),
+    RpcMethod("context.get_active", lambda s, p, w: s._context_get_active(p)),
+    RpcMethod("context.current", lambda s, p, w: s._context_get_active(p)),
+    RpcMethod("context.ensure", lambda s, p, w: s._context_ensure(p), intent=True, mutates=True),
+    RpcMethod("runtime.snapshot", lambda s, p, w: s._runtime_snapshot(p), cached=True, lane="bulk"),
+    RpcMethod("dashboard.snapshot", lambda s, p, w: s._dashboard_snapshot(p), cached=True, lane="bulk"),
+    RpcMethod("dashboard.validate", lambda s, p, w: s._dashboard_validate(p), lane="bulk"),
+    RpcMethod("herdr.snapshot", lambda s, p, w: s.herdr_service.snapshot(p), cached=True, lane="bulk"),
+    RpcMethod("herdr.proxy.snapshot", lambda s, p, w: s._herdr_proxy_snapshot(p), lane="bulk"),
+    RpcMethod("herdr.proxy.pane.focus", lambda s, p, w: s.herdr_service.proxy_pane_focus(p), mutates=True),
+    RpcMethod(
+        "herdr.pane.focus",
+        lambda s, p, w: s.herdr_service.pane_focus(p, launch_open=s._launch_open),
+        intent=True,
+        mutates=True,
+    ),
+    RpcMethod("herdr.pane.close", lambda s, p, w: s.herdr_service.pane_close(p), intent=True, mutates=True),
+    RpcMethod(
+        "herdr.remote.pane.focus",
+        lambda s, p, w: s.herdr_service.remote_pane_focus(
+            p,
+            launch_open=s._launch_open,
+            set_focus_overrides=s._set_focus_overrides,
+        ),
+        intent=True,
+        mutates=True,
+    ),
+    RpcMethod(
+        "herdr.remote.window.focus",
+        lambda s, p, w: s.herdr_service.remote_window_focus(p, launch_open=s._launch_open),
+        intent=True,
+        mutates=True,
+    ),
+    RpcMethod(
+        "herdr.workspace.focus",
+        lambda s, p, w: s.herdr_service.workspace_focus(p, launch_open=s._launch_open),
+        intent=True,
+        mutates=True,
+    ),
+    RpcMethod(
+        "herdr.tab.focus",
+        lambda s, p, w: s.herdr_service.tab_focus(p, launch_open=s._launch_open),
+        intent=True,
+        mutates=True,
+    ),
+    RpcMethod("display.snapshot", lambda s, p, w: s.display_service.snapshot()),
+    RpcMethod("display.apply", lambda s, p, w: s.display_service.apply(p), mutates=True),
+    RpcMethod("display.cycle", lambda s, p, w: s.display_service.cycle(p), mutates=True),
+    RpcMethod("display.toggle_output", lambda s, p, w: s.display_service.toggle_output(p), mutates=True),
+    RpcMethod("display.set_scale", lambda s, p, w: s.display_service.set_scale(p), mutates=True),
+    RpcMethod("get_windows", lambda s, p, w: s._get_windows_outputs(p)),
+    RpcMethod("get_events", lambda s, p, w: s._get_events_list(p)),
+    RpcMethod("list_monitors", lambda s, p, w: s._list_monitors()),
+    RpcMethod("subscribe_events", lambda s, p, w: s._subscribe_events(p, w)),
+    # Feature 058: Workspace mode event subscription
+    RpcMethod("subscribe", lambda s, p, w: s._subscribe_events(p, w)),
+    RpcMethod("reload_config", lambda s, p, w: s._reload_config(), mutates=True),
+    RpcMethod("get_diagnostic_state", lambda s, p, w: s._get_diagnostic_state(p), lane="bulk"),
+    RpcMethod("get_window_rules", lambda s, p, w: s._get_window_rules(p)),
+    RpcMethod("classify_window", lambda s, p, w: s._classify_window(p)),
+    RpcMethod("get_window_tree", lambda s, p, w: s._get_window_tree(p), cached=True, lane="bulk"),
+    # Feature 030: Production readiness methods (T016)
+    RpcMethod("daemon.status", lambda s, p, w: s.daemon_status_service.status_rpc()),
+    RpcMethod("daemon.events", lambda s, p, w: s.daemon_status_service.events_rpc(p)),
+    RpcMethod("daemon.diagnose", lambda s, p, w: s.daemon_status_service.diagnose_rpc(p), lane="bulk"),
+    RpcMethod("daemon.apps", lambda s, p, w: s.daemon_status_service.apps_rpc(p)),
+    RpcMethod("daemon.rpc_stats", lambda s, p, w: s._rpc_stats(p)),
+    # Feature 037 US5: Window visibility methods (T036, T037)
+    RpcMethod("windows.getHidden", lambda s, p, w: s._get_hidden_windows(p)),
+    RpcMethod("windows.getState", lambda s, p, w: s._get_window_state(p)),
+    # Feature 039: Diagnostic API methods (T087-T092)
+    RpcMethod("health_check", lambda s, p, w: s.daemon_status_service.health_check()),
+    # Feature 121: Socket health endpoint for diagnostic CLI
+    RpcMethod("get_socket_health", lambda s, p, w: s.daemon_status_service.socket_health()),
+    RpcMethod("get_window_identity", lambda s, p, w: s.diagnostic_service.window_identity(p)),
+    # Feature 058: Phase 3 - Get window environment by PID
+    RpcMethod("get_window_environment", lambda s, p, w: s.diagnostic_service.window_environment(p)),
+    RpcMethod("get_workspace_rule", lambda s, p, w: s.diagnostic_service.workspace_rule(p)),
+    RpcMethod("validate_state", lambda s, p, w: s.diagnostic_service.validate_state(), lane="bulk"),
+    RpcMethod("get_recent_events", lambda s, p, w: s.diagnostic_service.recent_events(p)),
+    RpcMethod("get_diagnostic_report", lambda s, p, w: s.diagnostic_service.report(p), lane="bulk"),
+    # Feature 041: IPC Launch Context methods (T010-T012)
+    RpcMethod("prepare_launch", lambda s, p, w: s._prepare_launch(p), mutates=True),
+    RpcMethod("launch.preview", lambda s, p, w: s._launch_preview(p)),
+    RpcMethod("launch.open", lambda s, p, w: s._launch_open(p), intent=True, mutates=True),
+    RpcMethod("launch.status", lambda s, p, w: s.launch_service.launch_status(p.get("launch_id", ""))),
+    RpcMethod("get_launch_stats", lambda s, p, w: s.launch_service.launch_stats()),
+    RpcMethod(
+        "get_pending_launches",
+        lambda s, p, w: s.launch_service.pending_launches(
+            include_matched=bool(p.get("include_matched", False))
+        ),
+    ),
+    RpcMethod(
+        "get_terminal_anchor",
+        lambda s, p, w: s.launch_service.terminal_anchor(p.get("terminal_anchor_id", "")),
+    ),
+    RpcMethod("window.focus", lambda s, p, w: s.focus_service.focus_window_from_params(p), intent=True, mutates=True),
+    RpcMethod("window.focus_fast", lambda s, p, w: s.focus_service.focus_window_fast(p), intent=True, mutates=True),
+    RpcMethod(
+        "window.action",
+        lambda s, p, w: s.focus_service.window_action(p),
+        mutates=True,
+        invalidates=frozenset({"window_tree"}),
+        notify="window::action",
+    ),
+    RpcMethod("session.list", lambda s, p, w: s._session_list(p), cached=True, lane="bulk"),
+    RpcMethod("focus.state", lambda s, p, w: s._focus_state(p)),
+    RpcMethod("session.exit", lambda s, p, w: s._session_exit(p), mutates=True),
+    # The worktree/repo/account/discover RPC family is gone: it existed
+    # to build and address the `repos.json` inventory, which keyed a
+    # directory by its (mutable) branch and whose only producer fired
+    # from RPCs no workflow reaches any more. `worktree.refresh` stays
+    # because it is the hook a post-`git worktree add` agent hook wants:
+    # it drops the git caches so a new checkout is probed immediately.
+    RpcMethod("worktree.refresh", lambda s, p, w: s._worktree_refresh(p), mutates=True),
+    # Feature 101: Window tracing for debugging
+    RpcMethod("trace.start", lambda s, p, w: s.trace_service.start(p), mutates=True),
+    RpcMethod("trace.start_app", lambda s, p, w: s.trace_service.start_app(p), mutates=True),
+    RpcMethod("trace.stop", lambda s, p, w: s.trace_service.stop(p), mutates=True),
+    RpcMethod("trace.get", lambda s, p, w: s.trace_service.get(p)),
+    RpcMethod("trace.list", lambda s, p, w: s.trace_service.list(p)),
+    RpcMethod("trace.snapshot", lambda s, p, w: s.trace_service.snapshot(p), lane="bulk"),
+    # Feature 102 T057-T058: Trace template methods
+    RpcMethod("traces.list_templates", lambda s, p, w: s.trace_service.list_templates(p)),
+    RpcMethod("traces.start_from_template", lambda s, p, w: s.trace_service.start_from_template(p), mutates=True),
+    # Feature 102: Cross-reference and unified event tracing methods
+    RpcMethod("traces.get_cross_reference", lambda s, p, w: s.trace_service.get_cross_reference(p)),
+    RpcMethod("events.get_by_trace", lambda s, p, w: s.trace_service.events_by_trace(p)),
+    RpcMethod("traces.query_window_traces", lambda s, p, w: s.trace_service.query_window_traces(p)),
+    RpcMethod("events.get_causality_chain", lambda s, p, w: s.trace_service.causality_chain(p)),
+    # Feature 102 T046: Output state IPC method
+    RpcMethod("outputs.get_state", lambda s, p, w: s.display_service.outputs_state(p)),
+    RpcMethod("output.configure", lambda s, p, w: s.display_service.configure_output(p), mutates=True),
+    RpcMethod("output.create_virtual", lambda s, p, w: s.display_service.create_virtual_output(p), mutates=True),
+    RpcMethod("workspace.move_to_output", lambda s, p, w: s.display_service.move_workspace_to_output(p), mutates=True),
+    RpcMethod("workspace.focus", lambda s, p, w: s.focus_service.focus_workspace(p), intent=True, mutates=True),
+    RpcMethod("workspace.focus_fast", lambda s, p, w: s.focus_service.focus_workspace_fast(p), intent=True, mutates=True),
+    # Method aliases for Deno CLI compatibility
+    RpcMethod("list_projects", lambda s, p, w: s._list_projects()),
+    # Return full project details for app launcher wrapper script
+    RpcMethod("get_current_project", lambda s, p, w: s._get_active_project()),
+    RpcMethod("list_rules", lambda s, p, w: s._list_rules(p)),
+    # Feature 074: Session Management - Focus tracking methods (T030-T031, US1)
+    RpcMethod("project.get_focused_workspace", lambda s, p, w: s._project_get_focused_workspace(p)),
+    RpcMethod("project.set_focused_workspace", lambda s, p, w: s._project_set_focused_workspace(p), mutates=True),
+    # Feature 074: Session Management - Config IPC methods (T085-T086)
+    RpcMethod("config.get", lambda s, p, w: s._config_get(p)),
+    RpcMethod("config.set", lambda s, p, w: s._config_set(p), mutates=True),
+    # Feature 074: Session Management - State and version methods (T096-T097)
+    RpcMethod("state.get", lambda s, p, w: s._state_get(p)),
+    RpcMethod("daemon.contract", lambda s, p, w: s._daemon_contract(p)),
+    RpcMethod("ipc.configure", lambda s, p, w: s._ipc_configure(p, w)),
+    RpcMethod("daemon.version", lambda s, p, w: s._daemon_version(p)),
+    # Feature 001: Declarative workspace-to-monitor assignment
+    RpcMethod("monitors.status", lambda s, p, w: s._monitors_status(p)),
+    RpcMethod("monitors.reassign", lambda s, p, w: s._monitors_reassign(p), mutates=True),
+    RpcMethod("monitors.config", lambda s, p, w: s._monitors_config(p)),
+    # Feature 051: Run-raise-hide application launching
+    RpcMethod("app.run", lambda s, p, w: s._app_run(p), mutates=True),
+    # Feature 099: Window environment variables view
+    RpcMethod("window.get_env", lambda s, p, w: s._window_get_env(p)),
+    # Feature 123: State change subscription for efficient monitoring panel updates
+    RpcMethod("subscribe_state_changes", lambda s, p, w: s._subscribe_state_changes(p, w)),
+)
+
+
+
 class IPCServer:
     """JSON-RPC IPC server for CLI tool queries."""
 
@@ -515,6 +703,23 @@ class IPCServer:
         self.server: Optional[asyncio.Server] = None
         self.clients: set[asyncio.StreamWriter] = set()
         self.subscribed_clients: set[asyncio.StreamWriter] = set()  # Feature 017: Event subscriptions
+        # Encoded event lines are queued per subscriber and flushed once per tick
+        self.event_fanout = SubscriberFanout(
+            "event",
+            on_evict=lambda writer: self.subscribed_clients.discard(writer),
+        )
+        # Per-subscriber topic filters; subscribers without one get everything
+        self.event_subscriptions = EventSubscriptions(resolve_window=self._window_project_context)
+        # JSON-RPC method table and per-method latency stats (daemon.rpc_stats)
+        self.rpc_registry = RpcRegistry(RPC_METHODS)
+        # Latency lanes: caps bulk builds and holds them behind interactive calls
+        self.rpc_scheduler = RpcScheduler()
+        # Connections that opted into concurrent request handling (ipc.configure)
+        self._pipelines: Dict[asyncio.StreamWriter, RequestPipeline] = {}
+        # Connections that handle SERVER_BUSY rejections (ipc.configure busy_errors)
+        self._busy_error_clients: set[asyncio.StreamWriter] = set()
+        # Pre-serialized snapshot responses keyed on the state generations
+        self.response_cache = ResponseCache()
         self._dashboard_notify_task: Optional[asyncio.Task] = None
         self._dashboard_notify_pending: set[str] = set()
         self.registry_loader = RegistryLoader()
@@ -598,6 +803,8 @@ class IPCServer:
             registry_path=APP_REGISTRY_PATH,
             startup_recovery_provider=lambda: getattr(self, "startup_recovery_result", None),
             reconnection_manager_provider=lambda: getattr(self, "i3_reconnection_manager", None),
+            title_coalescer_provider=lambda: getattr(self, "title_coalescer", None),
+            classification_cache_provider=get_classification_cache,
         )
         self.event_query_service = EventQueryService(
             event_buffer_provider=lambda: self.event_buffer,
@@ -798,11 +1005,26 @@ class IPCServer:
 
             logger.info(f"IPC server listening on {socket_path} (permissions: 0600)")
 
+        self._open_snapshot_publisher()
         self.start_herdr_event_subscription()
 
+    def _open_snapshot_publisher(self) -> None:
+        """Publish dashboard snapshots to shared memory for local readers."""
+        publisher = SnapshotPublisher(self._runtime_dir() / "i3-project-daemon" / SNAPSHOT_FILENAME)
+        try:
+            publisher.open()
+        except OSError as e:
+            logger.warning(f"Shared dashboard snapshot disabled: {e}")
+            return
+        self.dashboard_service.publisher = publisher
+        logger.info(f"Publishing dashboard snapshots to {publisher.path}")
+
     async def stop(self) -> None:
         """Stop IPC server and close all connections."""
         await self.stop_herdr_event_subscription()
+        self.dashboard_service.cancel_pending_publish()
+        if self.dashboard_service.publisher is not None:
+            self.dashboard_service.publisher.close()
         await self.launch_service.stop_reconcile_tasks(
             timeout=self._RECONCILE_TASKS_CLOSE_TIMEOUT_SECONDS,
         )
@@ -854,8 +1076,18 @@ class IPCServer:
 
                 try:
                     request = json.loads(data.decode())
-                    response = await self._handle_request(request, writer)
-                    writer.write(json.dumps(response).encode() + b"\n")
+                    pipeline = self._pipelines.get(writer)
+                    if pipeline is not None:
+                        if isinstance(request, dict) and request.get("method") == "ipc.configure":
+                            # Reconfiguration is a barrier: answer everything
+                            # already running before switching modes.
+                            await pipeline.join()
+                            await pipeline.write(await self._handle_request(request, writer))
+                        else:
+                            await pipeline.submit(request)
+                        continue
+                    response = await self._handle_message(request, writer)
+                    writer.write(encode_response(response))
                     await writer.drain()
 
                 except json.JSONDecodeError as e:
@@ -866,8 +1098,12 @@ class IPCServer:
                         "error": {"code": -32700, "message": "Parse error"},
                         "id": None,
                     }
-                    writer.write(json.dumps(error_response).encode() + b"\n")
-                    await writer.drain()
+                    pipeline = self._pipelines.get(writer)
+                    if pipeline is not None:
+                        await pipeline.write(error_response)
+                    else:
+                        writer.write(json.dumps(error_response).encode() + b"\n")
+                        await writer.drain()
 
         except (BrokenPipeError, ConnectionError, ConnectionResetError, asyncio.IncompleteReadError) as e:
             logger.debug("Client %s disconnected during request handling: %s", addr, e)
@@ -875,8 +1111,14 @@ class IPCServer:
             logger.error(f"Error handling client {addr}: {e}", exc_info=True)
 
         finally:
+            pipeline = self._pipelines.pop(writer, None)
+            if pipeline is not None:
+                await pipeline.cancel()
+            self._busy_error_clients.discard(writer)
             self.clients.discard(writer)
             self.subscribed_clients.discard(writer)  # Remove from subscriptions if subscribed
+            self.event_fanout.discard(writer)
+            self.event_subscriptions.discard(writer)
             self.dashboard_service.discard_subscriber(writer)
             await self._close_client_writer(writer)
 
@@ -949,7 +1191,12 @@ class IPCServer:
         return {
             "client_count": len(self.clients),
             "subscribed_client_count": len(self.subscribed_clients),
+            "pipelined_client_count": len(self._pipelines),
+            "pipelined_in_flight": sum(p.in_flight for p in self._pipelines.values()),
             "state_change_subscriber_count": len(self.dashboard_service.subscribers),
+            "event_fanout": self.event_fanout.get_stats(),
+            "event_subscriptions": self.event_subscriptions.get_stats(),
+            "dashboard_fanout": self.dashboard_service.fanout.get_stats(),
             "malformed_json_count": self._malformed_json_count,
             "last_malformed_json_at": self._malformed_json_last_at,
             "last_malformed_json_peer": self._malformed_json_last_peer or None,
@@ -960,6 +1207,24 @@ class IPCServer:
             ],
         }
 
+    async def _handle_message(self, message: Any, writer: asyncio.StreamWriter) -> Any:
+        """Answer one decoded request line: a request object or a batch array.
+
+        Batches run read-only members concurrently around mutating barriers
+        and share snapshot builds (see services/rpc_batch.py).
+        """
+        if isinstance(message, list):
+            return await run_batch(
+                message,
+                lambda request: self._handle_request(request, writer),
+                mutates=self._method_mutates,
+            )
+        return await self._handle_request(message, writer)
+
+    def _method_mutates(self, method: Any) -> bool:
+        descriptor = self.rpc_registry.get(method)
+        return descriptor is not None and descriptor.mutates
+
     async def _handle_request(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
         """Handle a JSON-RPC request.
 
@@ -978,320 +1243,142 @@ class IPCServer:
             params = dict(params)
         request_id = request.get("id")
 
-        explicit_intent_methods = {
-            "context.ensure",
-            "herdr.pane.focus",
-            "herdr.pane.close",
-            "herdr.remote.pane.focus",
-            "herdr.remote.window.focus",
-            "herdr.workspace.focus",
-            "herdr.tab.focus",
-            "launch.open",
-            "window.focus",
-            "window.focus_fast",
-            "workspace.focus",
-            "workspace.focus_fast",
-        }
-        if isinstance(method, str) and method in explicit_intent_methods:
+        descriptor = self.rpc_registry.get(method)
+        if descriptor is None:
+            self.rpc_registry.record_unknown()
+            return {
+                "jsonrpc": "2.0",
+                "error": {"code": METHOD_NOT_FOUND, "message": f"Method not found: {method}"},
+                "id": request_id,
+            }
+
+        started = time.perf_counter()
+        if descriptor.cached:
+            response = await self._dispatch_cached(descriptor, params, writer, request_id)
+        else:
+            response = await self._dispatch(descriptor, params, writer, request_id)
+        if descriptor.mutates:
+            self.response_cache.invalidate()
+        self.rpc_registry.record(descriptor.name, time.perf_counter() - started, "error" in response)
+        return response
+
+    def _response_generation(self, method: str) -> Optional[Tuple[Any, ...]]:
+        """Generation tuple a cached snapshot response is valid for.
+
+        Covers the dashboard generations (bumped when a state-change
+        notification is drained), the herdr generations (bumped as herdr events
+        patch its cache) and the response cache epoch (bumped as soon as a
+        change is observed, before the coalesced notification runs). Returns
+        None when the method should not be served from cache right now.
+        """
+        herdr = self.herdr_service
+        generation: Tuple[Any, ...] = (
+            self._snapshot_version,
+            self._session_generation,
+            self._display_generation,
+            self._focus_generation,
+            herdr.local_herdr_generation,
+            herdr.herdr_event_generation,
+            tuple(sorted(herdr.remote_herdr_generation.items())),
+            self.response_cache.epoch,
+        )
+        if method == "herdr.snapshot":
+            # herdr.snapshot has its own TTL cache; only short-circuit while
+            # that cache would have answered the call anyway.
+            herdr_token = herdr.snapshot_cache_token(now=time.time())
+            if herdr_token is None:
+                return None
+            generation += herdr_token
+        return generation
+
+    async def _dispatch_cached(
+        self,
+        descriptor: RpcMethod,
+        params: Dict[str, Any],
+        writer: asyncio.StreamWriter,
+        request_id: Any,
+    ) -> Dict[str, Any]:
+        """Serve a snapshot method from the response cache, building on a miss.
+
+        ``if_generation`` makes the request conditional: when it matches the
+        cached payload's generation token the reply is ``not_modified``.
+        """
+        if_generation = params.pop(CONDITIONAL_PARAM, None)
+        generation = self._response_generation(descriptor.name)
+        key = self.response_cache.key(descriptor.name, params) if generation is not None else None
+        if key is None:
+            return await self._dispatch(descriptor, params, writer, request_id)
+
+        entry = None
+        refresh = any(params.get(name) for name in REFRESH_PARAMS)
+        if not refresh:
+            entry = self.response_cache.lookup(key, generation)
+            if entry is None:
+                pending = self.response_cache.pending(key, generation)
+                if pending is not None:
+                    entry = await asyncio.shield(pending)
+
+        if entry is None:
+            build = self.response_cache.begin(key, generation)
+            try:
+                response = await self._dispatch(descriptor, params, writer, request_id)
+                if "error" not in response:
+                    entry = self.response_cache.store(key, generation, response.get("result"))
+            finally:
+                self.response_cache.finish(key, generation, build, entry)
+            if entry is None:
+                return response
+
+        return self.response_cache.respond(entry, request_id, if_generation)
+
+    async def _dispatch(
+        self,
+        descriptor: RpcMethod,
+        params: Dict[str, Any],
+        writer: asyncio.StreamWriter,
+        request_id: Any,
+    ) -> Dict[str, Any]:
+        """Admit a method through its scheduler lane, then run it."""
+        try:
+            slot = await self.rpc_scheduler.acquire(
+                descriptor.latency_class,
+                reject=bool(self._busy_error_clients) and writer in self._busy_error_clients,
+            )
+        except RpcOverloaded as e:
+            logger.debug("Rejected %s: %s", descriptor.name, e)
+            return self._error_response(request_id, SERVER_BUSY, str(e), e.to_json())
+        try:
+            return await self._run_method(descriptor, params, writer, request_id)
+        finally:
+            self.rpc_scheduler.release(slot)
+
+    async def _run_method(
+        self,
+        descriptor: RpcMethod,
+        params: Dict[str, Any],
+        writer: asyncio.StreamWriter,
+        request_id: Any,
+    ) -> Dict[str, Any]:
+        """Run a registered method and shape its JSON-RPC response."""
+        method = descriptor.name
+        if descriptor.intent:
             params["__intent_epoch"] = self._advance_user_intent_epoch(
                 method=method,
                 params=params,
             )
 
         try:
-            # Dispatch to handler method
-            if method == "get_status":
-                result = await self._get_status()
-            elif method == "get_active_project":
-                result = await self._get_active_project()
-            elif method == "context.get_active":
-                result = await self._context_get_active(params)
-            elif method == "context.current":
-                result = await self._context_get_active(params)
-            elif method == "context.ensure":
-                result = await self._context_ensure(params)
-            elif method == "runtime.snapshot":
-                result = await self._runtime_snapshot(params)
-            elif method == "dashboard.snapshot":
-                result = await self._dashboard_snapshot(params)
-            elif method == "dashboard.validate":
-                result = await self._dashboard_validate(params)
-            elif method == "herdr.snapshot":
-                result = await self.herdr_service.snapshot(params)
-            elif method == "herdr.proxy.snapshot":
-                result = await self._herdr_proxy_snapshot(params)
-            elif method == "herdr.proxy.pane.focus":
-                result = await self.herdr_service.proxy_pane_focus(params)
-            elif method == "herdr.pane.focus":
-                result = await self.herdr_service.pane_focus(
-                    params,
-                    launch_open=self._launch_open,
-                )
-            elif method == "herdr.pane.close":
-                result = await self.herdr_service.pane_close(params)
-            elif method == "herdr.remote.pane.focus":
-                result = await self.herdr_service.remote_pane_focus(
-                    params,
-                    launch_open=self._launch_open,
-                    set_focus_overrides=self._set_focus_overrides,
-                )
-            elif method == "herdr.remote.window.focus":
-                result = await self.herdr_service.remote_window_focus(
-                    params,
-                    launch_open=self._launch_open,
-                )
-            elif method == "herdr.workspace.focus":
-                result = await self.herdr_service.workspace_focus(
-                    params,
-                    launch_open=self._launch_open,
-                )
-            elif method == "herdr.tab.focus":
-                result = await self.herdr_service.tab_focus(
-                    params,
-                    launch_open=self._launch_open,
-                )
-            elif method == "display.snapshot":
-                result = await self.display_service.snapshot()
-            elif method == "display.apply":
-                result = await self.display_service.apply(params)
-            elif method == "display.cycle":
-                result = await self.display_service.cycle(params)
-            elif method == "display.toggle_output":
-                result = await self.display_service.toggle_output(params)
-            elif method == "display.set_scale":
-                result = await self.display_service.set_scale(params)
-            elif method == "get_windows":
-                # Return hierarchical tree structure (outputs array)
-                tree_result = await self._get_window_tree(params)
-                result = tree_result.get("outputs", [])
-            elif method == "get_events":
-                # Return events array (not dict with stats) for CLI
-                # Unified event system: Return full event data with source field
-                events_result = await self.event_query_service.get_events(params)
-                result = events_result.get("events", [])
-            elif method == "list_monitors":
-                result = await self._list_monitors()
-            elif method == "subscribe_events":
-                result = await self._subscribe_events(params, writer)
-            elif method == "subscribe":  # Feature 058: Workspace mode event subscription
-                result = await self._subscribe_events(params, writer)
-            elif method == "reload_config":
-                result = await self._reload_config()
-            elif method == "get_diagnostic_state":
-                result = await self._get_diagnostic_state(params)
-            elif method == "get_window_rules":
-                result = await self._get_window_rules(params)
-            elif method == "classify_window":
-                result = await self._classify_window(params)
-            elif method == "get_window_tree":
-                result = await self._get_window_tree(params)
-
-            # Feature 030: Production readiness methods (T016)
-            elif method == "daemon.status":
-                result = await self.daemon_status_service.status_rpc()
-            elif method == "daemon.events":
-                result = await self.daemon_status_service.events_rpc(params)
-            elif method == "daemon.diagnose":
-                result = await self.daemon_status_service.diagnose_rpc(params)
-            elif method == "daemon.apps":
-                result = await self.daemon_status_service.apps_rpc(params)
-
-            # Feature 037 US5: Window visibility methods (T036, T037)
-            elif method == "windows.getHidden":
-                result = await self._get_hidden_windows(params)
-            elif method == "windows.getState":
-                result = await self._get_window_state(params)
-
-            # Feature 039: Diagnostic API methods (T087-T092)
-            elif method == "health_check":
-                result = self.daemon_status_service.health_check()
-            # Feature 121: Socket health endpoint for diagnostic CLI
-            elif method == "get_socket_health":
-                result = await self.daemon_status_service.socket_health()
-            elif method == "get_window_identity":
-                result = await self.diagnostic_service.window_identity(params)
-            elif method == "get_window_environment":
-                # Feature 058: Phase 3 - Get window environment by PID
-                result = await self.diagnostic_service.window_environment(params)
-            elif method == "get_workspace_rule":
-                result = await self.diagnostic_service.workspace_rule(params)
-            elif method == "validate_state":
-                result = await self.diagnostic_service.validate_state()
-            elif method == "get_recent_events":
-                result = await self.diagnostic_service.recent_events(params)
-            elif method == "get_diagnostic_report":
-                result = await self.diagnostic_service.report(params)
-
-            # Feature 041: IPC Launch Context methods (T010-T012)
-            elif method == "prepare_launch":
-                result = await self._prepare_launch(params)
-            elif method == "launch.preview":
-                preview_params = dict(params or {})
-                preview_params["dry_run"] = True
-                result = await self._prepare_launch(preview_params)
-            elif method == "launch.open":
-                result = await self._launch_open(params)
-            elif method == "launch.status":
-                result = await self.launch_service.launch_status(params.get("launch_id", ""))
-            elif method == "get_launch_stats":
-                result = self.launch_service.launch_stats()
-            elif method == "get_pending_launches":
-                result = await self.launch_service.pending_launches(
-                    include_matched=bool(params.get("include_matched", False))
-                )
-            elif method == "get_terminal_anchor":
-                result = await self.launch_service.terminal_anchor(params.get("terminal_anchor_id", ""))
-            elif method == "window.focus":
-                result = await self.focus_service.focus_window_from_params(params)
-            elif method == "window.focus_fast":
-                result = await self.focus_service.focus_window_fast(params)
-            elif method == "window.action":
-                result = await self.focus_service.window_action(params)
-                if isinstance(result, dict) and bool(result.get("success", False)):
-                    self.invalidate_window_tree_cache()
-                    await self.notify_state_change_background("window::action")
-            elif method == "session.list":
-                result = await self._session_list(params)
-            elif method == "focus.state":
-                result = await self._focus_state(params)
-            elif method == "session.exit":
-                result = await self._session_exit(params)
-
-            # The worktree/repo/account/discover RPC family is gone: it existed
-            # to build and address the `repos.json` inventory, which keyed a
-            # directory by its (mutable) branch and whose only producer fired
-            # from RPCs no workflow reaches any more. `worktree.refresh` stays
-            # because it is the hook a post-`git worktree add` agent hook wants:
-            # it drops the git caches so a new checkout is probed immediately.
-            elif method == "worktree.refresh":
-                result = await self._worktree_refresh(params)
-
-            # Feature 101: Window tracing for debugging
-            elif method == "trace.start":
-                result = await self.trace_service.start(params)
-            elif method == "trace.start_app":
-                result = await self.trace_service.start_app(params)
-            elif method == "trace.stop":
-                result = await self.trace_service.stop(params)
-            elif method == "trace.get":
-                result = await self.trace_service.get(params)
-            elif method == "trace.list":
-                result = await self.trace_service.list(params)
-            elif method == "trace.snapshot":
-                result = await self.trace_service.snapshot(params)
-
-            # Feature 102 T057-T058: Trace template methods
-            elif method == "traces.list_templates":
-                result = await self.trace_service.list_templates(params)
-            elif method == "traces.start_from_template":
-                result = await self.trace_service.start_from_template(params)
-
-            # Feature 102: Cross-reference and unified event tracing methods
-            elif method == "traces.get_cross_reference":
-                result = await self.trace_service.get_cross_reference(params)
-            elif method == "events.get_by_trace":
-                result = await self.trace_service.events_by_trace(params)
-            elif method == "traces.query_window_traces":
-                result = await self.trace_service.query_window_traces(params)
-            elif method == "events.get_causality_chain":
-                result = await self.trace_service.causality_chain(params)
-
-            # Feature 102 T046: Output state IPC method
-            elif method == "outputs.get_state":
-                result = await self.display_service.outputs_state(params)
-            elif method == "output.configure":
-                result = await self.display_service.configure_output(params)
-            elif method == "output.create_virtual":
-                result = await self.display_service.create_virtual_output(params)
-            elif method == "workspace.move_to_output":
-                result = await self.display_service.move_workspace_to_output(params)
-            elif method == "workspace.focus":
-                result = await self.focus_service.focus_workspace(params)
-            elif method == "workspace.focus_fast":
-                result = await self.focus_service.focus_workspace_fast(params)
-
-            # Method aliases for Deno CLI compatibility
-            elif method == "list_projects":
-                # Convert Project objects to array format for CLI (Feature 030)
-                projects = self.state_manager.state.projects
-                result = [
-                    {
-                        "name": proj.name,
-                        "display_name": proj.display_name,
-                        "icon": proj.icon or "",  # Ensure not null
-                        "directory": str(proj.directory),
-                        "scoped_classes": list(proj.scoped_classes) if proj.scoped_classes else [],
-                        "created_at": 1,  # Placeholder: TODO add created_at to Project model
-                        "last_used_at": 1,  # Placeholder: TODO add last_used_at tracking
-                    }
-                    for proj in projects.values()
-                ]
-            elif method == "get_current_project":
-                # Return full project details for app launcher wrapper script
-                result = await self._get_active_project()
-            elif method == "list_rules":
-                # Return rules array adapted to CLI format
-                import uuid
-                rules_result = await self._get_window_rules(params)
-                rules = rules_result.get("rules", [])
-                # Adapt format: pattern -> class_pattern, add rule_id and enabled
-                result = [
-                    {
-                        "rule_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, rule["pattern"])),
-                        "class_pattern": rule["pattern"],
-                        "scope": rule["scope"],
-                        "priority": rule["priority"],
-                        "enabled": True,  # TODO: Track enabled state
-                    }
-                    for rule in rules
-                ]
-
-            # Feature 074: Session Management - Focus tracking methods (T030-T031, US1)
-            elif method == "project.get_focused_workspace":
-                result = await self._project_get_focused_workspace(params)
-            elif method == "project.set_focused_workspace":
-                result = await self._project_set_focused_workspace(params)
-
-            # Feature 074: Session Management - Config IPC methods (T085-T086)
-            elif method == "config.get":
-                result = await self._config_get(params)
-            elif method == "config.set":
-                result = await self._config_set(params)
-
-            # Feature 074: Session Management - State and version methods (T096-T097)
-            elif method == "state.get":
-                result = await self._state_get(params)
-            elif method == "daemon.contract":
-                result = await self._daemon_contract(params)
-            elif method == "daemon.version":
-                result = await self._daemon_version(params)
-
-            # Feature 001: Declarative workspace-to-monitor assignment
-            elif method == "monitors.status":
-                result = await self._monitors_status(params)
-            elif method == "monitors.reassign":
-                result = await self._monitors_reassign(params)
-            elif method == "monitors.config":
-                result = await self._monitors_config(params)
-
-            # Feature 051: Run-raise-hide application launching
-            elif method == "app.run":
-                result = await self._app_run(params)
-
-            # Feature 099: Window environment variables view
-            elif method == "window.get_env":
-                result = await self._window_get_env(params)
-
-            # Feature 123: State change subscription for efficient monitoring panel updates
-            elif method == "subscribe_state_changes":
-                result = await self._subscribe_state_changes(params, writer)
+            result = descriptor.handler(self, params, writer)
+            if inspect.isawaitable(result):
+                result = await result
 
-            else:
-                return {
-                    "jsonrpc": "2.0",
-                    "error": {"code": -32601, "message": f"Method not found: {method}"},
-                    "id": request_id,
-                }
+            if (descriptor.invalidates or descriptor.notify) and isinstance(result, dict) and bool(
+                result.get("success", False)
+            ):
+                if "window_tree" in descriptor.invalidates:
+                    self.invalidate_window_tree_cache()
+                if descriptor.notify:
+                    await self.notify_state_change_background(descriptor.notify)
 
             focus_intent = self._finalize_focus_intent_for_result(
                 method=str(method or ""),
@@ -1387,6 +1474,79 @@ class IPCServer:
                 {"exception": error_type, "details": str(e)}
             )
 
+    async def _get_windows_outputs(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """get_windows: hierarchical tree structure (outputs array)."""
+        tree_result = await self._get_window_tree(params)
+        return tree_result.get("outputs", [])
+
+    async def _get_events_list(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """get_events: events array (not dict with stats) for CLI.
+
+        Unified event system: Return full event data with source field.
+        """
+        events_result = await self.event_query_service.get_events(params)
+        return events_result.get("events", [])
+
+    async def _launch_preview(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        preview_params = dict(params or {})
+        preview_params["dry_run"] = True
+        return await self._prepare_launch(preview_params)
+
+    def _list_projects(self) -> List[Dict[str, Any]]:
+        """Convert Project objects to array format for CLI (Feature 030)."""
+        projects = self.state_manager.state.projects
+        return [
+            {
+                "name": proj.name,
+                "display_name": proj.display_name,
+                "icon": proj.icon or "",  # Ensure not null
+                "directory": str(proj.directory),
+                "scoped_classes": list(proj.scoped_classes) if proj.scoped_classes else [],
+                "created_at": 1,  # Placeholder: TODO add created_at to Project model
+                "last_used_at": 1,  # Placeholder: TODO add last_used_at tracking
+            }
+            for proj in projects.values()
+        ]
+
+    async def _list_rules(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Return rules array adapted to CLI format."""
+        import uuid
+        rules_result = await self._get_window_rules(params)
+        rules = rules_result.get("rules", [])
+        # Adapt format: pattern -> class_pattern, add rule_id and enabled
+        return [
+            {
+                "rule_id": str(uuid.uuid5(uuid.NAMESPACE_DNS, rule["pattern"])),
+                "class_pattern": rule["pattern"],
+                "scope": rule["scope"],
+                "priority": rule["priority"],
+                "enabled": True,  # TODO: Track enabled state
+            }
+            for rule in rules
+        ]
+
+    def _rpc_stats(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Per-method call counts, error counts and latency percentiles.
+
+        Params:
+            include_idle: Also list registered methods that were never called
+            reset: Zero the counters after reading them
+        """
+        result = self.rpc_registry.get_stats(include_idle=bool(params.get("include_idle", False)))
+        result["response_cache"] = self.response_cache.get_stats()
+        result["scheduler"] = self.rpc_scheduler.get_stats()
+        result["herdr_client"] = self.herdr_service.client.get_stats()
+        result["herdr_status_subscription"] = self.herdr_service.status_subscription.get_stats()
+        result["herdr_proxy_channels"] = {
+            key: channel.get_stats()
+            for key, channel in self.herdr_service.proxy_channels.items()
+        }
+        if self.dashboard_service.publisher is not None:
+            result["shared_snapshot"] = self.dashboard_service.publisher.get_stats()
+        if params.get("reset"):
+            self.rpc_registry.reset()
+        return result
+
     async def _log_ipc_event(
         self,
         event_type: str,
@@ -2060,6 +2220,44 @@ class IPCServer:
                 error=error_msg,
             )
 
+    def _ipc_configure(self, params: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
+        """Set per-connection IPC options.
+
+        ``pipelining: true`` makes this connection handle requests concurrently
+        (up to ``max_in_flight``) and answer them as they complete, matched by
+        JSON-RPC id. ``pipelining: false`` restores one-at-a-time handling.
+
+        ``busy_errors: true`` lets bulk calls on this connection fail fast with
+        SERVER_BUSY (and ``retry_after_ms``) when the bulk queue is full;
+        connections that have not opted in wait for a slot instead.
+        """
+        pipeline = self._pipelines.get(writer)
+        if "pipelining" in params:
+            if params["pipelining"]:
+                max_in_flight = int(params.get("max_in_flight") or DEFAULT_MAX_IN_FLIGHT)
+                if max_in_flight < 1 or max_in_flight > MAX_IN_FLIGHT_LIMIT:
+                    raise ValueError(f"max_in_flight must be 1-{MAX_IN_FLIGHT_LIMIT}")
+                if pipeline is None or pipeline.max_in_flight != max_in_flight:
+                    pipeline = self._pipelines[writer] = RequestPipeline(
+                        lambda request: self._handle_message(request, writer),
+                        writer,
+                        max_in_flight=max_in_flight,
+                    )
+            else:
+                self._pipelines.pop(writer, None)
+                pipeline = None
+        if "busy_errors" in params:
+            if params["busy_errors"]:
+                self._busy_error_clients.add(writer)
+            else:
+                self._busy_error_clients.discard(writer)
+
+        return {
+            "pipelining": pipeline is not None,
+            "max_in_flight": pipeline.max_in_flight if pipeline is not None else 1,
+            "busy_errors": writer in self._busy_error_clients,
+        }
+
     async def _daemon_contract(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Get the daemon contract marker used by health and rebuild gates."""
         start_time = time.perf_counter()
@@ -2136,31 +2334,52 @@ class IPCServer:
             "subscribed_clients": len(self.subscribed_clients)
         }
 
-    async def _subscribe_events(self, params: Dict[str, Any], writer: asyncio.StreamWriter) -> Dict[str, Any]:
+    async def _subscribe_events(self, params: Dict[str, Any], writer: asyncio.StreamWriter) -> Any:
         """Subscribe/unsubscribe from event stream (Feature 017).
 
         Args:
-            params: Subscription parameters (subscribe: bool)
+            params: Subscription parameters:
+                - subscribe: bool (default True)
+                - event_types: Event-type prefixes per "::" category ("window", "window::focus")
+                - sources: Event sources ("i3", "ipc", "daemon", ...)
+                - window_id: Only events for this window
+                - project / context_key: Only events for this project or context
+                - max_rate: Maximum events per second for this subscriber
             writer: Stream writer for this client connection
 
         Returns:
-            Subscription confirmation
+            "subscribed"/"unsubscribed", or the normalized filter when one was given
         """
         subscribe = params.get("subscribe", True)
 
         if subscribe:
+            event_filter = EventFilter.from_params(params)
             self.subscribed_clients.add(writer)
+            self.event_subscriptions.set(writer, event_filter)
             logger.info(f"Client subscribed to events (total subscribers: {len(self.subscribed_clients)})")
         else:
             self.subscribed_clients.discard(writer)
+            self.event_subscriptions.discard(writer)
             logger.info(f"Client unsubscribed from events (total subscribers: {len(self.subscribed_clients)})")
 
         # Feature 058: Return simple "subscribed" result for workspace mode events
         if subscribe:
-            return "subscribed"
+            if self.event_subscriptions.get(writer) is None:
+                return "subscribed"
+            return {"subscribed": True, "filter": event_filter.to_json()}
         else:
             return "unsubscribed"
 
+    def _window_project_context(self, window_id: int) -> Tuple[str, str]:
+        """Return (project, context_key) of a tracked window for event filters."""
+        window_info = self.state_manager.state.window_map.get(window_id)
+        if window_info is None:
+            return "", ""
+        return (
+            str(getattr(window_info, "project", "") or ""),
+            str(getattr(window_info, "context_key", "") or ""),
+        )
+
     async def broadcast_event(self, event_data: Dict[str, Any]) -> None:
         """Broadcast event notification to all subscribed clients (Feature 017).
 
@@ -2170,105 +2389,33 @@ class IPCServer:
         if not self.subscribed_clients:
             return
 
+        targets = self.event_subscriptions.targets(event_data, self.subscribed_clients)
+        if not targets:
+            return
         # Feature 058: Use "event" method for workspace panel compatibility
-        notification = {
-            "jsonrpc": "2.0",
-            "method": "event",
-            "params": event_data
-        }
-        message = json.dumps(notification).encode() + b"\n"
-
-        # Send to all subscribed clients without awaiting drain — this runs
-        # inside Sway window/workspace handlers, so one wedged subscriber must
-        # not stall event processing. Mirrors the dashboard event fanout: evict
-        # and close writers whose write buffer exceeds the cap instead.
-        dead_clients = set()
-        for writer in list(self.subscribed_clients):
-            try:
-                writer.write(message)
-                transport = getattr(writer, "transport", None)
-                get_buffer_size = getattr(transport, "get_write_buffer_size", None)
-                if callable(get_buffer_size) and int(get_buffer_size() or 0) > 1_000_000:
-                    logger.warning("Dropping slow event subscriber with oversized write buffer")
-                    dead_clients.add(writer)
-            except Exception as e:
-                logger.error(f"Failed to broadcast to client: {e}")
-                dead_clients.add(writer)
-
-        self.subscribed_clients -= dead_clients
-        for writer in dead_clients:
-            try:
-                writer.close()
-            except Exception:
-                pass
+        self.event_fanout.publish(targets, encode_line(event_notification(event_data)))
 
     async def broadcast_event_entry(self, event_entry) -> None:
         """Broadcast EventEntry to all subscribed clients (Feature 017: T019).
 
+        Subscribers are selected by their topic filters first; the entry is
+        encoded once (non-None fields only) only if any of them match, and the
+        same bytes are queued for every target.
+
+        Nothing here awaits a drain — this runs inside Sway window/workspace
+        handlers, so one wedged subscriber must not stall event processing.
+        Lines are flushed on the next loop iteration as one batched write per
+        subscriber; writers whose write buffer exceeds the cap are evicted and
+        closed instead.
+
         Args:
             event_entry: EventEntry instance to broadcast
         """
-        # Convert EventEntry to dict for JSON serialization
-        # Include all unified event system fields
-        event_data = {
-            "event_id": event_entry.event_id,
-            "event_type": event_entry.event_type,
-            "timestamp": event_entry.timestamp.isoformat(),
-            "source": event_entry.source,
-
-            # Window event fields
-            "window_id": event_entry.window_id,
-            "window_class": event_entry.window_class,
-            "window_title": event_entry.window_title,
-            "window_instance": event_entry.window_instance,
-            "workspace_name": event_entry.workspace_name,
-
-            # Project event fields
-            "project_name": event_entry.project_name,
-            "project_directory": event_entry.project_directory,
-            "old_project": event_entry.old_project,
-            "new_project": event_entry.new_project,
-            "windows_affected": event_entry.windows_affected,
-
-            # Tick event fields
-            "tick_payload": event_entry.tick_payload,
-
-            # Output event fields
-            "output_name": event_entry.output_name,
-            "output_count": event_entry.output_count,
-
-            # Query event fields
-            "query_method": event_entry.query_method,
-            "query_params": event_entry.query_params,
-            "query_result_count": event_entry.query_result_count,
-
-            # Config event fields
-            "config_type": event_entry.config_type,
-            "rules_added": event_entry.rules_added,
-            "rules_removed": event_entry.rules_removed,
-
-            # Daemon event fields
-            "daemon_version": event_entry.daemon_version,
-            "i3_socket": event_entry.i3_socket,
-
-            # Systemd event fields (Feature 029)
-            "systemd_unit": event_entry.systemd_unit,
-            "systemd_message": event_entry.systemd_message,
-            "systemd_pid": event_entry.systemd_pid,
-            "journal_cursor": event_entry.journal_cursor,
-
-            # Process event fields (Feature 029)
-            "process_pid": event_entry.process_pid,
-            "process_name": event_entry.process_name,
-            "process_cmdline": event_entry.process_cmdline,
-            "process_parent_pid": event_entry.process_parent_pid,
-            "process_start_time": event_entry.process_start_time.isoformat() if hasattr(event_entry.process_start_time, 'isoformat') else event_entry.process_start_time,
-
-            # Processing metadata
-            "processing_duration_ms": event_entry.processing_duration_ms,
-            "error": event_entry.error,
-        }
-        await self.broadcast_event(event_data)
+        if not self.subscribed_clients:
+            return
+        targets = self.event_subscriptions.targets(event_entry.__dict__, self.subscribed_clients)
+        if targets:
+            self.event_fanout.publish(targets, encode_event_entry(event_entry))
 
     async def _reload_config(self) -> Dict[str, Any]:
         """Reload project configs from disk."""
@@ -2525,8 +2672,8 @@ class IPCServer:
             window_rules = self.window_rules_getter()
 
         # Get app classification
-        app_classification_scoped = list(self.state_manager.state.scoped_classes)
-        app_classification_global = list(self.state_manager.state.global_classes)
+        app_classification_scoped = self.state_manager.state.scoped_classes
+        app_classification_global = self.state_manager.state.global_classes
 
         # Classify
         classification = classify_window(
@@ -2537,6 +2684,7 @@ class IPCServer:
             app_classification_patterns=None,  # TODO: Extract from app classification
             app_classification_scoped=app_classification_scoped,
             app_classification_global=app_classification_global,
+            cache=get_classification_cache(),
         )
 
         return classification.to_json()
@@ -2558,6 +2706,7 @@ class IPCServer:
             logger.debug("[Feature 123] Window tree cache invalidated")
         self._window_tree_cache = None
         self._window_tree_cache_time = 0.0
+        self.response_cache.invalidate()
 
     def invalidate_worktree_cache(self) -> None:
         """Drop the git caches keyed by checkout after a worktree mutation.
@@ -2867,6 +3016,7 @@ class IPCServer:
         Args:
             event_type: Type of state change event (for debugging)
         """
+        self.response_cache.invalidate()
         await self.dashboard_service.notify_state_change(event_type)
 
     async def notify_state_change_background(self, event_type: str = "dashboard_invalidated") -> None:
@@ -2896,6 +3046,8 @@ class IPCServer:
 
     def _schedule_state_change_notification(self, event_type: str = "dashboard_invalidated") -> None:
         """Run dashboard notification fanout in the background."""
+        # Cached snapshots go stale now, not when the coalesced fanout runs.
+        self.response_cache.invalidate()
         self._dashboard_notify_pending.add(str(event_type or "dashboard_invalidated"))
         current = self._dashboard_notify_task
         if current and not current.done():
@@ -3024,13 +3176,15 @@ class IPCServer:
         without owning Sway subscriptions or UI state.
 
         Args:
-            params: Subscription parameters (currently unused)
+            params: Subscription parameters; ``{"delta": true}`` requests
+                delta-encoded events (see services/dashboard_delta.py)
             writer: Client's stream writer
 
         Returns:
             dict with subscription status
         """
-        return self.dashboard_service.subscribe(writer)
+        params = params or {}
+        return self.dashboard_service.subscribe(writer, delta=bool(params.get("delta", False)))
 
     async def _get_window_tree(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """Get hierarchical window state tree (Feature 025: T016).
@@ -3054,6 +3208,11 @@ class IPCServer:
         Raises:
             Exception: If i3 connection unavailable or query fails
         """
+        params = params or {}
+        # Calls in one batch stage (including runtime snapshots) share a build
+        return await batch_shared("get_window_tree", params, lambda: self._build_window_tree(params))
+
+    async def _build_window_tree(self, params: Dict[str, Any]) -> Dict[str, Any]:
         if not self.i3_connection or not self.i3_connection.conn:
             raise Exception("i3 connection not available")
 
@@ -3074,7 +3233,7 @@ class IPCServer:
             try:
                 # Query i3 IPC for current state using serialized methods
                 # to prevent concurrent command socket corruption
-                tree = await self.i3_connection.get_tree()
+                tree = await get_compact_tree(self.i3_connection)
                 workspaces = await self._sway_get_workspaces()
                 outputs_list = await self.i3_connection.get_outputs()
                 break  # Success, exit retry loop
@@ -3092,6 +3251,10 @@ class IPCServer:
                 else:
                     raise Exception(f"Failed to query i3 window tree after {max_retries} attempts: {last_error}")
 
+        # Read every window's process environment (and ancestors) in one
+        # worker-thread pass instead of per-window /proc reads on the loop.
+        await get_process_index().prime(node.pid for node in tree if node.pid)
+
         tracked_windows = await self.state_manager.get_window_map_snapshot()
         tracked_windows_by_con_id = {
             int(window_info.con_id): window_info
@@ -3103,19 +3266,6 @@ class IPCServer:
         outputs = []
         total_windows = 0
 
-        # Index workspace containers by name in a single pass over the tree, so the
-        # per-workspace lookup below is O(1) instead of a fresh full-tree DFS per
-        # workspace (was O(workspaces * tree_nodes) via _find_workspace_container).
-        workspace_containers: Dict[str, Any] = {}
-
-        def _index_workspace_containers(node: Any) -> None:
-            if getattr(node, "type", None) == "workspace" and node.name:
-                workspace_containers.setdefault(node.name, node)
-            for child in (node.nodes + node.floating_nodes):
-                _index_workspace_containers(child)
-
-        _index_workspace_containers(tree)
-
         for output in outputs_list:
             if not output.active or output.name.startswith("__"):
                 continue  # Skip inactive and special outputs
@@ -3151,8 +3301,9 @@ class IPCServer:
                     "windows": [],
                 }
 
-                # Find windows in this workspace (O(1) lookup from the index above)
-                ws_con = workspace_containers.get(ws.name)
+                # Find windows in this workspace (O(1) lookup in the compact
+                # tree's workspace index, built once per tree generation)
+                ws_con = tree.find_workspace(ws.name)
                 if ws_con:
                     windows = self._extract_windows_from_container(
                         ws_con,
@@ -3696,15 +3847,11 @@ class IPCServer:
                 # Get window class (X11 uses window_class, Wayland uses app_id)
                 window_class = node.window_class if hasattr(node, 'window_class') and node.window_class else (node.app_id if hasattr(node, 'app_id') else "")
 
-                # Read I3PM_* environment for app_id and worktree metadata via the
-                # 10s-TTL per-PID cache (read_process_environ_with_fallback) instead
-                # of an uncached /proc read. This runs per-window on every snapshot;
-                # the cache turns a repeated blocking /proc/<pid>/environ read into
-                # at most one read per PID per 10s. Process env is immutable after
-                # exec, so caching is correct. The fallback returns the window's own
-                # env when it carries I3PM markers (same as before) and only walks
-                # parents otherwise — no data loss, and it recovers env that a
-                # direct-only read would miss.
+                # Read I3PM_* environment for app_id and worktree metadata from
+                # the process index (primed by _get_window_tree): cached per
+                # (pid, starttime), so this is a dict lookup unless the window's
+                # process is new. The fallback returns the window's own env when
+                # it carries I3PM markers and only walks parents otherwise.
                 env = {}
                 if hasattr(node, 'pid') and node.pid:
                     try:
@@ -5441,8 +5588,14 @@ class IPCServer:
         return {"switched": True, "context": await self._context_get_active({})}
 
     async def _runtime_snapshot(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Return a compact daemon-owned runtime snapshot for UI consumers."""
+        """Return a compact daemon-owned runtime snapshot for UI consumers.
+
+        Calls in one batch stage share a single build.
+        """
         params = params or {}
+        return await batch_shared("runtime.snapshot", params, lambda: self._build_runtime_snapshot(params))
+
+    async def _build_runtime_snapshot(self, params: Dict[str, Any]) -> Dict[str, Any]:
         tree_result = await self._get_window_tree(params)
         active_context = await self._context_get_active({})
         tracked_windows = await self.state_manager.get_window_map_snapshot()
@@ -5730,10 +5883,15 @@ class IPCServer:
             "launch_stats": self.launch_service.launch_stats(),
         }
         herdr_snapshot = await self.herdr_service.snapshot({})
+        # Cached Herdr rows are frozen and shared between readers; the focus
+        # and git passes below edit session rows, so take row copies (the
+        # nested values stay shared) and publish them in this snapshot's herdr
+        # view as well.
         sessions = [
-            session for session in herdr_snapshot.get("sessions", [])
+            dict(session) for session in herdr_snapshot.get("sessions", [])
             if isinstance(session, dict)
         ]
+        herdr_snapshot["sessions"] = list(sessions)
         focused_window = next(
             (
                 window
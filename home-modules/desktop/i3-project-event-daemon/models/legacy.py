@@ -207,6 +207,7 @@ class EventEntry:
     source: str                         # "i3" | "ipc" | "daemon"
     processing_duration_ms: float = 0.0 # Time daemon took to handle event
     error: Optional[str] = None         # Error message if processing failed
+    boot_id: Optional[str] = None       # Daemon run that assigned event_id (ids restart per run)
 
     # ===== SOURCE CONTEXT (Optional) =====
     client_pid: Optional[int] = None    # PID of client that triggered (for IPC events)
@@ -64,6 +64,11 @@ class PatternRule:
         # Glob patterns validated by fnmatch.translate (no explicit check needed)
         # PWA and title_glob patterns have no additional validation
 
+    @property
+    def uses_title(self) -> bool:
+        """Whether matching depends on the window title (pwa:, title: patterns)."""
+        return self._parse_pattern()[0] in ("pwa", "title_glob", "title_regex")
+
     def _parse_pattern(self) -> tuple[str, str]:
         """Parse pattern into (type, raw_pattern) tuple.
 
@@ -1,11 +1,13 @@
 """Pattern-based window classification with 4-level precedence resolution."""
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Optional, Literal, List
+from typing import Any, Dict, Optional, Literal, List, Tuple
 
 # Import models
 from .pattern import PatternRule
 from .window_rules import WindowRule
+from .rule_engine import WindowRuleList, first_matching_rule
 
 
 @dataclass
@@ -62,6 +64,7 @@ def classify_window(
     app_classification_patterns: Optional[List[PatternRule]] = None,
     app_classification_scoped: Optional[List[str]] = None,
     app_classification_global: Optional[List[str]] = None,
+    cache: Optional["ClassificationCache"] = None,
 ) -> Classification:
     """Classify window using 4-level precedence hierarchy.
 
@@ -79,6 +82,7 @@ def classify_window(
         app_classification_patterns: App classification patterns from app-classes.json
         app_classification_scoped: App classification scoped list
         app_classification_global: App classification global list
+        cache: Optional ClassificationCache to memoize the result in
 
     Returns:
         Classification object with scope, workspace, and source attribution
@@ -100,6 +104,29 @@ def classify_window(
         >>> cls.source
         'window_rule'
     """
+    if cache is not None:
+        key = cache.key_for(
+            window_class,
+            window_title,
+            active_project_scoped_classes=active_project_scoped_classes,
+            window_rules=window_rules,
+            app_classification_patterns=app_classification_patterns,
+            app_classification_scoped=app_classification_scoped,
+            app_classification_global=app_classification_global,
+        )
+        if key is not None:
+            classification = cache.get(key)
+            if classification is None:
+                classification = classify_window(
+                    window_class,
+                    window_title,
+                    window_rules=window_rules,
+                    app_classification_scoped=app_classification_scoped,
+                    app_classification_global=app_classification_global,
+                )
+                cache.put(key, classification)
+            return classification
+
     # Priority 1000: Project scoped_classes
     if active_project_scoped_classes and window_class in active_project_scoped_classes:
         return Classification(
@@ -110,14 +137,14 @@ def classify_window(
 
     # Priority 200-500: Window rules (sorted by priority)
     if window_rules:
-        for rule in window_rules:
-            if rule.matches(window_class, window_title):
-                return Classification(
-                    scope=rule.scope,
-                    workspace=rule.workspace,
-                    source="window_rule",
-                    matched_rule=rule,
-                )
+        rule = first_matching_rule(window_rules, window_class, window_title)
+        if rule is not None:
+            return Classification(
+                scope=rule.scope,
+                workspace=rule.workspace,
+                source="window_rule",
+                matched_rule=rule,
+            )
 
     # Priority 100: App classification patterns
     if app_classification_patterns:
@@ -150,3 +177,154 @@ def classify_window(
         workspace=None,
         source="default",
     )
+
+
+def title_can_affect_classification(
+    window_class: str,
+    window_rules: Optional[List[WindowRule]] = None,
+) -> bool:
+    """Check whether a title change could change classify_window()'s result.
+
+    Window rules are the only title-aware level that classify_window() consults
+    (project and app-classes lists match on class alone), and the first
+    matching rule wins. So the title matters only if a title-based rule that
+    can apply to this class comes before the first class-only rule matching it.
+
+    Args:
+        window_class: Window WM_CLASS / app_id
+        window_rules: Loaded window rules, in evaluation order
+
+    Returns:
+        True if classification must be re-run when the title changes
+
+    Examples:
+        >>> rules = [WindowRule(PatternRule("title:^Yazi:", "scoped", 230))]
+        >>> title_can_affect_classification("com.mitchellh.ghostty", rules)
+        True
+        >>> rules = [WindowRule(PatternRule("Code", "scoped", 250))] + rules
+        >>> title_can_affect_classification("Code", rules)
+        False
+    """
+    if isinstance(window_rules, WindowRuleList):
+        return window_rules.compiled.title_can_affect(window_class)
+    for rule in window_rules or ():
+        pattern_rule = rule.pattern_rule
+        if pattern_rule.uses_title:
+            # pwa: rules additionally require an FFPWA-* class.
+            if not pattern_rule.pattern.startswith("pwa:") or window_class.startswith("FFPWA-"):
+                return True
+        elif rule.matches(window_class, ""):
+            return False
+    return False
+
+
+class ClassificationCache:
+    """Bounded LRU memo in front of classify_window().
+
+    Keys are (window_class, title) for classes whose result a title change
+    can affect (title_can_affect_classification) and (window_class, None)
+    otherwise, so terminals with churning titles still share one entry.
+
+    The cache remembers which rule set and app-classification sets it was
+    filled from. Reloads replace those objects (and a mutated WindowRuleList
+    recompiles), so a lookup with different sources bumps the generation and
+    starts over; invalidate() does the same explicitly. Calls that carry
+    per-project scoped classes, app-classes patterns or a plain (uncompiled)
+    rule list bypass the cache and classify directly.
+
+    Example:
+        >>> cache = get_classification_cache()
+        >>> classify_window("Code", window_rules=rules, cache=cache)
+    """
+
+    def __init__(self, maxsize: int = 2048) -> None:
+        self.maxsize = maxsize
+        self.generation = 0
+        self._entries: "OrderedDict[Tuple[str, Optional[str]], Classification]" = OrderedDict()
+        self._title_sensitive: Dict[str, bool] = {}
+        self._sources: Tuple[Any, Any, Any] = (None, None, None)
+        self._hits = 0
+        self._misses = 0
+        self._bypassed = 0
+        self._evictions = 0
+
+    def invalidate(self) -> None:
+        """Drop all entries and bump the generation."""
+        self.generation += 1
+        self._entries.clear()
+        self._title_sensitive.clear()
+
+    def key_for(
+        self,
+        window_class: str,
+        window_title: str = "",
+        *,
+        active_project_scoped_classes: Optional[List[str]] = None,
+        window_rules: Optional[List[WindowRule]] = None,
+        app_classification_patterns: Optional[List[PatternRule]] = None,
+        app_classification_scoped: Optional[List[str]] = None,
+        app_classification_global: Optional[List[str]] = None,
+    ) -> Optional[Tuple[str, Optional[str]]]:
+        """Cache key for a classify_window() call, or None to bypass the cache."""
+        if active_project_scoped_classes or app_classification_patterns:
+            self._bypassed += 1
+            return None
+        if isinstance(window_rules, WindowRuleList):
+            rules_source = window_rules.compiled
+        elif not window_rules:
+            rules_source = None
+        else:
+            self._bypassed += 1
+            return None
+
+        sources = (rules_source, app_classification_scoped, app_classification_global)
+        if any(new is not old for new, old in zip(sources, self._sources)):
+            self._sources = sources
+            self.invalidate()
+
+        sensitive = self._title_sensitive.get(window_class)
+        if sensitive is None:
+            sensitive = title_can_affect_classification(window_class, window_rules)
+            if len(self._title_sensitive) >= self.maxsize:
+                self._title_sensitive.clear()
+            self._title_sensitive[window_class] = sensitive
+        return (window_class, window_title if sensitive else None)
+
+    def get(self, key: Tuple[str, Optional[str]]) -> Optional[Classification]:
+        classification = self._entries.get(key)
+        if classification is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return classification
+
+    def put(self, key: Tuple[str, Optional[str]], classification: Classification) -> None:
+        self._entries[key] = classification
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache counters for daemon status."""
+        lookups = self._hits + self._misses
+        return {
+            "generation": self.generation,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            "bypassed": self._bypassed,
+            "evictions": self._evictions,
+        }
+
+
+# Shared by the window handlers and the classify_window IPC method
+_classification_cache = ClassificationCache()
+
+
+def get_classification_cache() -> ClassificationCache:
+    """Get the daemon-wide classification cache."""
+    return _classification_cache
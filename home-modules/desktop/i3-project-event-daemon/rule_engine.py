@@ -0,0 +1,202 @@
+"""
+Compiled window-rule matching for classify_window.
+
+classify_window() used to walk window-rules.json linearly and call
+WindowRule.matches() for every rule until one matched. Each call re-parsed
+the pattern prefix, and regex/glob rules went through the re/fnmatch module
+caches, which thrash once a config has more distinct patterns than re keeps
+(512). With a few hundred rules that cost was paid on every window::new and
+every title-driven reclassification.
+
+CompiledRuleSet is built once per load/reload of the rules and splits them by
+pattern type:
+
+- literal class rules go into a dict keyed by class (O(1) lookup)
+- glob/regex class rules are precompiled; globs keep their literal prefix so
+  most rules are rejected with a str.startswith() before any regex runs
+- pwa: rules only apply to FFPWA-* classes and are skipped wholesale otherwise
+- title: rules are held separately and skipped when there is no title
+
+Every entry remembers its position in the original list, so the result is
+exactly "first rule in evaluation order that matches" — the linear semantics
+— and scans stop as soon as they pass the best candidate found so far.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .window_rules import WindowRule
+
+# pwa: rules additionally require a Firefox PWA window class.
+PWA_CLASS_PREFIX = "FFPWA-"
+
+_GLOB_SPECIAL = "*?["
+
+Matcher = Callable[[str], Optional[re.Match]]
+
+
+def _glob_prefix(pattern: str) -> str:
+    """Literal text before the first glob wildcard ("FFPWA-" for "FFPWA-*")."""
+    for index, char in enumerate(pattern):
+        if char in _GLOB_SPECIAL:
+            return pattern[:index]
+    return pattern
+
+
+def _glob_matcher(pattern: str) -> Matcher:
+    # fnmatch.fnmatch() is fnmatchcase() over os.path.normcase, a no-op on POSIX.
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def _blacklist(rule: "WindowRule") -> Optional[FrozenSet[str]]:
+    if rule.modifier == "GLOBAL" and rule.blacklist:
+        return frozenset(rule.blacklist)
+    return None
+
+
+class CompiledRuleSet:
+    """Indexed, first-match-in-order view over a list of WindowRules.
+
+    Example:
+        >>> compiled = CompiledRuleSet(load_window_rules(path))
+        >>> rule = compiled.first_match("FFPWA-01ABC", "Music - YouTube")
+    """
+
+    __slots__ = ("rules", "_literal", "_class_patterns", "_pwa", "_title")
+
+    def __init__(self, rules: Iterable["WindowRule"]) -> None:
+        self.rules: Tuple["WindowRule", ...] = tuple(rules)
+        self._literal: Dict[str, int] = {}
+        self._class_patterns: List[Tuple[int, str, Matcher, Optional[FrozenSet[str]]]] = []
+        self._pwa: List[Tuple[int, str, Optional[FrozenSet[str]]]] = []
+        self._title: List[Tuple[int, Matcher, Optional[FrozenSet[str]]]] = []
+
+        for position, rule in enumerate(self.rules):
+            pattern_type, raw = rule.pattern_rule._parse_pattern()
+            blacklist = _blacklist(rule)
+            if pattern_type == "literal":
+                # A GLOBAL rule blacklisting its own class can never match.
+                if blacklist is None or raw not in blacklist:
+                    self._literal.setdefault(raw, position)
+            elif pattern_type == "glob":
+                self._class_patterns.append((position, _glob_prefix(raw), _glob_matcher(raw), blacklist))
+            elif pattern_type == "regex":
+                self._class_patterns.append((position, "", re.compile(raw).search, blacklist))
+            elif pattern_type == "pwa":
+                self._pwa.append((position, raw.lower(), blacklist))
+            elif pattern_type == "title_glob":
+                self._title.append((position, _glob_matcher(raw), blacklist))
+            else:  # title_regex
+                self._title.append((position, re.compile(raw).search, blacklist))
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def _class_position(self, window_class: str) -> int:
+        """Position of the first class-only rule matching, or len(rules)."""
+        best = self._literal.get(window_class, len(self.rules))
+        for position, prefix, match, blacklist in self._class_patterns:
+            if position >= best:
+                break
+            if (
+                window_class.startswith(prefix)
+                and match(window_class)
+                and not (blacklist and window_class in blacklist)
+            ):
+                return position
+        return best
+
+    def first_match_position(self, window_class: str, window_title: str = "") -> int:
+        """Position of the first matching rule, or len(rules) if none match."""
+        best = self._class_position(window_class)
+        if not window_title:
+            return best
+
+        if self._pwa and window_class.startswith(PWA_CLASS_PREFIX):
+            lowered = window_title.lower()
+            for position, keyword, blacklist in self._pwa:
+                if position >= best:
+                    break
+                if keyword in lowered and not (blacklist and window_class in blacklist):
+                    best = position
+                    break
+
+        for position, match, blacklist in self._title:
+            if position >= best:
+                break
+            if match(window_title) and not (blacklist and window_class in blacklist):
+                best = position
+                break
+        return best
+
+    def first_match(self, window_class: str, window_title: str = "") -> Optional["WindowRule"]:
+        """First rule (in evaluation order) matching the window, if any."""
+        position = self.first_match_position(window_class, window_title)
+        return self.rules[position] if position < len(self.rules) else None
+
+    def title_can_affect(self, window_class: str) -> bool:
+        """Whether a title-based rule that can apply to this class precedes
+        the first class-only rule matching it (see
+        pattern_resolver.title_can_affect_classification)."""
+        best = self._class_position(window_class)
+        if self._title and self._title[0][0] < best:
+            return True
+        if self._pwa and self._pwa[0][0] < best:
+            return window_class.startswith(PWA_CLASS_PREFIX)
+        return False
+
+
+class WindowRuleList(list):
+    """List of WindowRules that carries its CompiledRuleSet.
+
+    load_window_rules() returns this so every existing List[WindowRule]
+    consumer keeps working, while classify_window() can use the compiled
+    index. The index is built on first use and dropped on any mutation.
+    """
+
+    _compiled: Optional[CompiledRuleSet] = None
+
+    @property
+    def compiled(self) -> CompiledRuleSet:
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = CompiledRuleSet(self)
+        return compiled
+
+
+def _invalidating(name: str):
+    method = getattr(list, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._compiled = None
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+for _name in (
+    "append", "extend", "insert", "pop", "remove", "clear", "sort", "reverse",
+    "__setitem__", "__delitem__", "__iadd__", "__imul__",
+):
+    setattr(WindowRuleList, _name, _invalidating(_name))
+del _name
+
+
+def first_matching_rule(
+    window_rules: Iterable["WindowRule"],
+    window_class: str,
+    window_title: str = "",
+) -> Optional["WindowRule"]:
+    """First rule matching the window, via the compiled index when available."""
+    if isinstance(window_rules, WindowRuleList):
+        return window_rules.compiled.first_match(window_class, window_title)
+    for rule in window_rules:
+        if rule.matches(window_class, window_title):
+            return rule
+    return None
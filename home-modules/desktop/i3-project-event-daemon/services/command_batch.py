@@ -6,6 +6,11 @@ project switch latency from 5.3s to under 200ms.
 
 Feature 101 Enhancement: Command execution tracing for debugging.
 Feature 102 Enhancement: Publish command events to EventBuffer for Log tab visibility.
+
+Combined mode (execute_combined / execute_batches_combined) joins independent
+commands into one RUN_COMMAND message. The daemon's Sway connection serializes
+IPC calls, so gather() over N commands still costs N round trips; one
+';'-joined message costs one and Sway replies with a per-command result array.
 """
 
 from __future__ import annotations
@@ -24,6 +29,11 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on sub-commands joined into a single RUN_COMMAND message. Sway
+# handles the whole chain before replying, so unbounded chains would stall
+# every other IPC caller for the duration of a large project switch.
+MAX_COMMANDS_PER_MESSAGE = 64
+
 # Feature 102: Type alias for event publishing callback
 EventCallback = Callable[[str, dict], Awaitable[None]]
 
@@ -132,9 +142,11 @@ class CommandResult:
 class CommandBatchService:
     """Service for batching and executing Sway IPC commands.
 
-    This service provides two primary optimization strategies:
+    This service provides three execution strategies:
     1. Parallel execution: Independent commands executed via asyncio.gather()
-    2. Command batching: Sequential commands chained with semicolons
+    2. Sequential batches: One window's commands as separate IPC calls
+    3. Combined execution: Independent commands joined into one RUN_COMMAND
+       message per chunk, with Sway's reply array mapped back per command
 
     Example:
         >>> service = CommandBatchService(connection)
@@ -417,6 +429,324 @@ class CommandBatchService:
 
         return result, metrics
 
+    async def execute_combined(
+        self,
+        commands: list[WindowCommand],
+        operation_type: str = "combined",
+        *,
+        correlation_id: Optional[str] = None,
+        causality_depth: int = 0,
+    ) -> tuple[list[CommandResult], OperationMetrics]:
+        """Execute independent commands as ';'-joined RUN_COMMAND messages.
+
+        Drop-in alternative to execute_parallel(): same results and metrics, but
+        commands are sent MAX_COMMANDS_PER_MESSAGE at a time in a single message,
+        so a 40-window hide costs one round trip instead of 40. Results are in
+        input order and carry Sway's own success flag and error for each command.
+
+        Args:
+            commands: List of WindowCommand instances to execute
+            operation_type: Type of operation for metrics (hide/restore/switch)
+            correlation_id: Optional correlation ID for causality tracking
+            causality_depth: Current depth in causality chain (default: 0)
+
+        Returns:
+            Tuple of (results list, operation metrics). ``parallel_batches`` in
+            the metrics is the number of RUN_COMMAND messages sent.
+        """
+        if not commands:
+            return [], self._empty_metrics(operation_type)
+
+        start_time = datetime.now()
+        start_perf = asyncio.get_event_loop().time()
+
+        for cmd in commands:
+            await _trace_command_event(
+                cmd.window_id,
+                "command::queued",
+                f"Queued: {cmd.command_type.value}",
+                {
+                    "command": cmd.to_sway_command(),
+                    "command_type": cmd.command_type.value,
+                    "operation_type": operation_type,
+                },
+                correlation_id=correlation_id,
+                causality_depth=causality_depth,
+            )
+
+        results, message_count = await self._execute_combined_commands(
+            commands,
+            correlation_id=correlation_id,
+            causality_depth=causality_depth + 1,
+        )
+
+        end_perf = asyncio.get_event_loop().time()
+        end_time = datetime.now()
+        duration_ms = (end_perf - start_perf) * 1000
+
+        self._execution_count += 1
+        self._total_duration_ms += duration_ms
+
+        metrics = OperationMetrics(
+            operation_type=operation_type,
+            start_time=start_time,
+            end_time=end_time,
+            duration_ms=duration_ms,
+            window_count=len(set(cmd.window_id for cmd in commands)),
+            command_count=len(commands),
+            parallel_batches=message_count,
+            cache_hits=0,
+            cache_misses=0,
+        )
+
+        success_count = sum(1 for r in results if r.success)
+        logger.info(
+            f"[Feature 091] Combined execution: {success_count}/{len(commands)} succeeded "
+            f"in {duration_ms:.1f}ms ({len(commands)} commands, {message_count} messages)"
+        )
+
+        return results, metrics
+
+    async def execute_batches_combined(
+        self,
+        batches: list[CommandBatch],
+        *,
+        correlation_id: Optional[str] = None,
+        causality_depth: int = 0,
+    ) -> tuple[list[CommandResult], OperationMetrics]:
+        """Execute many per-window batches in lockstep combined rounds.
+
+        execute_batch() keeps each window's commands in separate IPC calls so
+        that e.g. 'floating disable' lands after 'move workspace' has settled
+        (see FLOATING_WINDOW_FIX_RESEARCH.md). That ordering is kept here: round
+        N sends the N-th command of every batch as one combined message, so no
+        window ever has two of its own commands in the same message, and a
+        restore of W windows costs max(len(batch.commands)) round trips
+        instead of sum(len(batch.commands)).
+
+        Args:
+            batches: CommandBatch instances, one per window
+            correlation_id: Optional correlation ID for causality tracking
+            causality_depth: Current depth in causality chain
+
+        Returns:
+            Tuple of (one summary CommandResult per batch in input order,
+            operation metrics)
+        """
+        if not batches:
+            return [], self._empty_metrics("batch_combined")
+
+        start_time = datetime.now()
+        start_perf = asyncio.get_event_loop().time()
+
+        for batch in batches:
+            command_types = [cmd.command_type.value for cmd in batch.commands]
+            await _trace_command_event(
+                batch.window_id,
+                "command::batch",
+                f"Batch: {len(batch.commands)} commands ({', '.join(command_types)})",
+                {
+                    "commands": [cmd.to_sway_command() for cmd in batch.commands],
+                    "command_types": command_types,
+                    "batch_count": len(batch.commands),
+                },
+                correlation_id=correlation_id,
+                causality_depth=causality_depth,
+            )
+
+        per_batch: list[list[CommandResult]] = [[] for _ in batches]
+        message_count = 0
+        rounds = max(len(batch.commands) for batch in batches)
+
+        for round_index in range(rounds):
+            members = [
+                (batch_index, batch.commands[round_index])
+                for batch_index, batch in enumerate(batches)
+                if round_index < len(batch.commands)
+            ]
+            round_results, sent = await self._execute_combined_commands(
+                [cmd for _, cmd in members],
+                correlation_id=correlation_id,
+                causality_depth=causality_depth + 1,
+            )
+            message_count += sent
+            for (batch_index, _), cmd_result in zip(members, round_results):
+                per_batch[batch_index].append(cmd_result)
+
+        results: list[CommandResult] = []
+        for batch, command_results in zip(batches, per_batch):
+            errors = [r.error for r in command_results if not r.success]
+            for failed in (r for r in command_results if not r.success):
+                logger.warning(
+                    f"[Feature 091] Command failed in sequence: {failed.command} - {failed.error}"
+                )
+            results.append(
+                CommandResult(
+                    success=not errors,
+                    command=f"[Combined: {len(batch.commands)} commands for window {batch.window_id}]",
+                    window_id=batch.window_id,
+                    error="; ".join(str(e) for e in errors) if errors else None,
+                    duration_ms=sum(r.duration_ms for r in command_results),
+                )
+            )
+
+        end_perf = asyncio.get_event_loop().time()
+        end_time = datetime.now()
+        duration_ms = (end_perf - start_perf) * 1000
+
+        self._execution_count += 1
+        self._total_duration_ms += duration_ms
+
+        metrics = OperationMetrics(
+            operation_type="batch_combined",
+            start_time=start_time,
+            end_time=end_time,
+            duration_ms=duration_ms,
+            window_count=len(batches),
+            command_count=sum(len(batch.commands) for batch in batches),
+            parallel_batches=message_count,
+            cache_hits=0,
+            cache_misses=0,
+        )
+
+        logger.debug(
+            f"[Feature 091] Combined batches complete: {len(batches)} windows, "
+            f"{metrics.command_count} commands in {message_count} messages ({duration_ms:.1f}ms)"
+        )
+
+        return results, metrics
+
+    async def _execute_combined_commands(
+        self,
+        commands: list[WindowCommand],
+        *,
+        correlation_id: Optional[str] = None,
+        causality_depth: int = 0,
+    ) -> tuple[list[CommandResult], int]:
+        """Send commands as ';'-joined chunks and map Sway's replies back.
+
+        Sway answers a chained RUN_COMMAND with one reply per sub-command, but
+        stops at the first command it cannot parse, so a short reply array means
+        the trailing commands never ran. Those are resent as a new chunk. If a
+        whole message fails (socket error, no replies) the chunk is split in
+        half until single commands remain, which fail individually.
+
+        Returns:
+            Tuple of (results in input order, number of messages sent)
+        """
+        results: list[Optional[CommandResult]] = [None] * len(commands)
+        message_count = 0
+
+        # Pending chunks as index lists; popped from the end, so push in reverse
+        # to keep Sway executing commands in input order.
+        pending = [
+            list(range(i, min(i + MAX_COMMANDS_PER_MESSAGE, len(commands))))
+            for i in range(0, len(commands), MAX_COMMANDS_PER_MESSAGE)
+        ]
+        pending.reverse()
+
+        while pending:
+            indices = pending.pop()
+            command_strs = [commands[i].to_sway_command() for i in indices]
+
+            for i, command_str in zip(indices, command_strs):
+                await _trace_command_event(
+                    commands[i].window_id,
+                    "command::executed",
+                    f"Executing: {commands[i].command_type.value}",
+                    {
+                        "command": command_str,
+                        "command_type": commands[i].command_type.value,
+                        "message_commands": len(indices),
+                    },
+                    correlation_id=correlation_id,
+                    causality_depth=causality_depth,
+                )
+
+            start_perf = asyncio.get_event_loop().time()
+            message_error: Optional[str] = None
+            try:
+                replies = list(await self.conn.command("; ".join(command_strs)) or [])
+            except Exception as e:
+                replies = []
+                message_error = str(e)
+                logger.debug(
+                    f"[Feature 091] Combined command failed ({len(indices)} commands): {message_error}"
+                )
+            message_count += 1
+            duration_ms = (asyncio.get_event_loop().time() - start_perf) * 1000
+
+            answered = min(len(replies), len(indices))
+            for offset in range(answered):
+                reply = replies[offset]
+                success = bool(getattr(reply, "success", False))
+                error = None if success else (getattr(reply, "error", None) or "command failed")
+                results[indices[offset]] = await self._combined_result(
+                    commands[indices[offset]],
+                    command_strs[offset],
+                    success,
+                    error,
+                    duration_ms / len(indices),
+                    correlation_id=correlation_id,
+                    causality_depth=causality_depth,
+                )
+
+            unanswered = indices[answered:]
+            if not unanswered:
+                continue
+            if answered:
+                # Sway stopped early; the rest were never executed.
+                pending.append(unanswered)
+            elif len(unanswered) > 1:
+                middle = len(unanswered) // 2
+                pending.append(unanswered[middle:])
+                pending.append(unanswered[:middle])
+            else:
+                results[unanswered[0]] = await self._combined_result(
+                    commands[unanswered[0]],
+                    command_strs[0],
+                    False,
+                    message_error or "no reply from Sway",
+                    duration_ms,
+                    correlation_id=correlation_id,
+                    causality_depth=causality_depth,
+                )
+
+        return [r for r in results if r is not None], message_count
+
+    async def _combined_result(
+        self,
+        cmd: WindowCommand,
+        command_str: str,
+        success: bool,
+        error: Optional[str],
+        duration_ms: float,
+        *,
+        correlation_id: Optional[str] = None,
+        causality_depth: int = 0,
+    ) -> CommandResult:
+        """Trace and build the CommandResult for one sub-command of a message."""
+        await _trace_command_event(
+            cmd.window_id,
+            "command::result",
+            f"{'✓' if success else '✗'} {cmd.command_type.value} ({duration_ms:.1f}ms)",
+            {
+                "command": command_str,
+                "success": success,
+                "error": error,
+                "duration_ms": duration_ms,
+            },
+            correlation_id=correlation_id,
+            causality_depth=causality_depth,
+        )
+        return CommandResult(
+            success=success,
+            command=command_str,
+            window_id=cmd.window_id,
+            error=error,
+            duration_ms=duration_ms,
+        )
+
     async def _execute_single_command(
         self,
         cmd: WindowCommand,
@@ -0,0 +1,315 @@
+"""
+Compact read-only Sway tree built straight from GET_TREE reply data.
+
+i3ipc turns every GET_TREE into a graph of Con objects: each node copies
+~20 attributes into its __dict__ and eagerly builds Rect/Gaps objects, and
+workspace()/scratchpad() re-walk parent chains or the whole tree on every
+call. The daemon's hot readers (window filtering, window-map reconcile, the
+window-tree snapshot) only touch a handful of fields per node.
+
+TreeNode keeps those fields in __slots__, links every node to its workspace
+and output once while the tree is built, and derives everything else (rects,
+window properties, layout, ...) from the raw dict only when it is read. It
+implements the read side of the i3ipc Con API, so code written against Con
+works unchanged; it holds no connection, so Con.command() is not available.
+
+The reply is decoded with orjson when it is installed, json otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+from i3ipc import Rect
+
+# Raw keys exposed as plain attributes on demand (Con sets these eagerly).
+_LAZY_KEYS = frozenset({
+    "border",
+    "current_border_width",
+    "focus",
+    "layout",
+    "orientation",
+    "percent",
+    "representation",
+    "sticky",
+})
+
+
+def loads_tree(data: Union[bytes, str]) -> Dict[str, Any]:
+    """Decode a GET_TREE reply, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _TreeIndex:
+    """Lookups shared by every node of one compact tree."""
+
+    __slots__ = ("by_id", "workspaces_by_name", "scratchpad")
+
+    def __init__(self) -> None:
+        self.by_id: Dict[int, TreeNode] = {}
+        self.workspaces_by_name: Dict[str, TreeNode] = {}
+        self.scratchpad: Optional[TreeNode] = None
+
+
+class TreeNode:
+    """One container of a compact tree; a read-only stand-in for i3ipc Con."""
+
+    __slots__ = (
+        "ipc_data",
+        "id",
+        "type",
+        "name",
+        "num",
+        "pid",
+        "app_id",
+        "window",
+        "marks",
+        "floating",
+        "focused",
+        "fullscreen_mode",
+        "urgent",
+        "scratchpad_state",
+        "parent",
+        "nodes",
+        "floating_nodes",
+        "_workspace",
+        "_output",
+        "_index",
+    )
+
+    def __init__(self, data: Dict[str, Any], parent: Optional["TreeNode"], index: _TreeIndex) -> None:
+        get = data.get
+        self.ipc_data = data
+        self.id = get("id")
+        self.type = get("type")
+        self.name = get("name")
+        self.num = get("num")
+        self.pid = get("pid")
+        self.app_id = get("app_id")
+        self.window = get("window")
+        self.marks = get("marks") or []
+        self.floating = get("floating")
+        self.focused = get("focused")
+        self.fullscreen_mode = get("fullscreen_mode")
+        self.urgent = get("urgent")
+        self.scratchpad_state = get("scratchpad_state")
+        self.parent = parent
+        self.nodes: List[TreeNode] = []
+        self.floating_nodes: List[TreeNode] = []
+        self._index = index
+        if self.type == "workspace":
+            self._workspace: Optional[TreeNode] = self
+        else:
+            self._workspace = parent._workspace if parent is not None else None
+        if self.type == "output":
+            self._output: Optional[TreeNode] = self
+        else:
+            self._output = parent._output if parent is not None else None
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached for names that are not slots or class attributes.
+        if name in _LAZY_KEYS:
+            return self.ipc_data.get(name)
+        raise AttributeError(f"{type(self).__name__!s} has no attribute {name!r}")
+
+    def __repr__(self) -> str:
+        return f"TreeNode(id={self.id!r}, type={self.type!r}, name={self.name!r})"
+
+    def __iter__(self) -> Iterator["TreeNode"]:
+        """Breadth-first descendants, in the same order as Con.__iter__."""
+        queue = deque(self.nodes)
+        queue.extend(self.floating_nodes)
+        while queue:
+            con = queue.popleft()
+            yield con
+            queue.extend(con.nodes)
+            queue.extend(con.floating_nodes)
+
+    # Lazily derived Con attributes -------------------------------------------
+
+    def _rect(self, key: str) -> Optional[Rect]:
+        data = self.ipc_data.get(key)
+        return Rect(data) if data else None
+
+    @property
+    def rect(self) -> Optional[Rect]:
+        return self._rect("rect")
+
+    @property
+    def window_rect(self) -> Optional[Rect]:
+        return self._rect("window_rect")
+
+    @property
+    def deco_rect(self) -> Optional[Rect]:
+        return self._rect("deco_rect")
+
+    @property
+    def geometry(self) -> Optional[Rect]:
+        return self._rect("geometry")
+
+    def _window_property(self, key: str) -> Optional[str]:
+        properties = self.ipc_data.get("window_properties")
+        return properties.get(key) if properties else None
+
+    @property
+    def window_class(self) -> Optional[str]:
+        return self._window_property("class")
+
+    @property
+    def window_instance(self) -> Optional[str]:
+        return self._window_property("instance")
+
+    @property
+    def window_role(self) -> Optional[str]:
+        return self._window_property("window_role")
+
+    @property
+    def window_title(self) -> Optional[str]:
+        return self._window_property("title")
+
+    # Navigation ----------------------------------------------------------------
+
+    def root(self) -> "TreeNode":
+        con = self
+        while con.parent is not None:
+            con = con.parent
+        return con
+
+    def workspace(self) -> Optional["TreeNode"]:
+        """Enclosing workspace (self for a workspace), precomputed at build."""
+        return self._workspace
+
+    def output_node(self) -> Optional["TreeNode"]:
+        """Enclosing output container (self for an output), precomputed at build."""
+        return self._output
+
+    def descendants(self) -> List["TreeNode"]:
+        return list(self)
+
+    def leaves(self) -> List["TreeNode"]:
+        return [
+            c for c in self
+            if not c.nodes and c.type == "con" and c.parent.type != "dockarea"
+        ]
+
+    def workspaces(self) -> List["TreeNode"]:
+        return [
+            ws for ws in self._index.workspaces_by_name.values()
+            if not (ws.name or "").startswith("__")
+        ]
+
+    def scratchpad(self) -> Optional["TreeNode"]:
+        return self._index.scratchpad
+
+    def find_workspace(self, name: str) -> Optional["TreeNode"]:
+        """Workspace container by name (first in tree order), O(1)."""
+        return self._index.workspaces_by_name.get(name)
+
+    def _is_ancestor_of(self, con: "TreeNode") -> bool:
+        current = con.parent
+        while current is not None:
+            if current is self:
+                return True
+            current = current.parent
+        return False
+
+    def find_by_id(self, id: int) -> Optional["TreeNode"]:
+        con = self._index.by_id.get(id)
+        if con is not None and self._is_ancestor_of(con):
+            return con
+        return None
+
+    def find_focused(self) -> Optional["TreeNode"]:
+        return next((c for c in self if c.focused), None)
+
+    def find_by_pid(self, pid: int) -> List["TreeNode"]:
+        return [c for c in self if c.pid == pid]
+
+    def find_by_window(self, window: int) -> Optional["TreeNode"]:
+        return next((c for c in self if c.window == window), None)
+
+    def find_by_role(self, pattern: str) -> List["TreeNode"]:
+        return [c for c in self if c.window_role and re.search(pattern, c.window_role)]
+
+    def find_named(self, pattern: str) -> List["TreeNode"]:
+        return [c for c in self if c.name and re.search(pattern, c.name)]
+
+    def find_titled(self, pattern: str) -> List["TreeNode"]:
+        return [c for c in self if c.window_title and re.search(pattern, c.window_title)]
+
+    def find_classed(self, pattern: str) -> List["TreeNode"]:
+        return [c for c in self if c.window_class and re.search(pattern, c.window_class)]
+
+    def find_instanced(self, pattern: str) -> List["TreeNode"]:
+        return [c for c in self if c.window_instance and re.search(pattern, c.window_instance)]
+
+    def find_marked(self, pattern: str = ".*") -> List["TreeNode"]:
+        compiled = re.compile(pattern)
+        return [c for c in self if any(compiled.search(mark) for mark in c.marks)]
+
+    def find_fullscreen(self) -> List["TreeNode"]:
+        return [c for c in self if c.type == "con" and c.fullscreen_mode]
+
+
+def build_compact_tree(raw: Dict[str, Any]) -> TreeNode:
+    """Build a compact tree over an already-decoded GET_TREE reply.
+
+    The raw dicts are referenced, not copied, so the result shares ipc_data
+    with its source and must be treated as read-only like any Con tree.
+    """
+    index = _TreeIndex()
+    root = TreeNode(raw, None, index)
+    # Pre-order, tiling children before floating — the walk order the old
+    # recursive workspace indexers used, so first-seen-wins lookups agree.
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.id is not None:
+            index.by_id[node.id] = node
+        if node.type == "workspace" and node.name:
+            index.workspaces_by_name.setdefault(node.name, node)
+            if node.name == "__i3_scratch" and index.scratchpad is None:
+                index.scratchpad = node
+        data = node.ipc_data
+        node.nodes = [TreeNode(child, node, index) for child in data.get("nodes") or ()]
+        node.floating_nodes = [
+            TreeNode(child, node, index) for child in data.get("floating_nodes") or ()
+        ]
+        stack.extend(reversed(node.floating_nodes))
+        stack.extend(reversed(node.nodes))
+    return root
+
+
+def parse_compact_tree(data: Union[bytes, str]) -> TreeNode:
+    """Decode raw GET_TREE reply bytes and build a compact tree."""
+    return build_compact_tree(loads_tree(data))
+
+
+async def get_compact_tree(conn: Any, force_refresh: bool = False) -> TreeNode:
+    """Compact tree for any connection-like object.
+
+    Uses the mirror-backed get_compact_tree() that ResilientI3Connection
+    installs on its connections when present, and otherwise converts the
+    Con returned by get_tree() (plain i3ipc connections, always live).
+    force_refresh makes the mirror refetch before answering.
+    """
+    getter = getattr(conn, "get_compact_tree", None)
+    if getter is not None and asyncio.iscoroutinefunction(getter):
+        return await getter(force_refresh=force_refresh)
+    tree = await conn.get_tree()
+    if isinstance(tree, TreeNode):
+        return tree
+    return build_compact_tree(tree.ipc_data)
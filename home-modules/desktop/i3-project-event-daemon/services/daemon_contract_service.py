@@ -6,6 +6,16 @@ from typing import Any, Dict
 
 from .dashboard_model import DASHBOARD_EVENT_SCHEMA_VERSION, DASHBOARD_SCHEMA_VERSION
 from .focus_service import FOCUS_STATE_SCHEMA_VERSION
+from .request_pipeline import DEFAULT_MAX_IN_FLIGHT, MAX_IN_FLIGHT_LIMIT
+from .response_cache import CONDITIONAL_PARAM, DEFAULT_MAX_AGE_SECONDS
+from .rpc_batch import MAX_BATCH_SIZE
+from .rpc_scheduler import (
+    DEFAULT_MAX_BULK_CONCURRENCY,
+    DEFAULT_MAX_BULK_HOLD,
+    DEFAULT_MAX_BULK_QUEUE,
+    SERVER_BUSY,
+)
+from .snapshot_publisher import HEADER_SIZE, SNAPSHOT_FILENAME, SNAPSHOT_FORMAT
 
 
 DAEMON_CONTRACT_SCHEMA_VERSION = "i3pm.daemon.contract.v1"
@@ -66,7 +76,50 @@ class DaemonContractService:
                 "formal-focus-intents",
                 "dashboard-delta-events",
                 "herdr-native-ai-sessions",
+                "pipelined-requests",
+                "conditional-snapshots",
+                "filtered-event-subscriptions",
+                "dashboard-delta-encoding",
+                "subscriber-backlogs",
+                "rpc-priority-lanes",
+                "json-rpc-batch",
+                "shared-memory-snapshot",
             ],
+            "ipc": {
+                "configure_method": "ipc.configure",
+                "pipelining": {
+                    "default_max_in_flight": DEFAULT_MAX_IN_FLIGHT,
+                    "max_in_flight_limit": MAX_IN_FLIGHT_LIMIT,
+                },
+                "conditional": {
+                    "param": CONDITIONAL_PARAM,
+                    "methods": [
+                        "runtime.snapshot",
+                        "dashboard.snapshot",
+                        "session.list",
+                        "get_window_tree",
+                        "herdr.snapshot",
+                    ],
+                    "max_age_seconds": DEFAULT_MAX_AGE_SECONDS,
+                },
+                "batch": {
+                    "max_size": MAX_BATCH_SIZE,
+                },
+                "scheduler": {
+                    "busy_error_code": SERVER_BUSY,
+                    # SERVER_BUSY is only sent after ipc.configure busy_errors=true.
+                    "busy_error_opt_in": "busy_errors",
+                    "max_bulk_concurrency": DEFAULT_MAX_BULK_CONCURRENCY,
+                    "max_bulk_queue": DEFAULT_MAX_BULK_QUEUE,
+                    "max_bulk_hold_ms": int(DEFAULT_MAX_BULK_HOLD * 1000),
+                },
+                "shared_snapshot": {
+                    "file": f"i3-project-daemon/{SNAPSHOT_FILENAME}",
+                    "relative_to": "XDG_RUNTIME_DIR",
+                    "format": SNAPSHOT_FORMAT,
+                    "header_bytes": HEADER_SIZE,
+                },
+            },
         }
 
     def version_payload(self) -> Dict[str, Any]:
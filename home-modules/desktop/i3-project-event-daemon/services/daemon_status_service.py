@@ -19,6 +19,8 @@ SocketPathProvider = Callable[[], str]
 IpcStatsProvider = Callable[[], Dict[str, Any]]
 StartupRecoveryProvider = Callable[[], Optional[Any]]
 ReconnectionManagerProvider = Callable[[], Optional[Any]]
+TitleCoalescerProvider = Callable[[], Optional[Any]]
+ClassificationCacheProvider = Callable[[], Optional[Any]]
 EventBufferProvider = Callable[[], Optional[Any]]
 LogIpcEvent = Callable[..., Awaitable[None]]
 
@@ -43,6 +45,8 @@ class DaemonStatusService:
         registry_path: Optional[Path] = None,
         startup_recovery_provider: StartupRecoveryProvider = lambda: None,
         reconnection_manager_provider: ReconnectionManagerProvider = lambda: None,
+        title_coalescer_provider: TitleCoalescerProvider = lambda: None,
+        classification_cache_provider: ClassificationCacheProvider = lambda: None,
         status_version: str = "1.0.0",
         health_version: str = "1.4.0",
     ) -> None:
@@ -59,6 +63,8 @@ class DaemonStatusService:
         )
         self.startup_recovery_provider = startup_recovery_provider
         self.reconnection_manager_provider = reconnection_manager_provider
+        self.title_coalescer_provider = title_coalescer_provider
+        self.classification_cache_provider = classification_cache_provider
         self.status_version = status_version
         self.health_version = health_version
 
@@ -120,6 +126,19 @@ class DaemonStatusService:
                 "startup_recovery_performed": False,
             }
 
+        tree_mirror = getattr(i3_connection, "tree_mirror", None)
+        if tree_mirror is not None:
+            result["tree_mirror"] = tree_mirror.get_stats()
+        command_pool = getattr(i3_connection, "command_pool", None)
+        if command_pool is not None:
+            result["sway_command_pool"] = command_pool.get_stats()
+        title_coalescer = self.title_coalescer_provider()
+        if title_coalescer is not None:
+            result["title_coalescing"] = title_coalescer.get_stats()
+        classification_cache = self.classification_cache_provider()
+        if classification_cache is not None:
+            result["classification_cache"] = classification_cache.get_stats()
+
         reconnection_manager = self.reconnection_manager_provider()
         if reconnection_manager:
             result["i3_reconnection"] = reconnection_manager.get_stats()
@@ -0,0 +1,274 @@
+"""
+Delta encoding for dashboard event subscribers.
+
+A typed dashboard event ships whole top-level keys (``active_ai_sessions``,
+``projects``, ``outputs``...) even when one field of one row changed; herdr
+``agent_status`` updates stream continuously and each one used to cost tens
+of KB per subscriber. A subscriber that passes ``{"delta": true}`` to
+``subscribe_state_changes`` instead receives each changed key as the smallest
+of:
+
+- ``rows``: upserts and deletes for list keys whose rows have a stable
+  identity (sessions by ``session_key``, project cards by project and target
+  host, outputs by name), plus the new id ``order`` when it changed;
+- ``patches``: an RFC 6902 JSON Patch against the last value delivered;
+- the full value in ``payload`` (also used when there is no base yet).
+
+Keys whose value did not change at all are listed in ``unchanged_keys``.
+Scalar metadata (generations, counts) is always sent as-is.
+
+Every delta event names its ``base_generation``: the generation of the last
+event delivered on this subscription, or 0 when there is no base and every
+key is sent in full. A client whose last applied generation differs
+re-subscribes, which resets the base. A ``dashboard.invalidated`` event also
+resets it and is sent without delta encoding.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Row identity for list keys that support row-level deltas.
+ROW_KEY_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "active_ai_sessions": ("session_key",),
+    "projects": ("project", "target_host"),
+    "outputs": ("name",),
+    "tracked_windows": ("id",),
+    "launches": ("launch_id",),
+}
+
+# Small scalar payload fields that are always sent as-is.
+METADATA_KEYS = frozenset({
+    "status",
+    "schema_version",
+    "timestamp",
+    "generation",
+    "snapshot_version",
+    "session_generation",
+    "display_generation",
+    "focus_generation",
+    "total_windows",
+    "window_count",
+    "project_count",
+})
+
+_MISSING = object()
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"), default=str))
+
+
+def _pointer_token(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def json_patch(base: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """RFC 6902 operations that turn base into new.
+
+    Objects are diffed member by member and equal-length arrays element by
+    element; anything else that differs is replaced.
+    """
+    if base == new:
+        return []
+    if isinstance(base, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in base:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_pointer_token(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_pointer_token(key)}"
+            if key not in base:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_patch(base[key], value, child))
+        return ops
+    if isinstance(base, list) and isinstance(new, list) and len(base) == len(new):
+        ops = []
+        for index, (old_item, new_item) in enumerate(zip(base, new)):
+            ops.extend(json_patch(old_item, new_item, f"{path}/{index}"))
+        return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_json_patch(document: Any, ops: Sequence[Dict[str, Any]]) -> Any:
+    """Apply json_patch() output (add/remove/replace) to a copy of document."""
+    document = json.loads(json.dumps(document))
+    for op in ops:
+        tokens = [
+            token.replace("~1", "/").replace("~0", "~")
+            for token in op["path"].split("/")[1:]
+        ]
+        if not tokens:
+            document = op.get("value")
+            continue
+        parent = document
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last: Any = tokens[-1]
+        if isinstance(parent, list):
+            last = int(last)
+        if op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return document
+
+
+def _row_id(row: Any, fields: Tuple[str, ...]) -> Any:
+    if not isinstance(row, dict):
+        return None
+    values = [row.get(field) for field in fields]
+    if any(value in (None, "") for value in values):
+        return None
+    return values[0] if len(values) == 1 else values
+
+
+def row_delta(base: Any, new: Any, fields: Tuple[str, ...]) -> Optional[Dict[str, Any]]:
+    """Upserts/deletes keyed by fields; None when rows lack a unique identity."""
+    if not isinstance(base, list) or not isinstance(new, list):
+        return None
+    base_rows: Dict[str, Any] = {}
+    base_order: List[Any] = []
+    for row in base:
+        row_id = _row_id(row, fields)
+        marker = json.dumps(row_id)
+        if row_id is None or marker in base_rows:
+            return None
+        base_rows[marker] = row
+        base_order.append(row_id)
+    upsert: List[Any] = []
+    order: List[Any] = []
+    seen = set()
+    for row in new:
+        row_id = _row_id(row, fields)
+        marker = json.dumps(row_id)
+        if row_id is None or marker in seen:
+            return None
+        seen.add(marker)
+        order.append(row_id)
+        if base_rows.get(marker, _MISSING) != row:
+            upsert.append(row)
+    delete = [row_id for row_id in base_order if json.dumps(row_id) not in seen]
+    delta: Dict[str, Any] = {"key_fields": list(fields), "upsert": upsert, "delete": delete}
+    # Clients keep surviving rows in place and append new rows in upsert
+    # order; only ship the full id order when that would be wrong.
+    surviving = [row_id for row_id in base_order if json.dumps(row_id) in seen]
+    appended = [row_id for row_id in order if json.dumps(row_id) not in base_rows]
+    if order != surviving + appended:
+        delta["order"] = order
+    return delta
+
+
+def apply_row_delta(base: List[Any], delta: Dict[str, Any]) -> List[Any]:
+    """Apply row_delta() output to base, returning the new row list."""
+    fields = tuple(delta["key_fields"])
+    rows = {json.dumps(_row_id(row, fields)): row for row in base}
+    order = [json.dumps(_row_id(row, fields)) for row in base]
+    for row_id in delta.get("delete", []):
+        marker = json.dumps(row_id)
+        rows.pop(marker, None)
+        order.remove(marker)
+    for row in delta.get("upsert", []):
+        marker = json.dumps(_row_id(row, fields))
+        if marker not in rows:
+            order.append(marker)
+        rows[marker] = row
+    if "order" in delta:
+        order = [json.dumps(row_id) for row_id in delta["order"]]
+    return [rows[marker] for marker in order]
+
+
+def encode_key_delta(key: str, base: Any, new: Any) -> Tuple[str, Any]:
+    """Pick the smallest encoding of new relative to base.
+
+    Returns ("unchanged", None), ("rows", delta), ("patch", ops) or
+    ("full", new).
+    """
+    if base is _MISSING:
+        return "full", new
+    if base == new:
+        return "unchanged", None
+    candidates: List[Tuple[int, str, Any]] = [(_size(new), "full", new)]
+    fields = ROW_KEY_FIELDS.get(key)
+    if fields:
+        rows = row_delta(base, new, fields)
+        if rows is not None:
+            candidates.append((_size(rows), "rows", rows))
+    ops = json_patch(base, new)
+    candidates.append((_size(ops), "patch", ops))
+    # On a size tie prefer the full value: it needs no base on the client.
+    _, kind, encoded = min(candidates, key=lambda item: (item[0], item[1] != "full"))
+    return kind, encoded
+
+
+class DashboardDeltaState:
+    """Values last delivered to one delta subscriber, per top-level key."""
+
+    __slots__ = ("base", "generation")
+
+    def __init__(self) -> None:
+        self.base: Dict[str, Any] = {}
+        self.generation = 0
+
+    def reset(self) -> None:
+        self.base = {}
+        self.generation = 0
+
+    def signature(self, keys: Sequence[str]) -> Tuple[Any, ...]:
+        """Identity of this subscriber's bases, to share one encoding per group."""
+        return (self.generation,) + tuple(id(self.base.get(key, _MISSING)) for key in keys)
+
+
+def delta_keys(payload: Dict[str, Any]) -> List[str]:
+    """Payload keys that are delta-encoded (everything but the scalar metadata)."""
+    return [key for key in payload if key not in METADATA_KEYS]
+
+
+def encode_delta_notification(
+    message: Dict[str, Any],
+    state: DashboardDeltaState,
+    keys: Sequence[str],
+) -> Dict[str, Any]:
+    """Rewrite a full dashboard event notification as a delta against state."""
+    params = message.get("params") or {}
+    payload = dict(params.get("payload") or {})
+    patches: Dict[str, Any] = {}
+    rows: Dict[str, Any] = {}
+    unchanged: List[str] = []
+    for key in keys:
+        kind, encoded = encode_key_delta(key, state.base.get(key, _MISSING), payload[key])
+        if kind == "full":
+            continue
+        del payload[key]
+        if kind == "patch":
+            patches[key] = encoded
+        elif kind == "rows":
+            rows[key] = encoded
+        else:
+            unchanged.append(key)
+    delta_params = dict(params)
+    delta_params.update({
+        "encoding": "delta",
+        "base_generation": state.generation,
+        "payload": payload,
+        "patches": patches,
+        "rows": rows,
+        "unchanged_keys": unchanged,
+    })
+    return {**message, "params": delta_params}
+
+
+def advance_delta_state(
+    state: DashboardDeltaState,
+    payload: Dict[str, Any],
+    keys: Sequence[str],
+    generation: int,
+) -> None:
+    """Record the values just delivered as the subscriber's new base."""
+    base = dict(state.base)
+    for key in keys:
+        base[key] = payload[key]
+    state.base = base
+    state.generation = int(generation)
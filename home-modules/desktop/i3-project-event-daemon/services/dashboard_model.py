@@ -376,6 +376,45 @@ def dashboard_event_notification(
     }
 
 
+def coalesce_dashboard_event_notifications(
+    queued: Dict[str, Any],
+    latest: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Merge two dashboard event notifications for a backlogged subscriber.
+
+    The merged event carries the latest value of every key either event
+    changed, the union of changed_keys and the latest generations. It names
+    the generation the first queued event followed in
+    ``coalesced_from_generation`` so clients accept the generation skip
+    instead of refetching a snapshot. An invalidation in either event
+    survives the merge.
+    """
+    queued_params = queued.get("params") or {}
+    latest_params = latest.get("params") or {}
+    changed_keys = list(queued_params.get("changed_keys", []) or [])
+    for key in latest_params.get("changed_keys", []) or []:
+        if key not in changed_keys:
+            changed_keys.append(key)
+    payload = dict(queued_params.get("payload") or {})
+    payload.update(latest_params.get("payload") or {})
+
+    params = dict(latest_params)
+    if "dashboard" in changed_keys:
+        params["type"] = "dashboard_invalidated"
+        params["event_type"] = "dashboard.invalidated"
+    params["changed_keys"] = changed_keys
+    params["payload"] = payload
+    params["coalesced_from_generation"] = int(
+        queued_params.get("coalesced_from_generation", int(queued_params.get("generation") or 0) - 1)
+    )
+    params["coalesced_events"] = int(queued_params.get("coalesced_events") or 1) + 1
+    return {
+        "jsonrpc": "2.0",
+        "method": params["event_type"],
+        "params": params,
+    }
+
+
 def dashboard_event_payload_from_snapshot(
     snapshot: Dict[str, Any],
     changed_keys: List[str],
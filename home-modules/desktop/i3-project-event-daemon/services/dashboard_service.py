@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import time
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
@@ -13,14 +12,28 @@ from .dashboard_model import (
     DASHBOARD_SCHEMA_VERSION,
     advance_dashboard_event_state_for_batch,
     build_dashboard_snapshot_payload,
+    coalesce_dashboard_event_notifications,
     dashboard_event_notification,
     dashboard_event_payload_from_snapshot,
     dashboard_invalidated_payload,
     validate_dashboard_payload,
 )
+from .dashboard_delta import (
+    DashboardDeltaState,
+    advance_delta_state,
+    delta_keys,
+    encode_delta_notification,
+)
+from .event_fanout import SubscriberFanout, encode_line
+from .snapshot_publisher import SnapshotPublisher
 
 logger = logging.getLogger(__name__)
 
+# Shared-snapshot readers map the file and never talk to the daemon, so with
+# no subscribers a state change only marks the published copy dirty. One
+# rebuild runs this long after the first change of a burst.
+DEFAULT_PUBLISH_DELAY_MS = 100.0
+
 
 class DashboardService:
     """Own daemon dashboard generations, snapshots, validation, and events."""
@@ -39,6 +52,7 @@ class DashboardService:
         timestamp: Callable[[], float] = time.time,
         schema_version: str = DASHBOARD_SCHEMA_VERSION,
         event_schema_version: str = DASHBOARD_EVENT_SCHEMA_VERSION,
+        publish_delay_ms: float = DEFAULT_PUBLISH_DELAY_MS,
     ) -> None:
         self._runtime_loader = runtime_loader
         self._display_snapshot = display_snapshot
@@ -52,26 +66,51 @@ class DashboardService:
         self.schema_version = schema_version
         self.event_schema_version = event_schema_version
         self.subscribers: Set[asyncio.StreamWriter] = set()
+        # Subscribers that asked for delta-encoded events, with their bases.
+        self.delta_states: Dict[asyncio.StreamWriter, DashboardDeltaState] = {}
         self.snapshot_version = 0
         self.session_generation = 0
         self.display_generation = 0
         self.focus_generation = 0
         self._last_snapshot: Dict[str, Any] = {}
         self._notify_lock = asyncio.Lock()
+        # Shared-memory copy of the latest snapshot for local readers; set by
+        # IPCServer.start() (see services/snapshot_publisher.py).
+        self.publisher: Optional[SnapshotPublisher] = None
+        self.publish_delay_ms = publish_delay_ms
+        self._publish_keys: List[str] = []
+        self._publish_timer: Optional[asyncio.TimerHandle] = None
+        self._publish_task: Optional[asyncio.Task] = None
+        self.fanout = SubscriberFanout(
+            "dashboard event",
+            coalesce=coalesce_dashboard_event_notifications,
+            on_evict=self.discard_subscriber,
+        )
 
-    def subscribe(self, writer: asyncio.StreamWriter) -> Dict[str, Any]:
-        """Subscribe a client to typed dashboard events."""
+    def subscribe(self, writer: asyncio.StreamWriter, *, delta: bool = False) -> Dict[str, Any]:
+        """Subscribe a client to typed dashboard events.
+
+        With delta=True the client receives delta-encoded events (see
+        services/dashboard_delta.py). Subscribing again resets its base.
+        """
         self.subscribers.add(writer)
+        if delta:
+            self.delta_states[writer] = DashboardDeltaState()
+        else:
+            self.delta_states.pop(writer, None)
         subscriber_count = len(self.subscribers)
         logger.info("Client subscribed to dashboard events (total: %s)", subscriber_count)
         return {
             "subscribed": True,
             "subscriber_count": subscriber_count,
+            "encoding": "delta" if delta else "full",
         }
 
     def discard_subscriber(self, writer: asyncio.StreamWriter) -> None:
         """Remove a client from dashboard event subscribers."""
         self.subscribers.discard(writer)
+        self.delta_states.pop(writer, None)
+        self.fanout.discard(writer)
 
     async def snapshot(self, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Return the daemon-owned dashboard payload consumed by QuickShell."""
@@ -121,6 +160,7 @@ class DashboardService:
             schema_version=self.schema_version,
         )
         self._last_snapshot = payload
+        self._publish_snapshot(payload)
         return payload
 
     @staticmethod
@@ -292,6 +332,8 @@ class DashboardService:
             }
             if active_ai_sessions:
                 payload["active_ai_sessions"] = active_ai_sessions
+            if snapshot:
+                self._publish_snapshot({**snapshot, **payload})
             return payload
         git_bearing_keys = {"active_ai_sessions", "herdr"}
         skip_git_hydration = not any(
@@ -339,17 +381,21 @@ class DashboardService:
             if bool(event_state.get("invalidate_worktree_cache", False)):
                 self._invalidate_worktree_cache()
 
+            # Without subscribers nobody needs the payload now; the shared
+            # snapshot catches up on a timer (see _schedule_publish).
             if not self.subscribers:
+                if self.publishing:
+                    self._schedule_publish(changed_keys)
                 return
 
             try:
                 event_payload = await self.event_payload(changed_keys)
-                notification = json.dumps(dashboard_event_notification(
+                message = dashboard_event_notification(
                     state=event_state,
                     payload=event_payload,
                     timestamp=self._timestamp(),
                     event_schema_version=self.event_schema_version,
-                ))
+                )
             except Exception as exc:
                 logger.warning("Failed to build dashboard event payload for %s: %s", normalized_type, exc)
                 event_state = dict(event_state)
@@ -364,39 +410,87 @@ class DashboardService:
                     focus_generation=self.focus_generation,
                     schema_version=self.schema_version,
                 )
-                notification = json.dumps(
-                    dashboard_event_notification(
-                        state=event_state,
-                        payload=event_payload,
-                        timestamp=self._timestamp(),
-                        event_schema_version=self.event_schema_version,
-                    ),
-                    default=str,
+                message = dashboard_event_notification(
+                    state=event_state,
+                    payload=event_payload,
+                    timestamp=self._timestamp(),
+                    event_schema_version=self.event_schema_version,
                 )
 
-            data = (notification + "\n").encode()
-            dead_clients = set()
-            for writer in list(self.subscribers):
-                try:
-                    writer.write(data)
-                    transport = getattr(writer, "transport", None)
-                    get_buffer_size = getattr(transport, "get_write_buffer_size", None)
-                    if callable(get_buffer_size) and int(get_buffer_size() or 0) > 1_000_000:
-                        logger.warning("Dropping slow dashboard event subscriber with oversized write buffer")
-                        dead_clients.add(writer)
-                except (ConnectionResetError, BrokenPipeError, ConnectionError):
-                    dead_clients.add(writer)
-                except Exception as exc:
-                    logger.warning("Error notifying dashboard event subscriber: %s", exc)
-                    dead_clients.add(writer)
+            # Encoded once; every subscriber gets the same bytes, written now
+            # so generations reach clients in the order they were bumped.
+            # Stalled subscribers merge `message` into their backlog instead.
+            full_subscribers = [writer for writer in self.subscribers if writer not in self.delta_states]
+            if full_subscribers:
+                self.fanout.publish(full_subscribers, encode_line(message), flush=True, message=message)
+            if self.delta_states:
+                self._publish_delta(message, invalidated="dashboard" in changed_keys)
+
+    @property
+    def publishing(self) -> bool:
+        return self.publisher is not None and self.publisher.is_open
+
+    def cancel_pending_publish(self) -> None:
+        """Drop a scheduled shared-snapshot rebuild (daemon shutdown)."""
+        if self._publish_timer is not None:
+            self._publish_timer.cancel()
+            self._publish_timer = None
+        self._publish_keys = []
+
+    def _schedule_publish(self, changed_keys: List[str]) -> None:
+        """Mark the shared snapshot dirty and arm one delayed rebuild."""
+        for key in changed_keys:
+            if key not in self._publish_keys:
+                self._publish_keys.append(key)
+        if self._publish_timer is None:
+            self._publish_timer = asyncio.get_running_loop().call_later(
+                self.publish_delay_ms / 1000.0, self._start_pending_publish
+            )
+
+    def _start_pending_publish(self) -> None:
+        self._publish_timer = None
+        self._publish_task = asyncio.ensure_future(self._publish_pending())
+
+    async def _publish_pending(self) -> None:
+        """Rebuild the payload for every key changed since the last publish."""
+        async with self._notify_lock:
+            changed_keys, self._publish_keys = self._publish_keys, []
+            if not changed_keys or not self.publishing:
+                return
+            try:
+                # event_payload() publishes the snapshot it builds.
+                await self.event_payload(changed_keys)
+            except Exception as exc:
+                logger.warning("Failed to rebuild shared dashboard snapshot: %s", exc)
+
+    def _publish_snapshot(self, payload: Dict[str, Any]) -> None:
+        """Write payload to the shared-memory snapshot, if one is open."""
+        if not self.publishing:
+            return
+        try:
+            self.publisher.publish(payload, generation=int(payload.get("snapshot_version") or 0))
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to publish shared dashboard snapshot: %s", exc)
 
-            self.subscribers -= dead_clients
-            for writer in dead_clients:
-                # Close evicted writers so blocked `dashboard watch` readers see
-                # EOF and reconnect instead of hanging on readline forever.
-                try:
-                    writer.close()
-                except Exception:
-                    pass
-            if dead_clients:
-                logger.debug("Removed %s dead dashboard event subscribers", len(dead_clients))
+    def _publish_delta(self, message: Dict[str, Any], *, invalidated: bool) -> None:
+        """Write one event to delta subscribers, encoding once per shared base."""
+        if invalidated:
+            for state in self.delta_states.values():
+                state.reset()
+            self.fanout.publish(list(self.delta_states), encode_line(message), flush=True, message=message)
+            return
+        params = message.get("params") or {}
+        payload = params.get("payload") or {}
+        keys = delta_keys(payload)
+        groups: Dict[Tuple[Any, ...], List[asyncio.StreamWriter]] = {}
+        for writer, state in self.delta_states.items():
+            groups.setdefault(state.signature(keys), []).append(writer)
+        generation = int(params.get("generation") or 0)
+        for writers in groups.values():
+            delta_message = encode_delta_notification(message, self.delta_states[writers[0]], keys)
+            data = encode_line(delta_message)
+            for writer in writers:
+                advance_delta_state(self.delta_states[writer], payload, keys, generation)
+            # A backlogged delta subscriber coalesces the full message, which
+            # leaves it holding exactly the base just recorded.
+            self.fanout.publish(writers, data, flush=True, message=message)
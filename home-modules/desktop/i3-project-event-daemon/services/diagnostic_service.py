@@ -353,7 +353,12 @@ class DiagnosticService:
         if not event_buffer:
             return []
 
-        events = event_buffer.get_recent(limit=limit, event_type=event_type)
+        # Reach into the persistent store when the ring has too few events
+        with_history = getattr(event_buffer, "get_events_with_history", None)
+        if with_history is not None:
+            events = await with_history(limit=limit, event_type=event_type)
+        else:
+            events = event_buffer.get_recent(limit=limit, event_type=event_type)
 
         formatted_events = []
         for event in events:
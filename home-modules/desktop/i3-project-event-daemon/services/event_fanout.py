@@ -0,0 +1,408 @@
+"""
+Serialize-once fan-out for event and dashboard subscribers.
+
+Every event used to be hand-copied field by field into a ~40-key dict (most of
+them None), dumped with json, and written to each subscriber with its own
+transport write. This module splits that into an encoding stage and a write
+stage:
+
+- ``encode_event_entry`` turns an EventEntry into one JSON-RPC ``event``
+  notification line. Fields are read in a precomputed order straight from the
+  dataclass ``__dict__`` and None fields are omitted. The line is encoded with
+  orjson when it is installed, json otherwise.
+- ``SubscriberFanout`` queues the same immutable bytes object for every
+  subscriber and flushes once per event-loop iteration, so a burst of events
+  reaches each socket as one ``writelines`` (writev) call.
+
+A subscriber whose transport buffer passes the cap is not disconnected: it is
+moved to a bounded backlog drained by its own task once the socket drains.
+Event streams keep the newest ``max_queue_bytes`` of lines and, after drops,
+send a resync marker carrying the drop count first. Streams with a
+``coalesce`` function (dashboard events) instead keep one merged message
+holding the latest value per key. A subscriber that stays stalled for
+``max_stall_seconds``, or whose writer cannot be drained, is evicted.
+
+The per-event cost is one encode plus one list append per subscriber;
+serialization no longer scales with the number of subscribers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WRITE_BUFFER = 1_000_000
+DEFAULT_MAX_QUEUE_BYTES = 1_000_000
+DEFAULT_MAX_STALL_SECONDS = 30.0
+RESYNC_EVENT_TYPE = "subscription::resync"
+
+# EventEntry fields sent to event subscribers, in wire order.
+EVENT_BROADCAST_FIELDS = (
+    "event_id",
+    "boot_id",
+    "event_type",
+    "timestamp",
+    "source",
+    # Window event fields
+    "window_id",
+    "window_class",
+    "window_title",
+    "window_instance",
+    "workspace_name",
+    # Project event fields
+    "project_name",
+    "project_directory",
+    "old_project",
+    "new_project",
+    "windows_affected",
+    # Tick event fields
+    "tick_payload",
+    # Output event fields
+    "output_name",
+    "output_count",
+    # Query event fields
+    "query_method",
+    "query_params",
+    "query_result_count",
+    # Config event fields
+    "config_type",
+    "rules_added",
+    "rules_removed",
+    # Daemon event fields
+    "daemon_version",
+    "i3_socket",
+    # Systemd event fields (Feature 029)
+    "systemd_unit",
+    "systemd_message",
+    "systemd_pid",
+    "journal_cursor",
+    # Process event fields (Feature 029)
+    "process_pid",
+    "process_name",
+    "process_cmdline",
+    "process_parent_pid",
+    "process_start_time",
+    # Processing metadata
+    "processing_duration_ms",
+    "error",
+)
+
+
+def encode_line(message: Any) -> bytes:
+    """Serialize one JSON message line, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                message,
+                default=str,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            pass
+    return json.dumps(message, separators=(",", ":"), default=str).encode() + b"\n"
+
+
+def event_entry_params(event_entry: Any) -> Dict[str, Any]:
+    """Return the broadcast fields of an EventEntry, omitting None values."""
+    fields = getattr(event_entry, "__dict__", None)
+    if fields is None:
+        fields = {name: getattr(event_entry, name, None) for name in EVENT_BROADCAST_FIELDS}
+    params = {
+        name: fields[name]
+        for name in EVENT_BROADCAST_FIELDS
+        if fields.get(name) is not None
+    }
+    for name in ("timestamp", "process_start_time"):
+        value = params.get(name)
+        if isinstance(value, datetime):
+            params[name] = value.isoformat()
+    return params
+
+
+def event_notification(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Wrap event params in the JSON-RPC ``event`` notification (Feature 058)."""
+    return {"jsonrpc": "2.0", "method": "event", "params": params}
+
+
+def encode_event_entry(event_entry: Any) -> bytes:
+    """Encode an EventEntry as one ``event`` notification line."""
+    return encode_line(event_notification(event_entry_params(event_entry)))
+
+
+def encode_resync_marker(dropped: int) -> bytes:
+    """Encode the marker sent before a backlog from which events were dropped."""
+    return encode_line(event_notification({
+        "event_type": RESYNC_EVENT_TYPE,
+        "source": "daemon",
+        "dropped": int(dropped),
+    }))
+
+
+class _Backlog:
+    """Messages held for one stalled subscriber until its socket drains."""
+
+    __slots__ = ("chunks", "size", "dropped", "message", "coalesced", "task")
+
+    def __init__(self) -> None:
+        self.chunks: Deque[bytes] = deque()
+        self.size = 0
+        self.dropped = 0
+        self.message: Optional[Dict[str, Any]] = None
+        self.coalesced = 0
+        self.task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.chunks or self.dropped or self.message is not None)
+
+
+def _current_task() -> Optional[asyncio.Task]:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:
+        return None
+
+
+class SubscriberFanout:
+    """Write shared message bytes to many subscribers in batched writes.
+
+    Example:
+        >>> fanout = SubscriberFanout("event", on_evict=subscribers.discard)
+        >>> fanout.publish(subscribers, encode_event_entry(entry))  # flushed next tick
+        >>> fanout.publish(subscribers, data, flush=True)           # written now
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_write_buffer: int = DEFAULT_MAX_WRITE_BUFFER,
+        max_queue_bytes: int = DEFAULT_MAX_QUEUE_BYTES,
+        max_stall_seconds: float = DEFAULT_MAX_STALL_SECONDS,
+        coalesce: Optional[Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = None,
+        on_evict: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        """Initialize the fan-out.
+
+        Args:
+            name: Stream label used in log messages
+            max_write_buffer: Transport buffer size (bytes) that backlogs a subscriber
+            max_queue_bytes: Backlog size (bytes) past which the oldest lines are dropped
+            max_stall_seconds: How long a backlogged subscriber may stay stalled
+            coalesce: Merges (queued, latest) messages for a backlogged subscriber
+            on_evict: Called with each evicted writer after it is closed
+        """
+        self.name = name
+        self.max_write_buffer = int(max_write_buffer)
+        self.max_queue_bytes = int(max_queue_bytes)
+        self.max_stall_seconds = float(max_stall_seconds)
+        self._coalesce = coalesce
+        self._on_evict = on_evict
+        self._pending: Dict[Any, List[bytes]] = {}
+        self._backlogs: Dict[Any, _Backlog] = {}
+        self._flush_handle: Optional[asyncio.Handle] = None
+
+        self._published = 0
+        self._bytes_published = 0
+        self._writes = 0
+        self._batched_writes = 0
+        self._evicted = 0
+        self._backlogged = 0
+        self._dropped = 0
+        self._coalesced = 0
+
+    def publish(
+        self,
+        writers: Iterable[Any],
+        data: bytes,
+        *,
+        flush: bool = False,
+        message: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue data for every writer; flush now or on the next loop iteration.
+
+        message is the decoded form of data; backlogged subscribers of a
+        coalescing stream merge it instead of queueing the bytes.
+        """
+        published = queued = False
+        for writer in writers:
+            published = True
+            backlog = self._backlogs.get(writer)
+            if backlog is not None:
+                self._enqueue(backlog, data, message)
+                continue
+            self._pending.setdefault(writer, []).append(data)
+            queued = True
+        if published:
+            self._published += 1
+            self._bytes_published += len(data)
+        if not queued:
+            return
+        if flush:
+            self.flush()
+        elif self._flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                self.flush()
+                return
+            self._flush_handle = loop.call_soon(self.flush)
+
+    def discard(self, writer: Any) -> None:
+        """Drop anything still queued for a writer that went away."""
+        self._pending.pop(writer, None)
+        backlog = self._backlogs.pop(writer, None)
+        if backlog is not None and backlog.task is not None and backlog.task is not _current_task():
+            backlog.task.cancel()
+
+    def backlogged(self, writer: Any) -> bool:
+        """Whether writer is stalled and receiving through its backlog."""
+        return writer in self._backlogs
+
+    def _enqueue(self, backlog: _Backlog, data: bytes, message: Optional[Dict[str, Any]]) -> None:
+        if self._coalesce is not None and message is not None:
+            if backlog.message is None:
+                backlog.message = message
+            else:
+                backlog.message = self._coalesce(backlog.message, message)
+                backlog.coalesced += 1
+                self._coalesced += 1
+            return
+        backlog.chunks.append(data)
+        backlog.size += len(data)
+        while backlog.size > self.max_queue_bytes and backlog.chunks:
+            backlog.size -= len(backlog.chunks.popleft())
+            backlog.dropped += 1
+            self._dropped += 1
+
+    def _start_backlog(self, writer: Any) -> bool:
+        """Move a stalled writer to a backlog; False when it cannot be drained."""
+        if not callable(getattr(writer, "drain", None)):
+            return False
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        backlog = _Backlog()
+        self._backlogs[writer] = backlog
+        self._backlogged += 1
+        backlog.task = loop.create_task(self._drain_backlog(writer, backlog))
+        logger.info("Backlogging slow %s subscriber until its socket drains", self.name)
+        return True
+
+    async def _drain_backlog(self, writer: Any, backlog: _Backlog) -> None:
+        """Wait for the socket to drain, then write the backlog; repeat until caught up."""
+        try:
+            while True:
+                await asyncio.wait_for(writer.drain(), timeout=self.max_stall_seconds)
+                if not backlog:
+                    break
+                chunks: List[bytes] = []
+                if backlog.dropped:
+                    chunks.append(encode_resync_marker(backlog.dropped))
+                    backlog.dropped = 0
+                chunks.extend(backlog.chunks)
+                backlog.chunks.clear()
+                backlog.size = 0
+                if backlog.message is not None:
+                    chunks.append(encode_line(backlog.message))
+                    backlog.message = None
+                    backlog.coalesced = 0
+                writelines = getattr(writer, "writelines", None)
+                if callable(writelines):
+                    writelines(chunks)
+                else:
+                    writer.write(b"".join(chunks))
+                self._writes += 1
+                if not self._over_buffer(writer):
+                    break
+        except asyncio.CancelledError:
+            return
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %s subscriber stalled for %.0fs", self.name, self.max_stall_seconds)
+            self._evict([writer])
+            return
+        except Exception as exc:
+            logger.debug("Backlogged %s subscriber went away: %s", self.name, exc)
+            self._evict([writer])
+            return
+        if self._backlogs.get(writer) is backlog:
+            del self._backlogs[writer]
+
+    def _over_buffer(self, writer: Any) -> bool:
+        transport = getattr(writer, "transport", None)
+        get_buffer_size = getattr(transport, "get_write_buffer_size", None)
+        return callable(get_buffer_size) and int(get_buffer_size() or 0) > self.max_write_buffer
+
+    def flush(self) -> None:
+        """Write every queued chunk, one write call per subscriber."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        dead: List[Any] = []
+        for writer, chunks in pending.items():
+            try:
+                if len(chunks) == 1:
+                    writer.write(chunks[0])
+                else:
+                    writelines = getattr(writer, "writelines", None)
+                    if callable(writelines):
+                        writelines(chunks)
+                    else:
+                        writer.write(b"".join(chunks))
+                    self._batched_writes += 1
+                self._writes += 1
+                if self._over_buffer(writer) and not self._start_backlog(writer):
+                    logger.warning("Dropping slow %s subscriber with oversized write buffer", self.name)
+                    dead.append(writer)
+            except (ConnectionResetError, BrokenPipeError, ConnectionError):
+                dead.append(writer)
+            except Exception as exc:
+                logger.warning("Error notifying %s subscriber: %s", self.name, exc)
+                dead.append(writer)
+        self._evict(dead)
+
+    def _evict(self, dead: List[Any]) -> None:
+        for writer in dead:
+            self._evicted += 1
+            # Close evicted writers so blocked readers see EOF and reconnect
+            # instead of hanging on readline forever.
+            try:
+                writer.close()
+            except Exception:
+                pass
+            self.discard(writer)
+            if self._on_evict is not None:
+                self._on_evict(writer)
+        if dead:
+            logger.debug("Removed %s dead %s subscribers", len(dead), self.name)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return publish/write counters."""
+        return {
+            "encoder": "orjson" if ORJSON_AVAILABLE else "json",
+            "published": self._published,
+            "bytes_published": self._bytes_published,
+            "writes": self._writes,
+            "batched_writes": self._batched_writes,
+            "evicted": self._evicted,
+            "pending_subscribers": len(self._pending),
+            "backlogged_subscribers": len(self._backlogs),
+            "backlogged": self._backlogged,
+            "backlog_bytes": sum(backlog.size for backlog in self._backlogs.values()),
+            "dropped": self._dropped,
+            "coalesced": self._coalesced,
+        }
@@ -8,6 +8,8 @@ from dataclasses import asdict, is_dataclass
 from datetime import datetime
 from typing import Any, Awaitable, Callable, Dict, List, Optional
 
+from ..event_buffer import query_events
+
 
 EventBufferProvider = Callable[[], Optional[Any]]
 LogIpcEvent = Callable[..., Awaitable[None]]
@@ -91,7 +93,8 @@ class EventQueryService:
 
                 if source in ("all", "proc") or (event_buffer and source != "systemd"):
                     if event_buffer:
-                        buffer_events = event_buffer.get_events(
+                        buffer_events = await query_events(
+                            event_buffer,
                             limit=limit,
                             event_type=event_type,
                             source=source if source != "all" else None,
@@ -127,7 +130,8 @@ class EventQueryService:
                     "stats": {"total_events": 0, "buffer_size": 0, "max_size": 0},
                 }
 
-            events = event_buffer.get_events(
+            events = await query_events(
+                event_buffer,
                 limit=limit,
                 event_type=event_type,
                 source=source,
@@ -168,6 +172,8 @@ class EventQueryService:
                 "processing_duration_ms": event.processing_duration_ms,
             }
 
+            if event.boot_id:
+                event_dict["boot_id"] = event.boot_id
             if event.window_id is not None:
                 event_dict["window_id"] = event.window_id
             if event.window_class:
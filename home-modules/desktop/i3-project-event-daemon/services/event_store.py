@@ -0,0 +1,478 @@
+"""
+SQLite-backed persistent event store.
+
+The in-memory EventBuffer only holds the newest few thousand events, and the
+JSON snapshot it can write on shutdown is lost on a crash. EventStore keeps
+every buffered event in an on-disk ``event_log`` table so history queries can
+reach past the ring:
+
+- The database runs in WAL mode with ``synchronous=NORMAL``; readers never
+  block the writer.
+- ``enqueue()`` is O(1) on the event loop. A background task flushes pending
+  rows in one transaction every ``flush_interval`` seconds (or sooner once
+  ``batch_size`` rows are waiting), so a crash loses at most one interval.
+- All SQLite work runs on a single worker thread that owns the connection.
+- The base ``event_log`` schema is created here, then the SQL files under
+  ``migrations/`` (Feature 029: systemd/proc columns, correlation tables) are
+  applied once each and recorded in ``schema_migrations``.
+- Retention is enforced with an indexed ``DELETE`` on open and periodically.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+try:
+    import sqlite3
+    SQLITE_AVAILABLE = True
+except ImportError:
+    SQLITE_AVAILABLE = False
+
+try:
+    from ..models import EventEntry
+except ImportError:
+    # Fall back to absolute import for testing
+    from models import EventEntry
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# event_log as it stood before the Feature 029 migrations extend it.
+# event_id is the store's own key (referenced by the correlation tables);
+# buffer_event_id is the EventEntry.event_id shown to clients, which restarts
+# at 0 with every daemon run. The payload keeps the event's boot_id, so
+# (boot_id, buffer_event_id) stays unique across runs.
+_BASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_log (
+    event_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    buffer_event_id INTEGER NOT NULL,
+    event_type TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    source TEXT NOT NULL,
+    window_id INTEGER,
+    correlation_id TEXT,
+    trace_id TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_event_log_timestamp ON event_log(timestamp);
+CREATE INDEX IF NOT EXISTS idx_event_log_type ON event_log(event_type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_event_log_window ON event_log(window_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_event_log_correlation ON event_log(correlation_id);
+"""
+
+_BASE_MIGRATION = "000_create_event_log"
+
+# Columns written for every event; the Feature 029 ones exist once the
+# migrations have run.
+_COLUMNS: Tuple[str, ...] = (
+    "buffer_event_id",
+    "event_type",
+    "timestamp",
+    "source",
+    "window_id",
+    "correlation_id",
+    "trace_id",
+    "payload",
+    "systemd_unit",
+    "systemd_message",
+    "systemd_pid",
+    "journal_cursor",
+    "process_pid",
+    "process_name",
+    "process_cmdline",
+    "process_parent_pid",
+    "process_start_time",
+)
+
+_INSERT_SQL = (
+    f"INSERT INTO event_log ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in _COLUMNS)})"
+)
+
+_EVENT_FIELDS: Tuple[str, ...] = tuple(f.name for f in fields(EventEntry))
+
+Row = Tuple[Any, ...]
+
+
+def event_to_row(event: EventEntry) -> Row:
+    """Snapshot an event as an event_log row (payload holds every set field)."""
+    payload = {
+        name: value
+        for name in _EVENT_FIELDS
+        if (value := getattr(event, name, None)) is not None and name != "timestamp"
+    }
+    return (
+        event.event_id,
+        event.event_type,
+        event.timestamp.timestamp(),
+        event.source,
+        event.window_id,
+        event.correlation_id,
+        event.trace_id,
+        json.dumps(payload, default=str, separators=(",", ":")),
+        event.systemd_unit,
+        event.systemd_message,
+        event.systemd_pid,
+        event.journal_cursor,
+        event.process_pid,
+        event.process_name,
+        event.process_cmdline,
+        event.process_parent_pid,
+        event.process_start_time,
+    )
+
+
+def row_to_event(timestamp: float, payload: str) -> Optional[EventEntry]:
+    """Rebuild an EventEntry from its stored timestamp and payload."""
+    try:
+        data = json.loads(payload)
+        data = {name: value for name, value in data.items() if name in _EVENT_FIELDS}
+        return EventEntry(timestamp=datetime.fromtimestamp(timestamp), **data)
+    except (TypeError, ValueError) as e:
+        logger.debug(f"Skipping unreadable stored event: {e}")
+        return None
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def split_sql_statements(script: str) -> List[str]:
+    """Split a migration script into complete statements."""
+    statements: List[str] = []
+    pending = ""
+    for line in script.splitlines(keepends=True):
+        if not pending and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ""
+    if pending.strip():
+        statements.append(pending.strip())
+    return statements
+
+
+class EventStore:
+    """Append-only on-disk event log with batched background writes.
+
+    Example:
+        >>> store = EventStore(ConfigPaths.EVENT_STORE_FILE)
+        >>> await store.start()
+        >>> store.enqueue(event)          # from EventBuffer.add_event
+        >>> older = await store.query(limit=100, before=oldest_buffered.timestamp)
+        >>> await store.close()           # flushes anything pending
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        retention_days: int = 7,
+        flush_interval: float = 1.0,
+        batch_size: int = 500,
+        max_pending: int = 50_000,
+        prune_interval: float = 3600.0,
+        migrations_dir: Path = MIGRATIONS_DIR,
+    ) -> None:
+        """Initialize the store (nothing is opened until start()).
+
+        Args:
+            path: SQLite database file
+            retention_days: Events older than this are deleted
+            flush_interval: Max seconds a pending event waits before being written
+            batch_size: Pending rows that trigger an early flush
+            max_pending: Pending rows kept while writes fail (oldest dropped)
+            prune_interval: Seconds between retention sweeps
+            migrations_dir: Directory of *.sql migrations applied after the base schema
+        """
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.prune_interval = prune_interval
+        self.migrations_dir = migrations_dir
+
+        self._conn: Optional["sqlite3.Connection"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._pending: List[Row] = []
+        self._last_prune = 0.0
+
+        self._written = 0
+        self._dropped = 0
+        self._flushes = 0
+        self._pruned = 0
+        self._write_errors = 0
+        self._last_flush_ms = 0.0
+
+    # Lifecycle ---------------------------------------------------------------
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    async def start(self) -> None:
+        """Open the database, apply migrations, prune, and start the writer.
+
+        Raises:
+            RuntimeError: If sqlite3 is not available
+            sqlite3.Error: If the database cannot be opened or migrated
+        """
+        if not SQLITE_AVAILABLE:
+            raise RuntimeError("sqlite3 module not available")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-store")
+        await self._run(self._open)
+        self._pruned += await self._run(self._prune, self._cutoff())
+        self._last_prune = time.monotonic()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+
+    async def close(self) -> None:
+        """Stop the writer, flush pending events and close the database."""
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+        if self._conn is not None:
+            await self.flush()
+            await self._run(self._close)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    # Writes ------------------------------------------------------------------
+
+    def enqueue(self, event: EventEntry) -> None:
+        """Queue an event for the next batch write."""
+        if self._conn is None:
+            return
+        self._pending.append(event_to_row(event))
+        if len(self._pending) > self.max_pending:
+            overflow = len(self._pending) - self.max_pending
+            del self._pending[:overflow]
+            self._dropped += overflow
+        if len(self._pending) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write every pending event in one transaction.
+
+        Returns:
+            Number of rows written (0 if the write failed; rows are retried)
+        """
+        if not self._pending or self._conn is None:
+            return 0
+        rows, self._pending = self._pending, []
+        started = time.perf_counter()
+        try:
+            await self._run(self._insert, rows)
+        except Exception as e:
+            self._write_errors += 1
+            logger.warning(f"Event store write of {len(rows)} events failed: {e}")
+            self._pending[:0] = rows
+            overflow = max(0, len(self._pending) - self.max_pending)
+            del self._pending[:overflow]
+            self._dropped += overflow
+            return 0
+        self._flushes += 1
+        self._written += len(rows)
+        self._last_flush_ms = (time.perf_counter() - started) * 1000
+        return len(rows)
+
+    async def prune(self) -> int:
+        """Delete events older than the retention period; returns rows removed."""
+        if self._conn is None:
+            return 0
+        removed = await self._run(self._prune, self._cutoff())
+        self._pruned += removed
+        self._last_prune = time.monotonic()
+        if removed:
+            logger.info(f"Pruned {removed} stored events older than {self.retention_days} days")
+        return removed
+
+    async def _writer_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+                if time.monotonic() - self._last_prune >= self.prune_interval:
+                    await self.prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Event store writer error: {e}")
+
+    # Reads -------------------------------------------------------------------
+
+    async def query(
+        self,
+        limit: int = 100,
+        event_type: Optional[str] = None,
+        source: Optional[str] = None,
+        window_id: Optional[int] = None,
+        correlation_id: Optional[str] = None,
+        before: Optional[datetime] = None,
+        since: Optional[datetime] = None,
+    ) -> List[EventEntry]:
+        """Stored events matching the filters, most recent first.
+
+        Args:
+            limit: Maximum number of events to return
+            event_type: Event type prefix (e.g., "window", "window::new")
+            source: Exact event source
+            window_id: Only events for this window
+            correlation_id: Only events in this causality chain
+            before: Only events strictly older than this timestamp
+            since: Only events at or after this timestamp
+        """
+        if self._conn is None or limit <= 0:
+            return []
+        clauses: List[str] = []
+        params: List[Any] = []
+        if event_type:
+            clauses.append("event_type >= ? AND event_type < ?")
+            params += [event_type, _prefix_upper_bound(event_type)]
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if window_id is not None:
+            clauses.append("window_id = ?")
+            params.append(window_id)
+        if correlation_id is not None:
+            clauses.append("correlation_id = ?")
+            params.append(correlation_id)
+        if before is not None:
+            clauses.append("timestamp < ?")
+            params.append(before.timestamp())
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since.timestamp())
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = (
+            f"SELECT timestamp, payload FROM event_log {where}"
+            f"ORDER BY timestamp DESC, event_id DESC LIMIT ?"
+        )
+        params.append(limit)
+        rows = await self._run(self._select, sql, params)
+        return [event for ts, payload in rows if (event := row_to_event(ts, payload)) is not None]
+
+    async def count(self) -> int:
+        """Number of stored events."""
+        if self._conn is None:
+            return 0
+        rows = await self._run(self._select, "SELECT COUNT(*) FROM event_log", [])
+        return int(rows[0][0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return store counters for diagnostics."""
+        return {
+            "path": str(self.path),
+            "open": self.is_open,
+            "pending": len(self._pending),
+            "written": self._written,
+            "flushes": self._flushes,
+            "last_flush_ms": round(self._last_flush_ms, 2),
+            "dropped": self._dropped,
+            "write_errors": self._write_errors,
+            "pruned": self._pruned,
+            "retention_days": self.retention_days,
+        }
+
+    # Worker thread -------------------------------------------------------------
+
+    def _cutoff(self) -> float:
+        return (datetime.now() - timedelta(days=self.retention_days)).timestamp()
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._migrate(conn)
+        except Exception:
+            conn.close()
+            raise
+        self._conn = conn
+
+    def _migrate(self, conn: "sqlite3.Connection") -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            "name TEXT PRIMARY KEY, applied_at TEXT NOT NULL)"
+        )
+        applied = {name for (name,) in conn.execute("SELECT name FROM schema_migrations")}
+        migrations: List[Tuple[str, str]] = [(_BASE_MIGRATION, _BASE_SCHEMA)]
+        if self.migrations_dir.is_dir():
+            migrations += [
+                (path.stem, path.read_text())
+                for path in sorted(self.migrations_dir.glob("*.sql"))
+            ]
+        for name, script in migrations:
+            if name in applied:
+                continue
+            conn.execute("BEGIN")
+            try:
+                for statement in split_sql_statements(script):
+                    try:
+                        conn.execute(statement).fetchall()
+                    except sqlite3.OperationalError as e:
+                        # A column added by hand or by an interrupted
+                        # pre-tracking run; the rest of the migration still applies.
+                        if "duplicate column name" not in str(e):
+                            raise
+                conn.execute(
+                    "INSERT INTO schema_migrations (name, applied_at) VALUES (?, ?)",
+                    (name, datetime.now().isoformat()),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            logger.info(f"Applied event store migration {name}")
+
+    def _close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _insert(self, rows: Sequence[Row]) -> None:
+        assert self._conn is not None
+        with self._conn:
+            self._conn.execute("BEGIN")
+            self._conn.executemany(_INSERT_SQL, rows)
+
+    def _prune(self, cutoff: float) -> int:
+        assert self._conn is not None
+        with self._conn:
+            self._conn.execute("BEGIN")
+            return self._conn.execute("DELETE FROM event_log WHERE timestamp < ?", (cutoff,)).rowcount
+
+    def _select(self, sql: str, params: Sequence[Any]) -> List[Tuple[Any, ...]]:
+        assert self._conn is not None
+        return self._conn.execute(sql, params).fetchall()
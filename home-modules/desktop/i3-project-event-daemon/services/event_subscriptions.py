@@ -0,0 +1,300 @@
+"""
+Server-side filters for subscribe_events.
+
+Subscribers used to receive every event the daemon logs (window titles,
+commands, marks, traces) and discard most of them client-side. A subscriber
+can now pass filter params and the broadcast path selects matching writers
+before anything is encoded:
+
+- ``event_types``: prefixes matched per ``::`` category. ``"window"`` matches
+  ``window::new`` and ``window::title``; ``"window::fo"`` matches only
+  ``window::focus``. Dict events without ``event_type`` match on ``type``.
+- ``sources``: exact EventEntry sources (``i3``, ``ipc``, ``daemon``...).
+- ``window_id``: the event's ``window_id`` or ``mark_window_id``.
+- ``project`` / ``context_key``: the event's project fields, or for window
+  events the project/context of the tracked window.
+- ``max_rate``: events per second, enforced with a token bucket (burst of one
+  second); events over the rate are dropped and counted.
+
+Filtered subscribers are indexed by the most selective criterion they set
+(window, then category, then source; project/context and rate-only filters
+share one catch-all bucket), so a broadcast only checks candidates whose
+index key matches the event. Unfiltered subscribers skip
+the index entirely.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple
+
+WindowContextResolver = Callable[[int], Tuple[str, str]]
+
+_PROJECT_FIELDS = ("project_name", "new_project", "old_project", "mark_project", "project")
+
+
+def _category(event_type: str) -> str:
+    return event_type.split("::", 1)[0]
+
+
+def _string_list(params: Mapping[str, Any], *names: str) -> Tuple[str, ...]:
+    for name in names:
+        value = params.get(name)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f"{name} must be a string or list of strings")
+        return tuple(str(item).strip() for item in value if str(item).strip())
+    return ()
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Normalized subscribe_events filter.
+
+    Attributes:
+        event_types: Event-type prefixes, matched per ``::`` category
+        sources: Accepted event sources
+        window_id: Only events for this window
+        project: Only events for this project
+        context_key: Only events for this project context
+        max_rate: Maximum events per second delivered (None = unlimited)
+    """
+
+    event_types: Tuple[str, ...] = ()
+    sources: FrozenSet[str] = frozenset()
+    window_id: Optional[int] = None
+    project: Optional[str] = None
+    context_key: Optional[str] = None
+    max_rate: Optional[float] = None
+
+    @classmethod
+    def from_params(cls, params: Mapping[str, Any]) -> "EventFilter":
+        """Build a filter from subscribe params; raises ValueError on bad input."""
+        event_types = _string_list(params, "event_types", "types")
+        if any(prefix in ("*", "all") for prefix in event_types):
+            event_types = ()
+        sources = frozenset(_string_list(params, "sources", "source"))
+
+        window_id = params.get("window_id")
+        if window_id is not None:
+            try:
+                window_id = int(window_id)
+            except (TypeError, ValueError):
+                raise ValueError("window_id must be an integer")
+
+        max_rate = params.get("max_rate")
+        if max_rate is not None:
+            try:
+                max_rate = float(max_rate)
+            except (TypeError, ValueError):
+                raise ValueError("max_rate must be a number")
+            if max_rate <= 0:
+                raise ValueError("max_rate must be positive")
+
+        project = str(params.get("project") or "").strip()
+        context_key = str(params.get("context_key") or "").strip()
+        return cls(
+            event_types=tuple(dict.fromkeys(event_types)),
+            sources=sources,
+            window_id=window_id,
+            project=project or None,
+            context_key=context_key or None,
+            max_rate=max_rate,
+        )
+
+    @property
+    def selects(self) -> bool:
+        """Whether the filter restricts which events match (rate aside)."""
+        return bool(
+            self.event_types or self.sources or self.window_id is not None
+            or self.project or self.context_key
+        )
+
+    def matches(self, event: Mapping[str, Any], resolve_window: Optional[WindowContextResolver] = None) -> bool:
+        """Return whether an event (EventEntry fields or a dict event) matches."""
+        if self.event_types:
+            event_type = str(event.get("event_type") or event.get("type") or "")
+            category = _category(event_type)
+            if not any(
+                category == prefix if "::" not in prefix else event_type.startswith(prefix)
+                for prefix in self.event_types
+            ):
+                return False
+        if self.sources and event.get("source") not in self.sources:
+            return False
+        if self.window_id is not None and self.window_id not in (
+            event.get("window_id"),
+            event.get("mark_window_id"),
+        ):
+            return False
+        if self.project or self.context_key:
+            project, context_key = self._event_context(event, resolve_window)
+            if self.project and project != self.project:
+                return False
+            if self.context_key and context_key != self.context_key:
+                return False
+        return True
+
+    @staticmethod
+    def _event_context(
+        event: Mapping[str, Any],
+        resolve_window: Optional[WindowContextResolver],
+    ) -> Tuple[str, str]:
+        project = next((str(event[name]) for name in _PROJECT_FIELDS if event.get(name)), "")
+        context_key = str(event.get("context_key") or "")
+        window_id = event.get("window_id") or event.get("mark_window_id")
+        if (not project or not context_key) and window_id and resolve_window is not None:
+            window_project, window_context_key = resolve_window(int(window_id))
+            project = project or window_project
+            context_key = context_key or window_context_key
+        return project, context_key
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "event_types": list(self.event_types),
+            "sources": sorted(self.sources),
+            "window_id": self.window_id,
+            "project": self.project,
+            "context_key": self.context_key,
+            "max_rate": self.max_rate,
+        }
+
+
+class Subscription:
+    """One filtered subscriber with its rate-limit bucket."""
+
+    __slots__ = ("writer", "filter", "index_keys", "delivered", "rate_limited", "_tokens", "_updated")
+
+    def __init__(self, writer: Any, event_filter: EventFilter, now: float) -> None:
+        self.writer = writer
+        self.filter = event_filter
+        self.index_keys = _index_keys(event_filter)
+        self.delivered = 0
+        self.rate_limited = 0
+        self._tokens = max(float(event_filter.max_rate or 0.0), 1.0)
+        self._updated = now
+
+    def admit(self, now: float) -> bool:
+        """Take a token for one event; False when the subscriber is over its rate."""
+        rate = self.filter.max_rate
+        if rate is not None:
+            self._tokens = min(max(rate, 1.0), self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            if self._tokens < 1.0:
+                self.rate_limited += 1
+                return False
+            self._tokens -= 1.0
+        self.delivered += 1
+        return True
+
+
+def _index_keys(event_filter: EventFilter) -> Tuple[Tuple[str, Any], ...]:
+    """Index entries for the filter's most selective criterion."""
+    if event_filter.window_id is not None:
+        return (("window", event_filter.window_id),)
+    if event_filter.event_types:
+        return tuple(("category", _category(prefix)) for prefix in event_filter.event_types)
+    if event_filter.sources:
+        return tuple(("source", source) for source in event_filter.sources)
+    # Project/context filters can match through the window resolver, so they
+    # cannot be narrowed by an event field; rate-only filters match anything.
+    return (("any", None),)
+
+
+class EventSubscriptions:
+    """Filtered event subscribers indexed by topic.
+
+    Writers without a registered filter are unfiltered and receive everything.
+
+    Example:
+        >>> subscriptions = EventSubscriptions()
+        >>> subscriptions.set(writer, EventFilter.from_params({"event_types": ["window"]}))
+        >>> targets = subscriptions.targets(event_fields, all_subscribers)
+    """
+
+    def __init__(
+        self,
+        resolve_window: Optional[WindowContextResolver] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the registry.
+
+        Args:
+            resolve_window: Returns (project, context_key) for a window id
+            clock: Monotonic time source for rate limiting
+        """
+        self._resolve_window = resolve_window
+        self._clock = clock
+        self._subscriptions: Dict[Any, Subscription] = {}
+        self._index: Dict[Tuple[str, Any], Set[Subscription]] = {}
+        self._filtered_out = 0
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def get(self, writer: Any) -> Optional[Subscription]:
+        return self._subscriptions.get(writer)
+
+    def set(self, writer: Any, event_filter: EventFilter) -> None:
+        """Register (or replace) a writer's filter; an empty filter removes it."""
+        self.discard(writer)
+        if not event_filter.selects and event_filter.max_rate is None:
+            return
+        subscription = Subscription(writer, event_filter, self._clock())
+        self._subscriptions[writer] = subscription
+        for key in subscription.index_keys:
+            self._index.setdefault(key, set()).add(subscription)
+
+    def discard(self, writer: Any) -> None:
+        subscription = self._subscriptions.pop(writer, None)
+        if subscription is None:
+            return
+        for key in subscription.index_keys:
+            bucket = self._index.get(key)
+            if bucket is not None:
+                bucket.discard(subscription)
+                if not bucket:
+                    del self._index[key]
+
+    def targets(self, event: Mapping[str, Any], subscribers: Iterable[Any]) -> List[Any]:
+        """Writers among subscribers that should receive event."""
+        if not self._subscriptions:
+            return list(subscribers)
+        subscribers = set(subscribers)
+        targets = [writer for writer in subscribers if writer not in self._subscriptions]
+
+        event_type = str(event.get("event_type") or event.get("type") or "")
+        candidates: Set[Subscription] = set()
+        for key in (
+            ("any", None),
+            ("category", _category(event_type)),
+            ("source", event.get("source")),
+            ("window", event.get("window_id")),
+            ("window", event.get("mark_window_id")),
+        ):
+            bucket = self._index.get(key)
+            if bucket:
+                candidates |= bucket
+
+        now = self._clock()
+        for subscription in candidates:
+            if subscription.writer not in subscribers:
+                continue
+            if not subscription.filter.matches(event, self._resolve_window):
+                self._filtered_out += 1
+                continue
+            if subscription.admit(now):
+                targets.append(subscription.writer)
+        return targets
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "filtered_subscribers": len(self._subscriptions),
+            "index_keys": len(self._index),
+            "filtered_out": self._filtered_out,
+            "rate_limited": sum(sub.rate_limited for sub in self._subscriptions.values()),
+        }
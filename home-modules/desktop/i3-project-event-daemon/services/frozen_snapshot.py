@@ -0,0 +1,109 @@
+"""
+Immutable containers for shared snapshot caches.
+
+HerdrService used to hand every reader a ``copy.deepcopy`` of its cached
+merged snapshot and deep-copied twice more on every build. With several remote
+hosts that snapshot holds hundreds of session, pane, tab and worktree dicts,
+so each ``herdr.snapshot``, dashboard rebuild and ``session.list`` paid for a
+full copy. The cache is now frozen once when stored:
+
+- ``freeze`` converts dicts and lists into FrozenDict and FrozenList. They are
+  real dict/list subclasses, so ``isinstance`` checks, ``json``/``orjson``
+  serialization and ``dict(row)`` / ``list(rows)`` keep working, but every
+  in-place mutator raises TypeError. Already-frozen values are returned as
+  they are, so patched snapshots share every untouched row with the previous
+  one.
+- Readers get the frozen structure with a mutable top level (``thaw_top``),
+  an O(number of keys) copy whatever the snapshot size. Code that edits rows
+  copies just those rows (``dict(row)``), as most consumers already do.
+- Patchers never write in place; ``patch_rows`` path-copies only the rows
+  they change and the containers above them.
+
+``copy.copy`` and ``copy.deepcopy`` of a frozen value return plain mutable
+containers, so callers that still deep-copy a fragment get something they
+can edit.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+
+def _frozen(self: Any, *args: Any, **kwargs: Any) -> None:
+    raise TypeError(f"{type(self).__name__} is immutable; copy it before editing")
+
+
+class FrozenDict(dict):
+    """Read-only dict shared between snapshot readers."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _frozen
+    clear = pop = popitem = setdefault = update = _frozen
+    __ior__ = _frozen
+
+    def __copy__(self) -> Dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    """Read-only list shared between snapshot readers."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = _frozen
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+    __iadd__ = __imul__ = _frozen
+
+    def __copy__(self) -> List[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> List[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: Any) -> Any:
+    """Return value with every nested dict and list frozen (shared if already frozen)."""
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw_top(value: Mapping[str, Any]) -> Dict[str, Any]:
+    """Mutable top-level copy of a frozen snapshot; nested values stay shared."""
+    return dict(value)
+
+
+def patch_rows(
+    rows: Iterable[Any],
+    patch: Callable[[Mapping[str, Any]], Optional[Mapping[str, Any]]],
+) -> Tuple[FrozenList, bool]:
+    """Path-copy rows, merging patch(row) into each row it returns updates for.
+
+    Returns the new row list and whether any row matched. Rows patch() skips
+    (returns None for) are shared with the input unchanged.
+    """
+    patched: List[Any] = []
+    matched = False
+    for row in rows:
+        updates = patch(row) if isinstance(row, dict) else None
+        if updates is None:
+            patched.append(row)
+            continue
+        matched = True
+        patched.append(freeze({**row, **updates}))
+    return FrozenList(patched), matched
@@ -0,0 +1,379 @@
+"""
+Persistent, multiplexed connections to the local Herdr API socket.
+
+HerdrService used to open a fresh Unix connection for every socket call
+(write one request, read one line, close) and one more long-lived connection
+per pane for status-change subscriptions. Pane focus and close paid a connect
+and teardown each time, and the number of open sockets grew with the number
+of agent panes. HerdrClient replaces both with two connections:
+
+- ``rpc`` carries request/response calls. Requests are tagged with unique ids
+  and written as soon as they are issued; a single reader task resolves each
+  caller's future by id, so concurrent calls share the connection and
+  pipeline naturally. At most ``max_in_flight`` requests are outstanding at
+  once; later callers wait for a slot.
+- ``events`` carries ``events.subscribe`` requests. Their acknowledgements are
+  routed by id like any response, and id-less lines (event envelopes) go to
+  the ``on_event`` callback in arrival order. Additional subscriptions, such
+  as a new pane's status changes, are sent on the same stream instead of
+  opening a connection of their own.
+
+Further event streams (``stream_connection``) share the socket path and
+event handler; the pane status subscription uses one only when Herdr rejects
+extra subscriptions on the shared stream.
+
+A dropped connection fails every in-flight request with ConnectionError; the
+next call reconnects. Failed connects back off exponentially, and calls made
+during the backoff window fail immediately so callers can fall back to the
+Herdr CLI without waiting on a dead socket.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Herdr event lines (full session payloads) can exceed asyncio's default 64KiB
+# StreamReader limit; a limit overrun tears down the stream.
+HERDR_STREAM_READER_LIMIT = 2 ** 20
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_INITIAL_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+StreamOpener = Callable[[], Awaitable[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+
+
+class HerdrConnection:
+    """One persistent connection to the Herdr API socket, multiplexed by request id.
+
+    ``opener`` replaces the Unix socket with any line-delimited JSON stream
+    (the remote proxy channel runs the same protocol over an SSH pipe).
+    """
+
+    def __init__(
+        self,
+        socket_path: Optional[Callable[[], Path]],
+        *,
+        name: str,
+        opener: Optional[StreamOpener] = None,
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+        auto_connect: bool = True,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        self._socket_path = socket_path
+        self._opener = opener or self._open_unix_socket
+        self.name = name
+        self._on_event = on_event
+        self._on_close = on_close
+        self.auto_connect = auto_connect
+        self.max_in_flight = max_in_flight
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._connect_lock = asyncio.Lock()
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._closed: Optional[asyncio.Future] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._backoff = initial_backoff
+        self._retry_at = 0.0
+        self._malformed_warn_time = 0.0
+        self.stats: Dict[str, int] = {
+            "connects": 0,
+            "connect_failures": 0,
+            "disconnects": 0,
+            "requests": 0,
+            "timeouts": 0,
+            "events": 0,
+            "stale_responses": 0,
+        }
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    async def open(self) -> None:
+        """Open a fresh connection, replacing any current one (ignores backoff)."""
+        async with self._connect_lock:
+            await self._disconnect(ConnectionError(f"Herdr {self.name} connection reopened"))
+            await self._connect()
+
+    async def ensure_connected(self) -> None:
+        """Connect unless already connected; fail fast inside the backoff window.
+
+        Connections created with ``auto_connect=False`` are only (re)opened by
+        open(); requests on them fail while they are down.
+        """
+        if self.connected:
+            return
+        if not self.auto_connect:
+            raise ConnectionError(f"Herdr {self.name} connection is not open")
+        async with self._connect_lock:
+            if self.connected:
+                return
+            if time.monotonic() < self._retry_at:
+                raise ConnectionError(f"Herdr {self.name} connection backing off after a failed connect")
+            await self._connect()
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: float,
+        request_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Send one request and return its raw response object.
+
+        Raises OSError (usually ConnectionError) when the socket is
+        unreachable or drops before the response arrives, and TimeoutError
+        when no response arrives in time (a late response is discarded).
+        """
+        deadline = time.monotonic() + timeout
+        await asyncio.wait_for(self._slots.acquire(), timeout=timeout)
+        try:
+            await asyncio.wait_for(self.ensure_connected(), timeout=max(0.001, deadline - time.monotonic()))
+            request_id = request_id or f"i3pm-{self.name}-{next(self._ids)}"
+            future = asyncio.get_running_loop().create_future()
+            self._pending[request_id] = future
+            try:
+                writer = self._writer
+                if writer is None:
+                    raise ConnectionError(f"Herdr {self.name} connection closed")
+                writer.write(
+                    json.dumps(
+                        {"id": request_id, "method": method, "params": params or {}},
+                        separators=(",", ":"),
+                    ).encode("utf-8") + b"\n"
+                )
+                self.stats["requests"] += 1
+                await writer.drain()
+                return await asyncio.wait_for(future, timeout=max(0.001, deadline - time.monotonic()))
+            except TimeoutError:
+                self.stats["timeouts"] += 1
+                raise
+            finally:
+                self._pending.pop(request_id, None)
+        finally:
+            self._slots.release()
+
+    async def wait_closed(self) -> None:
+        """Wait until the current connection drops, then raise its ConnectionError."""
+        closed = self._closed
+        if closed is None:
+            raise ConnectionError(f"Herdr {self.name} connection is not open")
+        await asyncio.shield(closed)
+
+    async def close(self) -> None:
+        async with self._connect_lock:
+            await self._disconnect(ConnectionError(f"Herdr {self.name} connection closed"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "connected": self.connected,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+        }
+
+    async def _open_unix_socket(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        if self._socket_path is None:
+            raise ValueError(f"Herdr {self.name} connection has no socket path")
+        return await asyncio.open_unix_connection(
+            str(self._socket_path()),
+            limit=HERDR_STREAM_READER_LIMIT,
+        )
+
+    async def _connect(self) -> None:
+        try:
+            reader, writer = await self._opener()
+        except Exception:
+            self.stats["connect_failures"] += 1
+            self._retry_at = time.monotonic() + self._backoff
+            self._backoff = min(self._backoff * 2, self.max_backoff)
+            raise
+        self.stats["connects"] += 1
+        self._backoff = self.initial_backoff
+        self._retry_at = 0.0
+        self._writer = writer
+        self._closed = asyncio.get_running_loop().create_future()
+        self._reader_task = asyncio.create_task(
+            self._read_loop(reader, writer, self._closed),
+            name=f"i3pm-herdr-{self.name}-reader",
+        )
+
+    async def _read_loop(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        closed: asyncio.Future,
+    ) -> None:
+        error: BaseException = ConnectionError(f"Herdr {self.name} connection closed")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # A malformed or non-object line must not tear down the stream.
+                try:
+                    payload = json.loads(line.decode("utf-8"))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    payload = None
+                if not isinstance(payload, dict):
+                    self._warn_malformed_line()
+                    continue
+                if "id" in payload:
+                    future = self._pending.get(str(payload.get("id")))
+                    if future is None or future.done():
+                        self.stats["stale_responses"] += 1
+                    else:
+                        future.set_result(payload)
+                    continue
+                self.stats["events"] += 1
+                if self._on_event is not None:
+                    try:
+                        await self._on_event(payload)
+                    except Exception:
+                        logger.exception("Herdr %s event handler failed", self.name)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            error = ConnectionError(f"Herdr {self.name} connection failed: {exc}")
+        finally:
+            self._fail_pending(writer, error)
+            if not closed.done():
+                closed.set_exception(error)
+                # Nobody may be waiting on an RPC connection's close.
+                closed.exception()
+
+    def _fail_pending(self, writer: asyncio.StreamWriter, error: BaseException) -> None:
+        if self._writer is writer:
+            self._writer = None
+            self.stats["disconnects"] += 1
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            if self._on_close is not None:
+                self._on_close()
+        writer.close()
+
+    async def _disconnect(self, error: BaseException) -> None:
+        writer = self._writer
+        task = self._reader_task
+        self._reader_task = None
+        if writer is not None:
+            self._fail_pending(writer, error)
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        closed = self._closed
+        if closed is not None and not closed.done():
+            closed.set_exception(error)
+            closed.exception()
+        if writer is not None:
+            try:
+                await asyncio.wait_for(writer.wait_closed(), timeout=0.5)
+            except (TimeoutError, OSError):
+                pass
+
+    def _warn_malformed_line(self) -> None:
+        now = time.monotonic()
+        if now - self._malformed_warn_time < 5.0:
+            return
+        self._malformed_warn_time = now
+        logger.warning("Skipping malformed JSON line on the Herdr %s connection", self.name)
+
+
+class HerdrClient:
+    """The daemon's two persistent Herdr API connections: RPC calls and the event stream."""
+
+    def __init__(
+        self,
+        socket_path: Callable[[], Path],
+        *,
+        on_event: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        initial_backoff: float = DEFAULT_INITIAL_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        self._socket_path = socket_path
+        self._on_event = on_event
+        self.max_in_flight = max_in_flight
+        self.rpc = HerdrConnection(
+            socket_path,
+            name="rpc",
+            max_in_flight=max_in_flight,
+            initial_backoff=initial_backoff,
+            max_backoff=max_backoff,
+        )
+        self.events = HerdrConnection(
+            socket_path,
+            name="events",
+            on_event=on_event,
+            # Opened by the subscription loop, which sends the initial
+            # subscription; a lazy reconnect would start an empty stream.
+            auto_connect=False,
+            max_in_flight=max_in_flight,
+            initial_backoff=initial_backoff,
+            max_backoff=max_backoff,
+        )
+
+    def stream_connection(
+        self,
+        name: str,
+        *,
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> HerdrConnection:
+        """Another event stream to the same socket, feeding the same event handler.
+
+        Like ``events`` it is only opened explicitly; the caller owns it.
+        """
+        return HerdrConnection(
+            self._socket_path,
+            name=name,
+            on_event=self._on_event,
+            on_close=on_close,
+            auto_connect=False,
+            max_in_flight=self.max_in_flight,
+        )
+
+    async def call(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        """Call a Herdr API method over the shared RPC connection."""
+        return await self.rpc.request(method, params, timeout=timeout)
+
+    async def subscribe(self, request: Dict[str, Any], *, timeout: float) -> Dict[str, Any]:
+        """Send an ``events.subscribe`` request on the event stream and return its ack."""
+        return await self.events.request(
+            str(request.get("method") or "events.subscribe"),
+            request.get("params") if isinstance(request.get("params"), dict) else {},
+            timeout=timeout,
+            request_id=str(request.get("id") or "") or None,
+        )
+
+    async def close(self) -> None:
+        await self.rpc.close()
+        await self.events.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"rpc": self.rpc.get_stats(), "events": self.events.get_stats()}
@@ -0,0 +1,213 @@
+"""
+Long-lived JSON-RPC channel to a remote host's i3pm Herdr proxy.
+
+Remote snapshots and actions used to run ``ssh <host> i3pm herdr-proxy
+<args>`` as a fresh process per call, and the event stream ran one more
+``herdr-proxy events`` session. ControlMaster saves the TCP and key
+exchange, but every call still paid for ssh start-up, i3pm (Deno) start-up
+and the remote daemon connect.
+
+HerdrProxyChannel keeps one ``i3pm herdr-proxy serve --stdio`` process per
+host open over a single SSH session and speaks line-delimited JSON over its
+stdin/stdout. It reuses HerdrConnection, so requests are multiplexed by id
+with a per-request deadline, and id-less lines are pushed proxy event
+envelopes (``i3pm.herdr_proxy.event.v1``). In addition:
+
+- A heartbeat ``ping`` every ``heartbeat_interval`` seconds catches
+  half-open SSH sessions. A missed heartbeat closes the channel, which fails
+  pending requests and ends the event stream so its reconnect loop resubscribes.
+- Requests reopen the channel on demand. Failed spawns back off exponentially
+  (HerdrConnection).
+- A session that exits with an error before answering anything is either
+  an unreachable host or a remote i3pm without ``serve``. The channel then
+  reports itself unavailable for ``retry_after`` seconds, and callers use
+  the one-shot ssh commands instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from .herdr_client import HERDR_STREAM_READER_LIMIT, HerdrConnection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+DEFAULT_HEARTBEAT_TIMEOUT = 5.0
+DEFAULT_RETRY_AFTER = 300.0
+
+
+class HerdrProxyChannel:
+    """One persistent ``herdr-proxy serve --stdio`` session to a remote host."""
+
+    def __init__(
+        self,
+        command: Callable[[], List[str]],
+        *,
+        name: str,
+        on_event: Callable[[Dict[str, Any]], Awaitable[None]],
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+        heartbeat_timeout: float = DEFAULT_HEARTBEAT_TIMEOUT,
+        retry_after: float = DEFAULT_RETRY_AFTER,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            command: Returns the argv that starts the remote proxy (ssh ... serve --stdio)
+            name: Host label for logs, task names and stats
+            on_event: Called with each pushed proxy event envelope, in order
+            heartbeat_interval: Seconds between pings on an open channel
+            heartbeat_timeout: Seconds to wait for a ping reply
+            retry_after: Seconds to stay unavailable after a session that never answered
+            initial_backoff: First delay before respawning after a failed spawn
+            max_backoff: Respawn delay cap
+        """
+        self._command = command
+        self.name = name
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.retry_after = retry_after
+        self.connection = HerdrConnection(
+            None,
+            name=f"proxy {name}",
+            opener=self._spawn,
+            on_event=on_event,
+            on_close=self._session_ended,
+            initial_backoff=initial_backoff,
+            max_backoff=max_backoff,
+        )
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._answered = False
+        self._unavailable_until = 0.0
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._reap_tasks: Set[asyncio.Task] = set()
+        self.stats: Dict[str, int] = {
+            "sessions": 0,
+            "requests": 0,
+            "heartbeats": 0,
+            "heartbeat_failures": 0,
+            "unanswered_sessions": 0,
+        }
+
+    @property
+    def available(self) -> bool:
+        """False while recovering from a session that never answered."""
+        return time.monotonic() >= self._unavailable_until
+
+    async def request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        *,
+        timeout: float,
+    ) -> Dict[str, Any]:
+        """Send one request over the channel (spawning it if needed); return the raw response."""
+        self._ensure_heartbeat()
+        self.stats["requests"] += 1
+        response = await self.connection.request(method, params, timeout=timeout)
+        self._answered = True
+        return response
+
+    async def stream_events(self, *, timeout: float) -> None:
+        """Subscribe to pushed proxy events, then wait until the channel drops.
+
+        Events reach ``on_event``; the ConnectionError raised when the
+        channel closes hands control back to the caller's reconnect loop.
+        """
+        ack = await self.request("events.subscribe", {}, timeout=timeout)
+        if isinstance(ack.get("error"), dict) or not isinstance(ack.get("result"), dict):
+            raise RuntimeError(f"Herdr proxy event subscription failed for {self.name}: {ack}")
+        await self.connection.wait_closed()
+
+    async def close(self) -> None:
+        task = self._heartbeat_task
+        self._heartbeat_task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.connection.close()
+        if self._reap_tasks:
+            await asyncio.gather(*self._reap_tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "available": self.available,
+            "connection": self.connection.get_stats(),
+        }
+
+    async def _spawn(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        process = await asyncio.create_subprocess_exec(
+            *self._command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=HERDR_STREAM_READER_LIMIT,
+        )
+        if process.stdin is None or process.stdout is None:
+            raise RuntimeError("Herdr proxy channel is missing its pipes")
+        self._process = process
+        self._answered = False
+        self.stats["sessions"] += 1
+        return process.stdout, process.stdin
+
+    def _session_ended(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+        task = asyncio.create_task(
+            self._reap(process, answered=self._answered),
+            name=f"i3pm-herdr-proxy-reap-{self.name}",
+        )
+        self._reap_tasks.add(task)
+        task.add_done_callback(self._reap_tasks.discard)
+
+    async def _reap(self, process: asyncio.subprocess.Process, *, answered: bool) -> None:
+        if process.returncode is None:
+            try:
+                # stdin is already closed; a healthy proxy exits on EOF.
+                await asyncio.wait_for(process.wait(), timeout=1.0)
+            except TimeoutError:
+                process.terminate()
+                try:
+                    await asyncio.wait_for(process.wait(), timeout=1.0)
+                except TimeoutError:
+                    process.kill()
+                    await process.wait()
+        if not answered and process.returncode not in (0, None, -15):
+            self.stats["unanswered_sessions"] += 1
+            self._unavailable_until = time.monotonic() + self.retry_after
+            logger.info(
+                "Herdr proxy channel to %s exited with %s before answering; "
+                "using one-shot ssh commands for %.0fs",
+                self.name,
+                process.returncode,
+                self.retry_after,
+            )
+
+    def _ensure_heartbeat(self) -> None:
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat_loop(),
+                name=f"i3pm-herdr-proxy-heartbeat-{self.name}",
+            )
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            if not self.connection.connected:
+                continue
+            self.stats["heartbeats"] += 1
+            try:
+                await self.connection.request("ping", timeout=self.heartbeat_timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self.stats["heartbeat_failures"] += 1
+                logger.info("Herdr proxy channel to %s missed a heartbeat (%s); reconnecting", self.name, exc)
+                await self.connection.close()
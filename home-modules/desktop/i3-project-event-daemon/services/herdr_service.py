@@ -15,6 +15,11 @@ import time
 from pathlib import Path, PurePath
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
+from .herdr_client import HERDR_STREAM_READER_LIMIT, HerdrClient
+from .herdr_proxy_channel import HerdrProxyChannel
+from .herdr_status_subscription import PaneStatusSubscription
+from .frozen_snapshot import FrozenDict, FrozenList, freeze, patch_rows, thaw_top
+
 logger = logging.getLogger(__name__)
 
 HERDR_EVENT_SUBSCRIPTION_TYPES = (
@@ -45,9 +50,30 @@ HERDR_GIT_SPACE_FIELDS = (
 # connect budget so a dead host still fails fast.
 HERDR_PROXY_SNAPSHOT_TIMEOUT = 8.0
 HERDR_PROXY_ACTION_TIMEOUT = 3.5
-# Herdr event lines (full session payloads) can exceed asyncio's default 64KiB
-# StreamReader limit; a limit overrun tears down the stream.
-HERDR_STREAM_READER_LIMIT = 2 ** 20
+# The six queries behind one local snapshot: (snapshot key, Herdr API socket
+# method, equivalent CLI args used when the socket is unavailable).
+HERDR_LOCAL_SNAPSHOT_QUERIES = (
+    ("status", "status", ["status", "--json"]),
+    ("agents", "agent.list", ["agent", "list"]),
+    ("panes", "pane.list", ["pane", "list"]),
+    ("workspaces", "workspace.list", ["workspace", "list"]),
+    ("tabs", "tab.list", ["tab", "list"]),
+    ("worktrees", "worktree.list", ["worktree", "list"]),
+)
+# Budget for the whole pipelined local snapshot round trip (the CLI fallback
+# keeps run_json's per-command 2s timeout).
+HERDR_SOCKET_SNAPSHOT_TIMEOUT = 2.0
+# Socket error codes meaning the server does not implement a method at all
+# (older Herdr builds, JSON-RPC -32601). Any other error response is treated
+# as a failure of that one call.
+HERDR_SOCKET_UNKNOWN_METHOD_ERRORS = frozenset({"unknown_method", "method_not_found", "-32601"})
+# run_socket_json transport errors meaning no server is listening (socket file
+# gone or connect refused), as opposed to a slow or dropped call.
+HERDR_SOCKET_GONE_ERRORS = frozenset({
+    "herdr_socket_not_found",
+    "FileNotFoundError",
+    "ConnectionRefusedError",
+})
 
 RETIRED_SESSION_LIFECYCLE_FIELDS = {
     "session_phase",
@@ -110,13 +136,17 @@ class HerdrService:
         self.subscription_max_backoff = subscription_max_backoff
         self.notify_delay = notify_delay
         self.subscription_task: Optional[asyncio.Task] = None
-        self.status_subscription_tasks: Dict[str, asyncio.Task] = {}
         self.remote_subscription_tasks: Dict[str, asyncio.Task] = {}
+        # One long-lived `herdr-proxy serve --stdio` session per remote host,
+        # owned by that host's subscription task (services/herdr_proxy_channel.py).
+        self.proxy_channels: Dict[str, HerdrProxyChannel] = {}
         self.notify_task: Optional[asyncio.Task] = None
         self.local_herdr_generation: int = 0
         self.remote_herdr_generation: Dict[str, int] = {}
         self.remote_proxy_event_generation: Dict[str, int] = {}
-        self.snapshot_cache: Dict[str, Any] = {}
+        # Frozen (services/frozen_snapshot.py): shared by every reader and
+        # replaced, never edited, by the cache patchers below.
+        self.snapshot_cache: Dict[str, Any] = FrozenDict()
         self.snapshot_cache_time: float = 0.0
         self.snapshot_cache_built_at: float = 0.0
         self.snapshot_cache_is_failure: bool = False
@@ -127,6 +157,9 @@ class HerdrService:
         self.remote_snapshot_failure_cache_ttl: float = 2.0
         self.snapshot_provisional_cache_ttl: float = 1.0
         self.snapshot_build_lock = asyncio.Lock()
+        # Socket methods the running Herdr server answered with an error;
+        # local snapshots query those through the CLI instead.
+        self.socket_unsupported_methods: Set[str] = set()
         self.herdr_event_generation: int = 0
         self.remote_targets_cache: List[Dict[str, str]] = []
         self.remote_targets_cache_signature: Tuple[Any, ...] = ("", False, 0, 0)
@@ -138,6 +171,23 @@ class HerdrService:
         self._subscription_started: bool = False
         self._herdr_binary_path: str = ""
         self._malformed_line_warn_time: float = 0.0
+        # Persistent multiplexed connections to the local Herdr API socket
+        # (services/herdr_client.py): one for calls, one for the event stream.
+        self.client = HerdrClient(
+            lambda: self.socket_path(),
+            on_event=self.dispatch_stream_event,
+            initial_backoff=subscription_initial_backoff,
+            max_backoff=subscription_max_backoff,
+        )
+        # Agent-status subscription for every known pane, over the shared
+        # event stream (services/herdr_status_subscription.py).
+        self.status_subscription = PaneStatusSubscription(
+            self.client,
+            subscribe_payload=self.status_event_subscribe_payload,
+            status_event_types=(HERDR_STATUS_EVENT_TYPE, "pane_agent_status_changed"),
+            initial_backoff=subscription_initial_backoff,
+            max_backoff=subscription_max_backoff,
+        )
         self._normalize_project_path = normalize_project_path or self._default_normalize_project_path
         self._parse_remote_target = parse_remote_target or self._default_parse_remote_target
         self._normalize_connection_key = normalize_connection_key or self._default_normalize_connection_key
@@ -386,9 +436,32 @@ class HerdrService:
         now: float,
         has_remote_targets: bool,
     ) -> Optional[Dict[str, Any]]:
-        """Return a copy of a valid cached Herdr snapshot."""
-        if not self.snapshot_cache:
+        """Return a valid cached Herdr snapshot (mutable top level, frozen rows)."""
+        if not self.snapshot_cache_fresh(now=now, has_remote_targets=has_remote_targets):
+            return None
+        return thaw_top(self.snapshot_cache)
+
+    def snapshot_cache_token(self, *, now: float) -> Optional[Tuple[Any, ...]]:
+        """Identify the cached snapshot a read would return, or None if stale.
+
+        The token changes whenever the cache is rebuilt, patched in place or
+        invalidated, so equal tokens mean an identical snapshot() result.
+        """
+        if not self.snapshot_cache_fresh(
+            now=now,
+            has_remote_targets=bool(self.configured_remote_targets()),
+        ):
             return None
+        return (
+            self.snapshot_cache_built_at,
+            self.snapshot_cache_time,
+            self.herdr_event_generation,
+        )
+
+    def snapshot_cache_fresh(self, *, now: float, has_remote_targets: bool) -> bool:
+        """Return whether the cached Herdr snapshot is within its TTL."""
+        if not self.snapshot_cache:
+            return False
         # Expiry keys off the build time, never the last in-place patch time:
         # a sustained status-event stream must not defer refetching the
         # non-event fields (branch, git metadata, cwd) forever.
@@ -407,9 +480,7 @@ class HerdrService:
             ttl = min(normal_ttl, self.snapshot_provisional_cache_ttl)
         else:
             ttl = normal_ttl
-        if now - self.snapshot_cache_built_at > ttl:
-            return None
-        return copy.deepcopy(self.snapshot_cache)
+        return now - self.snapshot_cache_built_at <= ttl
 
     def store_snapshot(
         self,
@@ -418,20 +489,20 @@ class HerdrService:
         now: float,
         provisional: bool = False,
     ) -> Dict[str, Any]:
-        """Store and return a defensive copy of a Herdr snapshot.
+        """Freeze, store and return a Herdr snapshot.
 
         `provisional` marks a build that raced a mid-flight herdr event: the
         data is fresh but may already be one event behind, so it is cached only
         for the short TTL.
         """
-        self.snapshot_cache = copy.deepcopy(snapshot)
+        self.snapshot_cache = freeze(snapshot)
         self.snapshot_cache_time = float(now)
         self.snapshot_cache_built_at = float(now)
         # A snapshot whose local fetch explicitly failed only gets the short
         # failure TTL so recovery is immediate once herdr is reachable again.
         self.snapshot_cache_is_failure = snapshot.get("success") is False
         self.snapshot_cache_is_provisional = bool(provisional)
-        return copy.deepcopy(self.snapshot_cache)
+        return thaw_top(self.snapshot_cache)
 
     def touch_snapshot_cache(self, *, now: float) -> None:
         """Refresh the cache timestamp after in-place cache reconciliation."""
@@ -440,7 +511,7 @@ class HerdrService:
     def invalidate_snapshot_cache(self) -> None:
         """Clear cached Herdr snapshots so the next read fetches fresh state."""
         self.herdr_event_generation += 1
-        self.snapshot_cache = {}
+        self.snapshot_cache = FrozenDict()
         self.snapshot_cache_time = 0.0
         self.snapshot_cache_built_at = 0.0
         self.snapshot_cache_is_failure = False
@@ -490,35 +561,44 @@ class HerdrService:
 
         focused_session_key = ""
         updated = False
+        cache = thaw_top(self.snapshot_cache)
 
         # Every focus field is written here so a future refactor cannot miss
         # one: leaving `herdr_focused` out would leave the return-target hint
         # pointing at the pre-click pane until the next remote snapshot.
-        def apply_focus_fields(row: Dict[str, Any], *, focused: bool) -> None:
-            row["focused"] = focused
-            row["herdr_focused"] = focused
-            row["is_current_window"] = focused
-            row["window_active"] = focused
-            row["pane_active"] = focused
+        def focus_fields(row: Dict[str, Any]) -> Dict[str, Any]:
+            focused = str(row.get("pane_id") or "").strip() == pane_key
+            return {
+                "focused": focused,
+                "herdr_focused": focused,
+                "is_current_window": focused,
+                "window_active": focused,
+                "pane_active": focused,
+            }
 
         for collection_name in ("sessions", "panes", "agents"):
-            rows = self.snapshot_cache.get(collection_name)
+            rows = cache.get(collection_name)
             if not isinstance(rows, list):
                 continue
-            for row in rows:
-                if not isinstance(row, dict) or not matches_remote(row):
-                    continue
-                focused = str(row.get("pane_id") or "").strip() == pane_key
-                apply_focus_fields(row, focused=focused)
-                updated = True
-                if focused and collection_name == "sessions":
-                    focused_session_key = str(
-                        row.get("session_key") or row.get("herdr_session") or ""
-                    ).strip()
-
-        remote_snapshots = self.snapshot_cache.get("remote_snapshots")
+            patched, matched = patch_rows(
+                rows,
+                lambda row: focus_fields(row) if matches_remote(row) else None,
+            )
+            if not matched:
+                continue
+            cache[collection_name] = patched
+            updated = True
+            if collection_name == "sessions":
+                for row in patched:
+                    if isinstance(row, dict) and matches_remote(row) and row["focused"]:
+                        focused_session_key = str(
+                            row.get("session_key") or row.get("herdr_session") or ""
+                        ).strip()
+
+        remote_snapshots = cache.get("remote_snapshots")
         if isinstance(remote_snapshots, list):
-            for remote_snapshot in remote_snapshots:
+            patched_snapshots = list(remote_snapshots)
+            for index, remote_snapshot in enumerate(remote_snapshots):
                 if not isinstance(remote_snapshot, dict):
                     continue
                 snapshot_target = {
@@ -530,24 +610,32 @@ class HerdrService:
                 }
                 if not matches_remote(snapshot_target):
                     continue
+                patched_snapshot = dict(remote_snapshot)
                 for collection_name in ("sessions", "panes", "agents"):
                     rows = remote_snapshot.get(collection_name)
                     if not isinstance(rows, list):
                         continue
-                    for row in rows:
-                        if not isinstance(row, dict):
-                            continue
-                        focused = str(row.get("pane_id") or "").strip() == pane_key
-                        apply_focus_fields(row, focused=focused)
-                        if focused and collection_name == "sessions" and not focused_session_key:
+                    patched, matched = patch_rows(rows, focus_fields)
+                    if not matched:
+                        continue
+                    patched_snapshot[collection_name] = patched
+                    updated = True
+                    if collection_name == "sessions" and not focused_session_key:
+                        focused_row = next(
+                            (row for row in patched if isinstance(row, dict) and row["focused"]),
+                            None,
+                        )
+                        if focused_row is not None:
                             focused_session_key = str(
-                                row.get("session_key")
-                                or row.get("herdr_session")
-                                or self.session_key(row, host)
+                                focused_row.get("session_key")
+                                or focused_row.get("herdr_session")
+                                or self.session_key(focused_row, host)
                             ).strip()
-                        updated = True
+                patched_snapshots[index] = freeze(patched_snapshot)
+            cache["remote_snapshots"] = FrozenList(patched_snapshots)
 
         if updated:
+            self.snapshot_cache = freeze(cache)
             self.touch_snapshot_cache(now=now)
 
         return {
@@ -576,33 +664,43 @@ class HerdrService:
         if "state_labels" in data:
             updates["state_labels"] = self.normalize_state_labels(data.get("state_labels"))
 
-        cache_updated = False
+        def patch(row: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            return updates if str(row.get("pane_id") or "").strip() == pane_id else None
 
-        def update_rows(rows: Any) -> bool:
-            updated = False
-            if not isinstance(rows, list):
-                return False
-            for row in rows:
-                if not isinstance(row, dict):
-                    continue
-                if str(row.get("pane_id") or "").strip() != pane_id:
+        def patch_collections(container: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            """Path-copy container with the pane's rows updated; None if none matched."""
+            patched_container: Optional[Dict[str, Any]] = None
+            for collection_name in ("sessions", "agents", "panes"):
+                rows = container.get(collection_name)
+                if not isinstance(rows, list):
                     continue
-                row.update(updates)
-                updated = True
-            return updated
+                patched, matched = patch_rows(rows, patch)
+                if matched:
+                    patched_container = patched_container or dict(container)
+                    patched_container[collection_name] = patched
+            return patched_container
 
-        for collection_name in ("sessions", "agents", "panes"):
-            cache_updated = update_rows(self.snapshot_cache.get(collection_name)) or cache_updated
+        cache = patch_collections(self.snapshot_cache)
+        cache_updated = cache is not None
+        cache = cache or thaw_top(self.snapshot_cache)
 
-        remote_snapshots = self.snapshot_cache.get("remote_snapshots")
+        remote_snapshots = cache.get("remote_snapshots")
         if isinstance(remote_snapshots, list):
-            for remote_snapshot in remote_snapshots:
+            patched_snapshots = list(remote_snapshots)
+            remote_updated = False
+            for index, remote_snapshot in enumerate(remote_snapshots):
                 if not isinstance(remote_snapshot, dict):
                     continue
-                for collection_name in ("sessions", "agents", "panes"):
-                    cache_updated = update_rows(remote_snapshot.get(collection_name)) or cache_updated
+                patched_snapshot = patch_collections(remote_snapshot)
+                if patched_snapshot is not None:
+                    patched_snapshots[index] = freeze(patched_snapshot)
+                    remote_updated = True
+            if remote_updated:
+                cache["remote_snapshots"] = FrozenList(patched_snapshots)
+                cache_updated = True
 
         if cache_updated:
+            self.snapshot_cache = freeze(cache)
             self.touch_snapshot_cache(now=time.time())
         return {"applied": True, "cache_updated": cache_updated}
 
@@ -778,13 +876,14 @@ class HerdrService:
 
         cache_updated = False
         if self.snapshot_cache:
+            cache = thaw_top(self.snapshot_cache)
             matches_remote = self.remote_target_matcher(
                 target,
                 normalize_connection_key=normalize_connection_key,
             )
             if has_session_payload:
                 existing_sessions = [
-                    item for item in self.snapshot_cache.get("sessions", []) or []
+                    item for item in cache.get("sessions", []) or []
                     if not (isinstance(item, dict) and matches_remote(item))
                 ]
                 existing_sessions.extend(normalized_sessions)
@@ -796,19 +895,20 @@ class HerdrService:
                     str(item.get("agent") or ""),
                     str(item.get("pane_id") or ""),
                 ))
-                self.snapshot_cache["sessions"] = existing_sessions
+                cache["sessions"] = existing_sessions
                 cache_updated = True
 
-            remote_snapshots = self.snapshot_cache.setdefault("remote_snapshots", [])
-            if isinstance(remote_snapshots, list):
-                remote_snapshot = next(
+            existing_snapshots = cache.get("remote_snapshots", [])
+            if isinstance(existing_snapshots, list):
+                remote_snapshots = list(existing_snapshots)
+                index = next(
                     (
-                        item for item in remote_snapshots
+                        position for position, item in enumerate(remote_snapshots)
                         if isinstance(item, dict) and matches_remote(item)
                     ),
                     None,
                 )
-                if remote_snapshot is None:
+                if index is None:
                     remote_snapshot = {
                         "success": True,
                         "remote": True,
@@ -823,6 +923,9 @@ class HerdrService:
                         "errors": [],
                     }
                     remote_snapshots.append(remote_snapshot)
+                    index = len(remote_snapshots) - 1
+                else:
+                    remote_snapshot = dict(remote_snapshots[index])
                 remote_snapshot["success"] = True
                 remote_snapshot["remote"] = True
                 remote_snapshot["host"] = host_key
@@ -835,9 +938,12 @@ class HerdrService:
                     remote_snapshot["herdr"] = dict(herdr_payload)
                     if isinstance(herdr_payload.get("status"), dict):
                         remote_snapshot["status"] = herdr_payload.get("status")
+                remote_snapshots[index] = remote_snapshot
+                cache["remote_snapshots"] = remote_snapshots
                 cache_updated = True
 
-            self.snapshot_cache["remote_herdr_generation"] = self.remote_generations_snapshot()
+            cache["remote_herdr_generation"] = self.remote_generations_snapshot()
+            self.snapshot_cache = freeze(cache)
             self.touch_snapshot_cache(now=now)
 
         return {
@@ -1821,14 +1927,13 @@ class HerdrService:
         project_for_cwd: Callable[[str], Dict[str, str]],
     ) -> Dict[str, Any]:
         """Fetch and normalize the local Herdr host snapshot."""
-        status_payload, agent_payload, pane_payload, workspace_payload, tab_payload, worktree_payload = await asyncio.gather(
-            self.run_json(["status", "--json"]),
-            self.run_json(["agent", "list"]),
-            self.run_json(["pane", "list"]),
-            self.run_json(["workspace", "list"]),
-            self.run_json(["tab", "list"]),
-            self.run_json(["worktree", "list"]),
-        )
+        local_payloads = await self.local_snapshot_payloads()
+        status_payload = local_payloads["status"]
+        agent_payload = local_payloads["agents"]
+        pane_payload = local_payloads["panes"]
+        workspace_payload = local_payloads["workspaces"]
+        tab_payload = local_payloads["tabs"]
+        worktree_payload = local_payloads["worktrees"]
         host_key = self.normalize_host_key(local_host)
         local_connection_key = normalize_connection_key(f"local@{host_key}")
         generations = self.generations_snapshot()
@@ -1883,7 +1988,7 @@ class HerdrService:
             ),
             "errors": [
                 {
-                    "command": payload.get("command"),
+                    "command": payload.get("command") or payload.get("method"),
                     "error": payload.get("error") or payload.get("stderr") or payload.get("stdout"),
                     "returncode": payload.get("returncode"),
                 }
@@ -2990,14 +3095,12 @@ class HerdrService:
         params: Optional[Dict[str, Any]] = None,
         timeout: float = 0.5,
     ) -> Dict[str, Any]:
-        """Call the local Herdr API socket without spawning the Herdr CLI."""
+        """Call the local Herdr API socket without spawning the Herdr CLI.
+
+        Calls share the persistent RPC connection (self.client), so they
+        cost no connect or teardown once it is open.
+        """
         socket_path = self.socket_path()
-        request_id = f"i3pm-{method}-{time.monotonic_ns()}"
-        request = {
-            "id": request_id,
-            "method": method,
-            "params": params or {},
-        }
         if not socket_path.exists():
             return {
                 "success": False,
@@ -3007,14 +3110,8 @@ class HerdrService:
                 "method": method,
             }
 
-        writer: Optional[asyncio.StreamWriter] = None
         try:
-            reader, writer = await asyncio.wait_for(
-                asyncio.open_unix_connection(str(socket_path)),
-                timeout=timeout,
-            )
-            await self.write_json_line(writer, request)
-            response = await self.read_json_line(reader, timeout=timeout)
+            response = await self.client.call(method, params, timeout=timeout)
         except Exception as exc:
             return {
                 "success": False,
@@ -3024,11 +3121,12 @@ class HerdrService:
                 "socket_path": str(socket_path),
                 "method": method,
             }
-        finally:
-            if writer is not None:
-                writer.close()
-                await self._close_writer(writer)
 
+        return self._socket_response_payload(method, response)
+
+    @staticmethod
+    def _socket_response_payload(method: str, response: Any) -> Dict[str, Any]:
+        """Shape one Herdr API socket response like a run_json payload."""
         error = response.get("error") if isinstance(response, dict) else None
         if isinstance(error, dict):
             return {
@@ -3047,13 +3145,75 @@ class HerdrService:
             "response": response,
         }
 
+    async def run_socket_pipeline(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        *,
+        timeout: float = HERDR_SOCKET_SNAPSHOT_TIMEOUT,
+    ) -> List[Dict[str, Any]]:
+        """Send several Herdr API calls over the shared socket connection, pipelined.
+
+        Every request is written before any response is awaited, so the batch
+        costs one round trip. A call that fails in transport gets a
+        transport-error payload, which callers treat like a missing socket
+        for that call.
+        """
+        results = await asyncio.gather(*(
+            self.run_socket_json(method=method, params=params, timeout=timeout)
+            for method, params in calls
+        ))
+        for payload in results:
+            payload.pop("response", None)
+        return list(results)
+
+    async def local_snapshot_payloads(self) -> Dict[str, Dict[str, Any]]:
+        """Collect the six local snapshot queries, by snapshot key.
+
+        The queries go to the Herdr API socket in one pipelined round trip.
+        A query the socket could not answer (socket missing, connection
+        failure, or an error for that method) falls back to the equivalent
+        CLI command; CLI fallbacks run concurrently. Methods the server does
+        not implement (an older server) are remembered and sent straight to
+        the CLI until the socket is next missing or refuses connections;
+        other errors fall back for that call only.
+        """
+        queries = [
+            (key, method, args)
+            for key, method, args in HERDR_LOCAL_SNAPSHOT_QUERIES
+            if method not in self.socket_unsupported_methods
+        ]
+        socket_payloads = (
+            await self.run_socket_pipeline([(method, {}) for _key, method, _args in queries])
+            if queries
+            else []
+        )
+        payloads: Dict[str, Dict[str, Any]] = {}
+        for (key, method, _args), payload in zip(queries, socket_payloads):
+            if bool(payload.get("success", False)):
+                payloads[key] = payload
+            elif payload.get("socket") and payload.get("error") in HERDR_SOCKET_UNKNOWN_METHOD_ERRORS:
+                self.socket_unsupported_methods.add(method)
+            elif payload.get("transport_error") and payload.get("error") in HERDR_SOCKET_GONE_ERRORS:
+                # The server is down or restarting; re-probe every method
+                # against whichever server comes back. A timeout says nothing
+                # about which server is running, so it keeps the list.
+                self.socket_unsupported_methods.clear()
+        fallbacks = [(key, args) for key, _method, args in HERDR_LOCAL_SNAPSHOT_QUERIES if key not in payloads]
+        if fallbacks:
+            results = await asyncio.gather(*(self.run_json(args) for _key, args in fallbacks))
+            payloads.update((key, payload) for (key, _args), payload in zip(fallbacks, results))
+        return payloads
+
     async def run_proxy_json(
         self,
         target: Dict[str, str],
         args: List[str],
         timeout: float = HERDR_PROXY_ACTION_TIMEOUT,
     ) -> Dict[str, Any]:
-        """Run the remote host's i3pm Herdr proxy over one bounded SSH command."""
+        """Run the remote host's i3pm Herdr proxy over one bounded SSH command.
+
+        Uses the host's persistent proxy channel instead while one is open.
+        """
         ssh_target = str(target.get("ssh_target") or "").strip()
         fallback_command = ["ssh", ssh_target, "i3pm", "herdr-proxy", *args]
         if not ssh_target:
@@ -3069,6 +3229,15 @@ class HerdrService:
                 "command": fallback_command,
             }
 
+        channel_payload = await self._run_proxy_channel_json(
+            target,
+            args,
+            timeout=timeout,
+            fallback_command=fallback_command,
+        )
+        if channel_payload is not None:
+            return channel_payload
+
         command = self.ssh_command_prefix(ssh_target) + ["i3pm", "herdr-proxy", *args]
 
         def run() -> subprocess.CompletedProcess[str]:
@@ -3098,6 +3267,68 @@ class HerdrService:
         payload.setdefault("connection_key", str(target.get("connection_key") or "").strip())
         return payload
 
+    @staticmethod
+    def proxy_channel_request(args: List[str]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Map one-shot ``herdr-proxy`` CLI args to a proxy channel request."""
+        if not args:
+            return None
+        if args[0] == "snapshot":
+            return "snapshot", {"refresh": "--refresh" in args}
+        if args[0] == "focus" and len(args) > 1:
+            return "focus", {"pane_id": args[1]}
+        return None
+
+    def proxy_channel_command(self, ssh_target: str) -> List[str]:
+        """Return the command that opens a remote host's persistent proxy channel."""
+        return self.ssh_command_prefix(ssh_target) + ["i3pm", "herdr-proxy", "serve", "--stdio"]
+
+    async def _run_proxy_channel_json(
+        self,
+        target: Dict[str, str],
+        args: List[str],
+        *,
+        timeout: float,
+        fallback_command: List[str],
+    ) -> Optional[Dict[str, Any]]:
+        """Run a proxy call over the host's open channel, or None to use one-shot ssh.
+
+        Transport failures return None so the caller retries with a one-shot
+        command; a deadline miss is reported as the timeout it is.
+        """
+        channel = self.proxy_channels.get(self.remote_subscription_key(target))
+        request = self.proxy_channel_request(args)
+        if channel is None or request is None or not channel.available:
+            return None
+        method, params = request
+        try:
+            response = await channel.request(method, params, timeout=timeout)
+        except TimeoutError:
+            return {
+                "success": False,
+                "error": "timeout",
+                "command": fallback_command,
+            }
+        except Exception as exc:
+            logger.debug("Herdr proxy channel to %s unavailable: %s", channel.name, exc)
+            return None
+
+        error = response.get("error")
+        if isinstance(error, dict):
+            payload: Dict[str, Any] = {
+                "success": False,
+                "error": str(error.get("code") or "herdr_proxy_error"),
+                "message": str(error.get("message") or ""),
+            }
+        else:
+            result = response.get("result")
+            payload = dict(result) if isinstance(result, dict) else {"result": result}
+            payload.setdefault("success", True)
+        payload.setdefault("command", fallback_command)
+        payload.setdefault("herdr_host", str(target.get("host") or "").strip())
+        payload.setdefault("ssh_target", str(target.get("ssh_target") or "").strip())
+        payload.setdefault("connection_key", str(target.get("connection_key") or "").strip())
+        return payload
+
     def socket_path(self) -> Path:
         """Return the local Herdr API socket path."""
         override = str(os.environ.get(self._socket_env_var) or "").strip()
@@ -3166,16 +3397,16 @@ class HerdrService:
             },
         }
 
-    def status_event_subscribe_payload(self, pane_id: str) -> Dict[str, Any]:
-        """Return a Herdr event stream payload for one pane's status changes."""
+    def status_event_subscribe_payload(self, pane_ids: List[str], request_id: str) -> Dict[str, Any]:
+        """Return a Herdr event stream payload for several panes' status changes."""
         return {
-            "id": f"i3pm-herdr-status-{pane_id}",
+            "id": request_id,
             "method": "events.subscribe",
             "params": {
-                "subscriptions": [{
-                    "type": HERDR_STATUS_EVENT_TYPE,
-                    "pane_id": pane_id,
-                }],
+                "subscriptions": [
+                    {"type": HERDR_STATUS_EVENT_TYPE, "pane_id": pane_id}
+                    for pane_id in pane_ids
+                ],
             },
         }
 
@@ -3220,17 +3451,23 @@ class HerdrService:
             return payload
 
     async def connect_subscription_once(self) -> None:
-        """Connect once to the local Herdr event stream and process events until close."""
+        """Open the shared local Herdr event stream and process events until it closes.
+
+        Events are dispatched by the connection's reader; status
+        subscriptions for panes that appear later join this same stream.
+        """
         socket_path = self.socket_path()
-        reader, writer = await asyncio.open_unix_connection(
-            str(socket_path),
-            limit=HERDR_STREAM_READER_LIMIT,
-        )
+        events = self.client.events
+        await events.open()
         try:
             pane_ids = await self.subscription_pane_ids()
+            pane_ids += [
+                pane_id
+                for pane_id in self.status_subscription.initial_pane_ids()
+                if pane_id not in pane_ids
+            ]
             request = self.event_subscribe_payload(pane_ids=pane_ids)
-            await self.write_json_line(writer, request)
-            ack = await self.read_json_line(reader, timeout=3.0)
+            ack = await self.client.subscribe(request, timeout=3.0)
             result = ack.get("result") if isinstance(ack, dict) else {}
             if (
                 ack.get("id") != request["id"]
@@ -3238,14 +3475,12 @@ class HerdrService:
                 or result.get("type") != "subscription_started"
             ):
                 raise RuntimeError(f"Herdr event subscription failed: {ack}")
+            self.status_subscription.stream_connected(pane_ids)
             logger.info("Subscribed to local Herdr events at %s", socket_path)
-
-            while True:
-                event = await self.read_json_line(reader)
-                await self.handle_subscription_event(event)
+            await events.wait_closed()
         finally:
-            writer.close()
-            await self._close_writer(writer)
+            self.status_subscription.stream_lost()
+            await events.close()
 
     async def _run_reconnect_loop(
         self,
@@ -3294,72 +3529,20 @@ class HerdrService:
             describe="Local Herdr event subscription",
         )
 
-    async def connect_status_subscription_once(self, pane_id: str) -> None:
-        """Connect once to one local Herdr pane status stream and process until close."""
-        socket_path = self.socket_path()
-        reader, writer = await asyncio.open_unix_connection(
-            str(socket_path),
-            limit=HERDR_STREAM_READER_LIMIT,
-        )
-        try:
-            request = self.status_event_subscribe_payload(pane_id)
-            await self.write_json_line(writer, request)
-            ack = await self.read_json_line(reader, timeout=3.0)
-            result = ack.get("result") if isinstance(ack, dict) else {}
-            if (
-                ack.get("id") != request["id"]
-                or not isinstance(result, dict)
-                or result.get("type") != "subscription_started"
-            ):
-                raise RuntimeError(f"Herdr pane status subscription failed: {ack}")
-            logger.debug("Subscribed to Herdr status events for pane %s", pane_id)
-
-            while True:
-                event = await self.read_json_line(reader)
-                await self.handle_subscription_event(event)
-        finally:
-            writer.close()
-            await self._close_writer(writer)
-
-    async def run_status_subscription(self, pane_id: str) -> None:
-        """Maintain one pane-specific status subscription with bounded reconnect backoff."""
-        await self._run_reconnect_loop(
-            lambda: self.connect_status_subscription_once(pane_id),
-            describe=f"Herdr status subscription for pane {pane_id}",
-        )
-
     def ensure_status_subscription(self, pane_id: str) -> None:
-        """Ensure a pane-specific status event subscription is running."""
-        normalized_pane_id = str(pane_id or "").strip()
-        if not normalized_pane_id:
-            return
-        existing = self.status_subscription_tasks.get(normalized_pane_id)
-        if existing is not None and not existing.done():
-            return
-        self.status_subscription_tasks[normalized_pane_id] = asyncio.create_task(
-            self.run_status_subscription(normalized_pane_id),
-            name=f"i3pm-herdr-status-{normalized_pane_id}",
-        )
+        """Add a pane to the aggregated agent-status subscription."""
+        self.status_subscription.add(str(pane_id or "").strip())
 
     def cancel_status_subscription(self, pane_id: str) -> None:
-        """Cancel a pane-specific status event subscription."""
-        normalized_pane_id = str(pane_id or "").strip()
-        if not normalized_pane_id:
-            return
-        task = self.status_subscription_tasks.pop(normalized_pane_id, None)
-        if task is not None and not task.done():
-            task.cancel()
+        """Remove a pane from the aggregated agent-status subscription."""
+        self.status_subscription.discard(str(pane_id or "").strip())
 
     def reconcile_status_subscriptions(self, pane_ids: List[str]) -> None:
-        """Cancel status tasks for panes no longer present in the local snapshot.
+        """Drop status subscriptions for panes no longer in the local snapshot.
 
-        A missed pane.closed event would otherwise leak an immortal retry task.
+        A missed pane.closed event would otherwise keep a gone pane subscribed.
         """
-        active = set(pane_ids)
-        for pane_id in list(self.status_subscription_tasks.keys()):
-            if pane_id in active:
-                continue
-            self.cancel_status_subscription(pane_id)
+        self.status_subscription.reconcile(pane_ids)
 
     def start_subscription(self) -> None:
         """Start local and configured remote Herdr event subscription tasks."""
@@ -3371,6 +3554,7 @@ class HerdrService:
                 self.run_subscription(),
                 name="i3pm-herdr-event-subscription",
             )
+        self.status_subscription.start()
         self.sync_remote_proxy_subscriptions(self.load_remote_targets())
 
     def sync_remote_proxy_subscriptions(self, targets: List[Dict[str, str]]) -> None:
@@ -3413,13 +3597,7 @@ class HerdrService:
             task.cancel()
             await asyncio.gather(task, return_exceptions=True)
 
-        status_tasks = list(self.status_subscription_tasks.values())
-        self.status_subscription_tasks = {}
-        for status_task in status_tasks:
-            if not status_task.done():
-                status_task.cancel()
-        if status_tasks:
-            await asyncio.gather(*status_tasks, return_exceptions=True)
+        await self.status_subscription.stop()
 
         remote_tasks = list(self.remote_subscription_tasks.values())
         self.remote_subscription_tasks = {}
@@ -3428,12 +3606,21 @@ class HerdrService:
                 remote_task.cancel()
         if remote_tasks:
             await asyncio.gather(*remote_tasks, return_exceptions=True)
+        await self.client.close()
 
     async def connect_remote_proxy_subscription_once(self, target: Dict[str, str]) -> None:
-        """Connect once to a remote i3pm Herdr proxy event stream over SSH."""
+        """Connect once to a remote i3pm Herdr proxy event stream over SSH.
+
+        Uses the host's persistent proxy channel when it is available, and a
+        dedicated ``herdr-proxy events`` session otherwise.
+        """
         ssh_target = str(target.get("ssh_target") or "").strip()
         if not ssh_target:
             raise ValueError("ssh_target is required for remote Herdr proxy events")
+        channel = self.proxy_channels.get(self.remote_subscription_key(target))
+        if channel is not None and channel.available:
+            await channel.stream_events(timeout=HERDR_PROXY_SNAPSHOT_TIMEOUT)
+            return
         command = self.ssh_command_prefix(ssh_target) + ["i3pm", "herdr-proxy", "events", "--jsonl"]
         process = await asyncio.create_subprocess_exec(
             *command,
@@ -3471,12 +3658,31 @@ class HerdrService:
                     await process.wait()
 
     async def run_remote_proxy_subscription(self, target: Dict[str, str]) -> None:
-        """Maintain one remote Herdr proxy event stream with bounded reconnect backoff."""
+        """Maintain one remote Herdr proxy event stream with bounded reconnect backoff.
+
+        The task also owns the host's proxy channel, which remote snapshots
+        and actions share while it runs.
+        """
         host = self.normalize_host_key(target.get("host") or target.get("ssh_target"))
-        await self._run_reconnect_loop(
-            lambda: self.connect_remote_proxy_subscription_once(target),
-            describe=f"Remote Herdr proxy subscription for {host}",
+        key = self.remote_subscription_key(target)
+        ssh_target = str(target.get("ssh_target") or "").strip()
+        channel = HerdrProxyChannel(
+            lambda: self.proxy_channel_command(ssh_target),
+            name=host or key,
+            on_event=lambda event: self.handle_remote_proxy_event(target, event),
+            initial_backoff=self.subscription_initial_backoff,
+            max_backoff=self.subscription_max_backoff,
         )
+        self.proxy_channels[key] = channel
+        try:
+            await self._run_reconnect_loop(
+                lambda: self.connect_remote_proxy_subscription_once(target),
+                describe=f"Remote Herdr proxy subscription for {host}",
+            )
+        finally:
+            if self.proxy_channels.get(key) is channel:
+                self.proxy_channels.pop(key, None)
+            await channel.close()
 
     async def handle_remote_proxy_event(self, target: Dict[str, str], event: Dict[str, Any]) -> None:
         """Apply or recover from a remote Herdr proxy event."""
@@ -3522,6 +3728,11 @@ class HerdrService:
             return str(data.get("pane_id") or "").strip()
         return ""
 
+    async def dispatch_stream_event(self, event: Dict[str, Any]) -> None:
+        """Handle an event from a local Herdr stream, routed by pane id."""
+        if self.status_subscription.accepts(event):
+            await self.handle_subscription_event(event)
+
     async def handle_subscription_event(self, event: Dict[str, Any]) -> None:
         """Invalidate Herdr-derived dashboard state after a local Herdr event."""
         if not isinstance(event, dict):
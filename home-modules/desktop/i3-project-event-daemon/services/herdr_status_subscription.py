@@ -0,0 +1,237 @@
+"""
+One agent-status subscription for a changing set of Herdr panes.
+
+Herdr only reports ``pane.agent_status_changed`` for panes named in an
+``events.subscribe`` request. The daemon used to keep one asyncio task, Unix
+socket, reconnect loop and backoff timer per pane, and pruned them on every
+snapshot. With dozens of agent panes that meant dozens of sockets and timers.
+PaneStatusSubscription replaces them with a membership set and one worker
+task:
+
+- ``add``/``discard``/``reconcile`` update membership incrementally. Panes
+  added in the same burst (``batch_delay``) are subscribed together with a
+  single request on the daemon's shared event stream (HerdrClient.events),
+  next to the topology subscription.
+- When that stream reconnects (for example after a Herdr restart), its
+  initial request includes every member (``initial_pane_ids``), so
+  membership survives without per-pane resubscribes.
+- If Herdr rejects an extra subscription on one connection, the worker
+  switches to one dedicated status stream covering the members the shared
+  stream lacks. It reopens that stream, with the full set, only when
+  membership grows or the stream drops.
+- ``accepts`` routes stream events by pane id. Herdr has no unsubscribe
+  call, so status events for panes that have since closed are dropped here
+  rather than triggering snapshot invalidations.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from .herdr_client import HerdrClient
+
+logger = logging.getLogger(__name__)
+
+
+def subscription_started(ack: Any) -> bool:
+    result = ack.get("result") if isinstance(ack, dict) else None
+    return isinstance(result, dict) and result.get("type") == "subscription_started"
+
+
+class PaneStatusSubscription:
+    """Status-change subscription for a set of panes over the shared event stream."""
+
+    def __init__(
+        self,
+        client: HerdrClient,
+        *,
+        subscribe_payload: Callable[[List[str], str], Dict[str, Any]],
+        status_event_types: Iterable[str],
+        subscribe_timeout: float = 3.0,
+        batch_delay: float = 0.01,
+        initial_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ) -> None:
+        """
+        Args:
+            client: Daemon's Herdr connections; events arrive via client.events
+            subscribe_payload: Builds an events.subscribe request for pane ids and a request id
+            status_event_types: Event names routed by pane id (see accepts())
+            subscribe_timeout: Seconds to wait for a subscription ack
+            batch_delay: Seconds to gather membership changes into one request
+            initial_backoff: First retry delay after a failed subscribe
+            max_backoff: Retry delay cap
+        """
+        self.client = client
+        self._subscribe_payload = subscribe_payload
+        self.status_event_types = frozenset(status_event_types)
+        self.subscribe_timeout = subscribe_timeout
+        self.batch_delay = batch_delay
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.members: Set[str] = set()
+        # Members covered by the shared stream and the dedicated fallback.
+        self._shared_panes: Set[str] = set()
+        self._dedicated_panes: Set[str] = set()
+        self.multiplexing = True
+        self.dedicated = client.stream_connection("status", on_close=self._dedicated_lost)
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._ids = itertools.count(1)
+        self._backoff = initial_backoff
+        self.stats: Dict[str, int] = {
+            "subscribe_requests": 0,
+            "panes_subscribed": 0,
+            "dedicated_opens": 0,
+            "events_dropped": 0,
+        }
+
+    def __contains__(self, pane_id: object) -> bool:
+        return pane_id in self.members
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def add(self, pane_id: str) -> None:
+        if not pane_id or pane_id in self.members:
+            return
+        self.members.add(pane_id)
+        self._wake.set()
+
+    def discard(self, pane_id: str) -> None:
+        # Herdr may keep sending for the pane until the stream reconnects;
+        # accepts() drops those events. A pane that comes back is
+        # subscribed again.
+        self.members.discard(pane_id)
+        self._shared_panes.discard(pane_id)
+        self._dedicated_panes.discard(pane_id)
+
+    def reconcile(self, pane_ids: Iterable[str]) -> None:
+        """Drop members missing from a fresh snapshot (a missed pane.closed)."""
+        for pane_id in self.members.difference(pane_ids):
+            self.discard(pane_id)
+
+    def initial_pane_ids(self) -> List[str]:
+        """Members to include in the shared stream's initial subscribe request."""
+        return sorted(self.members)
+
+    def stream_connected(self, pane_ids: Iterable[str]) -> None:
+        """Record the panes the shared stream's initial request subscribed."""
+        pane_ids = set(pane_ids)
+        self.members.update(pane_ids)
+        self._shared_panes = pane_ids
+        # The dedicated stream may now be redundant, or members added
+        # meanwhile still need a request.
+        self._wake.set()
+
+    def stream_lost(self) -> None:
+        self._shared_panes = set()
+
+    def accepts(self, event: Dict[str, Any]) -> bool:
+        """Whether a stream event should be handled (status events only for members)."""
+        data = event.get("data") if isinstance(event, dict) else None
+        event_name = str(event.get("event") or "").strip()
+        if not event_name and isinstance(data, dict):
+            event_name = str(data.get("type") or "").strip()
+        if event_name not in self.status_event_types:
+            return True
+        pane_id = str(data.get("pane_id") or "").strip() if isinstance(data, dict) else ""
+        if not pane_id or pane_id in self.members:
+            return True
+        self.stats["events_dropped"] += 1
+        return False
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="i3pm-herdr-status-subscription")
+        self._wake.set()
+
+    async def stop(self) -> None:
+        task = self._task
+        self._task = None
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        await self.dedicated.close()
+        self.members = set()
+        self._shared_panes = set()
+        self._dedicated_panes = set()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "members": len(self.members),
+            "multiplexing": self.multiplexing,
+            "dedicated_connected": self.dedicated.connected,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            if self.batch_delay > 0:
+                await asyncio.sleep(self.batch_delay)
+            try:
+                if self.multiplexing:
+                    await self._subscribe_on_shared_stream()
+                if not self.multiplexing:
+                    await self._sync_dedicated_stream()
+                self._backoff = self.initial_backoff
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.debug("Herdr status subscription for %d panes failed: %s", len(self.members), exc)
+                await asyncio.sleep(self._backoff)
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+                self._wake.set()
+
+    async def _subscribe_on_shared_stream(self) -> None:
+        pending = sorted(self.members - self._shared_panes)
+        if not pending or not self.client.events.connected:
+            # Without a stream, its reconnect subscribes every member.
+            return
+        request = self._subscribe_payload(pending, f"i3pm-herdr-status-{next(self._ids)}")
+        self.stats["subscribe_requests"] += 1
+        ack = await self.client.subscribe(request, timeout=self.subscribe_timeout)
+        if subscription_started(ack):
+            self._shared_panes.update(pending)
+            self.stats["panes_subscribed"] += len(pending)
+            return
+        logger.info(
+            "Herdr rejected an extra subscription on the shared event stream (%s); "
+            "using one dedicated status stream",
+            ack.get("error") if isinstance(ack, dict) else ack,
+        )
+        self.multiplexing = False
+
+    async def _sync_dedicated_stream(self) -> None:
+        needed = self.members - self._shared_panes
+        if not needed:
+            await self.dedicated.close()
+            return
+        if self.dedicated.connected and needed <= self._dedicated_panes:
+            return
+        pane_ids = sorted(needed)
+        await self.dedicated.open()
+        self.stats["dedicated_opens"] += 1
+        request = self._subscribe_payload(pane_ids, f"i3pm-herdr-status-{next(self._ids)}")
+        self.stats["subscribe_requests"] += 1
+        ack = await self.dedicated.request(
+            str(request.get("method") or "events.subscribe"),
+            request.get("params") or {},
+            timeout=self.subscribe_timeout,
+            request_id=str(request["id"]),
+        )
+        if not subscription_started(ack):
+            await self.dedicated.close()
+            raise RuntimeError(f"Herdr status subscription failed: {ack}")
+        self._dedicated_panes = set(pane_ids)
+        self.stats["panes_subscribed"] += len(pane_ids)
+
+    def _dedicated_lost(self) -> None:
+        self._dedicated_panes = set()
+        if self._task is not None and not self._task.done():
+            self._wake.set()
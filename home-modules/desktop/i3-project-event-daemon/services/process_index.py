@@ -0,0 +1,355 @@
+"""
+Process-table index for /proc environ lookups.
+
+Window → project association comes from the I3PM_* variables a launcher put
+into the window process's environment, falling back to its parents when the
+app re-exec'd without them. Reading those used to mean a synchronous
+/proc/<pid>/stat + /proc/<pid>/environ pair per ancestor, cached by bare PID
+for 10s — so a recycled PID could inherit a dead process's project, and a
+window-tree snapshot with many windows did all of its /proc I/O on the loop.
+
+ProcessIndex keys cached environments on (pid, starttime), which is unique
+for the life of the system, and keeps a pid → (starttime, ppid) table:
+
+- ``prime(pids)`` scans /proc and reads any uncached environments in a
+  worker thread, so a batch reader pays for its /proc I/O once, off-loop.
+  While the last scan is fresh and already knows every pid, it skips the
+  scan and reads only the environments that are missing.
+- Within ``snapshot_ttl`` of a scan, identities and ancestor walks come from
+  the table with no syscalls; after that a single stat read re-verifies the
+  PID, and a changed starttime drops the old entry (PID reuse).
+- Each scan evicts cached environments of processes that have exited.
+- Only I3PM_* variables are decoded and kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProcessKey = Tuple[int, int]  # (pid, starttime)
+ProcessEntry = Tuple[int, int]  # (starttime, ppid)
+
+I3PM_PREFIX = b"I3PM_"
+
+# An environment carrying either of these is the one the launcher prepared.
+_I3PM_MARKERS = ("I3PM_APP_ID", "I3PM_APP_NAME")
+
+
+def read_proc_stat(pid: int, proc_root: str = "/proc") -> Optional[ProcessEntry]:
+    """Return (starttime, ppid) from /proc/<pid>/stat, or None if unavailable."""
+    try:
+        with open(f"{proc_root}/{pid}/stat", "rb") as f:
+            data = f.read()
+        # comm may contain spaces and parens; fields resume after the last ')'.
+        fields = data[data.rindex(b")") + 2:].split()
+        return int(fields[19]), int(fields[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def parse_i3pm_environ(data: bytes) -> Dict[str, str]:
+    """Decode only the I3PM_* entries of a NUL-separated environ block."""
+    env: Dict[str, str] = {}
+    for entry in data.split(b"\0"):
+        if not entry.startswith(I3PM_PREFIX):
+            continue
+        key, sep, value = entry.partition(b"=")
+        if not sep:
+            continue
+        try:
+            env[key.decode("utf-8")] = value.decode("utf-8")
+        except UnicodeDecodeError:
+            continue
+    return env
+
+
+def read_i3pm_environ(pid: int, proc_root: str = "/proc") -> Dict[str, str]:
+    """Read /proc/<pid>/environ, keeping I3PM_* variables.
+
+    Raises:
+        PermissionError: If the environ belongs to another user
+        FileNotFoundError: If the process does not exist
+    """
+    with open(f"{proc_root}/{pid}/environ", "rb") as f:
+        return parse_i3pm_environ(f.read())
+
+
+def scan_process_table(proc_root: str = "/proc") -> Dict[int, ProcessEntry]:
+    """Read pid → (starttime, ppid) for every process under proc_root."""
+    table: Dict[int, ProcessEntry] = {}
+    try:
+        entries = os.scandir(proc_root)
+    except OSError as e:
+        logger.debug(f"Cannot scan {proc_root}: {e}")
+        return table
+    with entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            pid = int(entry.name)
+            stat = read_proc_stat(pid, proc_root)
+            if stat is not None:
+                table[pid] = stat
+    return table
+
+
+def _read_environs(
+    proc_root: str,
+    table: Mapping[int, ProcessEntry],
+    pids: Iterable[int],
+    cached: Mapping[ProcessKey, Dict[str, str]],
+    max_depth: int,
+) -> Dict[ProcessKey, Dict[str, str]]:
+    """Read the uncached environments environ_with_fallback would visit."""
+    environs: Dict[ProcessKey, Dict[str, str]] = {}
+    for pid in pids:
+        current, depth = pid, 0
+        while current in table and depth < max_depth:
+            starttime, ppid = table[current]
+            key = (current, starttime)
+            env = environs.get(key) or cached.get(key)
+            if env is None:
+                try:
+                    env = environs[key] = read_i3pm_environ(current, proc_root)
+                except OSError:
+                    break
+            if any(marker in env for marker in _I3PM_MARKERS):
+                break
+            if ppid <= 1 or ppid == current:
+                break
+            current, depth = ppid, depth + 1
+    return environs
+
+
+def _scan_and_read(
+    proc_root: str,
+    pids: Iterable[int],
+    cached: Mapping[ProcessKey, Dict[str, str]],
+    max_depth: int,
+) -> Tuple[Dict[int, ProcessEntry], Dict[ProcessKey, Dict[str, str]]]:
+    """Worker-thread half of ProcessIndex.prime(); touches no index state."""
+    table = scan_process_table(proc_root)
+    return table, _read_environs(proc_root, table, pids, cached, max_depth)
+
+
+class ProcessIndex:
+    """PID-reuse-safe cache of I3PM_* process environments.
+
+    Example:
+        >>> index = get_process_index()
+        >>> await index.prime(node.pid for node in tree if node.pid)
+        >>> env = index.environ_with_fallback(window.pid)
+    """
+
+    def __init__(
+        self,
+        proc_root: str = "/proc",
+        snapshot_ttl: float = 1.0,
+        max_entries: int = 4096,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            proc_root: procfs mount point
+            snapshot_ttl: Seconds a table scan is trusted without re-stat'ing
+            max_entries: Cached environments kept before dead ones are swept
+        """
+        self.proc_root = proc_root
+        self.snapshot_ttl = snapshot_ttl
+        self.max_entries = max_entries
+        self._table: Dict[int, ProcessEntry] = {}
+        self._table_time = float("-inf")
+        self._environ: Dict[ProcessKey, Dict[str, str]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._stat_reads = 0
+        self._scans = 0
+        self._scans_skipped = 0
+        self._evicted = 0
+        self._pid_reuse = 0
+
+    # Process table ---------------------------------------------------------
+
+    def _snapshot_fresh(self) -> bool:
+        return time.monotonic() - self._table_time < self.snapshot_ttl
+
+    def _apply_table(self, table: Dict[int, ProcessEntry]) -> None:
+        self._scans += 1
+        self._table = table
+        self._table_time = time.monotonic()
+        dead = [
+            key for key in self._environ
+            if table.get(key[0], (None,))[0] != key[1]
+        ]
+        for key in dead:
+            del self._environ[key]
+        self._evicted += len(dead)
+
+    def refresh(self) -> None:
+        """Rescan /proc synchronously and evict environments of exited processes."""
+        self._apply_table(scan_process_table(self.proc_root))
+
+    async def refresh_async(self) -> None:
+        """Rescan /proc in a worker thread."""
+        self._apply_table(await asyncio.to_thread(scan_process_table, self.proc_root))
+
+    async def prime(self, pids: Iterable[int], max_depth: int = 3) -> None:
+        """Read uncached environments for pids (and the ancestors
+        environ_with_fallback would visit) in a worker thread, rescanning
+        /proc first unless the table is fresh and already lists every pid."""
+        wanted = sorted({int(pid) for pid in pids if pid})
+        if self._snapshot_fresh() and all(pid in self._table for pid in wanted):
+            self._scans_skipped += 1
+            pending = self._unresolved(wanted, max_depth)
+            if not pending:
+                return
+            environs = await asyncio.to_thread(
+                _read_environs, self.proc_root, dict(self._table), pending, dict(self._environ), max_depth
+            )
+        else:
+            table, environs = await asyncio.to_thread(
+                _scan_and_read, self.proc_root, wanted, dict(self._environ), max_depth
+            )
+            self._apply_table(table)
+        self._misses += len(environs)
+        self._environ.update(environs)
+
+    def _unresolved(self, pids: Iterable[int], max_depth: int) -> List[int]:
+        """Pids whose fallback walk reaches an environment not yet cached."""
+        pending: List[int] = []
+        for pid in pids:
+            current, depth = pid, 0
+            while current in self._table and depth < max_depth:
+                starttime, ppid = self._table[current]
+                env = self._environ.get((current, starttime))
+                if env is None:
+                    pending.append(pid)
+                    break
+                if any(marker in env for marker in _I3PM_MARKERS):
+                    break
+                if ppid <= 1 or ppid == current:
+                    break
+                current, depth = ppid, depth + 1
+        return pending
+
+    def identity(self, pid: int) -> Optional[ProcessEntry]:
+        """(starttime, ppid) for a live pid, from the table when it is fresh."""
+        if self._snapshot_fresh():
+            entry = self._table.get(pid)
+            if entry is not None:
+                return entry
+
+        self._stat_reads += 1
+        entry = read_proc_stat(pid, self.proc_root)
+        previous = self._table.get(pid)
+        if previous is not None and (entry is None or entry[0] != previous[0]):
+            if entry is not None:
+                self._pid_reuse += 1
+            if self._environ.pop((pid, previous[0]), None) is not None:
+                self._evicted += 1
+        if entry is None:
+            self._table.pop(pid, None)
+        else:
+            self._table[pid] = entry
+        return entry
+
+    # Environments ------------------------------------------------------------
+
+    def read_environ(self, pid: int) -> Dict[str, str]:
+        """I3PM_* variables of a process, cached per (pid, starttime).
+
+        The returned dict is shared with the cache and must not be mutated.
+
+        Raises:
+            PermissionError: If the environ belongs to another user
+            FileNotFoundError: If the process does not exist
+        """
+        entry = self.identity(pid)
+        if entry is None:
+            raise FileNotFoundError(f"Process {pid} not found")
+
+        key = (pid, entry[0])
+        env = self._environ.get(key)
+        if env is not None:
+            self._hits += 1
+            return env
+
+        self._misses += 1
+        env = read_i3pm_environ(pid, self.proc_root)
+        if len(self._environ) >= self.max_entries:
+            self.refresh()
+            if len(self._environ) >= self.max_entries:
+                self._evicted += len(self._environ)
+                self._environ.clear()
+        self._environ[key] = env
+        return env
+
+    def environ_with_fallback(self, pid: int, max_depth: int = 3) -> Dict[str, str]:
+        """I3PM_* environment of pid, or of the nearest of its first
+        max_depth ancestors that carries I3PM_APP_ID/I3PM_APP_NAME.
+
+        Returns:
+            Environment dictionary (empty if no I3PM vars were found)
+        """
+        current, depth = pid, 0
+        while current and depth < max_depth:
+            try:
+                env = self.read_environ(current)
+            except (FileNotFoundError, PermissionError):
+                break
+
+            if any(marker in env for marker in _I3PM_MARKERS):
+                if current != pid:
+                    logger.debug(
+                        f"Found I3PM environment in parent PID {current} "
+                        f"(traversed {depth} levels from PID {pid})"
+                    )
+                return env
+
+            entry = self.identity(current)
+            ppid = entry[1] if entry is not None else 0
+            if ppid <= 1 or ppid == current:
+                break
+            current, depth = ppid, depth + 1
+
+        logger.debug(f"No I3PM environment found for PID {pid} (traversed {depth} parents)")
+        return {}
+
+    def clear(self) -> None:
+        """Drop the process table and all cached environments."""
+        self._table = {}
+        self._table_time = float("-inf")
+        self._environ.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return index counters for diagnostics."""
+        return {
+            "processes": len(self._table),
+            "cached_environments": len(self._environ),
+            "hits": self._hits,
+            "misses": self._misses,
+            "stat_reads": self._stat_reads,
+            "scans": self._scans,
+            "scans_skipped": self._scans_skipped,
+            "evicted": self._evicted,
+            "pid_reuse": self._pid_reuse,
+        }
+
+
+# Singleton shared by window handlers, project filtering, tracing and IPC
+_process_index: Optional[ProcessIndex] = None
+
+
+def get_process_index() -> ProcessIndex:
+    """Get the daemon-wide process index, creating it on first use."""
+    global _process_index
+    if _process_index is None:
+        _process_index = ProcessIndex()
+    return _process_index
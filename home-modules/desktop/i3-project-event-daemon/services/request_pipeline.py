@@ -0,0 +1,134 @@
+"""
+Pipelined request execution for one IPC client connection.
+
+By default the IPC server answers a connection's requests strictly one after
+another, so a slow call (dashboard.snapshot waiting on herdr/git) delays every
+call queued behind it on the same socket. A client that sends
+``ipc.configure {"pipelining": true}`` switches its connection to a
+RequestPipeline:
+
+- Each request runs as its own task, up to ``max_in_flight`` at once. At the
+  cap the reader stops pulling lines, so socket flow control pushes back on
+  the client instead of the daemon buffering unbounded work.
+- Responses are written as they complete and matched to requests by their
+  JSON-RPC id, not by order.
+- Writes are serialized and drained one at a time, so response lines never
+  interleave and a slow reader throttles its own connection only.
+- On disconnect every in-flight task is cancelled.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from .response_cache import encode_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 16
+MAX_IN_FLIGHT_LIMIT = 64
+
+RequestHandler = Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class RequestPipeline:
+    """Concurrent request dispatcher with ordered, flow-controlled writes.
+
+    Example:
+        >>> pipeline = RequestPipeline(lambda req: server._handle_request(req, writer), writer)
+        >>> await pipeline.submit(request)   # returns once the request is running
+        >>> await pipeline.cancel()          # on disconnect
+    """
+
+    def __init__(
+        self,
+        handler: RequestHandler,
+        writer: Any,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    ) -> None:
+        """Initialize the pipeline.
+
+        Args:
+            handler: Coroutine producing the JSON-RPC response for a request
+            writer: Stream writer of the client connection
+            max_in_flight: Requests allowed to run concurrently
+        """
+        self.handler = handler
+        self.writer = writer
+        self.max_in_flight = max(1, min(int(max_in_flight), MAX_IN_FLIGHT_LIMIT))
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._write_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self._submitted = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._peak_in_flight = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def submit(self, request: Dict[str, Any]) -> None:
+        """Start handling a request, waiting for a free slot at the cap."""
+        await self._slots.acquire()
+        task = asyncio.create_task(self._run(request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        self._submitted += 1
+        self._peak_in_flight = max(self._peak_in_flight, len(self._tasks))
+
+    async def write(self, message: Dict[str, Any]) -> None:
+        """Write one JSON-RPC message line and wait for the transport to drain."""
+        data = encode_response(message)
+        async with self._write_lock:
+            self.writer.write(data)
+            await self.writer.drain()
+
+    async def join(self) -> None:
+        """Wait until every in-flight request has been answered."""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def cancel(self) -> None:
+        """Cancel all in-flight requests (the client is gone)."""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return per-connection pipeline counters."""
+        return {
+            "max_in_flight": self.max_in_flight,
+            "in_flight": len(self._tasks),
+            "peak_in_flight": self._peak_in_flight,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "cancelled": self._cancelled,
+        }
+
+    async def _run(self, request: Dict[str, Any]) -> None:
+        try:
+            try:
+                response = await self.handler(request)
+            except asyncio.CancelledError:
+                self._cancelled += 1
+                raise
+            except Exception as e:
+                fields = request if isinstance(request, dict) else {}
+                logger.error(f"Pipelined request {fields.get('method')!r} failed: {e}", exc_info=True)
+                response = {
+                    "jsonrpc": "2.0",
+                    "error": {"code": -32603, "message": f"Internal error: {e}"},
+                    "id": fields.get("id"),
+                }
+            await self.write(response)
+            self._completed += 1
+        except (BrokenPipeError, ConnectionError) as e:
+            logger.debug(f"Client disconnected before pipelined response was written: {e}")
+        finally:
+            self._slots.release()
@@ -0,0 +1,237 @@
+"""
+Generation-keyed response cache for snapshot RPCs.
+
+runtime.snapshot, dashboard.snapshot, session.list, get_window_tree and
+herdr.snapshot are polled by several panels at 1-2 Hz, and every call used to
+rebuild and re-serialize the full payload even when nothing had changed.
+IPCServer now routes methods declared ``cached=True`` through a ResponseCache:
+
+- Entries are keyed on (method, normalized params) and are valid only for the
+  generation tuple they were built under (dashboard/session/display/focus
+  generations, herdr generations and the cache's own invalidation epoch) and
+  for at most ``max_age`` seconds, which bounds staleness of fields that change
+  without a state-change event (git status, herdr remote polls).
+- The result is serialized once when stored; hits are written to the socket
+  as pre-serialized bytes with only the JSON-RPC id spliced in.
+- Each distinct payload gets a ``generation`` token, returned alongside
+  ``result`` in the response envelope. A client that sends it back as
+  ``if_generation`` receives ``{"not_modified": true, "generation": N}``
+  instead of the payload. A rebuild that produces identical bytes keeps its
+  token, so conditional pollers stay on the short reply across expiry.
+- Concurrent misses for the same key and generation share one build.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+DEFAULT_MAX_AGE_SECONDS = 3.0
+DEFAULT_MAX_ENTRIES = 64
+
+# Params that force a fresh build. They are dropped from the cache key so a
+# refreshed result replaces the entry plain polls are served from.
+REFRESH_PARAMS = frozenset({"refresh", "force_refresh"})
+CONDITIONAL_PARAM = "if_generation"
+
+CacheKey = Tuple[str, str]
+
+
+class CacheEntry:
+    """One cached result with its serialized body and generation token."""
+
+    __slots__ = ("result", "body", "token", "generation", "built_at")
+
+    def __init__(self, result: Any, body: bytes, token: int, generation: Hashable, built_at: float) -> None:
+        self.result = result
+        self.body = body
+        self.token = token
+        self.generation = generation
+        self.built_at = built_at
+
+
+class EncodedResponse(dict):
+    """JSON-RPC response dict carrying its pre-serialized wire form."""
+
+    __slots__ = ("encoded",)
+
+    def __init__(self, response: Dict[str, Any], encoded: bytes) -> None:
+        super().__init__(response)
+        self.encoded = encoded
+
+
+def encode_response(message: Any) -> bytes:
+    """Serialize one JSON-RPC message line, reusing pre-serialized bytes.
+
+    A list (batch response) is encoded as one array line, splicing in the
+    pre-serialized bytes of cached members.
+    """
+    if isinstance(message, list):
+        return b"[" + b",".join(encode_response(item)[:-1] for item in message) + b"]\n"
+    encoded = getattr(message, "encoded", None)
+    if encoded is not None:
+        return encoded
+    return json.dumps(message).encode() + b"\n"
+
+
+class ResponseCache:
+    """Pre-serialized snapshot responses keyed on method, params and generation.
+
+    Example:
+        >>> cache = ResponseCache()
+        >>> key = cache.key("session.list", params)
+        >>> entry = cache.lookup(key, generation)
+        >>> if entry is None:
+        ...     entry = cache.store(key, generation, await build())
+        >>> response = cache.respond(entry, request_id, params.get("if_generation"))
+    """
+
+    def __init__(
+        self,
+        max_age: float = DEFAULT_MAX_AGE_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_age: Seconds an entry may be served while its generation holds
+            max_entries: Distinct (method, params) keys kept; oldest are evicted
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.max_age = float(max_age)
+        self.max_entries = max(1, int(max_entries))
+        self._clock = clock
+        self._entries: Dict[CacheKey, CacheEntry] = {}
+        self._building: Dict[Tuple[CacheKey, Hashable], asyncio.Future] = {}
+        self._next_token = 0
+        self.epoch = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._shared_builds = 0
+        self._not_modified = 0
+        self._stores = 0
+        self._unchanged_rebuilds = 0
+        self._invalidations = 0
+        self._bytes_served = 0
+
+    def invalidate(self) -> None:
+        """Advance the epoch so every existing entry stops matching."""
+        self.epoch += 1
+        self._invalidations += 1
+
+    @staticmethod
+    def key(method: str, params: Dict[str, Any]) -> Optional[CacheKey]:
+        """Normalize params into a cache key; None if they cannot be keyed."""
+        keyed = {
+            name: value
+            for name, value in params.items()
+            if name not in REFRESH_PARAMS and name != CONDITIONAL_PARAM
+        }
+        try:
+            return (method, json.dumps(keyed, sort_keys=True, separators=(",", ":")))
+        except (TypeError, ValueError):
+            return None
+
+    def lookup(self, key: CacheKey, generation: Hashable) -> Optional[CacheEntry]:
+        """Return the entry for key if it was built under generation and is fresh."""
+        entry = self._entries.get(key)
+        if entry is None or entry.generation != generation or self._expired(entry):
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry
+
+    def pending(self, key: CacheKey, generation: Hashable) -> Optional[asyncio.Future]:
+        """Return the in-flight build for key and generation, if any."""
+        future = self._building.get((key, generation))
+        if future is not None:
+            self._shared_builds += 1
+        return future
+
+    def begin(self, key: CacheKey, generation: Hashable) -> asyncio.Future:
+        """Register a build so concurrent misses can await it."""
+        future = asyncio.get_running_loop().create_future()
+        self._building[(key, generation)] = future
+        return future
+
+    def finish(self, key: CacheKey, generation: Hashable, future: asyncio.Future, entry: Optional[CacheEntry]) -> None:
+        """Publish a build's outcome (None on error) to its waiters."""
+        if self._building.get((key, generation)) is future:
+            del self._building[(key, generation)]
+        if not future.done():
+            future.set_result(entry)
+
+    def store(self, key: CacheKey, generation: Hashable, result: Any) -> Optional[CacheEntry]:
+        """Serialize and cache a result; None if it is not JSON-serializable."""
+        try:
+            body = json.dumps(result).encode()
+        except (TypeError, ValueError):
+            return None
+        previous = self._entries.pop(key, None)
+        if previous is not None and previous.body == body:
+            token = previous.token
+            self._unchanged_rebuilds += 1
+        else:
+            self._next_token += 1
+            token = self._next_token
+        entry = CacheEntry(result, body, token, generation, self._clock())
+        self._entries[key] = entry
+        self._stores += 1
+        while len(self._entries) > self.max_entries:
+            del self._entries[next(iter(self._entries))]
+        return entry
+
+    def respond(self, entry: CacheEntry, request_id: Any, if_generation: Any = None) -> EncodedResponse:
+        """Build the JSON-RPC response for entry, short-circuiting on a token match."""
+        id_bytes = json.dumps(request_id).encode()
+        if if_generation is not None and str(if_generation) == str(entry.token):
+            self._not_modified += 1
+            result: Any = {"not_modified": True, "generation": entry.token}
+            encoded = (
+                b'{"jsonrpc": "2.0", "result": {"not_modified": true, "generation": '
+                + str(entry.token).encode()
+                + b'}, "id": ' + id_bytes + b"}\n"
+            )
+        else:
+            result = entry.result
+            encoded = (
+                b'{"jsonrpc": "2.0", "result": ' + entry.body
+                + b', "id": ' + id_bytes
+                + b', "generation": ' + str(entry.token).encode() + b"}\n"
+            )
+        self._bytes_served += len(encoded)
+        return EncodedResponse(
+            {"jsonrpc": "2.0", "result": result, "id": request_id, "generation": entry.token},
+            encoded,
+        )
+
+    def clear(self) -> None:
+        """Drop every entry (in-flight builds still publish to their waiters)."""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and cached payload sizes."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_age_seconds": self.max_age,
+            "epoch": self.epoch,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+            "shared_builds": self._shared_builds,
+            "not_modified": self._not_modified,
+            "stores": self._stores,
+            "unchanged_rebuilds": self._unchanged_rebuilds,
+            "invalidations": self._invalidations,
+            "bytes_served": self._bytes_served,
+            "cached_bytes": sum(len(entry.body) for entry in self._entries.values()),
+        }
+
+    def _expired(self, entry: CacheEntry) -> bool:
+        return self._clock() - entry.built_at > self.max_age
@@ -0,0 +1,126 @@
+"""
+JSON-RPC 2.0 batch requests.
+
+Panel widgets open by issuing several calls back to back (``context.current``,
+``focus.state``, ``session.list``, ``display.snapshot``), each a socket round
+trip and a separate runtime snapshot build. A client can instead send them as
+one JSON array and receive one array of responses:
+
+- The batch is split into stages. Consecutive methods that do not mutate
+  state run concurrently; a mutating method runs alone, after everything
+  before it and before everything after it, so mixed batches keep their
+  order-dependent meaning.
+- Each read-only stage runs with a BatchMemo in context. Snapshot builders
+  wrapped with ``batch_shared`` (the runtime snapshot and the window tree)
+  compute once per stage, so four calls that all need the runtime snapshot
+  share one build.
+- Invalid members get their own ``-32600`` error in the array; an empty
+  batch, or one over ``MAX_BATCH_SIZE``, gets a single error response.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+MAX_BATCH_SIZE = 64
+
+INVALID_REQUEST = -32600
+
+
+class BatchMemo:
+    """Results shared by the concurrent calls of one batch stage."""
+
+    def __init__(self) -> None:
+        self._results: Dict[Any, asyncio.Future] = {}
+        self.builds = 0
+        self.hits = 0
+
+    async def get(self, key: Any, build: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._results.get(key)
+        if future is None:
+            future = asyncio.ensure_future(build())
+            self._results[key] = future
+            self.builds += 1
+        else:
+            self.hits += 1
+        return await asyncio.shield(future)
+
+
+_batch_memo: contextvars.ContextVar[Optional[BatchMemo]] = contextvars.ContextVar(
+    "i3pm_batch_memo",
+    default=None,
+)
+
+
+async def batch_shared(name: str, params: Dict[str, Any], build: Callable[[], Awaitable[Any]]) -> Any:
+    """Run build(), or share its result with the other calls of the current batch stage.
+
+    Outside a batch this is just ``await build()``. Dict results are
+    shallow-copied per caller so top-level edits do not leak between calls.
+    """
+    memo = _batch_memo.get()
+    if memo is None:
+        return await build()
+    try:
+        key = (name, json.dumps(params, sort_keys=True, default=str))
+    except (TypeError, ValueError):
+        return await build()
+    result = await memo.get(key, build)
+    return dict(result) if isinstance(result, dict) else result
+
+
+def invalid_request(request_id: Any, message: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "error": {"code": INVALID_REQUEST, "message": message},
+        "id": request_id,
+    }
+
+
+async def run_batch(
+    requests: List[Any],
+    handle: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+    mutates: Callable[[Any], bool],
+) -> Any:
+    """Answer a batch array; returns a list of responses or one error response.
+
+    Args:
+        requests: Decoded batch array
+        handle: Produces the response for one request object
+        mutates: Whether a method name changes state (runs as its own stage)
+    """
+    if not requests:
+        return invalid_request(None, "Invalid Request: empty batch")
+    if len(requests) > MAX_BATCH_SIZE:
+        return invalid_request(None, f"Invalid Request: batch exceeds {MAX_BATCH_SIZE} requests")
+
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    stage: List[int] = []
+
+    async def run_stage(indices: List[int]) -> None:
+        token = _batch_memo.set(BatchMemo())
+        try:
+            results = await asyncio.gather(*(handle(requests[index]) for index in indices))
+        finally:
+            _batch_memo.reset(token)
+        for index, response in zip(indices, results):
+            responses[index] = response
+
+    for index, request in enumerate(requests):
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            request_id = request.get("id") if isinstance(request, dict) else None
+            responses[index] = invalid_request(request_id, "Invalid Request")
+            continue
+        if mutates(request["method"]):
+            if stage:
+                await run_stage(stage)
+                stage = []
+            responses[index] = await handle(request)
+            continue
+        stage.append(index)
+    if stage:
+        await run_stage(stage)
+    return responses
@@ -0,0 +1,250 @@
+"""
+Latency lanes and admission control for JSON-RPC methods.
+
+Keypress-driven focus calls share the event loop, the Sway socket and the
+herdr subprocess budget with bulk snapshot builds (``dashboard.snapshot``,
+``get_diagnostic_report``, refreshed ``herdr.snapshot``). Each RpcMethod
+declares a lane and the scheduler admits calls per lane:
+
+- ``interactive`` (every intent method by default) is never queued. While any
+  interactive call is in flight, queued bulk work is held back, so a burst of
+  snapshot requests cannot start new builds under a focus switch. A bulk call
+  is held for at most ``max_bulk_hold`` seconds: remote focus calls can run
+  for seconds over SSH, and back-to-back focus calls would otherwise starve
+  snapshots entirely.
+- ``normal`` runs immediately, as every method did before.
+- ``bulk`` runs at most ``max_bulk_concurrency`` builds at once. Further calls
+  wait in FIFO order up to ``max_bulk_queue`` deep; past that, callers that
+  opted in (``reject=True``) get RpcOverloaded carrying a ``retry_after_ms``
+  hint derived from the mean bulk build time. Other callers keep waiting.
+
+Only handler execution is scheduled: cached snapshot responses are served
+without taking a bulk slot. Queue wait is recorded per lane in the same
+log-linear histograms daemon.rpc_stats uses for method latency.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from .rpc_registry import LatencyHistogram
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BULK = "bulk"
+LANES = (INTERACTIVE, NORMAL, BULK)
+
+# JSON-RPC error code for RpcOverloaded rejections.
+SERVER_BUSY = 1006
+
+DEFAULT_MAX_BULK_CONCURRENCY = 2
+DEFAULT_MAX_BULK_QUEUE = 8
+DEFAULT_MAX_BULK_HOLD = 0.25
+_MIN_RETRY_AFTER_MS = 50
+
+
+class RpcOverloaded(Exception):
+    """A bulk call was rejected because the bulk queue is full."""
+
+    def __init__(self, lane: str, queue_depth: int, retry_after_ms: int) -> None:
+        super().__init__(f"Daemon busy: {queue_depth} {lane} requests queued; retry in {retry_after_ms}ms")
+        self.lane = lane
+        self.queue_depth = queue_depth
+        self.retry_after_ms = retry_after_ms
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "lane": self.lane,
+            "queue_depth": self.queue_depth,
+            "retry_after_ms": self.retry_after_ms,
+        }
+
+
+class _LaneStats:
+    __slots__ = ("admitted", "rejected", "in_flight", "wait", "service")
+
+    def __init__(self) -> None:
+        self.admitted = 0
+        self.rejected = 0
+        self.in_flight = 0
+        self.wait = LatencyHistogram()
+        self.service = LatencyHistogram()
+
+
+class RpcSlot:
+    """Admission ticket returned by RpcScheduler.acquire()."""
+
+    __slots__ = ("lane", "started")
+
+    def __init__(self, lane: str, started: float) -> None:
+        self.lane = lane
+        self.started = started
+
+
+class RpcScheduler:
+    """Per-lane admission for RPC handler execution.
+
+    Example:
+        >>> slot = await scheduler.acquire(descriptor.latency_class)  # may raise RpcOverloaded
+        >>> try:
+        ...     result = await handler()
+        ... finally:
+        ...     scheduler.release(slot)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bulk_concurrency: int = DEFAULT_MAX_BULK_CONCURRENCY,
+        max_bulk_queue: int = DEFAULT_MAX_BULK_QUEUE,
+        max_bulk_hold: float = DEFAULT_MAX_BULK_HOLD,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            max_bulk_concurrency: Bulk handlers allowed to run at once
+            max_bulk_queue: Bulk calls allowed to wait before new ones are rejected
+            max_bulk_hold: Seconds a queued bulk call may be held back for interactive work
+            clock: Monotonic time source
+        """
+        self.max_bulk_concurrency = max(1, int(max_bulk_concurrency))
+        self.max_bulk_queue = max(0, int(max_bulk_queue))
+        self.max_bulk_hold = max(0.0, float(max_bulk_hold))
+        self._clock = clock
+        self._lanes: Dict[str, _LaneStats] = {lane: _LaneStats() for lane in LANES}
+        # (future, queued_at) in FIFO order
+        self._bulk_waiters: Deque[Tuple[asyncio.Future, float]] = deque()
+        self._bulk_running = 0
+        self._held_for_interactive = 0
+        self._hold_expired = 0
+        self._hold_timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, lane: str, *, reject: bool = True) -> RpcSlot:
+        """Wait for admission in lane.
+
+        With ``reject`` a bulk call raises RpcOverloaded when the bulk queue
+        is full; without it the call queues regardless.
+        """
+        lane = lane if lane in self._lanes else NORMAL
+        stats = self._lanes[lane]
+        queued_at = self._clock()
+        if lane == BULK:
+            if self._bulk_waiters or not self._bulk_can_start():
+                await self._wait_for_bulk_slot(queued_at, reject=reject)
+            else:
+                self._bulk_running += 1
+        elif lane == INTERACTIVE:
+            stats.in_flight += 1
+        started = self._clock()
+        stats.admitted += 1
+        stats.wait.record(started - queued_at)
+        if lane != INTERACTIVE:
+            stats.in_flight += 1
+        return RpcSlot(lane, started)
+
+    def release(self, slot: RpcSlot) -> None:
+        """Return a slot and admit any bulk work it was holding back."""
+        stats = self._lanes[slot.lane]
+        stats.in_flight -= 1
+        stats.service.record(self._clock() - slot.started)
+        if slot.lane == BULK:
+            self._bulk_running -= 1
+            if self._bulk_waiters and self._lanes[INTERACTIVE].in_flight:
+                self._held_for_interactive += 1
+        self._wake_bulk()
+
+    def _bulk_can_start(self) -> bool:
+        return (
+            self._bulk_running < self.max_bulk_concurrency
+            and self._lanes[INTERACTIVE].in_flight == 0
+        )
+
+    async def _wait_for_bulk_slot(self, queued_at: float, *, reject: bool) -> None:
+        stats = self._lanes[BULK]
+        depth = len(self._bulk_waiters)
+        if reject and depth >= self.max_bulk_queue:
+            stats.rejected += 1
+            raise RpcOverloaded(BULK, depth, self._retry_after_ms(depth))
+        if self._bulk_running < self.max_bulk_concurrency and self._lanes[INTERACTIVE].in_flight:
+            self._held_for_interactive += 1
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (waiter, queued_at)
+        self._bulk_waiters.append(entry)
+        self._arm_hold_timer()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted as we were cancelled; pass it on.
+                self._bulk_running -= 1
+                self._wake_bulk()
+            else:
+                try:
+                    self._bulk_waiters.remove(entry)
+                except ValueError:
+                    pass
+            raise
+
+    def _wake_bulk(self) -> None:
+        while self._bulk_waiters and self._bulk_running < self.max_bulk_concurrency:
+            waiter, queued_at = self._bulk_waiters[0]
+            if waiter.done():
+                self._bulk_waiters.popleft()
+                continue
+            if self._lanes[INTERACTIVE].in_flight:
+                if self._clock() - queued_at < self.max_bulk_hold:
+                    break
+                self._hold_expired += 1
+            self._bulk_waiters.popleft()
+            self._bulk_running += 1
+            waiter.set_result(None)
+        self._arm_hold_timer()
+
+    def _arm_hold_timer(self) -> None:
+        """Re-run _wake_bulk when the oldest held bulk call reaches max_bulk_hold."""
+        if self._hold_timer is not None:
+            self._hold_timer.cancel()
+            self._hold_timer = None
+        if not self._bulk_waiters or not self._lanes[INTERACTIVE].in_flight:
+            return
+        if self._bulk_running >= self.max_bulk_concurrency:
+            return
+        remaining = self._bulk_waiters[0][1] + self.max_bulk_hold - self._clock()
+        loop = asyncio.get_running_loop()
+        self._hold_timer = loop.call_later(max(0.0, remaining), self._hold_timer_fired)
+
+    def _hold_timer_fired(self) -> None:
+        self._hold_timer = None
+        self._wake_bulk()
+
+    def _retry_after_ms(self, depth: int) -> int:
+        """Time for the queue ahead to drain at the mean bulk build time."""
+        service = self._lanes[BULK].service
+        mean_ms = service.total_us / service.count / 1000 if service.count else 0.0
+        rounds = depth // self.max_bulk_concurrency + 1
+        return max(_MIN_RETRY_AFTER_MS, int(mean_ms * rounds))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Admission counters and queue-wait percentiles per lane."""
+        lanes = {}
+        for lane, stats in self._lanes.items():
+            lanes[lane] = {
+                "admitted": stats.admitted,
+                "rejected": stats.rejected,
+                "in_flight": stats.in_flight,
+                "queue_wait": stats.wait.summary(),
+                "service": stats.service.summary(),
+            }
+        return {
+            "max_bulk_concurrency": self.max_bulk_concurrency,
+            "max_bulk_queue": self.max_bulk_queue,
+            "bulk_queue_depth": len(self._bulk_waiters),
+            "bulk_held_for_interactive": self._held_for_interactive,
+            "bulk_hold_expired": self._hold_expired,
+            "max_bulk_hold_ms": int(self.max_bulk_hold * 1000),
+            "lanes": lanes,
+        }
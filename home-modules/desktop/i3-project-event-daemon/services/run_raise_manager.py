@@ -128,8 +128,11 @@ class RunRaiseManager:
         """
         start_time = time.perf_counter()
 
-        # Get Sway tree and focused workspace
-        tree = await self.sway.get_tree()
+        # Get Sway tree and focused workspace. Summon/hide save the window's
+        # geometry from this tree, and floating drags emit no event, so read
+        # it live (fetch_tree) instead of from the tree mirror.
+        fetch_tree = getattr(self.sway, "fetch_tree", None) or self.sway.get_tree
+        tree = await fetch_tree()
         focused = tree.find_focused()
         current_workspace = focused.workspace().name if focused and focused.workspace() else "1"
 
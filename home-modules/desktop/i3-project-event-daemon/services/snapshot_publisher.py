@@ -0,0 +1,204 @@
+"""
+Shared-memory publication of the latest dashboard snapshot.
+
+Status-bar widgets and scripts poll ``dashboard.snapshot`` over the socket just
+to read state the daemon already holds. The daemon also writes the latest
+serialized snapshot into a memory-mapped file,
+``$XDG_RUNTIME_DIR/i3-project-daemon/dashboard.snapshot``, which local readers
+map once and then read with plain memory copies: no socket round trip, no
+syscall per read and no daemon CPU per reader. While no socket client is
+subscribed, the daemon rebuilds the snapshot on a short timer after a burst
+of state changes rather than on every change (see DashboardService), so the
+file may trail the daemon by that delay.
+
+File layout (little-endian)::
+
+    0   magic       8s   b"I3PMSNP1"
+    8   seq         u64  even = stable, odd = write in progress
+    16  generation  u64  dashboard snapshot_version of the body
+    24  length      u64  body bytes
+    32  checksum    u32  crc32 of the body
+    36  flags       u32  FLAG_STALE: file replaced or daemon stopped, reopen
+    40  capacity    u64  body bytes available after the header
+    64  body        JSON document (``length`` bytes)
+
+Writers follow the seqlock protocol: bump ``seq`` to odd, write body and
+header, bump ``seq`` back to even. Readers copy the header and body, re-read
+``seq`` and retry if it moved or was odd; the checksum is a second guard.
+The closing ``seq`` store goes through ``pwrite`` so readers blocked in
+inotify on the directory wake up (stores through the mapping alone do not
+raise inotify events).
+
+A body larger than the capacity is written to a new, larger file that
+replaces the old one atomically; the old mapping is flagged stale so readers
+remap. The reader lives in i3pm_diagnostic/snapshot_reader.py and must be kept
+in step with this layout.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .event_fanout import encode_line
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = "i3pm.snapshot.v1"
+SNAPSHOT_FILENAME = "dashboard.snapshot"
+MAGIC = b"I3PMSNP1"
+HEADER = struct.Struct("<8sQQQIIQ")
+HEADER_SIZE = 64
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+GENERATION_OFFSET = 16
+FLAGS_OFFSET = 36
+FLAG_STALE = 1
+
+DEFAULT_CAPACITY = 256 * 1024
+
+
+class SnapshotPublisher:
+    """Seqlock-guarded memory-mapped file holding the latest snapshot.
+
+    Example:
+        >>> publisher = SnapshotPublisher(runtime_dir / SNAPSHOT_FILENAME)
+        >>> publisher.open()
+        >>> publisher.publish(payload, generation=payload["snapshot_version"])
+        >>> publisher.close()
+    """
+
+    def __init__(self, path: Path, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize the publisher.
+
+        Args:
+            path: Snapshot file path (created on open)
+            capacity: Initial body capacity in bytes; grows on demand
+        """
+        self.path = Path(path)
+        self.capacity = max(1024, int(capacity))
+        self._fd: Optional[int] = None
+        self._map: Optional[mmap.mmap] = None
+        self._seq = 0
+        self._last: Optional[tuple] = None
+
+        self._publishes = 0
+        self._unchanged = 0
+        self._resizes = 0
+        self._bytes_written = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._map is not None
+
+    def open(self) -> None:
+        """Create the snapshot file (0600) with an empty body."""
+        self._replace_file(self.capacity)
+
+    def publish(self, payload: Any, *, generation: int = 0) -> bool:
+        """Serialize payload and publish it; False if closed or unchanged."""
+        return self.publish_bytes(encode_line(payload)[:-1], generation=generation)
+
+    def publish_bytes(self, body: bytes, *, generation: int = 0) -> bool:
+        """Publish an already-serialized body; False if closed or unchanged."""
+        if self._map is None:
+            return False
+        checksum = zlib.crc32(body)
+        identity = (int(generation), len(body), checksum)
+        if identity == self._last:
+            self._unchanged += 1
+            return False
+        if len(body) > self.capacity:
+            capacity = self.capacity
+            while capacity < len(body):
+                capacity *= 2
+            self._replace_file(capacity)
+            self._resizes += 1
+
+        mapped = self._map
+        self._seq += 1
+        SEQ.pack_into(mapped, SEQ_OFFSET, self._seq)
+        mapped[HEADER_SIZE:HEADER_SIZE + len(body)] = body
+        HEADER.pack_into(
+            mapped, 0, MAGIC, self._seq, int(generation), len(body), checksum, 0, self.capacity
+        )
+        self._seq += 1
+        os.pwrite(self._fd, SEQ.pack(self._seq), SEQ_OFFSET)
+
+        self._last = identity
+        self._publishes += 1
+        self._bytes_written += len(body)
+        return True
+
+    def close(self, *, unlink: bool = True) -> None:
+        """Flag the file stale for readers, unmap it and (by default) remove it."""
+        if self._map is None:
+            return
+        self._retire()
+        if unlink:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Publication counters for daemon diagnostics."""
+        return {
+            "path": str(self.path),
+            "open": self.is_open,
+            "format": SNAPSHOT_FORMAT,
+            "capacity": self.capacity,
+            "seq": self._seq,
+            "generation": self._last[0] if self._last else 0,
+            "length": self._last[1] if self._last else 0,
+            "publishes": self._publishes,
+            "unchanged": self._unchanged,
+            "resizes": self._resizes,
+            "bytes_written": self._bytes_written,
+        }
+
+    def _replace_file(self, capacity: int) -> None:
+        """Create a file of the given capacity and swap it in atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o600)
+        try:
+            os.ftruncate(fd, HEADER_SIZE + capacity)
+            mapped = mmap.mmap(fd, HEADER_SIZE + capacity)
+        except OSError:
+            os.close(fd)
+            raise
+        # Carry the sequence and the current body across, so a reader
+        # remapping mid-resize sees the same snapshot it left.
+        length = 0
+        if self._map is not None and self._last is not None:
+            length = self._last[1]
+            mapped[HEADER_SIZE:HEADER_SIZE + length] = self._map[HEADER_SIZE:HEADER_SIZE + length]
+        generation, _length, checksum = self._last if self._last else (0, 0, 0)
+        HEADER.pack_into(mapped, 0, MAGIC, self._seq, generation, length, checksum, 0, capacity)
+        os.replace(tmp_path, self.path)
+        if self._map is not None:
+            self._retire()
+        self._fd = fd
+        self._map = mapped
+        self.capacity = capacity
+
+    def _retire(self) -> None:
+        mapped, fd = self._map, self._fd
+        self._map = None
+        self._fd = None
+        if mapped is None or fd is None:
+            return
+        struct.pack_into("<I", mapped, FLAGS_OFFSET, FLAG_STALE)
+        try:
+            os.pwrite(fd, SEQ.pack(self._seq + 2), SEQ_OFFSET)
+        except OSError:
+            pass
+        self._seq += 2
+        mapped.close()
+        os.close(fd)
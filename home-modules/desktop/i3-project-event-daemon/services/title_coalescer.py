@@ -0,0 +1,153 @@
+"""
+Per-window coalescing of window::title events.
+
+Terminals running `tail -f`, shells redrawing prompts and browsers with
+ticking tab titles can emit dozens of window::title events per second for
+one container. Each one used to run the full title handler (classification,
+state update, EventEntry, broadcast), and because i3ipc runs handlers in
+arrival order, focus and workspace events queued behind a storm waited.
+
+WindowTitleCoalescer sits in front of the title handler. The first event for
+a con_id is dispatched immediately; further events for that con_id within
+the coalescing window only replace a pending slot, and the latest one is
+dispatched when the window closes. A window in a sustained storm therefore
+reaches the handler at most once per window, always with its newest title.
+Dispatches for one con_id never overlap: events arriving while the handler
+is still running for that con_id are folded too, and the latest is
+dispatched when it returns, so a stale title can never be written last.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TitleHandler = Callable[[Any, Any], Awaitable[None]]
+
+# Long enough to fold a redraw burst into one dispatch, short enough that a
+# title-based reclassification (e.g. a terminal switching to yazi) still
+# feels immediate.
+DEFAULT_COALESCE_WINDOW_MS = 50.0
+
+
+class WindowTitleCoalescer:
+    """Collapse bursts of window::title events per con_id, keeping the latest.
+
+    Example:
+        >>> coalescer = WindowTitleCoalescer(title_handler)
+        >>> connection.subscribe("window::title", coalescer.submit)
+        >>> connection.subscribe("window::close", coalescer.on_window_close)
+    """
+
+    def __init__(self, handler: TitleHandler, window_ms: float = DEFAULT_COALESCE_WINDOW_MS) -> None:
+        """Initialize the coalescer.
+
+        Args:
+            handler: Async (conn, event) title handler to feed
+            window_ms: Coalescing window per con_id in milliseconds
+        """
+        self._handler = handler
+        self.window_ms = window_ms
+        self._pending: Dict[int, Tuple[Any, Any]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        # con_ids whose handler call has not returned yet
+        self._running: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+        self._received = 0
+        self._dispatched = 0
+        self._collapsed = 0
+        self._dropped = 0
+        self._handler_errors = 0
+
+    async def submit(self, conn: Any, event: Any) -> None:
+        """window::title handler: dispatch now or fold into the pending slot."""
+        self._received += 1
+        con_id = getattr(getattr(event, "container", None), "id", None)
+        if con_id is None:
+            await self._dispatch(conn, event)
+            return
+
+        if con_id in self._timers or con_id in self._running:
+            if con_id in self._pending:
+                self._collapsed += 1
+            self._pending[con_id] = (conn, event)
+            return
+
+        self._arm(con_id)
+        await self._dispatch_con(con_id, conn, event)
+
+    async def on_window_close(self, _conn: Any, event: Any) -> None:
+        """window::close handler: forget a closed window's pending title."""
+        con_id = getattr(getattr(event, "container", None), "id", None)
+        if con_id is not None:
+            self.discard(con_id)
+
+    def discard(self, con_id: int) -> None:
+        """Drop any pending title event and timer for con_id."""
+        timer = self._timers.pop(con_id, None)
+        if timer is not None:
+            timer.cancel()
+        if self._pending.pop(con_id, None) is not None:
+            self._dropped += 1
+
+    def close(self) -> None:
+        """Cancel all timers and drop pending events (daemon shutdown)."""
+        for con_id in list(self._timers):
+            self.discard(con_id)
+        for task in list(self._tasks):
+            task.cancel()
+
+    def _arm(self, con_id: int) -> None:
+        loop = asyncio.get_running_loop()
+        self._timers[con_id] = loop.call_later(self.window_ms / 1000.0, self._flush, con_id)
+
+    def _flush(self, con_id: int) -> None:
+        self._timers.pop(con_id, None)
+        if con_id in self._running:
+            # The running dispatch flushes the pending slot when it returns.
+            return
+        pending = self._pending.pop(con_id, None)
+        if pending is None:
+            return
+        # Keep the window open while the storm lasts, so a sustained burst is
+        # rate-limited to one dispatch per window rather than two.
+        self._arm(con_id)
+        task = asyncio.create_task(self._dispatch_con(con_id, *pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch_con(self, con_id: int, conn: Any, event: Any) -> None:
+        self._running.add(con_id)
+        try:
+            await self._dispatch(conn, event)
+        finally:
+            self._running.discard(con_id)
+        if con_id in self._pending and con_id not in self._timers:
+            # A title arrived while the handler ran and its window has
+            # already closed; dispatch it now.
+            self._flush(con_id)
+
+    async def _dispatch(self, conn: Any, event: Any) -> None:
+        self._dispatched += 1
+        try:
+            await self._handler(conn, event)
+        except Exception as e:
+            # Never let one window's title handling take down the i3ipc loop.
+            self._handler_errors += 1
+            logger.error(f"Error dispatching coalesced window::title event: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return coalescing counters for daemon status."""
+        return {
+            "window_ms": self.window_ms,
+            "received": self._received,
+            "dispatched": self._dispatched,
+            "collapsed": self._collapsed,
+            "dropped_on_close": self._dropped,
+            "pending": len(self._pending),
+            "handler_errors": self._handler_errors,
+        }
@@ -7,6 +7,7 @@ import re
 from datetime import datetime
 from typing import Any, Callable, Dict, Optional
 
+from ..event_buffer import events_matching
 from .window_tracer import TRACE_TEMPLATES, get_tracer
 
 
@@ -357,7 +358,7 @@ class TraceService:
             raise ValueError(f"Trace not found: {trace_id}")
 
         events = []
-        for event in event_buffer.events:
+        for event in events_matching(event_buffer, trace_id=trace_id, window_id=trace.window_id):
             if event.trace_id == trace_id:
                 events.append({
                     "event_id": event.event_id,
@@ -428,7 +429,7 @@ class TraceService:
         root_event = None
         max_depth = 0
 
-        for event in event_buffer.events:
+        for event in events_matching(event_buffer, correlation_id=correlation_id):
             if event.correlation_id == correlation_id:
                 events.append({
                     "event_id": event.event_id,
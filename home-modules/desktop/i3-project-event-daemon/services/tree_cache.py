@@ -12,6 +12,8 @@ import logging
 from typing import TYPE_CHECKING, Optional
 from datetime import datetime, timedelta
 
+from .compact_tree import TreeNode, get_compact_tree
+
 if TYPE_CHECKING:
     from i3ipc.aio import Connection, Con
 
@@ -80,6 +82,7 @@ class TreeCacheService:
         self.conn = conn
         self.ttl_ms = ttl_ms
         self._cache: Optional[TreeCacheEntry] = None
+        self._compact_cache: Optional[TreeCacheEntry] = None
         self._cache_hits = 0
         self._cache_misses = 0
         self._invalidations = 0
@@ -120,6 +123,32 @@ class TreeCacheService:
 
         return tree
 
+    async def get_compact_tree(self, force_refresh: bool = False) -> TreeNode:
+        """Get the Sway tree as a compact TreeNode graph, with caching.
+
+        Same TTL and hit/miss accounting as get_tree(), cached separately so
+        Con and compact readers never hand each other the wrong type.
+
+        Args:
+            force_refresh: If True, bypass cache and fetch fresh tree
+
+        Returns:
+            Compact tree root (TreeNode)
+        """
+        if not force_refresh and self._compact_cache and not self._compact_cache.is_expired:
+            self._cache_hits += 1
+            return self._compact_cache.tree
+
+        self._cache_misses += 1
+        try:
+            tree = await get_compact_tree(self.conn, force_refresh=force_refresh)
+        except Exception as e:
+            self._compact_cache = None
+            logger.error(f"[Feature 091] Tree cache get_compact_tree() failed: {type(e).__name__}: {e}")
+            raise ConnectionError(f"Failed to get Sway tree (connection may be stale): {type(e).__name__}: {e}") from e
+        self._compact_cache = TreeCacheEntry(tree, ttl_ms=self.ttl_ms)
+        return tree
+
     def invalidate(self, reason: str = "manual") -> None:
         """Invalidate the cache.
 
@@ -133,6 +162,7 @@ class TreeCacheService:
                 f"age: {self._cache.age_ms:.1f}ms)"
             )
             self._cache = None
+        self._compact_cache = None
 
     def invalidate_on_event(self, event_type: str) -> bool:
         """Check if cache should be invalidated for an event type.
@@ -173,7 +203,10 @@ class TreeCacheService:
     @property
     def is_cached(self) -> bool:
         """Check if a valid cache entry exists."""
-        return self._cache is not None and not self._cache.is_expired
+        return any(
+            entry is not None and not entry.is_expired
+            for entry in (self._cache, self._compact_cache)
+        )
 
     def get_stats(self) -> dict:
         """Get cache statistics.
@@ -201,6 +234,7 @@ class TreeCacheService:
     def reset_all(self) -> None:
         """Reset cache and statistics."""
         self._cache = None
+        self._compact_cache = None
         self.reset_stats()
 
 
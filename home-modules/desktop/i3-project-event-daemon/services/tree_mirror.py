@@ -0,0 +1,401 @@
+"""
+Event-maintained mirror of the Sway layout tree.
+
+Panel refreshes, project switches, mark lookups and run-raise state detection
+all used to fetch and json-parse a full GET_TREE, with only 100ms TTL caches
+sparing repeats. The mirror keeps one copy of the raw tree that is seeded with
+a single GET_TREE at connect/reconnect and then patched from the window,
+workspace and output event stream:
+
+- Property-only events (title, mark, urgent, fullscreen_mode, same-workspace
+  focus, workspace rename/urgent) are applied in place.
+- window::close removes the node and its subtree.
+- Structural events whose new placement the event payload does not describe
+  (window::new/move/floating, workspace init/empty/move/reload, output
+  changes) mark the mirror dirty, so the next reader triggers exactly one
+  refetch no matter how many readers are waiting.
+- Every command sent on the command socket marks the mirror dirty too:
+  `layout`, `resize` and `move position` change the tree without emitting an
+  event. Interactive floating drags and resizes emit nothing either, so
+  readers that save floating geometry ask for a forced refresh.
+
+A periodic reconcile fetches the real tree, compares a cheap checksum of the
+fields readers depend on and reseeds on drift, so a missed or misapplied event
+cannot outlive one reconcile interval.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import zlib
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+from .compact_tree import TreeNode, build_compact_tree
+
+logger = logging.getLogger(__name__)
+
+RawTreeFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+ConFactory = Callable[[Dict[str, Any]], Any]
+
+# Window event changes whose payload fully describes the new node state.
+_WINDOW_PROPERTY_CHANGES = frozenset({"title", "mark", "urgent", "fullscreen_mode"})
+
+# Keys never copied from an event container onto the mirrored node: the child
+# lists are owned by the mirror, and the focus stack in an event payload is
+# the node's own, which the mirror already holds.
+_STRUCTURAL_KEYS = frozenset({"nodes", "floating_nodes", "focus"})
+
+
+def _iter_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Depth-first walk over a raw tree, tiling children before floating."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        yield current
+        children = list(current.get("nodes") or []) + list(current.get("floating_nodes") or [])
+        stack.extend(reversed(children))
+
+
+def tree_checksum(raw: Optional[Dict[str, Any]]) -> int:
+    """CRC32 over the tree fields that mirror readers actually consume.
+
+    Geometry and focus stacks are deliberately excluded: they churn on every
+    resize and are re-read from events anyway, so including them would make
+    every reconcile look like drift.
+    """
+    if not raw:
+        return 0
+    crc = 0
+    for node in _iter_nodes(raw):
+        parts = (
+            str(node.get("id")),
+            str(node.get("type")),
+            str(node.get("name")),
+            ",".join(node.get("marks") or ()),
+            "1" if node.get("focused") else "0",
+            str(node.get("fullscreen_mode")),
+            str(node.get("app_id")),
+            str(node.get("pid")),
+            str(len(node.get("nodes") or ())),
+            str(len(node.get("floating_nodes") or ())),
+        )
+        crc = zlib.crc32("\x1f".join(parts).encode("utf-8", "replace"), crc)
+    return crc
+
+
+class SwayTreeMirror:
+    """Daemon-owned copy of the Sway tree kept current from IPC events.
+
+    Example:
+        >>> mirror = SwayTreeMirror(fetch_raw_tree, con_factory)
+        >>> tree = await mirror.get_tree()   # seeds with one GET_TREE
+        >>> mirror.apply_window_event("title", container.ipc_data)
+        >>> tree = await mirror.get_tree()   # no IPC, rebuilt from the mirror
+    """
+
+    def __init__(self, fetch_raw: RawTreeFetcher, con_factory: ConFactory) -> None:
+        """Initialize an unseeded mirror.
+
+        Args:
+            fetch_raw: Coroutine returning the decoded GET_TREE reply
+            con_factory: Builds the reader-facing tree object from a raw root
+        """
+        self._fetch_raw = fetch_raw
+        self._con_factory = con_factory
+        self._raw: Optional[Dict[str, Any]] = None
+        self._nodes: Dict[int, Dict[str, Any]] = {}
+        self._parents: Dict[int, int] = {}
+        self._focused_id: Optional[int] = None
+        self._dirty_reason: Optional[str] = "unseeded"
+        self._tree: Any = None
+        self._tree_generation = -1
+        self._compact: Optional[TreeNode] = None
+        self._compact_generation = -1
+        self._refresh_lock = asyncio.Lock()
+        # Events that arrive while a GET_TREE is in flight may or may not be
+        # reflected in its reply, so they are replayed onto the fresh seed.
+        # Replays are idempotent: property updates overwrite, closes of
+        # already-removed nodes are no-ops, structural ones just re-dirty.
+        self._inflight_events: Optional[list] = None
+
+        self.generation = 0
+        self._hits = 0
+        self._refetches = 0
+        self._events_applied = 0
+        self._events_dirtied = 0
+        self._reconciles = 0
+        self._drift_count = 0
+        self._last_seeded_at: Optional[float] = None
+        self._last_reconcile_at: Optional[float] = None
+
+    @property
+    def is_seeded(self) -> bool:
+        """Whether the mirror holds a tree at all."""
+        return self._raw is not None
+
+    @property
+    def is_dirty(self) -> bool:
+        """Whether the next read must refetch from Sway."""
+        return self._dirty_reason is not None
+
+    def seed(self, raw: Dict[str, Any]) -> None:
+        """Replace the mirrored tree with a freshly fetched GET_TREE reply."""
+        self._raw = raw
+        self._nodes = {}
+        self._parents = {}
+        self._focused_id = None
+        for node in _iter_nodes(raw):
+            node_id = node.get("id")
+            if node_id is None:
+                continue
+            self._nodes[node_id] = node
+            if node.get("focused"):
+                self._focused_id = node_id
+            for child in list(node.get("nodes") or []) + list(node.get("floating_nodes") or []):
+                child_id = child.get("id")
+                if child_id is not None:
+                    self._parents[child_id] = node_id
+        self._dirty_reason = None
+        self._last_seeded_at = time.time()
+        self._bump()
+
+    def mark_dirty(self, reason: str) -> None:
+        """Force the next read to refetch the tree."""
+        if self._dirty_reason is None:
+            logger.debug("Tree mirror dirty: %s", reason)
+            self._dirty_reason = reason
+            self._events_dirtied += 1
+
+    def reset(self) -> None:
+        """Drop all mirrored state (used when the connection is replaced)."""
+        self._raw = None
+        self._nodes = {}
+        self._parents = {}
+        self._focused_id = None
+        self._tree = None
+        self._tree_generation = -1
+        self._compact = None
+        self._compact_generation = -1
+        self._dirty_reason = "reset"
+
+    def _bump(self) -> None:
+        self.generation += 1
+
+    def _workspace_of(self, node_id: Optional[int]) -> Optional[int]:
+        """Walk the parent map up to the enclosing workspace id."""
+        current = node_id
+        while current is not None:
+            node = self._nodes.get(current)
+            if node is not None and node.get("type") == "workspace":
+                return current
+            current = self._parents.get(current)
+        return None
+
+    def _remove_subtree(self, node_id: int) -> bool:
+        node = self._nodes.get(node_id)
+        parent_id = self._parents.get(node_id)
+        parent = self._nodes.get(parent_id) if parent_id is not None else None
+        if node is None or parent is None:
+            return False
+        for key in ("nodes", "floating_nodes"):
+            children = parent.get(key) or []
+            for index, child in enumerate(children):
+                if child is node:
+                    del children[index]
+                    break
+        for descendant in list(_iter_nodes(node)):
+            descendant_id = descendant.get("id")
+            self._nodes.pop(descendant_id, None)
+            self._parents.pop(descendant_id, None)
+            if descendant_id == self._focused_id:
+                self._focused_id = None
+        return True
+
+    def apply_window_event(self, change: str, container: Optional[Dict[str, Any]]) -> None:
+        """Apply one window::<change> event payload to the mirror.
+
+        Args:
+            change: Event change string (new, close, title, focus, ...)
+            container: Raw `container` dict from the event
+        """
+        if self._inflight_events is not None:
+            self._inflight_events.append((self.apply_window_event, (change, container)))
+        if not self.is_seeded or self.is_dirty:
+            return
+        node_id = (container or {}).get("id")
+        node = self._nodes.get(node_id) if node_id is not None else None
+
+        if change == "close":
+            if node_id is not None and node is None:
+                # Already gone (or never mirrored); nothing to undo.
+                return
+            if not self._remove_subtree(node_id):
+                self.mark_dirty(f"window::close:{node_id}")
+                return
+            self._events_applied += 1
+            self._bump()
+            return
+
+        if node is None:
+            self.mark_dirty(f"window::{change}:{node_id}:unknown")
+            return
+
+        if change == "focus":
+            previous_id = self._focused_id
+            if self._workspace_of(previous_id) != self._workspace_of(node_id):
+                # Crossing workspaces changes visibility across whole subtrees.
+                self.mark_dirty("window::focus:workspace")
+                return
+            previous = self._nodes.get(previous_id) if previous_id is not None else None
+            if previous is not None:
+                previous["focused"] = False
+            self._update_properties(node, container)
+            node["focused"] = True
+            self._focused_id = node_id
+            self._events_applied += 1
+            self._bump()
+            return
+
+        if change in _WINDOW_PROPERTY_CHANGES:
+            self._update_properties(node, container)
+            self._events_applied += 1
+            self._bump()
+            return
+
+        self.mark_dirty(f"window::{change}")
+
+    def apply_workspace_event(
+        self,
+        change: str,
+        current: Optional[Dict[str, Any]],
+        old: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Apply one workspace::<change> event payload to the mirror."""
+        if self._inflight_events is not None:
+            self._inflight_events.append((self.apply_workspace_event, (change, current, old)))
+        if not self.is_seeded or self.is_dirty:
+            return
+        node_id = (current or {}).get("id")
+        node = self._nodes.get(node_id) if node_id is not None else None
+        if change in {"rename", "urgent"} and node is not None:
+            for key in ("name", "num", "urgent"):
+                if current and key in current:
+                    node[key] = current[key]
+            self._events_applied += 1
+            self._bump()
+            return
+        self.mark_dirty(f"workspace::{change}")
+
+    def apply_output_event(self, change: str) -> None:
+        """Output add/remove/reconfigure re-parents workspaces; refetch."""
+        if self._inflight_events is not None:
+            self._inflight_events.append((self.apply_output_event, (change,)))
+        if self.is_seeded:
+            self.mark_dirty(f"output::{change}")
+
+    def apply_command(self, payload: str) -> None:
+        """A command may have changed the tree without any event; refetch."""
+        if self._inflight_events is not None:
+            self._inflight_events.append((self.apply_command, (payload,)))
+        if self.is_seeded:
+            self.mark_dirty(f"command:{payload[:40]}")
+
+    @staticmethod
+    def _update_properties(node: Dict[str, Any], container: Optional[Dict[str, Any]]) -> None:
+        for key, value in (container or {}).items():
+            if key not in _STRUCTURAL_KEYS:
+                node[key] = value
+
+    async def _fetch_and_seed(self) -> Dict[str, Any]:
+        self._inflight_events = []
+        try:
+            raw = await self._fetch_raw()
+        finally:
+            replay, self._inflight_events = self._inflight_events, None
+        self.seed(raw)
+        for apply, args in replay:
+            apply(*args)
+        return raw
+
+    async def _refresh(self) -> None:
+        await self._fetch_and_seed()
+        self._refetches += 1
+
+    async def _ensure_current(self, force_refresh: bool) -> None:
+        if force_refresh:
+            self.mark_dirty("forced")
+        if self.is_dirty or not self.is_seeded:
+            async with self._refresh_lock:
+                # Another reader may have refreshed while this one waited.
+                if self.is_dirty or not self.is_seeded:
+                    await self._refresh()
+        else:
+            self._hits += 1
+
+    async def get_tree(self, force_refresh: bool = False) -> Any:
+        """Return the mirrored tree, refetching only if dirty or forced.
+
+        The reader-facing tree object is built once per mirror generation and
+        shared by every reader until the next applied event, so callers must
+        treat it as read-only — the same contract TreeCacheService already has.
+        """
+        await self._ensure_current(force_refresh)
+        if self._tree is None or self._tree_generation != self.generation:
+            self._tree = self._con_factory(self._raw)
+            self._tree_generation = self.generation
+        return self._tree
+
+    async def get_compact_tree(self, force_refresh: bool = False) -> TreeNode:
+        """Return the mirrored tree as a compact TreeNode graph.
+
+        Same freshness and sharing rules as get_tree(), for readers that only
+        need the Con read API and not a connection-bound Con.
+        """
+        await self._ensure_current(force_refresh)
+        if self._compact is None or self._compact_generation != self.generation:
+            self._compact = build_compact_tree(self._raw)
+            self._compact_generation = self.generation
+        return self._compact
+
+    async def reconcile(self, factory: Optional[ConFactory] = None) -> Any:
+        """Compare against a real GET_TREE and reseed on drift.
+
+        Args:
+            factory: Builds the returned tree from the raw reply; defaults to
+                the mirror's con_factory
+
+        Returns:
+            Tree object built from the fresh GET_TREE, so periodic callers that
+            also reconcile daemon state get it without a second fetch.
+        """
+        async with self._refresh_lock:
+            # Checksum under the lock: a refresh finishing in between would
+            # otherwise be counted as drift.
+            trusted = self.is_seeded and not self.is_dirty
+            expected = tree_checksum(self._raw) if trusted else 0
+            raw = await self._fetch_and_seed()
+        self._reconciles += 1
+        self._last_reconcile_at = time.time()
+        if trusted and not self.is_dirty and tree_checksum(raw) != expected:
+            self._drift_count += 1
+            logger.info("Tree mirror drift detected on reconcile; reseeded")
+        return (factory or self._con_factory)(raw)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return mirror counters for status/diagnostics."""
+        return {
+            "seeded": self.is_seeded,
+            "dirty_reason": self._dirty_reason,
+            "generation": self.generation,
+            "node_count": len(self._nodes),
+            "hits": self._hits,
+            "refetches": self._refetches,
+            "events_applied": self._events_applied,
+            "events_dirtied": self._events_dirtied,
+            "reconciles": self._reconciles,
+            "drift_count": self._drift_count,
+            "last_seeded_at": self._last_seeded_at,
+            "last_reconcile_at": self._last_reconcile_at,
+        }
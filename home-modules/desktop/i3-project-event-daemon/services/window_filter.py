@@ -6,40 +6,34 @@ Feature 091: Optimize i3pm Project Switching Performance
 Reads /proc/<pid>/environ to determine window-to-project association.
 Replaces tag-based filtering with environment variable approach.
 
-Feature 091: Parallel command execution using asyncio.gather() for <200ms project switching.
+Feature 091: Hide/restore command batches combined into one IPC message for <200ms project switching.
 """
 
-import asyncio
 import logging
 import subprocess
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict
 from datetime import datetime
 
 # Feature 091: Import performance optimization services
 from ..models.window_command import WindowCommand, CommandBatch, CommandType
-from ..models.performance_metrics import OperationMetrics, ProjectSwitchMetrics
+from ..models.performance_metrics import ProjectSwitchMetrics
 from ..worktree_utils import canonicalize_context_key, parse_mark  # Feature 101
 from .command_batch import CommandBatchService
+from .compact_tree import get_compact_tree
 from .tree_cache import get_tree_cache_for_connection
 from .performance_tracker import PerformanceTrackerService, get_performance_tracker
+from .process_index import get_process_index
 # Feature 101/103: Import window tracer for visibility and filter decision events
 from .window_tracer import get_tracer, TraceEventType
 
 logger = logging.getLogger(__name__)
 
-# PID environ cache: avoids re-reading /proc/<pid>/environ for the same PID
-# within a short window (e.g. during a single get_window_tree call).
-# Maps PID -> (timestamp, env_dict). TTL = 10 seconds.
-_pid_environ_cache: Dict[int, Tuple[float, Dict[str, str]]] = {}
-_PID_ENVIRON_CACHE_TTL = 10.0
-
-
 def clear_pid_environ_cache() -> None:
-    """Clear the PID environ cache. Called when window tree cache is invalidated."""
-    _pid_environ_cache.clear()
+    """Clear the shared process index (cached I3PM environments and PID table)."""
+    get_process_index().clear()
 
 
 def log_restore_workspace_fallback(window_id: int) -> None:
@@ -205,8 +199,8 @@ def read_process_environ_with_fallback(pid: int, max_depth: int = 3) -> Dict[str
     up to parent process to find them (handles edge cases where child
     doesn't inherit environment).
 
-    Uses a short-TTL cache to avoid re-reading /proc/<pid>/environ for
-    the same PID within a single monitoring panel refresh cycle.
+    Served by the shared ProcessIndex: environments are cached per
+    (pid, starttime) and only I3PM_* variables are returned.
 
     Args:
         pid: Process ID
@@ -215,61 +209,7 @@ def read_process_environ_with_fallback(pid: int, max_depth: int = 3) -> Dict[str
     Returns:
         Environment dictionary (may be empty if no I3PM vars found)
     """
-    # Check cache first
-    now = time.time()
-    cached = _pid_environ_cache.get(pid)
-    if cached is not None:
-        cache_time, cache_env = cached
-        if now - cache_time < _PID_ENVIRON_CACHE_TTL:
-            return cache_env
-
-    result = _read_process_environ_with_fallback_uncached(pid, max_depth)
-
-    # Cache the result (even empty dicts, to avoid re-traversing parents)
-    _pid_environ_cache[pid] = (now, result)
-
-    # Evict stale entries periodically (keep cache bounded)
-    if len(_pid_environ_cache) > 100:
-        stale_pids = [p for p, (t, _) in _pid_environ_cache.items() if now - t > _PID_ENVIRON_CACHE_TTL]
-        for p in stale_pids:
-            del _pid_environ_cache[p]
-
-    return result
-
-
-def _read_process_environ_with_fallback_uncached(pid: int, max_depth: int = 3) -> Dict[str, str]:
-    """Uncached implementation of read_process_environ_with_fallback."""
-    current_pid = pid
-    depth = 0
-
-    while current_pid and depth < max_depth:
-        try:
-            env = read_process_environ(current_pid)
-
-            # Check if environment has I3PM variables
-            if "I3PM_APP_ID" in env or "I3PM_APP_NAME" in env:
-                if current_pid != pid:
-                    logger.debug(
-                        f"Found I3PM environment in parent PID {current_pid} "
-                        f"(traversed {depth} levels from PID {pid})"
-                    )
-                return env
-
-            # Try parent process
-            parent_pid = get_parent_pid(current_pid)
-            if parent_pid == current_pid:
-                break  # Avoid infinite loop
-
-            current_pid = parent_pid
-            depth += 1
-
-        except (FileNotFoundError, PermissionError):
-            # Process exited or permission denied
-            break
-
-    # No I3PM environment found
-    logger.debug(f"No I3PM environment found for PID {pid} (traversed {depth} parents)")
-    return {}
+    return get_process_index().environ_with_fallback(pid, max_depth)
 
 
 def get_window_pid(window_id: int) -> Optional[int]:
@@ -671,17 +611,19 @@ async def filter_windows_by_project(
     except Exception as e:
         logger.debug(f"[Trace] Error broadcasting project switch: {e}")
 
-    # Feature 091: Use tree cache to eliminate duplicate queries
+    # Feature 091: Use tree cache to eliminate duplicate queries. The compact
+    # tree is enough here (marks/pid/app_id/floating/rect + workspace links)
+    # and avoids building a full i3ipc Con graph per switch.
+    # The hide path saves floating geometry from this tree, and interactive
+    # drags/resizes emit no event, so force a live GET_TREE over the mirror.
     tree_cache = get_tree_cache_for_connection(conn)
     if tree_cache:
-        tree = await tree_cache.get_tree()
-        cache_hits = 1 if tree_cache.is_cached else 0
-        cache_misses = 0 if tree_cache.is_cached else 1
+        tree = await tree_cache.get_compact_tree(force_refresh=True)
     else:
-        # Fallback: Direct get_tree() if cache not initialized
-        tree = await conn.get_tree()
-        cache_hits = 0
-        cache_misses = 1
+        # Fallback: Direct fetch if cache not initialized
+        tree = await get_compact_tree(conn, force_refresh=True)
+    cache_hits = 0
+    cache_misses = 1
 
     windows = tree.leaves()
 
@@ -1185,10 +1127,11 @@ async def filter_windows_by_project(
     hide_metrics = None
     restore_metrics = None
 
-    # Execute hide commands in parallel
+    # Execute hide commands as combined RUN_COMMAND messages (one round trip
+    # per MAX_COMMANDS_PER_MESSAGE windows instead of one per window)
     if hide_commands:
         hide_start = time.perf_counter()
-        hide_results, hide_metrics = await batch_service.execute_parallel(
+        hide_results, hide_metrics = await batch_service.execute_combined(
             hide_commands, operation_type="hide"
         )
         hide_duration_ms = (time.perf_counter() - hide_start) * 1000
@@ -1200,42 +1143,22 @@ async def filter_windows_by_project(
             error_count += hide_failures
             logger.warning(f"[Feature 091] {hide_failures}/{len(hide_commands)} hide commands failed")
 
-    # Execute restore commands in parallel (as batched commands)
+    # Execute restore batches in lockstep combined rounds
     if restore_batches:
         restore_start = time.perf_counter()
 
-        # Feature 091: Execute all restore batches in parallel using asyncio.gather()
-        # Each batch contains sequential commands for ONE window (move, floating, resize, position)
-        # But we execute ALL window batches concurrently for maximum performance
-        restore_tasks = [batch_service.execute_batch(batch) for batch in restore_batches]
-        restore_results_with_metrics = await asyncio.gather(*restore_tasks, return_exceptions=True)
-
-        # Extract results and handle exceptions
-        restore_results = []
-        for i, result_tuple in enumerate(restore_results_with_metrics):
-            if isinstance(result_tuple, Exception):
-                logger.error(f"[Feature 091] Restore batch {i} failed: {result_tuple}")
-                restore_results.append(
-                    type('Result', (), {'success': False, 'error': str(result_tuple)})()
-                )
-            else:
-                result, _ = result_tuple
-                restore_results.append(result)
+        # Each batch contains sequential commands for ONE window (move, floating,
+        # resize, position). Round N sends the N-th command of every window in a
+        # single message, so per-window ordering matches execute_batch() while the
+        # whole restore costs only as many round trips as the longest batch.
+        restore_results, restore_metrics = await batch_service.execute_batches_combined(
+            restore_batches
+        )
 
         restore_duration_ms = (time.perf_counter() - restore_start) * 1000
-
-        # Create restore metrics
-        restore_metrics = OperationMetrics(
-            operation_type="restore",
-            start_time=datetime.now(),
-            end_time=datetime.now(),
-            duration_ms=restore_duration_ms,
-            window_count=len(restore_batches),
-            command_count=sum(len(b.commands) for b in restore_batches),
-            parallel_batches=len(restore_batches),
-            cache_hits=cache_hits,
-            cache_misses=cache_misses,
-        )
+        restore_metrics.operation_type = "restore"
+        restore_metrics.cache_hits = cache_hits
+        restore_metrics.cache_misses = cache_misses
 
         restore_failures = sum(1 for r in restore_results if not r.success)
         if restore_failures > 0:
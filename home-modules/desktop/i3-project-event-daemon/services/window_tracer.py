@@ -25,10 +25,12 @@ import time
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from enum import Enum
-from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 from collections import deque
 
+from ..event_buffer import events_matching
+from .process_index import get_process_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -787,21 +789,10 @@ class WindowTracer:
 
     def _read_process_environ(self, pid: int) -> Dict[str, str]:
         """Read I3PM_* environment variables from process."""
-        env_vars = {}
         try:
-            environ_path = Path(f"/proc/{pid}/environ")
-            if environ_path.exists():
-                content = environ_path.read_bytes()
-                for entry in content.split(b'\0'):
-                    if entry.startswith(b'I3PM_'):
-                        try:
-                            key, _, value = entry.partition(b'=')
-                            env_vars[key.decode()] = value.decode()
-                        except (ValueError, UnicodeDecodeError):
-                            pass
+            return dict(get_process_index().read_environ(pid))
         except (PermissionError, FileNotFoundError, ProcessLookupError):
-            pass
-        return env_vars
+            return {}
 
     def _matches_window(self, container, matcher: Dict[str, str]) -> bool:
         """Check if a window matches the given matcher criteria."""
@@ -1466,11 +1457,11 @@ class WindowTracer:
             Dict with has_trace, trace_id, trace_event_index, trace_active, window_id
         """
         # Find the event in the buffer
-        event = None
-        for e in event_buffer.events:
-            if e.event_id == event_id:
-                event = e
-                break
+        get_event = getattr(event_buffer, "get_event", None)
+        if get_event is not None:
+            event = get_event(event_id)
+        else:
+            event = next((e for e in event_buffer.events if e.event_id == event_id), None)
 
         if not event:
             return {
@@ -1557,6 +1548,7 @@ class WindowTracer:
             # Add log event references if buffer provided
             if event_buffer is not None:
                 events_with_refs = []
+                window_events = events_matching(event_buffer, window_id=trace.window_id)
                 for te in trace.events:
                     event_dict = {
                         "event_type": te.event_type.value,
@@ -1564,9 +1556,8 @@ class WindowTracer:
                         "description": te.description,
                     }
                     # Find matching log event
-                    for e in event_buffer.events:
-                        if (e.window_id == trace.window_id and
-                            abs(e.timestamp.timestamp() - te.timestamp) < 0.01):
+                    for e in window_events:
+                        if abs(e.timestamp.timestamp() - te.timestamp) < 0.01:
                             event_dict["log_event_id"] = e.event_id
                             break
                     events_with_refs.append(event_dict)
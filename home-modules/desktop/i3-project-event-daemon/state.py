@@ -11,6 +11,7 @@ from i3ipc import aio
 from .models import DaemonState, WindowInfo, WorkspaceInfo
 from .services.launch_registry import LaunchRegistry  # Feature 041: IPC Launch Context - T013
 from .services.focus_tracker import FocusTracker  # Feature 074: Session Management - T021
+from .services.compact_tree import TreeNode
 from .services.window_filter import parse_window_environment, read_process_environ
 from .worktree_utils import (
     canonicalize_context_key,
@@ -240,7 +241,7 @@ class StateManager:
     # NEVER clobbered by reconcile — only set when a window is first ADDED.
     _RECONCILE_TREE_FIELDS = ("workspace", "output", "is_floating", "marks", "window_title")
 
-    def _window_info_from_marked_container(self, container: aio.Con) -> Optional["WindowInfo"]:
+    def _window_info_from_marked_container(self, container: aio.Con | TreeNode) -> Optional["WindowInfo"]:
         """Build a WindowInfo from a marked tree container, or None if unbuildable.
 
         No locking and no window_map mutation — pure construction (may read
@@ -376,20 +377,23 @@ class StateManager:
             )
             return None
 
-    def _scan_marked_into_map(self, tree: aio.Con, *, allow_subtract: bool) -> Dict[str, int]:
+    def _scan_marked_into_map(self, tree: aio.Con | TreeNode, *, allow_subtract: bool) -> Dict[str, int]:
         """Walk the tree and reconcile window_map against marked windows.
 
         Caller MUST hold self._lock. ADDs marked windows missing from the map,
         refreshes only _RECONCILE_TREE_FIELDS on existing entries (never clobbering
         daemon-managed metadata), and — only when allow_subtract — removes tracked
         entries no longer present anywhere in the tree. Returns counts.
+
+        Callers pass the compact TreeNode tree, whose workspace() is a
+        precomputed link rather than a parent walk per marked window.
         """
         seen: set = set()
         added = 0
         updated = 0
         removed = 0
 
-        def scan(container: aio.Con) -> None:
+        def scan(container: aio.Con | TreeNode) -> None:
             nonlocal added, updated
             project_marks = [
                 mark for mark in container.marks if mark.startswith("scoped:") or mark.startswith("global:")
@@ -416,7 +420,9 @@ class StateManager:
                     if container.name:
                         existing.window_title = container.name
                     updated += 1
-            for child in container.nodes + container.floating_nodes:
+            for child in container.nodes:
+                scan(child)
+            for child in container.floating_nodes:
                 scan(child)
 
         scan(tree)
@@ -428,21 +434,21 @@ class StateManager:
 
         return {"added": added, "updated": updated, "removed": removed, "seen": len(seen)}
 
-    async def rebuild_from_marks(self, tree: aio.Con) -> None:
+    async def rebuild_from_marks(self, tree: aio.Con | TreeNode) -> None:
         """Rebuild window_map from i3 tree by scanning for project marks.
 
         Used during daemon startup/reconnection to restore state from marks:
         clear then re-add every marked window.
 
         Args:
-            tree: Root container from i3 GET_TREE (async)
+            tree: Root container from i3 GET_TREE (Con or compact TreeNode)
         """
         async with self._lock:
             self.state.window_map.clear()
             stats = self._scan_marked_into_map(tree, allow_subtract=False)
         logger.info(f"Rebuilt state: found {stats['added']} windows with project marks")
 
-    async def reconcile_from_tree(self, tree: aio.Con, *, allow_subtract: bool = False) -> Dict[str, int]:
+    async def reconcile_from_tree(self, tree: aio.Con | TreeNode, *, allow_subtract: bool = False) -> Dict[str, int]:
         """Non-destructive reconcile of window_map against the live tree.
 
         ADDs marked windows missing from the map (self-heals a window dropped by a
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+pattern_resolver_module = importlib.import_module("i3_project_daemon.pattern_resolver")
+pattern_module = importlib.import_module("i3_project_daemon.pattern")
+window_rules_module = importlib.import_module("i3_project_daemon.window_rules")
+rule_engine_module = importlib.import_module("i3_project_daemon.rule_engine")
+
+ClassificationCache = pattern_resolver_module.ClassificationCache
+classify_window = pattern_resolver_module.classify_window
+PatternRule = pattern_module.PatternRule
+WindowRule = window_rules_module.WindowRule
+WindowRuleList = rule_engine_module.WindowRuleList
+
+SCOPED = {"ghostty", "Code"}
+GLOBAL = {"firefox"}
+
+
+def _rules() -> WindowRuleList:
+    return WindowRuleList([
+        WindowRule(PatternRule("title:^Yazi:", "scoped", 260), workspace=5),
+        WindowRule(PatternRule("Code", "scoped", 250), workspace=2),
+        WindowRule(PatternRule("pwa:YouTube", "global", 200), workspace=4),
+    ])
+
+
+def _classify(cache, rules, window_class, title=""):
+    return classify_window(
+        window_class,
+        title,
+        window_rules=rules,
+        app_classification_scoped=SCOPED,
+        app_classification_global=GLOBAL,
+        cache=cache,
+    )
+
+
+def test_cached_results_match_uncached_precedence():
+    cache = ClassificationCache()
+    rules = _rules()
+    queries = [
+        ("Code", ""), ("Code", "Yazi: ~"), ("ghostty", "zsh"), ("ghostty", "Yazi: /etc"),
+        ("firefox", "Music - YouTube"), ("FFPWA-01ABC", "Music - YouTube"), ("FFPWA-01ABC", "Gmail"),
+        ("unknown", "whatever"),
+    ]
+
+    for _ in range(2):
+        for cls, title in queries:
+            cached = _classify(cache, rules, cls, title)
+            direct = _classify(None, rules, cls, title)
+            assert cached.to_json() == direct.to_json(), (cls, title)
+
+    stats = cache.get_stats()
+    assert stats["misses"] == len(queries)
+    assert stats["hits"] == len(queries)
+
+
+def test_title_churn_shares_one_entry_when_titles_cannot_matter():
+    cache = ClassificationCache()
+    rules = WindowRuleList([WindowRule(PatternRule("Code", "scoped", 250), workspace=2)])
+
+    for i in range(50):
+        _classify(cache, rules, "ghostty", f"tail -f log ({i})")
+
+    assert cache.get_stats()["size"] == 1
+    assert cache.get_stats()["hits"] == 49
+
+
+def test_new_sources_bump_generation():
+    cache = ClassificationCache()
+    rules = _rules()
+    _classify(cache, rules, "Code")
+    generation = cache.generation
+
+    _classify(cache, rules, "Code")
+    assert cache.generation == generation
+
+    reloaded = WindowRuleList([WindowRule(PatternRule("Code", "global", 300), workspace=9)])
+    assert _classify(cache, reloaded, "Code").workspace == 9
+    assert cache.generation == generation + 1
+
+    reloaded.insert(0, WindowRule(PatternRule("Code", "scoped", 400), workspace=7))
+    assert _classify(cache, reloaded, "Code").workspace == 7
+
+    cache.invalidate()
+    assert cache.get_stats()["size"] == 0
+
+
+def test_plain_rule_lists_and_project_classes_bypass():
+    cache = ClassificationCache()
+
+    _classify(cache, list(_rules()), "Code")
+    classify_window("Code", active_project_scoped_classes=["Code"], cache=cache)
+
+    stats = cache.get_stats()
+    assert stats["bypassed"] == 2
+    assert stats["size"] == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ClassificationCache(maxsize=2)
+    rules = WindowRuleList([WindowRule(PatternRule("Code", "scoped", 250), workspace=2)])
+
+    _classify(cache, rules, "a")
+    _classify(cache, rules, "b")
+    _classify(cache, rules, "a")
+    _classify(cache, rules, "c")
+
+    assert cache.get_stats()["evictions"] == 1
+    assert cache.get(("a", None)) is not None
+    assert cache.get(("b", None)) is None
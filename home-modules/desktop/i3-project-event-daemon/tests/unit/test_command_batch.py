@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import importlib
+import importlib.util
+import json
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+command_batch_module = importlib.import_module("i3_project_daemon.services.command_batch")
+connection_module = importlib.import_module("i3_project_daemon.connection")
+window_command_module = importlib.import_module("i3_project_daemon.models.window_command")
+MessageType = importlib.import_module("i3ipc._private").MessageType
+CommandReply = importlib.import_module("i3ipc").CommandReply
+
+CommandBatchService = command_batch_module.CommandBatchService
+SwayCommandPool = connection_module.SwayCommandPool
+WindowCommand = window_command_module.WindowCommand
+CommandBatch = window_command_module.CommandBatch
+CommandType = window_command_module.CommandType
+
+
+def _hide(window_id: int) -> WindowCommand:
+    return WindowCommand(window_id=window_id, command_type=CommandType.MOVE_SCRATCHPAD)
+
+
+class _MockSwaySocket:
+    """Sway-like IPC server: one message at a time, fixed cost per message.
+
+    RUN_COMMAND payloads are split on ';' and answered with one result per
+    sub-command. Commands for windows in ``missing`` fail like Sway's "No
+    matching node"; a sub-command containing ``bogus`` is rejected as
+    unparsable and ends the chain, as Sway does.
+    """
+
+    def __init__(self, path: Path, message_cost: float = 0.002) -> None:
+        self.path = path
+        self.message_cost = message_cost
+        self.missing: set[int] = set()
+        self.messages: list[str] = []
+        self.executed: list[str] = []
+        self._lock = asyncio.Lock()
+        self.server = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _run(self, payload: str) -> list[dict]:
+        replies = []
+        for part in (p.strip() for p in payload.split(";")):
+            if "bogus" in part:
+                replies.append({"success": False, "parse_error": True, "error": "Unknown command"})
+                break
+            con_id = int(part.split("con_id=", 1)[1].split("]", 1)[0])
+            if con_id in self.missing:
+                replies.append({"success": False, "error": "No matching node."})
+            else:
+                self.executed.append(part)
+                replies.append({"success": True})
+        return replies
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                header = await reader.readexactly(14)
+                _magic, length, msg_type = struct.unpack("=6sII", header)
+                payload = (await reader.readexactly(length)).decode() if length else ""
+                async with self._lock:
+                    await asyncio.sleep(self.message_cost)
+                    self.messages.append(payload)
+                    body = self._run(payload) if msg_type == MessageType.COMMAND.value else {}
+                data = json.dumps(body).encode()
+                writer.write(b"i3-ipc" + struct.pack("=II", len(data), msg_type) + data)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+class _PoolConnection:
+    """i3ipc-style ``command()`` over a SwayCommandPool, as the daemon wires it."""
+
+    def __init__(self, pool: SwayCommandPool) -> None:
+        self.pool = pool
+
+    async def command(self, cmd: str) -> list:
+        data = await self.pool.message(MessageType.COMMAND, cmd)
+        return CommandReply._parse_list(json.loads(data))
+
+
+@contextlib.asynccontextmanager
+async def _mock_sway(tmp_path):
+    server = _MockSwaySocket(tmp_path / "sway.sock")
+    await server.start()
+    pool = SwayCommandPool(lambda: str(server.path), general_size=1)
+    await pool.open()
+    try:
+        yield server, CommandBatchService(_PoolConnection(pool))
+    finally:
+        pool.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_combined_maps_reply_array_onto_results(tmp_path):
+    async with _mock_sway(tmp_path) as (server, service):
+        server.missing.add(102)
+
+        results, metrics = await service.execute_combined([_hide(101), _hide(102), _hide(103)], "hide")
+
+        assert len(server.messages) == 1
+        assert [r.window_id for r in results] == [101, 102, 103]
+        assert [r.success for r in results] == [True, False, True]
+        assert results[1].error == "No matching node."
+        assert metrics.parallel_batches == 1
+        assert metrics.command_count == 3
+
+
+@pytest.mark.asyncio
+async def test_combined_resends_commands_after_early_stop(tmp_path, monkeypatch):
+    async with _mock_sway(tmp_path) as (server, service):
+        bogus = _hide(102)
+        monkeypatch.setattr(
+            WindowCommand, "to_sway_command",
+            lambda self: "[con_id=102] bogus" if self is bogus else f"[con_id={self.window_id}] move scratchpad",
+        )
+
+        results, metrics = await service.execute_combined([_hide(101), bogus, _hide(103), _hide(104)])
+
+        assert [r.success for r in results] == [True, False, True, True]
+        assert server.executed == [
+            "[con_id=101] move scratchpad",
+            "[con_id=103] move scratchpad",
+            "[con_id=104] move scratchpad",
+        ]
+        assert metrics.parallel_batches == 2
+
+
+@pytest.mark.asyncio
+async def test_combined_splits_chunk_when_message_fails():
+    class _FlakyConnection:
+        def __init__(self) -> None:
+            self.sent: list[str] = []
+
+        async def command(self, cmd: str) -> list:
+            self.sent.append(cmd)
+            if "con_id=3]" in cmd:
+                raise ConnectionError("socket closed")
+            return [CommandReply({"success": True}) for _ in cmd.split(";")]
+
+    conn = _FlakyConnection()
+    service = CommandBatchService(conn)
+
+    results, _metrics = await service.execute_combined([_hide(i) for i in range(1, 5)])
+
+    assert [r.success for r in results] == [True, True, False, True]
+    assert results[2].error == "socket closed"
+    # [1..4] -> [1,2] ok, [3,4] fails -> [3] fails, [4] ok
+    assert len(conn.sent) == 5
+
+
+@pytest.mark.asyncio
+async def test_batches_combined_keeps_each_window_in_separate_rounds(tmp_path):
+    async with _mock_sway(tmp_path) as (server, service):
+        batches = [
+            CommandBatch.from_window_state(window_id=201, workspace_num=2, is_floating=False),
+            CommandBatch.from_window_state(
+                window_id=202, workspace_num=3, is_floating=True,
+                geometry={"x": 10, "y": 20, "width": 800, "height": 600},
+            ),
+        ]
+
+        results, metrics = await service.execute_batches_combined(batches)
+
+        assert all(r.success for r in results)
+        assert metrics.parallel_batches == max(len(b.commands) for b in batches)
+        for payload in server.messages:
+            targets = [part.split("]", 1)[0] for part in payload.split(";")]
+            assert len(targets) == len(set(targets))
+        assert server.executed.index("[con_id=202] move workspace number 3") < server.executed.index(
+            "[con_id=202] floating enable"
+        )
+
+
+@pytest.mark.asyncio
+async def test_combined_sends_one_message_where_parallel_sends_one_per_command(tmp_path):
+    async with _mock_sway(tmp_path) as (server, service):
+        commands = [_hide(1000 + i) for i in range(40)]
+
+        parallel_results, _ = await service.execute_parallel(commands, "hide")
+        parallel_messages = len(server.messages)
+
+        server.messages.clear()
+        combined_results, _ = await service.execute_combined(commands, "hide")
+
+        assert all(r.success for r in parallel_results + combined_results)
+        assert parallel_messages == 40
+        assert len(server.messages) == 1
+        assert len(server.executed) == 80
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import copy
+import importlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+from i3ipc import Con
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+compact_tree_module = importlib.import_module("i3_project_daemon.services.compact_tree")
+tree_mirror_module = importlib.import_module("i3_project_daemon.services.tree_mirror")
+
+TreeNode = compact_tree_module.TreeNode
+build_compact_tree = compact_tree_module.build_compact_tree
+parse_compact_tree = compact_tree_module.parse_compact_tree
+get_compact_tree = compact_tree_module.get_compact_tree
+SwayTreeMirror = tree_mirror_module.SwayTreeMirror
+
+_RECT = {"x": 0, "y": 0, "width": 800, "height": 600}
+
+
+def _window(con_id: int, name: str, *, app_id: str = "ghostty", marks=(), floating="auto_off") -> dict:
+    return {
+        "id": con_id,
+        "type": "con" if floating == "auto_off" else "floating_con",
+        "name": name,
+        "app_id": app_id,
+        "pid": 1000 + con_id,
+        "marks": list(marks),
+        "focused": False,
+        "floating": floating,
+        "rect": dict(_RECT, x=con_id),
+        "nodes": [],
+        "floating_nodes": [],
+    }
+
+
+def _xwindow(con_id: int) -> dict:
+    node = _window(con_id, "xterm", app_id=None)
+    node["window"] = 4242
+    node["window_properties"] = {"class": "XTerm", "instance": "xterm", "title": "xterm"}
+    return node
+
+
+def _workspace(con_id: int, name: str, nodes: list, floating: list = ()) -> dict:
+    return {
+        "id": con_id,
+        "type": "workspace",
+        "name": name,
+        "num": int(name) if name.isdigit() else -1,
+        "output": "DP-1",
+        "rect": _RECT,
+        "nodes": nodes,
+        "floating_nodes": list(floating),
+    }
+
+
+def _raw_tree() -> dict:
+    split = {
+        "id": 30,
+        "type": "con",
+        "name": None,
+        "layout": "splitv",
+        "rect": _RECT,
+        "nodes": [_window(101, "editor", marks=["scoped:nvim:proj:101"]), _xwindow(102)],
+        "floating_nodes": [],
+    }
+    return {
+        "id": 1,
+        "type": "root",
+        "name": "root",
+        "rect": _RECT,
+        "nodes": [
+            {
+                "id": 2,
+                "type": "output",
+                "name": "__i3",
+                "rect": _RECT,
+                "nodes": [_workspace(3, "__i3_scratch", [], [_window(900, "scratch", floating="user_on")])],
+                "floating_nodes": [],
+            },
+            {
+                "id": 4,
+                "type": "output",
+                "name": "DP-1",
+                "rect": _RECT,
+                "nodes": [
+                    _workspace(10, "1", [_window(100, "shell"), split], [_window(150, "float", floating="user_on")]),
+                    _workspace(20, "2", [_window(200, "browser", app_id="firefox")]),
+                ],
+                "floating_nodes": [],
+            },
+        ],
+        "floating_nodes": [],
+    }
+
+
+def _ids(nodes) -> list:
+    return [node.id for node in nodes]
+
+
+def test_matches_i3ipc_con_read_api():
+    raw = _raw_tree()
+    con = Con(copy.deepcopy(raw), None, None)
+    compact = build_compact_tree(raw)
+
+    assert _ids(compact.leaves()) == _ids(con.leaves())
+    assert _ids(compact.descendants()) == _ids(con.descendants())
+    assert _ids(compact.workspaces()) == _ids(con.workspaces())
+    assert compact.scratchpad().id == con.scratchpad().id == 3
+    assert _ids(compact.find_marked("^scoped:")) == _ids(con.find_marked("^scoped:")) == [101]
+    assert _ids(compact.find_classed("XTerm")) == _ids(con.find_classed("XTerm"))
+
+    for con_id in (100, 101, 102, 150, 200, 900):
+        expected = con.find_by_id(con_id)
+        node = compact.find_by_id(con_id)
+        assert node.workspace().id == expected.workspace().id
+        for attr in ("name", "app_id", "pid", "marks", "floating", "window", "window_class", "window_instance"):
+            assert getattr(node, attr) == getattr(expected, attr), attr
+        assert (node.rect.x, node.rect.width) == (expected.rect.x, expected.rect.width)
+
+
+def test_links_and_index_are_precomputed():
+    compact = build_compact_tree(_raw_tree())
+    editor = compact.find_by_id(101)
+
+    assert editor.workspace() is compact.find_workspace("1")
+    assert editor.output_node().name == "DP-1"
+    assert editor.parent.layout == "splitv"
+    assert compact.find_workspace("2").ipc_data["output"] == "DP-1"
+    # find_by_id stays scoped to the subtree it is called on, as with Con.
+    assert compact.find_workspace("2").find_by_id(101) is None
+    assert not hasattr(editor, "__dict__")
+    with pytest.raises(AttributeError):
+        editor.no_such_field
+
+
+def test_parse_decodes_with_and_without_orjson(monkeypatch):
+    data = json.dumps(_raw_tree()).encode()
+
+    fast = parse_compact_tree(data)
+    monkeypatch.setattr(compact_tree_module, "ORJSON_AVAILABLE", False)
+    plain = parse_compact_tree(data)
+
+    assert _ids(fast.descendants()) == _ids(plain.descendants())
+
+
+@pytest.mark.asyncio
+async def test_mirror_builds_compact_tree_once_per_generation():
+    raw = _raw_tree()
+    fetches = []
+
+    async def fetch() -> dict:
+        fetches.append(1)
+        return copy.deepcopy(raw)
+
+    mirror = SwayTreeMirror(fetch, lambda tree: tree)
+    first = await mirror.get_compact_tree()
+    assert await mirror.get_compact_tree() is first
+
+    renamed = _window(100, "htop")
+    mirror.apply_window_event("title", renamed)
+    second = await mirror.get_compact_tree()
+
+    assert second is not first
+    assert second.find_by_id(100).name == "htop"
+    assert len(fetches) == 1
+
+
+@pytest.mark.asyncio
+async def test_adapter_converts_plain_connection_trees():
+    class _PlainConnection:
+        async def get_tree(self):
+            return Con(_raw_tree(), None, None)
+
+    tree = await get_compact_tree(_PlainConnection())
+
+    assert isinstance(tree, TreeNode)
+    assert tree.find_by_id(200).workspace().name == "2"
@@ -0,0 +1,159 @@
+"""Unit tests for delta-encoded dashboard event subscriptions."""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+delta_module = importlib.import_module("i3_project_daemon.services.dashboard_delta")
+dashboard_service_module = importlib.import_module("i3_project_daemon.services.dashboard_service")
+
+DashboardService = dashboard_service_module.DashboardService
+
+
+class FakeWriter:
+    def __init__(self) -> None:
+        self.lines: list[bytes] = []
+
+    def write(self, data: bytes) -> None:
+        self.lines.append(data)
+
+    def messages(self) -> list[dict]:
+        return [json.loads(line) for line in self.lines]
+
+
+def _session(key: str, status: str = "idle", **fields) -> dict:
+    return {
+        "session_key": key,
+        "agent_status": status,
+        "project_name": "nixos",
+        "pane_id": f"pane-{key}",
+        "title": "x" * 400,
+        **fields,
+    }
+
+
+def _apply(document: dict, params: dict) -> dict:
+    """Client-side application of one dashboard event."""
+    if params.get("encoding") != "delta":
+        return {**document, **params["payload"]}
+    updated = {**document, **params["payload"]}
+    for key, ops in params["patches"].items():
+        updated[key] = delta_module.apply_json_patch(document[key], ops)
+    for key, rows in params["rows"].items():
+        updated[key] = delta_module.apply_row_delta(document[key], rows)
+    return updated
+
+
+def test_json_patch_round_trips_and_escapes_pointers():
+    base = {"a/b": {"x": 1, "gone": True}, "list": [1, 2], "short": [1]}
+    new = {"a/b": {"x": 2, "new~": [3]}, "list": [1, 5], "short": [1, 2]}
+
+    ops = delta_module.json_patch(base, new)
+
+    assert {"op": "replace", "path": "/a~1b/x", "value": 2} in ops
+    assert {"op": "remove", "path": "/a~1b/gone"} in ops
+    assert {"op": "replace", "path": "/short", "value": [1, 2]} in ops
+    assert delta_module.apply_json_patch(base, ops) == new
+
+
+def test_row_delta_upserts_deletes_and_reorders_by_key():
+    base = [_session("a"), _session("b"), _session("c")]
+    new = [_session("c"), _session("a", "working"), _session("d")]
+
+    rows = delta_module.row_delta(base, new, ("session_key",))
+
+    assert [row["session_key"] for row in rows["upsert"]] == ["a", "d"]
+    assert rows["delete"] == ["b"]
+    assert rows["order"] == ["c", "a", "d"]
+    assert delta_module.apply_row_delta(base, rows) == new
+    # Appending keeps the implicit order; rows without identity are refused.
+    assert "order" not in delta_module.row_delta(base, base + [_session("d")], ("session_key",))
+    assert delta_module.row_delta(base, [{"agent_status": "x"}], ("session_key",)) is None
+
+
+def test_encode_key_delta_falls_back_to_full_value_when_smaller():
+    kind, _ = delta_module.encode_key_delta("active_ai_sessions", [_session("a")], [_session("z", title="")])
+    assert kind == "full"
+    assert delta_module.encode_key_delta("outputs", [], [])[0] == "unchanged"
+
+
+@pytest.mark.asyncio
+async def test_delta_subscriber_receives_small_patches_that_rebuild_the_payload():
+    service = DashboardService(
+        runtime_loader=None,
+        display_snapshot=None,
+        build_projects=None,
+        build_focus_state=None,
+        build_herdr_spaces=None,
+        list_launches=None,
+        invalidate_worktree_cache=lambda: None,
+        timestamp=lambda: 42.0,
+    )
+    sessions = [_session(str(index)) for index in range(40)]
+    payloads = []
+
+    async def event_payload(changed_keys):
+        payload = {
+            "generation": service.snapshot_version,
+            "snapshot_version": service.snapshot_version,
+            "active_ai_sessions": [dict(row) for row in sessions],
+        }
+        payloads.append(payload)
+        return payload
+
+    service.event_payload = event_payload
+    full, delta_a, delta_b = FakeWriter(), FakeWriter(), FakeWriter()
+    service.subscribe(full)
+    assert service.subscribe(delta_a, delta=True)["encoding"] == "delta"
+    service.subscribe(delta_b, delta=True)
+
+    await service.notify_state_change("session_changed")
+    sessions[7] = _session("7", "working")
+    await service.notify_state_change("session_changed")
+    sessions.pop(3)
+    await service.notify_state_change("session_changed")
+
+    first, second, third = (message["params"] for message in delta_a.messages())
+    assert first["base_generation"] == 0 and "active_ai_sessions" in first["payload"]
+    assert second["base_generation"] == first["generation"]
+    assert second["patches"]["active_ai_sessions"] == [
+        {"op": "replace", "path": "/7/agent_status", "value": "working"},
+    ]
+    assert third["rows"]["active_ai_sessions"]["delete"] == ["3"]
+    assert len(delta_a.lines[1]) * 20 < len(full.lines[1])
+
+    # Subscribers sharing a base share the encoded bytes.
+    assert all(a is b for a, b in zip(delta_a.lines, delta_b.lines))
+
+    document: dict = {}
+    for message in delta_a.messages():
+        document = _apply(document, message["params"])
+    assert document["active_ai_sessions"] == payloads[-1]["active_ai_sessions"]
+
+    # Re-subscribing resets the base, so the next event carries full keys.
+    service.subscribe(delta_b, delta=True)
+    await service.notify_state_change("session_changed")
+    assert delta_a.messages()[-1]["params"]["unchanged_keys"] == ["active_ai_sessions"]
+    reset = delta_b.messages()[-1]["params"]
+    assert reset["base_generation"] == 0 and "active_ai_sessions" in reset["payload"]
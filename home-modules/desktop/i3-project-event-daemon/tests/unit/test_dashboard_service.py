@@ -195,13 +195,92 @@ async def test_concurrent_notify_state_change_writes_generations_in_order() -> N
     assert generations == [1, 2]
 
 
+class _RecordingPublisher:
+    is_open = True
+
+    def __init__(self) -> None:
+        self.published: list[tuple[int, dict]] = []
+
+    def publish(self, payload: dict, *, generation: int = 0) -> bool:
+        self.published.append((generation, payload))
+        return True
+
+
 @pytest.mark.asyncio
-async def test_notify_state_change_closes_evicted_slow_subscriber() -> None:
+async def test_notify_state_change_keeps_shared_snapshot_current_without_subscribers() -> None:
+    service = _service()
+    publisher = _RecordingPublisher()
+    service.publisher = publisher
+    builds = []
+    original_event_payload = service.event_payload
+
+    async def counting_event_payload(changed_keys):
+        builds.append(list(changed_keys))
+        return await original_event_payload(changed_keys)
+
+    service.event_payload = counting_event_payload  # type: ignore[method-assign]
+
+    # A burst of changes only marks the shared copy dirty; one timer-driven
+    # rebuild covers all of them.
+    for _ in range(5):
+        await service.notify_state_change("session::update")
+    assert builds == [] and publisher.published == []
+    assert service._publish_timer is not None
+
+    service.cancel_pending_publish()
+    assert service._publish_timer is None
+    await service.notify_state_change("session::update")
+    await service._publish_pending()
+    assert len(builds) == 1
+    generation, payload = publisher.published[-1]
+    assert generation == service.snapshot_version == 6
+    assert payload["snapshot_version"] == 6
+
+    # Focus-only events skip the snapshot rebuild; the published copy is the
+    # last snapshot with the lightweight focus fields merged in.
+    await service.notify_state_change("focus::window")
+    await service._publish_pending()
+    generation, payload = publisher.published[-1]
+    assert builds[-1] == ["focus_state"]
+    assert len(publisher.published) == 2
+    assert payload["focus_generation"] == service.focus_generation
+    assert payload["focus_state"]["current_workspace_name"] == "fast"
+    assert "outputs" in payload
+    service.cancel_pending_publish()
+
+
+@pytest.mark.asyncio
+async def test_pending_publish_runs_after_delay() -> None:
+    service = _service()
+    service.publish_delay_ms = 0.0
+    publisher = _RecordingPublisher()
+    service.publisher = publisher
+
+    await service.notify_state_change("session::update")
+    assert publisher.published == []
+
+    async def published():
+        while service._publish_task is None:
+            await asyncio.sleep(0)
+        await service._publish_task
+
+    await asyncio.wait_for(published(), timeout=1.0)
+
+    assert [generation for generation, _payload in publisher.published] == [1]
+
+
+@pytest.mark.asyncio
+async def test_notify_state_change_coalesces_events_for_stalled_subscriber() -> None:
     class SlowWriter(FakeWriter):
         def __init__(self) -> None:
             super().__init__()
             self.closed = False
-            self.transport = SimpleNamespace(get_write_buffer_size=lambda: 2_000_000)
+            self.buffer_size = 2_000_000
+            self.drained = asyncio.Event()
+            self.transport = SimpleNamespace(get_write_buffer_size=lambda: self.buffer_size)
+
+        async def drain(self) -> None:
+            await self.drained.wait()
 
         def close(self) -> None:
             self.closed = True
@@ -211,13 +290,29 @@ async def test_notify_state_change_closes_evicted_slow_subscriber() -> None:
     healthy_writer = FakeWriter()
     service.subscribers = {slow_writer, healthy_writer}  # type: ignore[assignment]
 
+    await service.notify_state_change("focus_changed")
+    await service.notify_state_change("output_changed")
     await service.notify_state_change("focus_changed")
 
-    # The evicted writer is closed so a blocked `dashboard watch` reader sees
-    # EOF and reconnects; the healthy subscriber still received the event.
-    assert service.subscribers == {healthy_writer}
-    assert slow_writer.closed is True
-    assert len(healthy_writer.lines) == 1
+    # The stalled writer stays subscribed; later events wait in its backlog.
+    assert service.subscribers == {slow_writer, healthy_writer}
+    assert slow_writer.closed is False
+    assert len(slow_writer.lines) == 1
+    assert len(healthy_writer.lines) == 3
+
+    slow_writer.buffer_size = 0
+    slow_writer.drained.set()
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+    assert len(slow_writer.lines) == 2
+    merged = json.loads(slow_writer.lines[1].decode("utf-8"))["params"]
+    assert merged["generation"] == 3
+    assert merged["coalesced_from_generation"] == 1
+    assert merged["coalesced_events"] == 2
+    assert set(merged["changed_keys"]) == {"focus_state", "outputs", "active_outputs", "display_layout"}
+    assert "outputs" in merged["payload"] and "focus_state" in merged["payload"]
+    assert not service.fanout.backlogged(slow_writer)
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import random
+import sys
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+event_buffer_module = importlib.import_module("i3_project_daemon.event_buffer")
+models_module = importlib.import_module("i3_project_daemon.models")
+
+EventBuffer = event_buffer_module.EventBuffer
+EventEntry = models_module.EventEntry
+
+_TYPES = ["window::new", "window::focus", "window::title", "workspace::focus", "query::status", "tick"]
+_SOURCES = ["i3", "ipc", "daemon"]
+
+
+def _buffer(max_size: int) -> EventBuffer:
+    buffer = EventBuffer(max_size=max_size, persistence_dir=Path("/nonexistent"))
+    buffer._burst_threshold = float("inf")
+    return buffer
+
+
+async def _fill(buffer: EventBuffer, count: int, rng: random.Random) -> None:
+    for _ in range(count):
+        await buffer.add_event(EventEntry(
+            event_id=buffer.event_counter,
+            event_type=rng.choice(_TYPES),
+            timestamp=datetime.now(),
+            source=rng.choice(_SOURCES),
+            window_id=rng.choice([None, 1, 2, 3, 4]),
+            correlation_id=rng.choice([None, "c1", "c2"]),
+        ))
+
+
+def _naive(events, limit=100, event_type=None, source=None, since_id=None, window_id=None):
+    rows = [
+        e for e in events
+        if (not event_type or e.event_type.startswith(event_type))
+        and (not source or e.source == source)
+        and (since_id is None or e.event_id > since_id)
+        and (window_id is None or e.window_id == window_id)
+    ]
+    return rows[-limit:][::-1]
+
+
+@pytest.mark.asyncio
+async def test_indexed_queries_match_full_scan_across_evictions():
+    rng = random.Random(9)
+    buffer = _buffer(max_size=300)
+    await _fill(buffer, 1000, rng)
+
+    assert len(buffer.events) == 300
+    for _ in range(300):
+        query = {
+            "limit": rng.choice([1, 10, 100, 500]),
+            "event_type": rng.choice([None, "window", "window::focus", "work", "nope"]),
+            "source": rng.choice([None, *_SOURCES]),
+            "since_id": rng.choice([None, 800, 990]),
+            "window_id": rng.choice([None, 2, 7]),
+        }
+        assert buffer.get_events(**query) == _naive(buffer.events, **query), query
+
+    assert all(len(seqs) for index in buffer._indexes.values() for seqs in index.values())
+    assert sum(len(seqs) for seqs in buffer._indexes["source"].values()) == 300
+
+
+@pytest.mark.asyncio
+async def test_lookup_by_id_window_trace_and_correlation():
+    buffer = _buffer(max_size=10)
+    await _fill(buffer, 15, random.Random(3))
+    newest = buffer.events[-1]
+
+    assert buffer.get_event(newest.event_id) is newest
+    assert buffer.get_event(0) is None  # evicted
+
+    by_window = buffer.get_events_by(window_id=2)
+    assert by_window == [e for e in buffer.events if e.window_id == 2]
+
+    either = buffer.get_events_by(window_id=2, correlation_id="c1")
+    assert either == [e for e in buffer.events if e.window_id == 2 or e.correlation_id == "c1"]
+    assert event_buffer_module.events_matching(
+        type("Plain", (), {"events": list(buffer.events)})(), window_id=2
+    ) == by_window
+
+
+@pytest.mark.asyncio
+async def test_direct_mutation_and_prune_resync_indexes():
+    buffer = _buffer(max_size=50)
+    await _fill(buffer, 20, random.Random(4))
+
+    buffer.events = deque(list(buffer.events)[10:], maxlen=50)
+    assert buffer.get_events(limit=100) == _naive(buffer.events, limit=100)
+
+    await buffer.prune_old_events()
+    buffer.clear()
+    assert buffer.get_events() == []
+    assert buffer.get_event(19) is None
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_append_stops_costing_once_evicted():
+    buffer = _buffer(max_size=10)
+    rng = random.Random(5)
+    await _fill(buffer, 5, rng)
+    # A handler stamped its id, then awaited while a later event landed first.
+    late = EventEntry(event_id=buffer.event_counter, event_type="window::new", timestamp=datetime.now(), source="i3")
+    await _fill(buffer, 2, rng)
+    await buffer.add_event(late)
+
+    assert buffer._out_of_order_seqs
+    assert buffer.get_events(since_id=4) == _naive(buffer.events, since_id=4)
+
+    await _fill(buffer, 10, rng)
+    assert not buffer._out_of_order_seqs
+    assert buffer.get_events(since_id=10) == _naive(buffer.events, since_id=10)
+
+
+class _CountingDict(dict):
+    """dict that counts item lookups (rows the query examined)."""
+
+    lookups = 0
+
+    def __getitem__(self, key):
+        self.lookups += 1
+        return super().__getitem__(key)
+
+
+@pytest.mark.asyncio
+async def test_20k_buffer_queries_examine_only_matching_rows():
+    rng = random.Random(20)
+    buffer = _buffer(max_size=20000)
+    await _fill(buffer, 20000, rng)
+    # A rare window whose events are spread across the whole buffer.
+    for event in list(buffer.events)[::1000]:
+        event.window_id = 99
+    buffer._rebuild_indexes()
+    buffer._by_seq = _CountingDict(buffer._by_seq)
+
+    indexed = buffer.get_events(limit=100, window_id=99)
+    window_rows = buffer._by_seq.lookups
+    latest = buffer.get_events(limit=50, event_type="window::new")
+
+    assert indexed == _naive(buffer.events, limit=100, window_id=99)
+    assert len(indexed) == 20
+    assert latest == _naive(buffer.events, limit=50, event_type="window::new")
+    # Each query touches its results only, not the 20k-event ring.
+    assert window_rows == 20
+    assert buffer._by_seq.lookups - window_rows == 50
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+fanout_module = importlib.import_module("i3_project_daemon.services.event_fanout")
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+models_module = importlib.import_module("i3_project_daemon.models")
+state_module = importlib.import_module("i3_project_daemon.state")
+
+SubscriberFanout = fanout_module.SubscriberFanout
+EventEntry = models_module.EventEntry
+
+
+class _Writer:
+    def __init__(self, buffer_size=0):
+        self.chunks = []
+        self.write_calls = 0
+        self.closed = False
+        self.transport = SimpleNamespace(get_write_buffer_size=lambda: buffer_size)
+
+    def write(self, data):
+        self.write_calls += 1
+        self.chunks.append(data)
+
+    def writelines(self, chunks):
+        self.write_calls += 1
+        self.chunks.extend(chunks)
+
+    def close(self):
+        self.closed = True
+
+
+def _entry(event_id=1, **fields):
+    return EventEntry(
+        event_id=event_id,
+        event_type="window::title",
+        timestamp=datetime(2026, 1, 2, 3, 4, 5),
+        source="i3",
+        **fields,
+    )
+
+
+def test_event_entry_encoding_keeps_field_order_and_drops_none():
+    line = fanout_module.encode_event_entry(
+        _entry(window_id=42, window_title="shell", query_params={1: "x"}, client_pid=9)
+    )
+    assert line.endswith(b"\n")
+    message = json.loads(line)
+
+    assert message["method"] == "event"
+    assert list(message["params"]) == [
+        "event_id",
+        "event_type",
+        "timestamp",
+        "source",
+        "window_id",
+        "window_title",
+        "query_params",
+        "processing_duration_ms",
+    ]
+    assert message["params"]["timestamp"] == "2026-01-02T03:04:05"
+    assert message["params"]["query_params"] == {"1": "x"}
+
+
+@pytest.mark.asyncio
+async def test_fanout_batches_a_burst_into_one_write_per_subscriber():
+    evicted = []
+    writers = [_Writer(), _Writer()]
+    slow = _Writer(buffer_size=2_000_000)
+    fanout = SubscriberFanout("event", on_evict=evicted.append)
+
+    for event_id in range(5):
+        fanout.publish(writers + [slow], fanout_module.encode_event_entry(_entry(event_id)))
+    assert all(writer.write_calls == 0 for writer in writers)
+    await asyncio.sleep(0)
+
+    for writer in writers:
+        assert writer.write_calls == 1
+        assert [json.loads(chunk)["params"]["event_id"] for chunk in writer.chunks] == [0, 1, 2, 3, 4]
+    # Every subscriber received the very same bytes objects.
+    assert all(a is b for a, b in zip(writers[0].chunks, writers[1].chunks))
+    assert evicted == [slow] and slow.closed
+    assert fanout.get_stats()["batched_writes"] == 3
+
+
+class _StallingWriter(_Writer):
+    def __init__(self):
+        super().__init__(buffer_size=2_000_000)
+        self.buffer_size = 2_000_000
+        self.transport = SimpleNamespace(get_write_buffer_size=lambda: self.buffer_size)
+        self.drained = asyncio.Event()
+
+    async def drain(self):
+        await self.drained.wait()
+
+
+async def _settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_stalled_subscriber_keeps_bounded_backlog_and_gets_resync_marker():
+    stalled = _StallingWriter()
+    line_size = len(fanout_module.encode_event_entry(_entry(0)))
+    fanout = SubscriberFanout("event", max_queue_bytes=line_size * 3)
+
+    fanout.publish([stalled], fanout_module.encode_event_entry(_entry(0)), flush=True)
+    for event_id in range(1, 6):
+        fanout.publish([stalled], fanout_module.encode_event_entry(_entry(event_id)))
+    await _settle()
+    assert fanout.backlogged(stalled) and not stalled.closed
+    assert fanout.get_stats()["dropped"] == 2
+
+    stalled.buffer_size = 0
+    stalled.drained.set()
+    await _settle()
+
+    params = [json.loads(chunk)["params"] for chunk in stalled.chunks]
+    assert params[1] == {"event_type": "subscription::resync", "source": "daemon", "dropped": 2}
+    assert [item["event_id"] for item in params[2:]] == [3, 4, 5]
+    assert not fanout.backlogged(stalled)
+
+
+@pytest.mark.asyncio
+async def test_subscriber_stalled_past_the_limit_is_evicted():
+    evicted = []
+    stalled = _StallingWriter()
+    fanout = SubscriberFanout("event", max_stall_seconds=0.01, on_evict=evicted.append)
+
+    fanout.publish([stalled], fanout_module.encode_event_entry(_entry(0)), flush=True)
+    await asyncio.sleep(0.05)
+
+    assert evicted == [stalled] and stalled.closed
+    assert not fanout.backlogged(stalled)
+
+
+@pytest.mark.asyncio
+async def test_broadcast_event_entry_encodes_only_with_subscribers(monkeypatch):
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    encoded = []
+    original = ipc_server_module.encode_event_entry
+
+    def counting_encode(entry):
+        encoded.append(entry.event_id)
+        return original(entry)
+
+    monkeypatch.setattr(ipc_server_module, "encode_event_entry", counting_encode)
+    await server.broadcast_event_entry(_entry(1))
+    assert encoded == []
+
+    writers = [_Writer() for _ in range(3)]
+    server.subscribed_clients = set(writers)
+    await server.broadcast_event_entry(_entry(2, window_id=7))
+    server.event_fanout.flush()
+
+    assert encoded == [2]
+    for writer in writers:
+        assert json.loads(writer.chunks[0])["params"]["window_id"] == 7
+
+
+@pytest.mark.asyncio
+async def test_per_event_work_is_flat_in_subscriber_count(monkeypatch):
+    events = [_entry(event_id, window_id=event_id, window_title=f"title {event_id}") for event_id in range(1000)]
+    encoded = []
+    original = ipc_server_module.encode_event_entry
+
+    def counting_encode(entry):
+        encoded.append(entry.event_id)
+        return original(entry)
+
+    monkeypatch.setattr(ipc_server_module, "encode_event_entry", counting_encode)
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    writers = [_Writer() for _ in range(20)]
+    server.subscribed_clients = set(writers)
+    for entry in events:
+        await server.broadcast_event_entry(entry)
+    server.event_fanout.flush()
+
+    # One encode per event whatever the subscriber count, and one batched
+    # write per subscriber for the whole burst.
+    assert len(encoded) == len(events)
+    assert [writer.write_calls for writer in writers] == [1] * 20
+    assert all(writer.chunks == writers[0].chunks for writer in writers)
+    assert len(writers[0].chunks) == len(events)
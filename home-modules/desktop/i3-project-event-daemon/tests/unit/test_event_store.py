@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+event_store_module = importlib.import_module("i3_project_daemon.services.event_store")
+event_buffer_module = importlib.import_module("i3_project_daemon.event_buffer")
+models_module = importlib.import_module("i3_project_daemon.models")
+
+EventStore = event_store_module.EventStore
+EventBuffer = event_buffer_module.EventBuffer
+EventEntry = models_module.EventEntry
+
+
+def _event(event_id: int, event_type: str = "window::new", **kwargs) -> EventEntry:
+    kwargs.setdefault("timestamp", datetime.now())
+    kwargs.setdefault("source", "i3")
+    return EventEntry(event_id=event_id, event_type=event_type, **kwargs)
+
+
+def _columns(path: Path, table: str) -> set:
+    with sqlite3.connect(path) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+@pytest.mark.asyncio
+async def test_migrations_apply_once_in_wal_mode(tmp_path):
+    path = tmp_path / "events.db"
+    for _ in range(2):
+        store = EventStore(path)
+        await store.start()
+        await store.close()
+
+    assert {"systemd_unit", "process_start_time", "correlation_id"} <= _columns(path, "event_log")
+    assert "parent_event_id" in _columns(path, "event_correlations")
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        applied = [name for (name,) in conn.execute("SELECT name FROM schema_migrations ORDER BY name")]
+    assert applied == [
+        "000_create_event_log",
+        "029_add_correlation_tables",
+        "029_add_systemd_proc_fields",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_writer_batches_and_round_trips_events(tmp_path):
+    store = EventStore(tmp_path / "events.db", flush_interval=0.05)
+    await store.start()
+    try:
+        store.enqueue(_event(1, window_id=7, window_class="Code", query_params={"a": 1}))
+        store.enqueue(_event(2, "systemd::service::start", source="systemd", systemd_unit="app-x.service"))
+        store.enqueue(_event(3, "workspace::focus", window_id=7))
+        await asyncio.sleep(0.2)
+
+        stats = store.get_stats()
+        assert stats["pending"] == 0 and stats["written"] == 3
+        assert stats["flushes"] == 1
+
+        newest = await store.query(limit=10)
+        assert [e.event_id for e in newest] == [3, 2, 1]
+        assert newest[2].window_class == "Code"
+        assert newest[2].query_params == {"a": 1}
+
+        assert [e.event_id for e in await store.query(event_type="window")] == [1]
+        assert [e.event_id for e in await store.query(event_type="w")] == [3, 1]
+        assert [e.event_id for e in await store.query(source="systemd")] == [2]
+        assert [e.event_id for e in await store.query(window_id=7, limit=1)] == [3]
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_flushed_events_survive_without_close(tmp_path):
+    path = tmp_path / "events.db"
+    store = EventStore(path, flush_interval=60)
+    await store.start()
+    store.enqueue(_event(1))
+    await store.flush()
+    store.enqueue(_event(2))  # never flushed: lost in a crash
+
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT buffer_event_id FROM event_log").fetchall() == [(1,)]
+    await store.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM event_log").fetchone()[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_retention_prunes_in_sql(tmp_path):
+    store = EventStore(tmp_path / "events.db", retention_days=7)
+    await store.start()
+    try:
+        store.enqueue(_event(1, timestamp=datetime.now() - timedelta(days=10)))
+        store.enqueue(_event(2))
+        await store.flush()
+
+        assert await store.prune() == 1
+        assert [e.event_id for e in await store.query()] == [2]
+        assert store.get_stats()["pruned"] == 1
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_buffer_queries_continue_into_store(tmp_path):
+    store = EventStore(tmp_path / "events.db", flush_interval=60)
+    await store.start()
+    buffer = EventBuffer(max_size=10, persistence_dir=Path("/nonexistent"), store=store)
+    buffer._burst_threshold = float("inf")
+    base = datetime.now() - timedelta(minutes=5)
+    try:
+        for i in range(30):
+            await buffer.add_event(_event(
+                buffer.event_counter,
+                "window::new" if i % 2 else "workspace::focus",
+                timestamp=base + timedelta(seconds=i),
+            ))
+        await store.flush()
+
+        assert len(buffer.get_events(limit=25)) == 10
+        events = await buffer.get_events_with_history(limit=25)
+        assert [e.event_id for e in events] == list(range(29, 4, -1))
+
+        windows = await event_buffer_module.query_events(buffer, limit=100, event_type="window")
+        assert [e.event_id for e in windows] == list(range(29, 0, -2))
+
+        # since_id is a live cursor and stays in memory
+        assert len(await buffer.get_events_with_history(limit=25, since_id=0)) == 10
+        assert buffer.get_stats()["store"]["written"] == 30
+    finally:
+        await store.close()
+
+
+@pytest.mark.asyncio
+async def test_event_ids_are_namespaced_per_daemon_run(tmp_path):
+    store = EventStore(tmp_path / "events.db", flush_interval=60)
+    await store.start()
+    base = datetime.now() - timedelta(minutes=5)
+    try:
+        previous = EventBuffer(max_size=10, persistence_dir=Path("/nonexistent"), store=store)
+        previous._burst_threshold = float("inf")
+        for i in range(3):
+            await previous.add_event(_event(previous.event_counter, timestamp=base + timedelta(seconds=i)))
+
+        # A restarted daemon hands out the same event ids again
+        buffer = EventBuffer(max_size=10, persistence_dir=Path("/nonexistent"), store=store)
+        buffer._burst_threshold = float("inf")
+        assert buffer.boot_id != previous.boot_id
+        for i in range(3):
+            await buffer.add_event(_event(buffer.event_counter, timestamp=base + timedelta(minutes=1, seconds=i)))
+        await store.flush()
+
+        events = await buffer.get_events_with_history(limit=10)
+        assert [(e.boot_id, e.event_id) for e in events] == (
+            [(buffer.boot_id, i) for i in (2, 1, 0)]
+            + [(previous.boot_id, i) for i in (2, 1, 0)]
+        )
+
+        # Stored copies of events still in the ring are not returned twice
+        buffer.events[0].timestamp = base + timedelta(minutes=2)
+        events = await buffer.get_events_with_history(limit=10)
+        assert len(events) == len({(e.boot_id, e.event_id) for e in events}) == 6
+    finally:
+        await store.close()
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+subscriptions_module = importlib.import_module("i3_project_daemon.services.event_subscriptions")
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+models_module = importlib.import_module("i3_project_daemon.models")
+state_module = importlib.import_module("i3_project_daemon.state")
+
+EventFilter = subscriptions_module.EventFilter
+EventSubscriptions = subscriptions_module.EventSubscriptions
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Writer:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    def events(self):
+        lines = b"".join(self.chunks).splitlines()
+        return [json.loads(line)["params"]["event_type"] for line in lines]
+
+
+def _event(event_type, source="i3", **fields):
+    return {"event_type": event_type, "source": source, **fields}
+
+
+def test_filter_params_are_normalized_and_validated():
+    event_filter = EventFilter.from_params({
+        "event_types": ["window", "window", "workspace::focus"],
+        "sources": "i3",
+        "window_id": "42",
+        "max_rate": 5,
+    })
+    assert event_filter.event_types == ("window", "workspace::focus")
+    assert event_filter.sources == {"i3"}
+    assert event_filter.window_id == 42
+    assert not EventFilter.from_params({"event_types": ["*"]}).selects
+
+    for bad in ({"window_id": "x"}, {"max_rate": 0}, {"event_types": 3}):
+        with pytest.raises(ValueError):
+            EventFilter.from_params(bad)
+
+
+def test_type_prefixes_match_per_category():
+    event_filter = EventFilter.from_params({"event_types": ["window", "workspace::fo"]})
+
+    assert event_filter.matches(_event("window::new"))
+    assert event_filter.matches(_event("workspace::focus"))
+    assert event_filter.matches({"type": "window"})
+    assert not event_filter.matches(_event("windows::x"))
+    assert not event_filter.matches(_event("workspace::init"))
+    assert not event_filter.matches(_event("mark::injection"))
+
+
+def test_targets_use_index_and_window_context():
+    windows = {7: ("nixos", "nixos::local::host")}
+    subscriptions = EventSubscriptions(resolve_window=lambda window_id: windows.get(window_id, ("", "")))
+    everything, titles, window, project, ipc = (object() for _ in range(5))
+    subscriptions.set(titles, EventFilter.from_params({"event_types": ["window::title"]}))
+    subscriptions.set(window, EventFilter.from_params({"window_id": 9}))
+    subscriptions.set(project, EventFilter.from_params({"project": "nixos"}))
+    subscriptions.set(ipc, EventFilter.from_params({"sources": ["ipc"]}))
+    subscribers = {everything, titles, window, project, ipc}
+
+    assert set(subscriptions.targets(_event("window::title", window_id=7), subscribers)) == {
+        everything, titles, project,
+    }
+    assert set(subscriptions.targets(_event("mark::injection", mark_window_id=9), subscribers)) == {
+        everything, window,
+    }
+    assert set(subscriptions.targets(_event("query::status", source="ipc"), subscribers)) == {everything, ipc}
+
+    subscriptions.discard(titles)
+    assert titles in subscriptions.targets(_event("output"), subscribers)
+    assert subscriptions.get_stats()["filtered_subscribers"] == 3
+
+
+def test_max_rate_drops_events_over_the_bucket():
+    clock = _Clock()
+    subscriptions = EventSubscriptions(clock=clock)
+    writer = object()
+    subscriptions.set(writer, EventFilter.from_params({"max_rate": 2}))
+
+    delivered = sum(bool(subscriptions.targets(_event("window::title"), {writer})) for _ in range(10))
+    assert delivered == 2
+    clock.now += 1.0
+    delivered = sum(bool(subscriptions.targets(_event("window::title"), {writer})) for _ in range(10))
+    assert delivered == 2
+    assert subscriptions.get_stats()["rate_limited"] == 16
+
+
+@pytest.mark.asyncio
+async def test_subscribe_events_filters_broadcast_before_encoding(monkeypatch):
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    focus_panel, follower = _Writer(), _Writer()
+
+    result = await server._subscribe_events({"event_types": ["workspace"]}, focus_panel)
+    assert result == {"subscribed": True, "filter": EventFilter(event_types=("workspace",)).to_json()}
+    assert await server._subscribe_events({}, follower) == "subscribed"
+
+    encoded = []
+    original = ipc_server_module.encode_event_entry
+    monkeypatch.setattr(
+        ipc_server_module,
+        "encode_event_entry",
+        lambda entry: encoded.append(entry.event_type) or original(entry),
+    )
+    for event_id, event_type in enumerate(["window::title", "workspace::focus", "window::title"]):
+        await server.broadcast_event_entry(models_module.EventEntry(
+            event_id=event_id,
+            event_type=event_type,
+            timestamp=datetime(2026, 1, 1),
+            source="i3",
+        ))
+    server.event_fanout.flush()
+
+    assert focus_panel.events() == ["workspace::focus"]
+    assert follower.events() == ["window::title", "workspace::focus", "window::title"]
+
+    # With only the filtered panel left, non-matching events are never encoded.
+    await server._subscribe_events({"subscribe": False}, follower)
+    encoded.clear()
+    await server.broadcast_event_entry(models_module.EventEntry(
+        event_id=9, event_type="window::title", timestamp=datetime(2026, 1, 1), source="i3",
+    ))
+    assert encoded == []
+    assert server.event_subscriptions.get(follower) is None
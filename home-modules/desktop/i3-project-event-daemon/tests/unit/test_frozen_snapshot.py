@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import importlib
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+frozen_module = importlib.import_module("i3_project_daemon.services.frozen_snapshot")
+herdr_service_module = importlib.import_module("i3_project_daemon.services.herdr_service")
+event_fanout_module = importlib.import_module("i3_project_daemon.services.event_fanout")
+
+freeze = frozen_module.freeze
+patch_rows = frozen_module.patch_rows
+HerdrService = herdr_service_module.HerdrService
+
+
+def _service() -> HerdrService:
+    return HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+        snapshot_cache_ttl=60.0,
+    )
+
+
+def _snapshot(rows: int) -> dict:
+    def row(index: int) -> dict:
+        return {
+            "pane_id": f"p{index}",
+            "session_key": f"local:p{index}",
+            "agent_status": "idle",
+            "focus_target": {"method": "herdr.pane.focus", "params": {"pane_id": f"p{index}"}},
+            "state_labels": {"idle": "Idle"},
+        }
+
+    return {
+        "success": True,
+        "sessions": [row(index) for index in range(rows)],
+        "panes": [row(index) for index in range(rows)],
+        "agents": [row(index) for index in range(rows)],
+        "tabs": [{"tab_id": f"t{index}", "panes": [f"p{index}"]} for index in range(rows)],
+        "remote_snapshots": [],
+    }
+
+
+def test_frozen_values_behave_like_json_containers_but_reject_edits():
+    frozen = freeze({"rows": [{"id": 1, "tags": ["a"]}]})
+
+    assert isinstance(frozen, dict) and isinstance(frozen["rows"], list)
+    assert json.loads(json.dumps(frozen)) == {"rows": [{"id": 1, "tags": ["a"]}]}
+    assert json.loads(event_fanout_module.encode_line(frozen)) == {"rows": [{"id": 1, "tags": ["a"]}]}
+    for edit in (
+        lambda: frozen.__setitem__("x", 1),
+        lambda: frozen["rows"].append({}),
+        lambda: frozen["rows"][0].update(id=2),
+        lambda: frozen["rows"][0]["tags"].sort(),
+    ):
+        with pytest.raises(TypeError):
+            edit()
+
+    thawed = copy.deepcopy(frozen)
+    thawed["rows"][0]["tags"].append("b")
+    assert type(thawed["rows"][0]) is dict
+    assert freeze(frozen) is frozen
+
+
+def test_patch_rows_path_copies_only_changed_rows():
+    rows = freeze([{"pane_id": "a", "n": 1}, {"pane_id": "b", "n": 1}])
+
+    patched, matched = patch_rows(rows, lambda row: {"n": 2} if row["pane_id"] == "b" else None)
+
+    assert matched
+    assert patched[0] is rows[0]
+    assert patched[1] == {"pane_id": "b", "n": 2}
+    assert rows[1]["n"] == 1
+
+
+def test_status_event_patch_shares_untouched_rows_with_previous_snapshot():
+    service = _service()
+    service.store_snapshot(_snapshot(3), now=time.time())
+    before = service.snapshot_cache
+
+    result = service.apply_status_event_cache({"data": {"pane_id": "p1", "agent_status": "working"}})
+
+    after = service.snapshot_cache
+    assert result == {"applied": True, "cache_updated": True}
+    assert after is not before
+    assert after["sessions"][1]["agent_status"] == "working"
+    assert before["sessions"][1]["agent_status"] == "idle"
+    assert after["sessions"][0] is before["sessions"][0]
+    assert after["tabs"] is before["tabs"]
+
+
+def test_cached_snapshot_read_copies_only_the_top_level(monkeypatch):
+    service = _service()
+    service.store_snapshot(_snapshot(1000), now=time.time())
+    cache = service.snapshot_cache
+    deepcopies = []
+    monkeypatch.setattr(herdr_service_module.copy, "deepcopy", lambda value, *args: deepcopies.append(value))
+
+    reads = [service.cached_snapshot(now=time.time(), has_remote_targets=False) for _ in range(200)]
+
+    # Each read is a fresh top-level dict over the same frozen row tuples:
+    # its cost depends on the number of keys, not the number of rows.
+    assert deepcopies == []
+    assert all(read is not cache for read in reads)
+    assert all(read[key] is cache[key] for read in reads for key in cache)
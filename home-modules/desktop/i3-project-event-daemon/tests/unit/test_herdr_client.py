@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+herdr_client_module = importlib.import_module("i3_project_daemon.services.herdr_client")
+
+HerdrConnection = herdr_client_module.HerdrConnection
+
+
+class FakeHerdr:
+    """Unix-socket Herdr stand-in; ``respond(request, writer)`` answers each line."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.connections = []
+        self.writers = []
+        self._tmp = tempfile.TemporaryDirectory(prefix="herdr")
+        self.path = Path(self._tmp.name) / "api.sock"
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        for writer in self.writers:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+        self._tmp.cleanup()
+
+    async def _handle(self, reader, writer):
+        requests = []
+        self.connections.append(requests)
+        self.writers.append(writer)
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                requests.append(request)
+                await self.respond(request, writer)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+def _reply(writer, request, result):
+    writer.write(json.dumps({"id": request["id"], "result": result}).encode() + b"\n")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_connection_and_route_by_id():
+    held = []
+
+    async def respond(request, writer):
+        # Answer in reverse order once all three have arrived.
+        held.append(request)
+        if len(held) == 3:
+            for pending in reversed(held):
+                _reply(writer, pending, {"method": pending["method"]})
+
+    async with FakeHerdr(respond) as herdr:
+        connection = HerdrConnection(lambda: herdr.path, name="rpc")
+        results = await asyncio.gather(*(
+            connection.request(method, timeout=2.0)
+            for method in ("pane.get", "tab.focus", "agent.focus")
+        ))
+        await connection.close()
+
+    assert [result["result"]["method"] for result in results] == ["pane.get", "tab.focus", "agent.focus"]
+    assert len(herdr.connections) == 1
+    assert connection.stats["connects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_in_flight_window_is_bounded():
+    outstanding = {"now": 0, "max": 0}
+
+    async def respond(request, writer):
+        outstanding["now"] += 1
+        outstanding["max"] = max(outstanding["max"], outstanding["now"])
+
+        async def later():
+            await asyncio.sleep(0.01)
+            outstanding["now"] -= 1
+            _reply(writer, request, {})
+
+        asyncio.create_task(later())
+
+    async with FakeHerdr(respond) as herdr:
+        connection = HerdrConnection(lambda: herdr.path, name="rpc", max_in_flight=2)
+        await asyncio.gather(*(connection.request("pane.get", timeout=2.0) for _ in range(6)))
+        await connection.close()
+
+    assert outstanding["max"] == 2
+
+
+@pytest.mark.asyncio
+async def test_dropped_connection_fails_pending_and_next_call_reconnects():
+    async def respond(request, writer):
+        if request["method"] == "drop":
+            writer.close()
+            return
+        _reply(writer, request, {"ok": True})
+
+    async with FakeHerdr(respond) as herdr:
+        connection = HerdrConnection(lambda: herdr.path, name="rpc")
+        with pytest.raises(ConnectionError):
+            await connection.request("drop", timeout=2.0)
+        result = await connection.request("pane.get", timeout=2.0)
+        await connection.close()
+
+    assert result["result"] == {"ok": True}
+    assert len(herdr.connections) == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_connect_backs_off_and_fails_fast(tmp_path):
+    connection = HerdrConnection(lambda: tmp_path / "missing.sock", name="rpc", initial_backoff=60.0)
+
+    with pytest.raises(OSError):
+        await connection.request("pane.get", timeout=1.0)
+    with pytest.raises(ConnectionError, match="backing off"):
+        await connection.request("pane.get", timeout=1.0)
+
+    assert connection.stats["connect_failures"] == 1
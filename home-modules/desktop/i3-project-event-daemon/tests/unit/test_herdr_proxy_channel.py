@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+herdr_service_module = importlib.import_module("i3_project_daemon.services.herdr_service")
+herdr_proxy_channel_module = importlib.import_module("i3_project_daemon.services.herdr_proxy_channel")
+
+HerdrService = herdr_service_module.HerdrService
+HerdrProxyChannel = herdr_proxy_channel_module.HerdrProxyChannel
+
+
+# Stand-in for `i3pm herdr-proxy serve --stdio` on the far end of the pipe.
+FAKE_PROXY = r"""
+import json, sys
+
+mode = sys.argv[1]
+if mode == "missing":
+    sys.exit(1)
+
+def send(message):
+    sys.stdout.write(json.dumps(message) + "\n")
+    sys.stdout.flush()
+
+held = []
+for line in sys.stdin:
+    request = json.loads(line)
+    method = request["method"]
+    if method == "ping":
+        if mode != "deaf":
+            send({"id": request["id"], "result": {"pong": True}})
+    elif method == "events.subscribe":
+        send({"id": request["id"], "result": {"type": "subscription_started"}})
+        send({"schema_version": "i3pm.herdr_proxy.event.v1", "generation": 7})
+    elif method == "focus":
+        # Answer in reverse order once three focus requests are in flight.
+        held.append(request)
+        if len(held) == 3:
+            for pending in reversed(held):
+                send({"id": pending["id"], "result": {"success": True, "pane_id": pending["params"]["pane_id"]}})
+    elif method == "snapshot":
+        send({"id": request["id"], "result": {"schema_version": "i3pm.herdr_proxy.v1", "refresh": request["params"]["refresh"]}})
+"""
+
+TARGET = {"host": "ryzen", "ssh_target": "ryzen", "connection_key": "vpittamp@ryzen:22"}
+
+
+def _fake_proxy(mode):
+    return [sys.executable, "-u", "-c", FAKE_PROXY, mode]
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+def _channel(mode, events=None, **kwargs):
+    async def record(event):
+        if events is not None:
+            events.append(event)
+
+    return HerdrProxyChannel(lambda: _fake_proxy(mode), name="ryzen", on_event=record, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_session_and_route_by_id():
+    channel = _channel("serve")
+    responses = await asyncio.gather(*(
+        channel.request("focus", {"pane_id": pane_id}, timeout=5.0)
+        for pane_id in ("a", "b", "c")
+    ))
+    await channel.close()
+
+    assert [response["result"]["pane_id"] for response in responses] == ["a", "b", "c"]
+    assert channel.stats["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pushed_events_and_per_request_deadlines():
+    events = []
+    channel = _channel("serve", events)
+    stream = asyncio.create_task(channel.stream_events(timeout=5.0))
+    await _until(lambda: events)
+
+    # One unanswered request times out without tearing the session down.
+    with pytest.raises(TimeoutError):
+        await channel.request("focus", {"pane_id": "slow"}, timeout=0.05)
+    response = await channel.request("snapshot", {"refresh": True}, timeout=5.0)
+    await channel.close()
+    with pytest.raises(ConnectionError):
+        await stream
+
+    assert events == [{"schema_version": "i3pm.herdr_proxy.event.v1", "generation": 7}]
+    assert response["result"]["refresh"] is True
+    assert channel.stats["sessions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_missed_heartbeat_reopens_the_session():
+    channel = _channel("deaf", heartbeat_interval=0.05, heartbeat_timeout=0.05, initial_backoff=0.01)
+    await channel.request("snapshot", {"refresh": False}, timeout=5.0)
+    await _until(lambda: channel.stats["heartbeat_failures"] >= 1)
+    response = await channel.request("snapshot", {"refresh": False}, timeout=5.0)
+    await channel.close()
+
+    assert response["result"]["schema_version"] == "i3pm.herdr_proxy.v1"
+    assert channel.stats["sessions"] >= 2
+    assert channel.available is True
+
+
+def _service(monkeypatch, mode, events, one_shot_calls):
+    service = HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+        subscription_initial_backoff=0.01,
+        subscription_max_backoff=0.05,
+    )
+
+    async def record(target, event):
+        events.append((target["host"], event))
+
+    def fake_run(command, **kwargs):
+        one_shot_calls.append(command)
+        return subprocess.CompletedProcess(command, 0, stdout='{"success":true,"one_shot":true}\n', stderr="")
+
+    monkeypatch.setattr(herdr_service_module.shutil, "which", lambda name: f"/bin/{name}")
+    monkeypatch.setattr(herdr_service_module.subprocess, "run", fake_run)
+    monkeypatch.setattr(service, "proxy_channel_command", lambda ssh_target: _fake_proxy(mode))
+    # Legacy `herdr-proxy events` sessions end immediately.
+    monkeypatch.setattr(service, "ssh_command_prefix", lambda ssh_target: [sys.executable, "-c", "pass"])
+    monkeypatch.setattr(service, "handle_remote_proxy_event", record)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_service_routes_remote_calls_and_events_over_the_channel(monkeypatch):
+    events = []
+    one_shot_calls = []
+    service = _service(monkeypatch, "serve", events, one_shot_calls)
+    service.sync_remote_proxy_subscriptions([TARGET])
+    await _until(lambda: events)
+
+    snapshot, focus = await asyncio.gather(
+        service.run_proxy_json(TARGET, ["snapshot", "--refresh", "--json"], timeout=5.0),
+        service.run_proxy_json(TARGET, ["focus", "pane-a", "--json"], timeout=0.2),
+    )
+    channel = service.proxy_channels["vpittamp@ryzen:22"]
+    await service.stop_subscription()
+
+    assert events[0] == ("ryzen", {"schema_version": "i3pm.herdr_proxy.event.v1", "generation": 7})
+    assert snapshot["success"] is True
+    assert snapshot["refresh"] is True
+    assert snapshot["herdr_host"] == "ryzen"
+    assert snapshot["command"] == ["ssh", "ryzen", "i3pm", "herdr-proxy", "snapshot", "--refresh", "--json"]
+    # The fake holds focus replies until three are in flight: a deadline miss,
+    # reported as such rather than retried over one-shot ssh.
+    assert focus["success"] is False
+    assert focus["error"] == "timeout"
+    assert one_shot_calls == []
+    assert channel.stats["sessions"] == 1
+    assert service.proxy_channels == {}
+
+
+@pytest.mark.asyncio
+async def test_service_falls_back_to_one_shot_ssh_without_serve(monkeypatch):
+    one_shot_calls = []
+    service = _service(monkeypatch, "missing", [], one_shot_calls)
+    service.sync_remote_proxy_subscriptions([TARGET])
+    await _until(lambda: "vpittamp@ryzen:22" in service.proxy_channels)
+    channel = service.proxy_channels["vpittamp@ryzen:22"]
+    await _until(lambda: not channel.available)
+
+    result = await service.run_proxy_json(TARGET, ["snapshot", "--json"], timeout=1.0)
+    await service.stop_subscription()
+
+    assert result["one_shot"] is True
+    assert one_shot_calls[0][-4:] == ["i3pm", "herdr-proxy", "snapshot", "--json"]
+    assert channel.stats["unanswered_sessions"] == 1
@@ -5,6 +5,7 @@ import json
 import logging
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 import pytest
@@ -77,22 +78,22 @@ def test_herdr_service_subscription_payload_covers_local_agent_events():
     assert "pane.agent_detected" in subscriptions
 
 
-def test_herdr_service_status_subscription_payload_targets_one_pane():
+def test_herdr_service_status_subscription_payload_targets_listed_panes():
     service = HerdrService(
         notify_state_change=lambda event_type: asyncio.sleep(0),
         invalidate_snapshot_cache=lambda: None,
     )
 
-    payload = service.status_event_subscribe_payload("pane-a")
+    payload = service.status_event_subscribe_payload(["pane-a", "pane-b"], "i3pm-herdr-status-1")
 
     assert payload == {
-        "id": "i3pm-herdr-status-pane-a",
+        "id": "i3pm-herdr-status-1",
         "method": "events.subscribe",
         "params": {
-            "subscriptions": [{
-                "type": "pane.agent_status_changed",
-                "pane_id": "pane-a",
-            }],
+            "subscriptions": [
+                {"type": "pane.agent_status_changed", "pane_id": "pane-a"},
+                {"type": "pane.agent_status_changed", "pane_id": "pane-b"},
+            ],
         },
     }
 
@@ -437,7 +438,10 @@ def test_herdr_service_owns_snapshot_cache_with_local_and_remote_ttls():
     snapshot = {"sessions": [{"pane_id": "a"}]}
 
     returned = service.store_snapshot(snapshot, now=100.0)
-    returned["sessions"][0]["pane_id"] = "mutated"
+    # Cached rows are frozen and shared; only the top level is the caller's.
+    with pytest.raises(TypeError):
+        returned["sessions"][0]["pane_id"] = "mutated"
+    returned["sessions"] = []
     snapshot["sessions"][0]["pane_id"] = "source-mutated"
 
     local_cached = service.cached_snapshot(now=100.5, has_remote_targets=False)
@@ -1392,6 +1396,150 @@ async def test_herdr_service_builds_local_snapshot(monkeypatch):
     assert snapshot["errors"] == []
 
 
+@pytest.mark.asyncio
+async def test_herdr_service_pipelines_local_snapshot_queries_over_one_socket(monkeypatch):
+    results = {
+        "agent.list": {"agents": [{"pane_id": "pane-s", "workspace_id": "workspace-s", "cwd": "/repo/s"}]},
+        "pane.list": {"panes": [{"pane_id": "pane-s", "workspace_id": "workspace-s", "cwd": "/repo/s"}]},
+        "workspace.list": {"workspaces": [{"workspace_id": "workspace-s"}]},
+        "tab.list": {"tabs": []},
+        "worktree.list": {"worktrees": []},
+    }
+    connections = []
+
+    async def handle(reader, writer):
+        requests = []
+        connections.append(requests)
+        while line := await reader.readline():
+            request = json.loads(line)
+            requests.append(request["method"])
+            if request["method"] in results:
+                response = {"id": request["id"], "result": results[request["method"]]}
+            else:
+                response = {"id": request["id"], "error": {"code": "unknown_method", "message": "unknown"}}
+            writer.write(json.dumps(response).encode() + b"\n")
+        writer.close()
+
+    with tempfile.TemporaryDirectory(prefix="herdr") as tmp:
+        socket_file = Path(tmp) / "api.sock"
+        server = await asyncio.start_unix_server(handle, path=str(socket_file))
+        monkeypatch.setenv("I3PM_HERDR_SOCKET", str(socket_file))
+        service = HerdrService(
+            notify_state_change=lambda event_type: asyncio.sleep(0),
+            invalidate_snapshot_cache=lambda: None,
+        )
+        cli_calls = []
+
+        async def fake_run_json(args, timeout=2.0):
+            cli_calls.append(tuple(args))
+            return {"success": True, "result": {"protocol": 13}, "command": ["herdr", *args]}
+
+        monkeypatch.setattr(service, "run_json", fake_run_json)
+        try:
+            first = await service.local_snapshot_payloads()
+            second = await service.local_snapshot_payloads()
+        finally:
+            await service.client.close()
+            server.close()
+            await server.wait_closed()
+
+    # Both snapshots share the persistent connection; the unknown status
+    # method falls back to the CLI and is not asked over the socket again.
+    assert connections == [[
+        "status", "agent.list", "pane.list", "workspace.list", "tab.list", "worktree.list",
+        "agent.list", "pane.list", "workspace.list", "tab.list", "worktree.list",
+    ]]
+    assert cli_calls == [("status", "--json"), ("status", "--json")]
+    assert first["agents"]["result"] == results["agent.list"]
+    assert first["agents"]["method"] == "agent.list"
+    assert first["status"]["result"] == {"protocol": 13}
+    assert second == first
+
+
+@pytest.mark.asyncio
+async def test_herdr_service_local_snapshot_queries_fall_back_to_cli_without_socket(monkeypatch, tmp_path):
+    monkeypatch.setenv("I3PM_HERDR_SOCKET", str(tmp_path / "missing.sock"))
+    service = HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+    )
+    service.socket_unsupported_methods.add("status")
+    cli_calls = []
+
+    async def fake_run_json(args, timeout=2.0):
+        cli_calls.append(tuple(args))
+        return {"success": True, "result": {}, "command": ["herdr", *args]}
+
+    monkeypatch.setattr(service, "run_json", fake_run_json)
+
+    payloads = await service.local_snapshot_payloads()
+
+    assert sorted(payloads) == ["agents", "panes", "status", "tabs", "workspaces", "worktrees"]
+    assert len(cli_calls) == 6
+    assert service.socket_unsupported_methods == set()
+
+
+@pytest.mark.asyncio
+async def test_herdr_service_keeps_unsupported_methods_across_socket_timeouts(monkeypatch):
+    service = HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+    )
+    service.socket_unsupported_methods.add("status")
+    error = "TimeoutError"
+
+    async def fake_pipeline(calls, timeout=2.0):
+        return [
+            {"success": False, "transport_error": True, "error": error, "method": method}
+            for method, _params in calls
+        ]
+
+    async def fake_run_json(args, timeout=2.0):
+        return {"success": True, "result": {}, "command": ["herdr", *args]}
+
+    monkeypatch.setattr(service, "run_socket_pipeline", fake_pipeline)
+    monkeypatch.setattr(service, "run_json", fake_run_json)
+
+    await service.local_snapshot_payloads()
+    assert service.socket_unsupported_methods == {"status"}
+
+    error = "ConnectionRefusedError"
+    await service.local_snapshot_payloads()
+    assert service.socket_unsupported_methods == set()
+
+
+@pytest.mark.asyncio
+async def test_herdr_service_only_remembers_unknown_socket_methods(monkeypatch):
+    service = HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+    )
+    errors = {"status": "unknown_method", "worktree.list": "git_error"}
+    cli_calls = []
+
+    async def fake_pipeline(calls, timeout=2.0):
+        return [
+            {"success": False, "socket": True, "error": errors[method], "method": method}
+            if method in errors
+            else {"success": True, "socket": True, "method": method, "result": {}}
+            for method, _params in calls
+        ]
+
+    async def fake_run_json(args, timeout=2.0):
+        cli_calls.append(tuple(args))
+        return {"success": True, "result": {}, "command": ["herdr", *args]}
+
+    monkeypatch.setattr(service, "run_socket_pipeline", fake_pipeline)
+    monkeypatch.setattr(service, "run_json", fake_run_json)
+
+    payloads = await service.local_snapshot_payloads()
+
+    # A transient server-side failure falls back for this call only.
+    assert sorted(cli_calls) == [("status", "--json"), ("worktree", "list")]
+    assert payloads["worktrees"]["command"] == ["herdr", "worktree", "list"]
+    assert service.socket_unsupported_methods == {"status"}
+
+
 @pytest.mark.asyncio
 async def test_herdr_service_builds_local_proxy_snapshot(monkeypatch):
     service = HerdrService(
@@ -2369,19 +2517,13 @@ async def test_herdr_service_status_events_do_not_extend_cache_ttl(monkeypatch):
 
 
 @pytest.mark.asyncio
-async def test_herdr_service_local_snapshot_reconciles_status_subscription_tasks(monkeypatch):
+async def test_herdr_service_local_snapshot_reconciles_status_subscription_members(monkeypatch):
     service = HerdrService(
         notify_state_change=lambda event_type: asyncio.sleep(0),
         invalidate_snapshot_cache=lambda: None,
     )
-
-    async def wait_forever():
-        await asyncio.Event().wait()
-
-    gone_task = asyncio.create_task(wait_forever())
-    kept_task = asyncio.create_task(wait_forever())
-    service.status_subscription_tasks["gone"] = gone_task
-    service.status_subscription_tasks["pane-l"] = kept_task
+    service.ensure_status_subscription("gone")
+    service.ensure_status_subscription("pane-l")
 
     async def fake_run_json(args, timeout=2.0):
         key = tuple(args)
@@ -2417,14 +2559,9 @@ async def test_herdr_service_local_snapshot_reconciles_status_subscription_tasks
         project_for_cwd=lambda path: {"project_name": "global", "project_path": path},
     )
 
-    # The pane that vanished without a pane.closed event loses its retry task;
-    # the still-present pane keeps its subscription.
-    assert set(service.status_subscription_tasks.keys()) == {"pane-l"}
-    await asyncio.gather(gone_task, return_exceptions=True)
-    assert gone_task.cancelled()
-
-    kept_task.cancel()
-    await asyncio.gather(kept_task, return_exceptions=True)
+    # The pane that vanished without a pane.closed event leaves the status
+    # subscription; the still-present pane stays subscribed.
+    assert service.status_subscription.members == {"pane-l"}
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+herdr_service_module = importlib.import_module("i3_project_daemon.services.herdr_service")
+
+HerdrService = herdr_service_module.HerdrService
+
+
+class FakeHerdr:
+    """Herdr API socket stand-in that tracks status subscriptions per connection."""
+
+    def __init__(self, *, allow_extra_subscriptions=True):
+        self.allow_extra_subscriptions = allow_extra_subscriptions
+        self.connections = []
+        self._tmp = tempfile.TemporaryDirectory(prefix="herdr")
+        self.path = Path(self._tmp.name) / "api.sock"
+        self.server = None
+
+    async def __aenter__(self):
+        self.server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.restart()
+        self.server.close()
+        await self.server.wait_closed()
+        self._tmp.cleanup()
+
+    @property
+    def open_connections(self):
+        return [connection for connection in self.connections if not connection["writer"].is_closing()]
+
+    @property
+    def subscribe_requests(self):
+        return sum(len(connection["requests"]) for connection in self.connections)
+
+    def subscribed(self):
+        return set().union(*(connection["panes"] for connection in self.open_connections))
+
+    def emit_status(self, pane_id, status="working"):
+        line = json.dumps({
+            "event": "pane.agent_status_changed",
+            "data": {"pane_id": pane_id, "agent_status": status},
+        }).encode() + b"\n"
+        for connection in self.open_connections:
+            if pane_id in connection["panes"]:
+                connection["writer"].write(line)
+
+    def restart(self):
+        for connection in self.connections:
+            connection["writer"].close()
+
+    async def _handle(self, reader, writer):
+        connection = {"requests": [], "panes": set(), "writer": writer}
+        self.connections.append(connection)
+        try:
+            while line := await reader.readline():
+                request = json.loads(line)
+                first = not connection["requests"]
+                connection["requests"].append(request)
+                if not first and not self.allow_extra_subscriptions:
+                    response = {"id": request["id"], "error": {"code": "already_subscribed", "message": ""}}
+                else:
+                    connection["panes"].update(
+                        item["pane_id"]
+                        for item in request["params"]["subscriptions"]
+                        if "pane_id" in item
+                    )
+                    response = {"id": request["id"], "result": {"type": "subscription_started"}}
+                writer.write(json.dumps(response).encode() + b"\n")
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.005)
+
+
+def _service(monkeypatch, herdr, events):
+    monkeypatch.setenv("I3PM_HERDR_SOCKET", str(herdr.path))
+    service = HerdrService(
+        notify_state_change=lambda event_type: asyncio.sleep(0),
+        invalidate_snapshot_cache=lambda: None,
+        subscription_initial_backoff=0.01,
+        subscription_max_backoff=0.05,
+    )
+
+    async def no_cached_panes():
+        return []
+
+    async def record(event):
+        events.append(event)
+
+    monkeypatch.setattr(service, "subscription_pane_ids", no_cached_panes)
+    monkeypatch.setattr(service, "handle_subscription_event", record)
+    return service
+
+
+async def _start(service):
+    stream = asyncio.create_task(service.run_subscription())
+    service.status_subscription.start()
+    await _until(lambda: service.client.events.connected)
+    return stream
+
+
+async def _stop(service, stream):
+    stream.cancel()
+    await asyncio.gather(stream, return_exceptions=True)
+    await service.stop_subscription()
+
+
+@pytest.mark.asyncio
+async def test_new_panes_are_batched_onto_the_shared_event_stream(monkeypatch):
+    events = []
+    async with FakeHerdr() as herdr:
+        service = _service(monkeypatch, herdr, events)
+        stream = await _start(service)
+
+        for pane_id in ("a", "b", "c"):
+            service.ensure_status_subscription(pane_id)
+        await _until(lambda: herdr.subscribed() == {"a", "b", "c"})
+        service.cancel_status_subscription("b")
+        herdr.emit_status("b")
+        herdr.emit_status("c")
+        await _until(lambda: events)
+        await _stop(service, stream)
+
+    # One topology subscribe plus one batched status subscribe, one socket.
+    assert len(herdr.connections) == 1
+    assert herdr.subscribe_requests == 2
+    # The closed pane's late event is dropped by pane-id routing.
+    assert [event["data"]["pane_id"] for event in events] == ["c"]
+    assert service.status_subscription.stats["events_dropped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_membership_survives_a_herdr_restart(monkeypatch):
+    events = []
+    async with FakeHerdr() as herdr:
+        service = _service(monkeypatch, herdr, events)
+        stream = await _start(service)
+        service.ensure_status_subscription("a")
+        service.ensure_status_subscription("b")
+        await _until(lambda: herdr.subscribed() == {"a", "b"})
+
+        herdr.restart()
+        await _until(lambda: len(herdr.open_connections) == 1 and herdr.subscribed() == {"a", "b"})
+        herdr.emit_status("b")
+        await _until(lambda: events)
+        await _stop(service, stream)
+
+    # The reconnect's initial request carries every member.
+    assert herdr.connections[1]["requests"][0]["id"] == "i3pm-herdr-events"
+    assert len(herdr.connections[1]["requests"]) == 1
+    assert events[0]["data"]["pane_id"] == "b"
+
+
+@pytest.mark.asyncio
+async def test_rejected_extra_subscription_uses_one_dedicated_stream(monkeypatch):
+    events = []
+    async with FakeHerdr(allow_extra_subscriptions=False) as herdr:
+        service = _service(monkeypatch, herdr, events)
+        stream = await _start(service)
+        for index in range(20):
+            service.ensure_status_subscription(f"pane-{index}")
+        await _until(lambda: herdr.subscribed() == {f"pane-{index}" for index in range(20)})
+        herdr.emit_status("pane-7")
+        await _until(lambda: events)
+        await _stop(service, stream)
+
+    assert service.status_subscription.multiplexing is False
+    # Shared stream plus a single status stream, not one per pane.
+    assert len(herdr.connections) == 2
+    assert events[0]["data"]["pane_id"] == "pane-7"
+
+
+@pytest.mark.asyncio
+async def test_stress_200_panes_share_one_socket(monkeypatch):
+    pane_ids = [f"pane-{index}" for index in range(200)]
+    events = []
+    async with FakeHerdr() as herdr:
+        service = _service(monkeypatch, herdr, events)
+        stream = await _start(service)
+
+        for pane_id in pane_ids:
+            service.ensure_status_subscription(pane_id)
+        await _until(lambda: herdr.subscribed() == set(pane_ids))
+
+        for pane_id in pane_ids:
+            herdr.emit_status(pane_id)
+        await _until(lambda: len(events) == len(pane_ids))
+
+        # Half the panes close; the rest keep their subscription.
+        service.reconcile_status_subscriptions(pane_ids[::2])
+        for pane_id in pane_ids:
+            herdr.emit_status(pane_id, "idle")
+        await _until(lambda: len(events) == len(pane_ids) + 100)
+        await asyncio.sleep(0.02)
+        tasks = [task for task in asyncio.all_tasks() if task.get_name().startswith("i3pm-herdr")]
+        await _stop(service, stream)
+
+    assert len(herdr.connections) == 1
+    assert herdr.subscribe_requests <= 3
+    assert len(events) == 300
+    assert {event["data"]["pane_id"] for event in events[200:]} == set(pane_ids[::2])
+    assert service.status_subscription.stats["events_dropped"] == 100
+    # Reader, stream loop and status worker: constant, not per pane.
+    assert len(tasks) <= 3
@@ -193,6 +193,7 @@ async def test_broadcast_event_evicts_and_closes_slow_subscriber(server):
     server.subscribed_clients = {slow_writer, healthy_writer}
 
     await server.broadcast_event({"event_type": "window::focus"})
+    server.event_fanout.flush()
 
     assert server.subscribed_clients == {healthy_writer}
     assert slow_writer.closed is True
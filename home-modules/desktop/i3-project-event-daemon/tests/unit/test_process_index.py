@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+process_index_module = importlib.import_module("i3_project_daemon.services.process_index")
+window_filter_module = importlib.import_module("i3_project_daemon.services.window_filter")
+window_tracer_module = importlib.import_module("i3_project_daemon.services.window_tracer")
+
+ProcessIndex = process_index_module.ProcessIndex
+read_proc_stat = process_index_module.read_proc_stat
+
+
+def _proc(root: Path, pid: int, ppid: int, starttime: int, env: dict) -> None:
+    directory = root / str(pid)
+    directory.mkdir(exist_ok=True)
+    # Fields after "(comm)": state ppid ... with starttime as the 20th.
+    fields = ["S", str(ppid)] + ["0"] * 17 + [str(starttime), "0", "0"]
+    (directory / "stat").write_text(f"{pid} (my (odd) app) " + " ".join(fields))
+    (directory / "environ").write_bytes(
+        b"\0".join(f"{k}={v}".encode() for k, v in env.items()) + b"\0"
+    )
+
+
+@pytest.fixture
+def proc_root(tmp_path):
+    root = tmp_path / "proc"
+    root.mkdir()
+    (root / "self").mkdir()
+    _proc(root, 100, 1, 5000, {"I3PM_APP_ID": "term-1", "I3PM_APP_NAME": "terminal", "HOME": "/home/u"})
+    _proc(root, 200, 100, 5100, {"PATH": "/bin"})
+    _proc(root, 300, 200, 5200, {"I3PM_PROJECT_NAME": "partial"})
+    return root
+
+
+def test_stat_parsing_handles_parens_in_comm(proc_root):
+    assert read_proc_stat(300, str(proc_root)) == (5200, 200)
+    assert read_proc_stat(999, str(proc_root)) is None
+
+
+def test_fallback_walks_ancestors_and_keeps_only_i3pm_vars(proc_root):
+    index = ProcessIndex(str(proc_root))
+
+    assert index.environ_with_fallback(300) == {"I3PM_APP_ID": "term-1", "I3PM_APP_NAME": "terminal"}
+    assert index.environ_with_fallback(300, max_depth=2) == {}
+    assert index.read_environ(300) == {"I3PM_PROJECT_NAME": "partial"}
+    with pytest.raises(FileNotFoundError):
+        index.read_environ(999)
+
+
+@pytest.mark.asyncio
+async def test_prime_serves_batch_without_syscalls(proc_root):
+    index = ProcessIndex(str(proc_root), snapshot_ttl=60.0)
+
+    await index.prime([300, 200, 0])
+    stats = index.get_stats()
+    assert stats["processes"] == 3
+    assert stats["cached_environments"] == 3
+
+    assert index.environ_with_fallback(300)["I3PM_APP_ID"] == "term-1"
+    assert index.environ_with_fallback(200)["I3PM_APP_ID"] == "term-1"
+    stats = index.get_stats()
+    assert stats["stat_reads"] == 0
+    assert stats["hits"] == 5
+
+
+@pytest.mark.asyncio
+async def test_prime_within_ttl_reads_only_missing_environments(proc_root):
+    index = ProcessIndex(str(proc_root), snapshot_ttl=60.0)
+    await index.prime([200])
+    assert index.get_stats()["scans"] == 1
+
+    # Known pids with cached environments: no scan, no reads.
+    await index.prime([200, 100])
+    # 300 is in the table but its environment was never read.
+    await index.prime([300])
+    stats = index.get_stats()
+    assert stats["scans"] == 1
+    assert stats["scans_skipped"] == 2
+    assert stats["cached_environments"] == 3
+
+    # A pid the table has not seen forces a rescan.
+    _proc(proc_root, 400, 100, 5300, {})
+    await index.prime([400])
+    assert index.get_stats()["scans"] == 2
+
+
+def test_reused_pid_is_not_served_stale_environment(proc_root):
+    index = ProcessIndex(str(proc_root), snapshot_ttl=0.0)
+    assert index.read_environ(100)["I3PM_APP_NAME"] == "terminal"
+
+    _proc(proc_root, 100, 1, 9999, {"I3PM_APP_ID": "browser-1", "I3PM_APP_NAME": "firefox"})
+
+    assert index.read_environ(100)["I3PM_APP_NAME"] == "firefox"
+    assert index.get_stats()["pid_reuse"] == 1
+    assert index.get_stats()["cached_environments"] == 1
+
+
+def test_refresh_evicts_exited_processes(proc_root):
+    index = ProcessIndex(str(proc_root))
+    index.environ_with_fallback(300)
+    assert index.get_stats()["cached_environments"] == 3
+
+    shutil.rmtree(proc_root / "300")
+    index.refresh()
+
+    assert index.get_stats()["cached_environments"] == 2
+    assert index.get_stats()["evicted"] == 1
+
+
+def test_filter_and_tracer_share_the_index(proc_root, monkeypatch):
+    index = ProcessIndex(str(proc_root), snapshot_ttl=60.0)
+    monkeypatch.setattr(process_index_module, "_process_index", index)
+
+    env = window_filter_module.read_process_environ_with_fallback(200)
+    tracer_env = window_tracer_module.WindowTracer()._read_process_environ(100)
+
+    assert env == tracer_env == {"I3PM_APP_ID": "term-1", "I3PM_APP_NAME": "terminal"}
+    assert index.get_stats()["hits"] == 1
+    assert window_tracer_module.WindowTracer()._read_process_environ(999) == {}
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+state_module = importlib.import_module("i3_project_daemon.state")
+contract_module = importlib.import_module("i3_project_daemon.services.daemon_contract_service")
+
+
+class _Harness:
+    """IPCServer over a real unix socket with test.* methods stubbed in."""
+
+    def __init__(self):
+        self.server = ipc_server_module.IPCServer(state_module.StateManager())
+        self.running = 0
+        self.peak = 0
+        self.cancelled = 0
+        original = self.server._handle_request
+
+        async def handle(request, writer):
+            method = request.get("method", "")
+            if not method.startswith("test."):
+                return await original(request, writer)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            try:
+                await asyncio.sleep(float(request["params"].get("delay", 0)))
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+            finally:
+                self.running -= 1
+            return {"jsonrpc": "2.0", "result": method, "id": request.get("id")}
+
+        self.server._handle_request = handle
+
+    async def connect(self, tmp_path):
+        path = str(tmp_path / "ipc.sock")
+        self.listener = await asyncio.start_unix_server(self.server._handle_client, path=path)
+        self.reader, self.writer = await asyncio.open_unix_connection(path)
+
+    async def send(self, request_id, method, **params):
+        self.writer.write(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}).encode() + b"\n")
+        await self.writer.drain()
+
+    async def recv(self):
+        return json.loads(await asyncio.wait_for(self.reader.readline(), timeout=5))
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        for _ in range(100):
+            if not self.server.clients:
+                break
+            await asyncio.sleep(0.01)
+        self.listener.close()
+        await self.listener.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_sequential_until_pipelining_is_enabled(tmp_path):
+    harness = _Harness()
+    await harness.connect(tmp_path)
+    try:
+        await harness.send(1, "test.slow", delay=0.2)
+        await harness.send(2, "test.fast")
+        assert [(await harness.recv())["id"] for _ in range(2)] == [1, 2]
+
+        await harness.send(3, "ipc.configure", pipelining=True)
+        assert (await harness.recv())["result"] == {"pipelining": True, "max_in_flight": 16, "busy_errors": False}
+
+        await harness.send(4, "test.slow", delay=0.3)
+        await harness.send(5, "test.fast")
+        first = await harness.recv()
+        # The later fast request is answered while the slow one still runs.
+        assert first == {"jsonrpc": "2.0", "result": "test.fast", "id": 5}
+        assert (await harness.recv())["id"] == 4
+
+        await harness.send(6, "ipc.configure", pipelining=False)
+        assert (await harness.recv())["result"]["pipelining"] is False
+        assert harness.server._get_ipc_stats()["pipelined_client_count"] == 0
+    finally:
+        await harness.close()
+
+
+@pytest.mark.asyncio
+async def test_in_flight_cap_and_barrier(tmp_path):
+    harness = _Harness()
+    await harness.connect(tmp_path)
+    try:
+        await harness.send(0, "ipc.configure", pipelining=True, max_in_flight=2)
+        await harness.recv()
+        for i in range(1, 7):
+            await harness.send(i, "test.work", delay=0.05)
+        await harness.send(7, "ipc.configure", pipelining=True, max_in_flight=4)
+
+        ids = [(await harness.recv())["id"] for _ in range(7)]
+        assert sorted(ids[:6]) == [1, 2, 3, 4, 5, 6]
+        assert ids[6] == 7  # reconfiguring waits for in-flight requests
+        assert harness.peak == 2
+
+        await harness.send(8, "ipc.configure", pipelining=True, max_in_flight=65)
+        assert (await harness.recv())["error"]["code"] == ipc_server_module.VALIDATION_ERROR
+    finally:
+        await harness.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_in_flight_requests(tmp_path):
+    harness = _Harness()
+    await harness.connect(tmp_path)
+    await harness.send(1, "ipc.configure", pipelining=True)
+    await harness.recv()
+    await harness.send(2, "test.hang", delay=30)
+    await asyncio.sleep(0.05)
+    assert harness.server._get_ipc_stats()["pipelined_in_flight"] == 1
+
+    await harness.close()
+    for _ in range(100):
+        if harness.cancelled:
+            break
+        await asyncio.sleep(0.01)
+
+    assert harness.cancelled == 1
+    assert harness.server._pipelines == {}
+
+
+def test_contract_advertises_pipelining():
+    contract = contract_module.DaemonContractService().contract_payload()
+    assert "pipelined-requests" in contract["features"]
+    assert contract["ipc"]["configure_method"] == "ipc.configure"
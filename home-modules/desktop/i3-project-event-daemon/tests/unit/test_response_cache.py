@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+response_cache_module = importlib.import_module("i3_project_daemon.services.response_cache")
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+state_module = importlib.import_module("i3_project_daemon.state")
+contract_module = importlib.import_module("i3_project_daemon.services.daemon_contract_service")
+
+ResponseCache = response_cache_module.ResponseCache
+encode_response = response_cache_module.encode_response
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _server_with_session_list():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    builds = []
+
+    async def session_list(params):
+        builds.append(dict(params))
+        return {"sessions": [{"session_key": "a"}], "total": 1}
+
+    server._session_list = session_list
+    return server, builds
+
+
+async def _call(server, request_id, params=None):
+    request = {"jsonrpc": "2.0", "id": request_id, "method": "session.list"}
+    if params is not None:
+        request["params"] = params
+    return await server._handle_request(request, SimpleNamespace())
+
+
+def test_entries_match_generation_and_expire():
+    clock = _Clock()
+    cache = ResponseCache(max_age=3.0, clock=clock)
+    key = cache.key("session.list", {"b": 1, "a": 2, "refresh": True, "if_generation": 4})
+    assert key == cache.key("session.list", {"a": 2, "b": 1})
+
+    entry = cache.store(key, (1, 0), {"total": 1})
+    assert cache.lookup(key, (1, 0)) is entry
+    assert cache.lookup(key, (2, 0)) is None
+    cache.invalidate()
+    assert cache.epoch == 1
+
+    clock.now += 3.5
+    assert cache.lookup(key, (1, 0)) is None
+    assert cache.key("x", {"bad": object()}) is None
+
+
+def test_identical_rebuild_keeps_generation_token():
+    cache = ResponseCache()
+    key = cache.key("session.list", {})
+
+    first = cache.store(key, (1,), {"total": 1})
+    same = cache.store(key, (2,), {"total": 1})
+    changed = cache.store(key, (3,), {"total": 2})
+
+    assert same.token == first.token
+    assert changed.token != first.token
+    assert cache.get_stats()["unchanged_rebuilds"] == 1
+
+
+def test_respond_splices_id_into_preserialized_body():
+    cache = ResponseCache()
+    entry = cache.store(cache.key("m", {}), (0,), {"rows": [1, 2]})
+
+    full = cache.respond(entry, "req-1")
+    assert json.loads(encode_response(full)) == {
+        "jsonrpc": "2.0",
+        "result": {"rows": [1, 2]},
+        "id": "req-1",
+        "generation": entry.token,
+    }
+    assert json.loads(encode_response(full)) == json.loads(json.dumps(full))
+
+    short = cache.respond(entry, 7, if_generation=str(entry.token))
+    assert json.loads(encode_response(short)) == {
+        "jsonrpc": "2.0",
+        "result": {"not_modified": True, "generation": entry.token},
+        "id": 7,
+    }
+    assert encode_response({"jsonrpc": "2.0", "id": 1}) == b'{"jsonrpc": "2.0", "id": 1}\n'
+
+
+@pytest.mark.asyncio
+async def test_snapshot_rpc_served_from_cache_until_state_changes():
+    server, builds = _server_with_session_list()
+
+    first = await _call(server, 1)
+    second = await _call(server, 2)
+    assert len(builds) == 1
+    assert second["result"] == first["result"]
+    assert second["id"] == 2
+    token = second["generation"]
+
+    not_modified = await _call(server, 3, {"if_generation": token})
+    assert not_modified["result"] == {"not_modified": True, "generation": token}
+    assert builds == [{}]
+
+    server.invalidate_window_tree_cache()
+    await _call(server, 4)
+    assert len(builds) == 2
+
+    # A mutating RPC drops cached snapshots even when it fails.
+    await server._handle_request(
+        {"jsonrpc": "2.0", "id": 5, "method": "config.set", "params": {}}, SimpleNamespace()
+    )
+    refreshed = await _call(server, 6, {"if_generation": token})
+    assert len(builds) == 3
+    # Rebuilt payload is identical, so the conditional poller stays short.
+    assert refreshed["result"] == {"not_modified": True, "generation": token}
+
+    await _call(server, 7, {"refresh": True})
+    assert len(builds) == 4
+
+    stats = server._rpc_stats({})["response_cache"]
+    assert stats["hits"] == 2
+    assert stats["not_modified"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_build():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    builds = 0
+    release = asyncio.Event()
+
+    async def session_list(params):
+        nonlocal builds
+        builds += 1
+        await release.wait()
+        return {"sessions": [], "total": 0}
+
+    server._session_list = session_list
+    calls = [asyncio.create_task(_call(server, request_id)) for request_id in range(4)]
+    await asyncio.sleep(0)
+    release.set()
+    responses = await asyncio.gather(*calls)
+
+    assert builds == 1
+    assert [response["id"] for response in responses] == [0, 1, 2, 3]
+    assert all(response["result"] == {"sessions": [], "total": 0} for response in responses)
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    calls = 0
+
+    async def session_list(params):
+        nonlocal calls
+        calls += 1
+        raise ValueError("not ready")
+
+    server._session_list = session_list
+    for request_id in range(2):
+        response = await _call(server, request_id)
+        assert response["error"]["code"] == ipc_server_module.VALIDATION_ERROR
+    assert calls == 2
+
+
+def test_contract_lists_the_cached_methods():
+    contract = contract_module.DaemonContractService().contract_payload()
+    cached = {method.name for method in ipc_server_module.RPC_METHODS if method.cached}
+
+    assert "conditional-snapshots" in contract["features"]
+    assert set(contract["ipc"]["conditional"]["methods"]) == cached
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+state_module = importlib.import_module("i3_project_daemon.state")
+registry_module = importlib.import_module("i3_project_daemon.services.rpc_registry")
+response_cache_module = importlib.import_module("i3_project_daemon.services.response_cache")
+
+RpcMethod = registry_module.RpcMethod
+
+
+def _server():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    log = []
+    builds = []
+
+    async def read(s, params, writer):
+        log.append(("start", params["name"]))
+        await asyncio.sleep(float(params.get("delay", 0)))
+        log.append(("end", params["name"]))
+        return params["name"]
+
+    async def runtime(s, params, writer):
+        snapshot = await s._runtime_snapshot({})
+        return snapshot["built"]
+
+    async def build_runtime_snapshot(params):
+        builds.append(params)
+        await asyncio.sleep(0.01)
+        return {"built": len(builds)}
+
+    server.rpc_registry.register(RpcMethod("test.read", read))
+    server.rpc_registry.register(RpcMethod("test.write", read, mutates=True))
+    server.rpc_registry.register(RpcMethod("test.runtime", runtime))
+    server._build_runtime_snapshot = build_runtime_snapshot
+    return server, log, builds
+
+
+def _call(request_id, method, **params):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_reads_concurrently_around_mutating_barriers():
+    server, log, _builds = _server()
+
+    responses = await server._handle_message([
+        _call(1, "test.read", name="a", delay=0.1),
+        _call(2, "test.read", name="b", delay=0.1),
+        _call(3, "test.write", name="w"),
+        _call(4, "test.read", name="c", delay=0.1),
+    ], writer=None)
+
+    assert [response["result"] for response in responses] == ["a", "b", "w", "c"]
+    assert [response["id"] for response in responses] == [1, 2, 3, 4]
+    # The two leading reads overlap.
+    assert log.index(("start", "b")) < log.index(("end", "a"))
+    # The write starts only after both earlier reads finished, and the
+    # later read only after the write.
+    assert log.index(("start", "w")) > max(log.index(("end", "a")), log.index(("end", "b")))
+    assert log.index(("start", "c")) > log.index(("end", "w"))
+
+
+@pytest.mark.asyncio
+async def test_batch_members_share_one_runtime_snapshot_per_stage():
+    server, _log, builds = _server()
+
+    responses = await server._handle_message(
+        [_call(index, "test.runtime") for index in range(4)],
+        writer=None,
+    )
+    assert [response["result"] for response in responses] == [1, 1, 1, 1]
+    assert len(builds) == 1
+
+    # Outside a batch every call builds its own snapshot.
+    await server._handle_message(_call(9, "test.runtime"), writer=None)
+    await server._handle_message(_call(10, "test.runtime"), writer=None)
+    assert len(builds) == 3
+
+
+@pytest.mark.asyncio
+async def test_invalid_batches_and_members_get_invalid_request_errors():
+    server, _log, _builds = _server()
+
+    assert (await server._handle_message([], writer=None))["error"]["code"] == -32600
+    too_big = [_call(index, "test.read", name="x") for index in range(65)]
+    assert (await server._handle_message(too_big, writer=None))["error"]["code"] == -32600
+
+    responses = await server._handle_message(
+        [3, {"id": 7}, _call(8, "test.read", name="ok"), _call(9, "no.such")],
+        writer=None,
+    )
+    assert [response.get("id") for response in responses] == [None, 7, 8, 9]
+    assert [response.get("error", {}).get("code") for response in responses] == [
+        -32600, -32600, None, ipc_server_module.METHOD_NOT_FOUND,
+    ]
+
+
+def test_batch_response_encoding_splices_cached_bytes():
+    cache = response_cache_module.ResponseCache()
+    entry = cache.store(("k",), (1,), {"big": [1, 2, 3]})
+    cached = cache.respond(entry, 2)
+
+    line = response_cache_module.encode_response([{"jsonrpc": "2.0", "result": "x", "id": 1}, cached])
+
+    assert line.endswith(b"]\n") and line.count(b"\n") == 1
+    assert [item["id"] for item in json.loads(line)] == [1, 2]
+    assert json.loads(line)[1]["result"] == {"big": [1, 2, 3]}
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import random
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, create_autospec
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+rpc_registry_module = importlib.import_module("i3_project_daemon.services.rpc_registry")
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+state_module = importlib.import_module("i3_project_daemon.state")
+
+LatencyHistogram = rpc_registry_module.LatencyHistogram
+RpcMethod = rpc_registry_module.RpcMethod
+RpcRegistry = rpc_registry_module.RpcRegistry
+
+
+def test_histogram_percentiles_are_within_bucket_precision():
+    rng = random.Random(12)
+    values = sorted(rng.randint(1, 2_000_000) for _ in range(5000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value / 1_000_000)
+
+    for percent in (50, 90, 99):
+        exact = values[int(round(percent / 100 * len(values))) - 1]
+        assert abs(histogram.percentile(percent) - exact) <= exact / 16 + 1, percent
+    assert histogram.percentile(100) == values[-1]
+    assert histogram.summary()["max_ms"] == values[-1] / 1000
+
+
+def test_registry_rejects_duplicates_and_ranks_by_total_time():
+    registry = RpcRegistry([RpcMethod("a", lambda s, p, w: 1), RpcMethod("b", lambda s, p, w: 2)])
+    with pytest.raises(ValueError):
+        registry.register(RpcMethod("a", lambda s, p, w: 3))
+
+    registry.record("a", 0.001, error=False)
+    registry.record("b", 0.050, error=True)
+    registry.record_unknown()
+
+    stats = registry.get_stats()
+    assert [row["method"] for row in stats["methods"]] == ["b", "a"]
+    assert stats["methods"][0]["errors"] == 1
+    assert stats["unknown_method_calls"] == 1
+    assert len(registry.get_stats(include_idle=True)["methods"]) == 2
+
+
+def test_method_table_carries_intent_policy():
+    registry = RpcRegistry(ipc_server_module.RPC_METHODS)
+
+    assert registry.intent_methods() == {
+        "context.ensure",
+        "herdr.pane.focus",
+        "herdr.pane.close",
+        "herdr.remote.pane.focus",
+        "herdr.remote.window.focus",
+        "herdr.workspace.focus",
+        "herdr.tab.focus",
+        "launch.open",
+        "window.focus",
+        "window.focus_fast",
+        "workspace.focus",
+        "workspace.focus_fast",
+    }
+    assert registry.get("window.action").invalidates == {"window_tree"}
+    assert "daemon.rpc_stats" in registry
+
+
+@pytest.mark.asyncio
+async def test_dispatch_records_calls_errors_and_unknown_methods():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    server._daemon_version = AsyncMock(side_effect=ValueError("bad"))
+
+    for request_id in range(3):
+        response = await server._handle_request(
+            {"jsonrpc": "2.0", "id": request_id, "method": "daemon.contract"}, SimpleNamespace()
+        )
+        assert response["result"]["schema_version"] == "i3pm.daemon.contract.v1"
+    failed = await server._handle_request({"jsonrpc": "2.0", "id": 9, "method": "daemon.version"}, SimpleNamespace())
+    missing = await server._handle_request({"jsonrpc": "2.0", "id": 10, "method": "nope"}, SimpleNamespace())
+
+    assert failed["error"]["code"] == ipc_server_module.VALIDATION_ERROR
+    assert missing["error"]["code"] == ipc_server_module.METHOD_NOT_FOUND
+
+    response = await server._handle_request(
+        {"jsonrpc": "2.0", "id": 11, "method": "daemon.rpc_stats", "params": {"reset": True}}, SimpleNamespace()
+    )
+    rows = {row["method"]: row for row in response["result"]["methods"]}
+    assert rows["daemon.contract"]["calls"] == 3
+    assert rows["daemon.contract"]["errors"] == 0
+    assert rows["daemon.version"]["errors"] == 1
+    assert response["result"]["unknown_method_calls"] == 1
+
+    # Only the rpc_stats call itself, timed after it reset the counters
+    after_reset = server.rpc_registry.get_stats()
+    assert [row["method"] for row in after_reset["methods"]] == ["daemon.rpc_stats"]
+
+
+@pytest.mark.asyncio
+async def test_every_registered_method_resolves_its_handler():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    # Stub each handler's target with an autospec: calls never reach Sway,
+    # Herdr or the filesystem, but a misspelled method name still raises.
+    targets = {descriptor.handler.__code__.co_names[0] for descriptor in ipc_server_module.RPC_METHODS}
+    for target in targets:
+        value = getattr(server, target, None)
+        if value is not None:
+            setattr(server, target, create_autospec(value, instance=not callable(value)))
+
+    failures = {}
+    for request_id, descriptor in enumerate(ipc_server_module.RPC_METHODS):
+        response = await server._handle_request(
+            {"jsonrpc": "2.0", "id": request_id, "method": descriptor.name, "params": {}}, SimpleNamespace()
+        )
+        code = response.get("error", {}).get("code")
+        if code in (ipc_server_module.METHOD_NOT_FOUND, ipc_server_module.INTERNAL_ERROR):
+            failures[descriptor.name] = response["error"]["message"]
+
+    assert failures == {}
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+scheduler_module = importlib.import_module("i3_project_daemon.services.rpc_scheduler")
+ipc_server_module = importlib.import_module("i3_project_daemon.ipc_server")
+state_module = importlib.import_module("i3_project_daemon.state")
+
+RpcScheduler = scheduler_module.RpcScheduler
+RpcOverloaded = scheduler_module.RpcOverloaded
+
+
+async def _settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+def test_method_lanes_follow_intent_and_bulk_declarations():
+    registry = ipc_server_module.IPCServer(state_module.StateManager()).rpc_registry
+
+    assert registry.get("window.focus_fast").latency_class == "interactive"
+    assert registry.get("herdr.pane.focus").latency_class == "interactive"
+    assert registry.get("dashboard.snapshot").latency_class == "bulk"
+    assert registry.get("get_diagnostic_report").latency_class == "bulk"
+    assert registry.get("get_status").latency_class == "normal"
+
+
+@pytest.mark.asyncio
+async def test_bulk_concurrency_is_capped_and_queued_work_yields_to_interactive():
+    scheduler = RpcScheduler(max_bulk_concurrency=1, max_bulk_queue=4)
+    order = []
+
+    running = await scheduler.acquire("bulk")
+    queued = asyncio.ensure_future(scheduler.acquire("bulk"))
+    await _settle()
+    assert not queued.done()
+
+    focus = await scheduler.acquire("interactive")
+    order.append("focus")
+    scheduler.release(running)
+    await _settle()
+    # The freed bulk slot stays closed while the keypress is in flight.
+    assert not queued.done()
+
+    scheduler.release(focus)
+    order.append((await queued).lane)
+    assert order == ["focus", "bulk"]
+    scheduler.release(queued.result())
+
+    stats = scheduler.get_stats()
+    assert stats["bulk_held_for_interactive"] == 1
+    assert stats["lanes"]["bulk"]["admitted"] == 2
+    # Interactive never queued; allow for a loaded test runner.
+    assert stats["lanes"]["interactive"]["queue_wait"]["max_ms"] < 50
+    assert stats["lanes"]["bulk"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_calls_past_queue_depth_are_rejected_with_retry_hint():
+    scheduler = RpcScheduler(max_bulk_concurrency=1, max_bulk_queue=1)
+    running = await scheduler.acquire("bulk")
+    waiting = asyncio.ensure_future(scheduler.acquire("bulk"))
+    await _settle()
+
+    with pytest.raises(RpcOverloaded) as excinfo:
+        await scheduler.acquire("bulk")
+    assert excinfo.value.to_json()["retry_after_ms"] >= 50
+
+    # A cancelled waiter leaves the queue and frees its place.
+    waiting.cancel()
+    await _settle()
+    assert scheduler.get_stats()["bulk_queue_depth"] == 0
+    scheduler.release(running)
+    assert scheduler.get_stats()["lanes"]["bulk"]["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_held_bulk_call_is_admitted_after_max_hold():
+    scheduler = RpcScheduler(max_bulk_concurrency=1, max_bulk_hold=0.02)
+    focus = await scheduler.acquire("interactive")
+
+    # Long remote focus calls keep the interactive lane busy; the snapshot
+    # still runs once it has been held for max_bulk_hold.
+    snapshot = await asyncio.wait_for(scheduler.acquire("bulk"), timeout=2.0)
+    second_focus = await scheduler.acquire("interactive")
+    scheduler.release(focus)
+    scheduler.release(snapshot)
+    scheduler.release(second_focus)
+
+    stats = scheduler.get_stats()
+    assert stats["bulk_hold_expired"] == 1
+    assert stats["lanes"]["bulk"]["admitted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_full_bulk_queue_waits_for_connections_without_busy_errors():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    server.rpc_scheduler = RpcScheduler(max_bulk_concurrency=1, max_bulk_queue=0)
+    server._get_diagnostic_state = lambda params: {"success": True}
+    slot = await server.rpc_scheduler.acquire("bulk")
+
+    queued = asyncio.ensure_future(server._handle_request(
+        {"jsonrpc": "2.0", "id": 1, "method": "get_diagnostic_state", "params": {}},
+        writer=None,
+    ))
+    await _settle()
+    assert not queued.done()
+    server.rpc_scheduler.release(slot)
+
+    assert (await queued)["result"] == {"success": True}
+    assert server.rpc_scheduler.get_stats()["lanes"]["bulk"]["rejected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_overloaded_bulk_request_returns_busy_error():
+    server = ipc_server_module.IPCServer(state_module.StateManager())
+    server.rpc_scheduler = RpcScheduler(max_bulk_concurrency=1, max_bulk_queue=0)
+    assert server._ipc_configure({"busy_errors": True}, None)["busy_errors"] is True
+    slot = await server.rpc_scheduler.acquire("bulk")
+
+    response = await server._handle_request(
+        {"jsonrpc": "2.0", "id": 1, "method": "get_diagnostic_report", "params": {}},
+        writer=None,
+    )
+    server.rpc_scheduler.release(slot)
+
+    assert response["error"]["code"] == scheduler_module.SERVER_BUSY
+    assert response["error"]["data"]["lane"] == "bulk"
+    assert response["error"]["data"]["retry_after_ms"] >= 50
+    assert "scheduler" in server._rpc_stats({})
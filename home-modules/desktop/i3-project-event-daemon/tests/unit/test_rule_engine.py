@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+rule_engine_module = importlib.import_module("i3_project_daemon.rule_engine")
+pattern_module = importlib.import_module("i3_project_daemon.pattern")
+pattern_resolver_module = importlib.import_module("i3_project_daemon.pattern_resolver")
+window_rules_module = importlib.import_module("i3_project_daemon.window_rules")
+
+CompiledRuleSet = rule_engine_module.CompiledRuleSet
+WindowRuleList = rule_engine_module.WindowRuleList
+PatternRule = pattern_module.PatternRule
+WindowRule = window_rules_module.WindowRule
+load_window_rules = window_rules_module.load_window_rules
+classify_window = pattern_resolver_module.classify_window
+title_can_affect_classification = pattern_resolver_module.title_can_affect_classification
+
+_CLASSES = [f"app{i}" for i in range(40)] + ["Code", "firefox", "com.mitchellh.ghostty", "FFPWA-01ABC", "FFPWA-02XYZ"]
+_TITLES = ["", "Yazi: /etc", "Music - YouTube", "lazygit", "k9s - pods", "htop", "Gmail - Inbox"]
+
+
+def _random_rule(rng: random.Random, index: int) -> WindowRule:
+    cls = rng.choice(_CLASSES)
+    pattern = rng.choice([
+        cls,
+        cls,
+        f"glob:{cls[:3]}*",
+        f"glob:FFPWA-0?{rng.choice('AX')}*",
+        f"regex:^{cls[:4]}",
+        f"regex:{rng.choice(['ghost', 'fox$', 'Code|code'])}",
+        f"pwa:{rng.choice(['YouTube', 'Gmail', 'Nope'])}",
+        f"title:^{rng.choice(['Yazi:', 'k9s', 'htop'])}",
+        f"title:glob:*{rng.choice(['git', 'Inbox', 'zzz'])}*",
+    ])
+    modifier = blacklist = None
+    if rng.random() < 0.1:
+        modifier, blacklist = "GLOBAL", rng.sample(_CLASSES, 3)
+    return WindowRule(
+        PatternRule(pattern, rng.choice(["scoped", "global"]), rng.randint(0, 500)),
+        workspace=index % 9 + 1,
+        modifier=modifier,
+        blacklist=blacklist or [],
+    )
+
+
+def _linear(rules, window_class: str, window_title: str):
+    return next((r for r in rules if r.matches(window_class, window_title)), None)
+
+
+def test_compiled_first_match_equals_linear_scan():
+    rng = random.Random(6)
+    for _ in range(30):
+        rules = sorted((_random_rule(rng, i) for i in range(rng.randint(1, 60))), key=lambda r: -r.priority)
+        compiled = CompiledRuleSet(rules)
+        for cls in _CLASSES:
+            for title in _TITLES:
+                assert compiled.first_match(cls, title) is _linear(rules, cls, title), (cls, title)
+            assert compiled.title_can_affect(cls) == title_can_affect_classification(cls, list(rules))
+
+
+def test_global_blacklist_and_pwa_gating():
+    rules = WindowRuleList([
+        WindowRule(PatternRule("Code", "global", 300), modifier="GLOBAL", blacklist=["Code"]),
+        WindowRule(PatternRule("glob:*", "global", 250), modifier="GLOBAL", blacklist=["firefox"]),
+        WindowRule(PatternRule("pwa:YouTube", "global", 200)),
+    ])
+
+    assert rules.compiled.first_match("Code") is rules[1]
+    assert rules.compiled.first_match("firefox", "Music - YouTube") is None
+    assert rules.compiled.first_match("FFPWA-01ABC", "") is rules[1]
+
+
+def test_rule_list_recompiles_after_mutation():
+    rules = WindowRuleList([WindowRule(PatternRule("Code", "scoped", 250), workspace=2)])
+    assert classify_window("firefox", window_rules=rules).source == "default"
+
+    rules.insert(0, WindowRule(PatternRule("firefox", "global", 300), workspace=3))
+
+    assert classify_window("firefox", window_rules=rules).workspace == 3
+    # Slicing and concatenation hand back plain lists, which scan linearly.
+    assert type(rules[:1]) is list
+
+
+def test_load_window_rules_returns_compiled_list(tmp_path):
+    path = tmp_path / "window-rules.json"
+    path.write_text(json.dumps([
+        {"pattern_rule": {"pattern": "Code", "scope": "scoped", "priority": 250}, "workspace": 2},
+        {"pattern_rule": {"pattern": "title:^Yazi:", "scope": "scoped", "priority": 260}, "workspace": 5},
+    ]))
+
+    rules = load_window_rules(str(path))
+
+    assert isinstance(rules, WindowRuleList)
+    assert rules[0].priority == 260
+    assert classify_window("Code", "Yazi: ~", window_rules=rules).workspace == 5
+    assert title_can_affect_classification("Code", rules) is True
+    assert isinstance(load_window_rules(str(tmp_path / "missing.json")), WindowRuleList)
+
+
+def test_500_rules_classify_without_per_rule_matching(monkeypatch):
+    rng = random.Random(500)
+    rules = []
+    for i in range(500):
+        kind = i % 10
+        if kind < 6:
+            pattern = f"org.example.app{i}"
+        elif kind < 8:
+            pattern = f"glob:org.example.tool{i}-*"
+        elif kind == 8:
+            pattern = f"regex:^net\\.example\\.svc{i}$"
+        else:
+            pattern = f"title:^Project {i}:"
+        rules.append(WindowRule(PatternRule(pattern, "scoped", rng.randint(0, 500)), workspace=i % 9 + 1))
+    rules.sort(key=lambda r: r.priority, reverse=True)
+    compiled_rules = WindowRuleList(rules)
+    compiled_rules.compiled
+
+    queries = [(f"org.example.app{rng.randrange(600)}", "terminal") for _ in range(300)]
+    queries += [("com.mitchellh.ghostty", f"Project {rng.randrange(500)}: shell") for _ in range(100)]
+
+    calls = {"matches": 0, "parse": 0}
+    matches = WindowRule.matches
+    parse = PatternRule._parse_pattern
+
+    def counting_matches(self, *args, **kwargs):
+        calls["matches"] += 1
+        return matches(self, *args, **kwargs)
+
+    def counting_parse(self, *args, **kwargs):
+        calls["parse"] += 1
+        return parse(self, *args, **kwargs)
+
+    monkeypatch.setattr(WindowRule, "matches", counting_matches)
+    monkeypatch.setattr(PatternRule, "_parse_pattern", counting_parse)
+
+    linear = [classify_window(c, t, window_rules=rules) for c, t in queries]
+    linear_calls = dict(calls)
+    calls.update(matches=0, parse=0)
+    compiled = [classify_window(c, t, window_rules=compiled_rules) for c, t in queries]
+
+    assert [c.matched_rule for c in compiled] == [c.matched_rule for c in linear]
+    # The linear scan tries rules one by one; the index never does.
+    assert linear_calls["matches"] > len(queries) * 100
+    assert calls == {"matches": 0, "parse": 0}
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import struct
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+REPO_ROOT = Path(__file__).resolve().parents[5]
+READER_PATH = (
+    REPO_ROOT / "home-modules" / "tools" / "i3pm-diagnostic"
+    / "i3pm_diagnostic_pkg" / "i3pm_diagnostic" / "snapshot_reader.py"
+)
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+publisher_module = importlib.import_module("i3_project_daemon.services.snapshot_publisher")
+
+reader_spec = importlib.util.spec_from_file_location("i3pm_snapshot_reader", READER_PATH)
+reader_module = importlib.util.module_from_spec(reader_spec)
+assert reader_spec.loader is not None
+reader_spec.loader.exec_module(reader_module)
+
+SnapshotPublisher = publisher_module.SnapshotPublisher
+SnapshotReader = reader_module.SnapshotReader
+
+
+def test_reader_layout_matches_publisher():
+    assert reader_module.MAGIC == publisher_module.MAGIC
+    assert reader_module.HEADER.format == publisher_module.HEADER.format
+    assert reader_module.HEADER_SIZE == publisher_module.HEADER_SIZE
+    assert reader_module.SEQ_OFFSET == publisher_module.SEQ_OFFSET
+    assert reader_module.FLAG_STALE == publisher_module.FLAG_STALE
+    assert reader_module.SNAPSHOT_FILENAME == publisher_module.SNAPSHOT_FILENAME
+
+
+def test_published_snapshot_round_trips_and_skips_unchanged(tmp_path):
+    publisher = SnapshotPublisher(tmp_path / "dashboard.snapshot")
+    publisher.open()
+    assert (tmp_path / "dashboard.snapshot").stat().st_mode & 0o777 == 0o600
+
+    reader = SnapshotReader(tmp_path / "dashboard.snapshot")
+    assert reader.read().body == b""
+
+    assert publisher.publish({"snapshot_version": 3, "rows": [1, 2]}, generation=3)
+    assert not publisher.publish({"snapshot_version": 3, "rows": [1, 2]}, generation=3)
+
+    snapshot = reader.read()
+    assert snapshot.generation == 3
+    assert snapshot.seq % 2 == 0
+    assert snapshot.json() == {"snapshot_version": 3, "rows": [1, 2]}
+    assert publisher.get_stats()["unchanged"] == 1
+
+    publisher.close()
+    reader.close()
+    assert not (tmp_path / "dashboard.snapshot").exists()
+
+
+def test_oversized_body_replaces_file_and_readers_remap(tmp_path):
+    publisher = SnapshotPublisher(tmp_path / "dashboard.snapshot", capacity=1024)
+    publisher.open()
+    publisher.publish({"small": True}, generation=1)
+    reader = SnapshotReader(tmp_path / "dashboard.snapshot")
+    assert reader.read().json() == {"small": True}
+
+    big = {"rows": ["x" * 100] * 50}
+    publisher.publish(big, generation=2)
+
+    assert publisher.capacity >= 4096
+    assert publisher.get_stats()["resizes"] == 1
+    # The reader's old mapping is flagged stale; it remaps transparently.
+    snapshot = reader.read()
+    assert snapshot.generation == 2
+    assert snapshot.json() == big
+    publisher.close()
+    reader.close()
+
+
+def test_write_in_progress_is_never_returned(tmp_path):
+    path = tmp_path / "dashboard.snapshot"
+    publisher = SnapshotPublisher(path)
+    publisher.open()
+    publisher.publish({"v": 1}, generation=1)
+
+    # Simulate a writer stopped mid-update: odd sequence in the header.
+    with open(path, "r+b") as handle:
+        handle.seek(publisher_module.SEQ_OFFSET)
+        handle.write(struct.pack("<Q", publisher.get_stats()["seq"] + 1))
+
+    reader = SnapshotReader(path, retries=20)
+    with pytest.raises(reader_module.SnapshotUnavailable):
+        reader.read()
+    reader.close()
+    publisher.close()
+
+
+def test_wait_wakes_on_publication(tmp_path):
+    publisher = SnapshotPublisher(tmp_path / "dashboard.snapshot")
+    publisher.open()
+    publisher.publish({"v": 1}, generation=1)
+    reader = SnapshotReader(tmp_path / "dashboard.snapshot", poll_interval=0.01)
+    first = reader.read()
+
+    assert reader.wait(first.seq, timeout=0.05) is None
+
+    timer = threading.Timer(0.05, lambda: publisher.publish({"v": 2}, generation=2))
+    timer.start()
+    snapshot = reader.wait(first.seq, timeout=5.0)
+    timer.join()
+
+    assert snapshot is not None and snapshot.json() == {"v": 2}
+    reader.close()
+    publisher.close()
+
+
+def test_reader_started_before_daemon_watches_once_directory_appears(tmp_path):
+    runtime_dir = tmp_path / "i3-project-daemon"
+    reader = SnapshotReader(runtime_dir / "dashboard.snapshot", poll_interval=0.01)
+
+    assert reader.wait(0, timeout=0.02) is None
+    assert reader._inotify is None and not reader._inotify_failed
+
+    runtime_dir.mkdir()
+    publisher = SnapshotPublisher(runtime_dir / "dashboard.snapshot")
+    publisher.open()
+    publisher.publish({"v": 1}, generation=1)
+    snapshot = reader.wait(0, timeout=5.0)
+
+    assert snapshot is not None and snapshot.json() == {"v": 1}
+    assert reader._inotify is not None
+    reader.close()
+    publisher.close()
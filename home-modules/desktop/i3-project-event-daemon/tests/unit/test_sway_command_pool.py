@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import json
+import struct
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+connection_module = importlib.import_module("i3_project_daemon.connection")
+MessageType = importlib.import_module("i3ipc._private").MessageType
+
+SwayCommandPool = connection_module.SwayCommandPool
+
+
+class _FakeSwayServer:
+    """Minimal Sway IPC server: slow GET_TREE, instant everything else."""
+
+    def __init__(self, path: Path, tree_delay: float = 0.3) -> None:
+        self.path = path
+        self.tree_delay = tree_delay
+        self.connections = 0
+        self.writers: list = []
+        self.server = None
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+
+    async def stop(self) -> None:
+        for writer in self.writers:
+            writer.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self.writers.append(writer)
+        try:
+            while True:
+                header = await reader.readexactly(14)
+                _magic, length, msg_type = struct.unpack("=6sII", header)
+                payload = await reader.readexactly(length) if length else b""
+                if msg_type == MessageType.GET_TREE.value:
+                    await asyncio.sleep(self.tree_delay)
+                    body = json.dumps({"id": 1, "type": "root", "nodes": [], "pad": "x" * 200_000})
+                elif msg_type == MessageType.COMMAND.value:
+                    body = json.dumps([{"success": True, "echo": payload.decode()}])
+                else:
+                    body = json.dumps({"human_readable": "fake"})
+                data = body.encode()
+                writer.write(b"i3-ipc" + struct.pack("=II", len(data), msg_type) + data)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_command_is_not_queued_behind_slow_tree_reads(tmp_path):
+    server = _FakeSwayServer(tmp_path / "sway.sock")
+    await server.start()
+    pool = SwayCommandPool(lambda: str(server.path), general_size=1)
+    await pool.open()
+    try:
+        tree_task = asyncio.create_task(pool.message(MessageType.GET_TREE))
+        await asyncio.sleep(0.02)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        reply = await pool.message(MessageType.COMMAND, "[con_id=1] focus")
+        elapsed = loop.time() - started
+
+        assert json.loads(reply)[0]["echo"] == "[con_id=1] focus"
+        assert elapsed < server.tree_delay / 2
+        assert not tree_task.done()
+
+        tree = json.loads(await tree_task)
+        assert len(tree["pad"]) == 200_000
+    finally:
+        pool.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_reads_queue_and_report_wait_metrics(tmp_path):
+    server = _FakeSwayServer(tmp_path / "sway.sock", tree_delay=0.05)
+    await server.start()
+    pool = SwayCommandPool(lambda: str(server.path), general_size=1)
+    await pool.open()
+    try:
+        await asyncio.gather(*(pool.message(MessageType.GET_TREE) for _ in range(3)))
+        stats = pool.get_stats()
+
+        assert stats["size"] == 2
+        assert stats["lanes"]["general"]["requests"] == 3
+        assert stats["lanes"]["general"]["max_queue_depth"] == 2
+        assert stats["lanes"]["general"]["max_wait_ms"] >= 50
+        assert stats["lanes"]["general"]["queue_depth"] == 0
+    finally:
+        pool.close()
+        await server.stop()
+
+
+@pytest.mark.asyncio
+async def test_slot_reopens_after_socket_is_dropped(tmp_path):
+    server = _FakeSwayServer(tmp_path / "sway.sock")
+    await server.start()
+    pool = SwayCommandPool(lambda: str(server.path), general_size=1)
+    await pool.open()
+    try:
+        await asyncio.sleep(0.01)
+        assert server.connections == 2
+        for writer in list(server.writers):
+            writer.close()
+        await asyncio.sleep(0.01)
+
+        reply = await pool.message(MessageType.GET_VERSION)
+
+        assert json.loads(reply)["human_readable"] == "fake"
+        assert pool.get_stats()["reconnects"] == 1
+
+        # The priority socket was dropped too; the health check finds it and
+        # the next pass reopens it.
+        assert await pool.check_health() is False
+        assert await pool.check_health() is True
+        assert pool.get_stats()["reconnects"] == 2
+    finally:
+        pool.close()
+        await server.stop()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+title_coalescer_module = importlib.import_module("i3_project_daemon.services.title_coalescer")
+handlers_module = importlib.import_module("i3_project_daemon.handlers")
+pattern_resolver_module = importlib.import_module("i3_project_daemon.pattern_resolver")
+pattern_module = importlib.import_module("i3_project_daemon.pattern")
+window_rules_module = importlib.import_module("i3_project_daemon.window_rules")
+
+WindowTitleCoalescer = title_coalescer_module.WindowTitleCoalescer
+title_can_affect_classification = pattern_resolver_module.title_can_affect_classification
+PatternRule = pattern_module.PatternRule
+WindowRule = window_rules_module.WindowRule
+
+
+def _title_event(con_id: int, title: str, app_id: str = "com.mitchellh.ghostty") -> SimpleNamespace:
+    container = SimpleNamespace(
+        id=con_id,
+        name=title,
+        app_id=app_id,
+        window_class=None,
+        window_instance=None,
+        workspace=lambda: SimpleNamespace(name="1", num=1),
+    )
+    return SimpleNamespace(change="title", container=container)
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.titles: list = []
+
+    async def __call__(self, _conn, event) -> None:
+        self.titles.append((event.container.id, event.container.name))
+
+
+@pytest.mark.asyncio
+async def test_storm_reaches_handler_as_first_and_latest_title():
+    handler = _Recorder()
+    coalescer = WindowTitleCoalescer(handler, window_ms=20)
+
+    for i in range(20):
+        await coalescer.submit(None, _title_event(7, f"tail -f log ({i})"))
+    await coalescer.submit(None, _title_event(8, "other window"))
+    await asyncio.sleep(0.05)
+
+    assert handler.titles == [
+        (7, "tail -f log (0)"),
+        (8, "other window"),
+        (7, "tail -f log (19)"),
+    ]
+    stats = coalescer.get_stats()
+    assert stats["received"] == 21
+    assert stats["dispatched"] == 3
+    assert stats["collapsed"] == 18
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_dispatches_for_one_window_never_overlap():
+    release = asyncio.Event()
+    log = []
+
+    async def slow_handler(_conn, event) -> None:
+        log.append(("start", event.container.name))
+        if event.container.name == "t0":
+            await release.wait()
+        log.append(("end", event.container.name))
+
+    coalescer = WindowTitleCoalescer(slow_handler, window_ms=10_000)
+    first = asyncio.ensure_future(coalescer.submit(None, _title_event(7, "t0")))
+    await asyncio.sleep(0)
+    await coalescer.submit(None, _title_event(7, "t1"))
+
+    # The window closes while the handler is still busy with t0.
+    coalescer._timers[7].cancel()
+    coalescer._flush(7)
+    await asyncio.sleep(0)
+    await coalescer.submit(None, _title_event(7, "t2"))
+    assert log == [("start", "t0")]
+
+    release.set()
+    await first
+    await asyncio.gather(*coalescer._tasks)
+
+    assert log == [("start", "t0"), ("end", "t0"), ("start", "t2"), ("end", "t2")]
+    assert coalescer.get_stats()["collapsed"] == 1
+    coalescer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_drops_pending_title():
+    handler = _Recorder()
+    coalescer = WindowTitleCoalescer(handler, window_ms=20)
+
+    await coalescer.submit(None, _title_event(7, "first"))
+    await coalescer.submit(None, _title_event(7, "second"))
+    await coalescer.on_window_close(None, _title_event(7, "second"))
+    await asyncio.sleep(0.05)
+
+    assert handler.titles == [(7, "first")]
+    assert coalescer.get_stats()["dropped_on_close"] == 1
+    assert coalescer.get_stats()["pending"] == 0
+
+
+def test_title_sensitivity_follows_rule_order():
+    yazi = WindowRule(PatternRule("title:^Yazi:", "scoped", 230))
+    code = WindowRule(PatternRule("Code", "scoped", 250))
+    youtube = WindowRule(PatternRule("pwa:YouTube", "global", 200))
+
+    assert title_can_affect_classification("com.mitchellh.ghostty", [yazi]) is True
+    assert title_can_affect_classification("Code", [code, yazi]) is False
+    assert title_can_affect_classification("Code", [yazi, code]) is True
+    assert title_can_affect_classification("firefox", [youtube]) is False
+    assert title_can_affect_classification("FFPWA-01ABC", [youtube]) is True
+    assert title_can_affect_classification("anything", None) is False
+
+
+@pytest.mark.asyncio
+async def test_title_handler_skips_classification_without_title_rules(monkeypatch):
+    calls = []
+    updates = []
+
+    def fake_classify(**kwargs):
+        calls.append(kwargs["window_title"])
+        return pattern_resolver_module.Classification("global", workspace=None, source="default")
+
+    class _State:
+        async def update_window(self, window_id, **fields):
+            updates.append((window_id, fields["window_title"]))
+
+        async def increment_error_count(self):
+            raise AssertionError("handler failed")
+
+    monkeypatch.setattr(handlers_module, "classify_window", fake_classify)
+    class_rules = [WindowRule(PatternRule("Code", "scoped", 250))]
+
+    await handlers_module.on_window_title(None, _title_event(7, "htop"), _State(), window_rules=class_rules)
+    assert calls == []
+
+    title_rules = [WindowRule(PatternRule("title:^Yazi:", "scoped", 230))]
+    await handlers_module.on_window_title(None, _title_event(7, "Yazi: /tmp"), _State(), window_rules=title_rules)
+    assert calls == ["Yazi: /tmp"]
+    assert updates == [(7, "htop"), (7, "Yazi: /tmp")]
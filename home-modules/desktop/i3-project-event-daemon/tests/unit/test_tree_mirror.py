@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import copy
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+
+PACKAGE_ROOT = Path(__file__).parent.parent.parent
+
+
+if "i3_project_daemon" not in sys.modules:
+    package_spec = importlib.util.spec_from_file_location(
+        "i3_project_daemon",
+        PACKAGE_ROOT / "__init__.py",
+        submodule_search_locations=[str(PACKAGE_ROOT)],
+    )
+    package_module = importlib.util.module_from_spec(package_spec)
+    sys.modules["i3_project_daemon"] = package_module
+    assert package_spec.loader is not None
+    package_spec.loader.exec_module(package_module)
+
+
+tree_mirror_module = importlib.import_module("i3_project_daemon.services.tree_mirror")
+
+SwayTreeMirror = tree_mirror_module.SwayTreeMirror
+tree_checksum = tree_mirror_module.tree_checksum
+
+
+def _window(con_id: int, name: str, *, focused: bool = False) -> dict:
+    return {
+        "id": con_id,
+        "type": "con",
+        "name": name,
+        "app_id": "ghostty",
+        "pid": 1000 + con_id,
+        "marks": [],
+        "focused": focused,
+        "nodes": [],
+        "floating_nodes": [],
+    }
+
+
+def _workspace(con_id: int, name: str, windows: list) -> dict:
+    return {"id": con_id, "type": "workspace", "name": name, "num": int(name), "nodes": windows, "floating_nodes": []}
+
+
+def _tree() -> dict:
+    return {
+        "id": 1,
+        "type": "root",
+        "name": "root",
+        "nodes": [
+            {
+                "id": 2,
+                "type": "output",
+                "name": "DP-1",
+                "nodes": [
+                    _workspace(10, "1", [_window(100, "shell", focused=True), _window(101, "editor")]),
+                    _workspace(20, "2", [_window(200, "browser")]),
+                ],
+                "floating_nodes": [],
+            }
+        ],
+        "floating_nodes": [],
+    }
+
+
+class _FakeSway:
+    def __init__(self) -> None:
+        self.tree = _tree()
+        self.fetches = 0
+
+    async def fetch(self) -> dict:
+        self.fetches += 1
+        return copy.deepcopy(self.tree)
+
+
+def _names(raw: dict) -> dict:
+    return {node["id"]: node.get("name") for node in tree_mirror_module._iter_nodes(raw)}
+
+
+@pytest.mark.asyncio
+async def test_reads_share_one_fetch_until_structural_event():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+
+    first = await mirror.get_tree()
+    second = await mirror.get_tree()
+
+    assert sway.fetches == 1
+    assert first is second
+
+    mirror.apply_window_event("new", _window(102, "new"))
+    await mirror.get_tree()
+    assert sway.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_title_mark_and_close_are_applied_without_refetch():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+    await mirror.get_tree()
+
+    renamed = _window(101, "vim main.py")
+    renamed["marks"] = ["scoped:nvim:proj:101"]
+    mirror.apply_window_event("title", renamed)
+    mirror.apply_window_event("close", {"id": 200})
+
+    raw = await mirror.get_tree()
+
+    assert sway.fetches == 1
+    names = _names(raw)
+    assert names[101] == "vim main.py"
+    assert 200 not in names
+    assert mirror._nodes[101]["marks"] == ["scoped:nvim:proj:101"]
+    assert mirror.get_stats()["events_applied"] == 2
+
+
+@pytest.mark.asyncio
+async def test_focus_within_workspace_patches_and_across_workspaces_refetches():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+    await mirror.get_tree()
+
+    mirror.apply_window_event("focus", _window(101, "editor", focused=True))
+    await mirror.get_tree()
+    assert sway.fetches == 1
+    assert mirror._nodes[100]["focused"] is False
+    assert mirror._nodes[101]["focused"] is True
+
+    mirror.apply_window_event("focus", _window(200, "browser", focused=True))
+    assert mirror.is_dirty
+    await mirror.get_tree()
+    assert sway.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_event_during_fetch_is_replayed_onto_new_seed():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+
+    async def fetch_with_interleaved_event() -> dict:
+        raw = await sway.fetch()
+        mirror.apply_window_event("title", _window(100, "tail -f log"))
+        return raw
+
+    mirror._fetch_raw = fetch_with_interleaved_event
+    raw = await mirror.get_tree()
+
+    assert _names(raw)[100] == "tail -f log"
+
+
+@pytest.mark.asyncio
+async def test_reconcile_detects_drift_and_reseeds():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+    await mirror.get_tree()
+
+    await mirror.reconcile()
+    assert mirror.get_stats()["drift_count"] == 0
+
+    # A change the mirror never saw an event for.
+    sway.tree["nodes"][0]["nodes"][1]["nodes"][0]["name"] = "missed update"
+    assert tree_checksum(sway.tree) != tree_checksum(mirror._raw)
+
+    fresh = await mirror.reconcile()
+
+    assert mirror.get_stats()["drift_count"] == 1
+    assert _names(fresh)[200] == "missed update"
+    assert _names(await mirror.get_tree())[200] == "missed update"
+
+
+@pytest.mark.asyncio
+async def test_commands_mark_mirror_dirty_even_during_fetch():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+    await mirror.get_tree()
+
+    # `resize` emits no event; the next read must not serve the old rect.
+    mirror.apply_command("[con_id=100] resize set 800 600")
+    assert mirror.is_dirty
+    await mirror.get_tree()
+    assert sway.fetches == 2
+
+    async def fetch_with_interleaved_command() -> dict:
+        raw = await sway.fetch()
+        mirror.apply_command("layout tabbed")
+        return raw
+
+    mirror._fetch_raw = fetch_with_interleaved_command
+    await mirror.get_tree(force_refresh=True)
+    assert mirror.is_dirty
+
+
+@pytest.mark.asyncio
+async def test_reconcile_does_not_count_concurrent_refresh_as_drift():
+    sway = _FakeSway()
+    mirror = SwayTreeMirror(sway.fetch, lambda raw: raw)
+    await mirror.get_tree()
+
+    # The reconcile queues behind a refresh that picks up a real change.
+    async with mirror._refresh_lock:
+        reconcile = asyncio.ensure_future(mirror.reconcile())
+        await asyncio.sleep(0)
+        sway.tree["nodes"][0]["nodes"][1]["nodes"][0]["name"] = "renamed"
+        mirror.seed(await sway.fetch())
+    await reconcile
+
+    assert mirror.get_stats()["drift_count"] == 0
+    assert _names(mirror._raw)[200] == "renamed"
@@ -11,6 +11,9 @@ from .pattern import PatternRule
 # Import structured action types (Feature 024)
 from .rule_action import RuleAction, action_from_dict, action_to_dict
 
+# Compiled first-match index attached to loaded rule lists
+from .rule_engine import WindowRuleList
+
 
 @dataclass
 class WindowRule:
@@ -187,7 +190,8 @@ def load_window_rules(config_path: str) -> List[WindowRule]:
         config_path: Path to window-rules.json file
 
     Returns:
-        List of WindowRule objects sorted by priority (highest first).
+        WindowRuleList of WindowRule objects sorted by priority (highest
+        first), carrying the compiled matching index classify_window() uses.
         Returns empty list if file doesn't exist.
 
     Examples:
@@ -201,7 +205,7 @@ def load_window_rules(config_path: str) -> List[WindowRule]:
 
     # Return empty list if file doesn't exist
     if not path.exists():
-        return []
+        return WindowRuleList()
 
     try:
         with open(path, "r") as f:
@@ -215,6 +219,10 @@ def load_window_rules(config_path: str) -> List[WindowRule]:
         # Sort by priority (highest first) for efficient matching
         rules.sort(key=lambda r: r.priority, reverse=True)
 
+        # Build the matching index now so the first classification after a
+        # (re)load doesn't pay for it.
+        rules = WindowRuleList(rules)
+        rules.compiled
         return rules
 
     except json.JSONDecodeError as e:
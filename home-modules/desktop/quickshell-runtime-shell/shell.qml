@@ -8600,7 +8600,12 @@ function normalizeLauncherMode(mode) {
             return;
         }
 
-        if (eventGeneration >= 0 && currentGeneration >= 0 && eventGeneration > currentGeneration + 1) {
+        // Merged events from a backlogged subscription skip generations but
+        // are complete when they continue from the generation we hold.
+        const previousGeneration = event.coalesced_from_generation !== undefined
+            ? Number(event.coalesced_from_generation)
+            : eventGeneration - 1;
+        if (eventGeneration >= 0 && currentGeneration >= 0 && previousGeneration > currentGeneration) {
             recoverDashboardWatch("dashboard event generation gap");
             return;
         }
@@ -45,6 +45,7 @@ let
     rich         # Terminal UI for diagnostic commands
     jsonschema   # JSON schema validation (for compatibility with other modules)
     psutil       # Process utilities for scratchpad terminal validation (Feature 062)
+    orjson       # Fast GET_TREE decoding for the compact tree (optional; json fallback)
   ]);
 
   # Daemon package (Feature 061: Unified mark format)
@@ -205,6 +206,8 @@ in
       default = [];
       description = "Remote Herdr instances to aggregate into daemon dashboard snapshots.";
     };
+
+    eventStore.enable = mkEnableOption "persisting daemon events to an SQLite log (~/.local/share/i3pm/events.db) so event history reaches past the in-memory buffer";
   };
 
   config = mkIf cfg.enable {
@@ -287,6 +290,7 @@ in
           "LOG_LEVEL=${cfg.logLevel}"
           "I3PM_TERMINAL_HELPER_DIR=${daemonPackage}/scripts"
           "I3PM_HERDR_REMOTE_TARGETS_FILE=${config.home.homeDirectory}/.config/i3/herdr-remote-targets.json"
+          "I3PM_EVENT_STORE=${if cfg.eventStore.enable then "1" else "0"}"
           "PYTHONUNBUFFERED=1"
           "PYTHONPATH=${daemonPackage}/lib/python${pkgs.python3.pythonVersion}/site-packages"
           "PYTHONWARNINGS=ignore::DeprecationWarning"
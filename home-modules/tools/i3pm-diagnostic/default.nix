@@ -36,6 +36,7 @@ pkgs.python3Packages.buildPythonApplication rec {
       - window:    Inspect window properties and identity
       - events:    View recent event history with live streaming
       - validate:  Validate daemon state consistency against i3 IPC
+      - snapshot:  Read the daemon's shared-memory dashboard snapshot
 
       Features (Feature 039):
       - JSON-RPC communication with daemon via Unix socket
@@ -10,6 +10,7 @@ Usage:
     i3pm diagnose window <window_id> [--json]
     i3pm diagnose events [--limit N] [--type TYPE] [--follow] [--json]
     i3pm diagnose validate [--json]
+    i3pm diagnose snapshot [--follow] [--json]
 """
 
 import click
@@ -22,6 +23,7 @@ from typing import Dict, Any, Optional
 
 # Import display modules
 from .displays import health_display, window_display, event_display
+from .snapshot_reader import SnapshotReader, SnapshotUnavailable
 
 
 class DaemonClient:
@@ -363,5 +365,56 @@ def validate(output_json: bool):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--follow', is_flag=True, help='Print a summary line for every published snapshot')
+@click.option('--json', 'output_json', is_flag=True, help='Output the snapshot document as JSON')
+def snapshot(follow: bool, output_json: bool):
+    """
+    Read the daemon's shared-memory dashboard snapshot.
+
+    Reads $XDG_RUNTIME_DIR/i3-project-daemon/dashboard.snapshot directly,
+    without a socket round trip, so it also shows what panels see when the
+    daemon is too busy to answer. Use --follow to block on new publications
+    (Ctrl+C to stop).
+    """
+    console = Console()
+
+    def summarize(snap) -> str:
+        data = snap.json()
+        focus = data.get("focus_state") or {}
+        return (
+            f"seq={snap.seq} generation={snap.generation} bytes={len(snap.body)} "
+            f"sessions={len(data.get('active_ai_sessions') or [])} "
+            f"current={focus.get('current_session_key') or '-'}"
+        )
+
+    try:
+        with SnapshotReader() as reader:
+            current = reader.read()
+            if output_json and not follow:
+                print(current.body.decode())
+                sys.exit(0)
+            console.print(summarize(current))
+            if not follow:
+                sys.exit(0)
+            try:
+                while True:
+                    current = reader.wait(current.seq)
+                    console.print(summarize(current))
+            except KeyboardInterrupt:
+                console.print("\n[dim]Stopped following snapshots[/dim]")
+        sys.exit(0)
+
+    except FileNotFoundError:
+        console.print(
+            "[red]Error: Shared snapshot not found. Is the daemon running?\n"
+            "  systemctl --user status i3-project-event-listener[/red]"
+        )
+        sys.exit(1)
+    except SnapshotUnavailable as e:
+        console.print(f"[red]Error: {e}[/red]")
+        sys.exit(1)
+
+
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,227 @@
+"""
+Reader for the daemon's shared-memory dashboard snapshot.
+
+The daemon publishes its latest dashboard snapshot into
+$XDG_RUNTIME_DIR/i3-project-daemon/dashboard.snapshot (see the daemon's
+services/snapshot_publisher.py for the layout, which this module mirrors).
+The file is mapped once; each read() is a seqlock-checked memory copy with no
+syscalls and no daemon involvement. wait() blocks until the daemon publishes
+again, using inotify on the runtime directory when available and falling back
+to polling the mapped header.
+
+Usage:
+    reader = SnapshotReader()
+    snapshot = reader.read()
+    data = snapshot.json()
+    snapshot = reader.wait(since_seq=snapshot.seq, timeout=5.0)
+
+Standard library only, so widgets and scripts can copy or import it freely.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import json
+import mmap
+import os
+import select
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+SNAPSHOT_FILENAME = "dashboard.snapshot"
+MAGIC = b"I3PMSNP1"
+HEADER = struct.Struct("<8sQQQIIQ")
+HEADER_SIZE = 64
+SEQ = struct.Struct("<Q")
+SEQ_OFFSET = 8
+FLAG_STALE = 1
+
+_IN_MODIFY = 0x00000002
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+
+class SnapshotUnavailable(RuntimeError):
+    """The snapshot file is missing, malformed, or could not be read consistently."""
+
+
+class Snapshot(NamedTuple):
+    """One consistent copy of the published snapshot."""
+
+    seq: int
+    generation: int
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body) if self.body else {}
+
+
+def default_snapshot_path() -> Path:
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    return Path(runtime_dir) / "i3-project-daemon" / SNAPSHOT_FILENAME
+
+
+class _Inotify:
+    """Directory watch used to sleep until the daemon publishes."""
+
+    def __init__(self, directory: Path) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = _IN_MODIFY | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, str(directory).encode(), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+
+    def wait(self, timeout: float) -> None:
+        readable, _, _ = select.select([self.fd], [], [], max(0.0, timeout))
+        if readable:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class SnapshotReader:
+    """Map the published snapshot and read consistent copies of it."""
+
+    def __init__(self, path: Optional[Path] = None, *, retries: int = 100, poll_interval: float = 0.05):
+        """
+        Initialize the reader (the file is mapped lazily on first read).
+
+        Args:
+            path: Snapshot file (default: $XDG_RUNTIME_DIR/i3-project-daemon/dashboard.snapshot)
+            retries: Attempts before a torn read is reported as unavailable
+            poll_interval: Sleep between header checks when inotify is unavailable
+        """
+        self.path = Path(path) if path is not None else default_snapshot_path()
+        self.retries = retries
+        self.poll_interval = poll_interval
+        self._map: Optional[mmap.mmap] = None
+        self._inotify: Optional[_Inotify] = None
+        self._inotify_failed = False
+
+    def read(self) -> Snapshot:
+        """Return a consistent copy of the current snapshot."""
+        for attempt in range(self.retries):
+            mapped = self._mapping()
+            seq = SEQ.unpack_from(mapped, SEQ_OFFSET)[0]
+            if seq & 1:
+                self._backoff(attempt)
+                continue
+            magic, _seq, generation, length, checksum, flags, capacity = HEADER.unpack_from(mapped, 0)
+            if magic != MAGIC:
+                raise SnapshotUnavailable(f"Not a daemon snapshot file: {self.path}")
+            if flags & FLAG_STALE:
+                self._unmap()
+                self._backoff(attempt)
+                continue
+            if length > capacity or HEADER_SIZE + length > len(mapped):
+                self._backoff(attempt)
+                continue
+            body = mapped[HEADER_SIZE:HEADER_SIZE + length]
+            if SEQ.unpack_from(mapped, SEQ_OFFSET)[0] != seq or zlib.crc32(body) != checksum:
+                self._backoff(attempt)
+                continue
+            return Snapshot(seq, generation, body)
+        raise SnapshotUnavailable(f"No consistent snapshot after {self.retries} attempts: {self.path}")
+
+    def seq(self) -> int:
+        """Current publication sequence (cheap change check; odd while writing)."""
+        mapped = self._mapping()
+        if HEADER.unpack_from(mapped, 0)[5] & FLAG_STALE:
+            self._unmap()
+            mapped = self._mapping()
+        return SEQ.unpack_from(mapped, SEQ_OFFSET)[0]
+
+    def wait(self, since_seq: int, timeout: Optional[float] = None) -> Optional[Snapshot]:
+        """Block until a snapshot newer than since_seq is published.
+
+        Returns None on timeout. Missing files are waited for, so a reader
+        started before the daemon picks up its first publication.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        # Watch before the first check so a publish in between still wakes us.
+        self._ensure_inotify()
+        while True:
+            try:
+                if self.seq() != since_seq:
+                    snapshot = self.read()
+                    if snapshot.seq != since_seq:
+                        return snapshot
+            except (FileNotFoundError, SnapshotUnavailable):
+                self._unmap()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._sleep(remaining)
+
+    def close(self) -> None:
+        self._unmap()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def __enter__(self) -> "SnapshotReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _mapping(self) -> mmap.mmap:
+        if self._map is None:
+            fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+            try:
+                size = os.fstat(fd).st_size
+                if size < HEADER_SIZE:
+                    raise SnapshotUnavailable(f"Snapshot file is truncated: {self.path}")
+                self._map = mmap.mmap(fd, size, prot=mmap.PROT_READ)
+            finally:
+                os.close(fd)
+        return self._map
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def _backoff(self, attempt: int) -> None:
+        # A writer holds the odd sequence for microseconds; spin briefly,
+        # then yield the CPU.
+        if attempt > 10:
+            time.sleep(0.001)
+
+    def _ensure_inotify(self) -> None:
+        if self._inotify is None and not self._inotify_failed:
+            try:
+                self._inotify = _Inotify(self.path.parent)
+            except AttributeError:
+                # libc has no inotify; poll from now on.
+                self._inotify_failed = True
+            except OSError as exc:
+                # ENOSYS: the kernel has no inotify. Anything else (usually
+                # the runtime directory not existing before the daemon starts)
+                # is retried on the next wait().
+                self._inotify_failed = exc.errno == errno.ENOSYS
+
+    def _sleep(self, remaining: Optional[float]) -> None:
+        self._ensure_inotify()
+        # Re-check at the poll interval even with inotify: the watch cannot
+        # be added before the runtime directory exists.
+        interval = self.poll_interval if self._inotify is None else max(self.poll_interval, 1.0)
+        delay = interval if remaining is None else min(interval, remaining)
+        if self._inotify is not None:
+            self._inotify.wait(delay)
+        else:
+            time.sleep(delay)
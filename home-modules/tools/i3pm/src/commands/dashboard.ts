@@ -187,10 +187,13 @@ export async function dashboardCommand(args: string[], _flags: CommandOptions):
           if (Number.isFinite(generation) && generation >= 0 && generation <= lastSeenGeneration) {
             continue;
           }
+          // A backlogged subscriber receives merged events that skip
+          // generations; they are complete as long as they continue from ours.
+          const previousGeneration = Number(event.coalesced_from_generation ?? generation - 1);
           if (
             !currentSnapshot ||
             !Number.isFinite(generation) ||
-            generation > lastSeenGeneration + 1 ||
+            previousGeneration > lastSeenGeneration ||
             !isDeltaEvent(event)
           ) {
             await emitSnapshot();
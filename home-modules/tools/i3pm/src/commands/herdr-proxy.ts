@@ -51,15 +51,29 @@ function hasHerdrFocusPayload(payload: Record<string, unknown>): boolean {
     activeSession.source === "herdr";
 }
 
+type ProxyRequestClient = {
+  request(method: string, params?: unknown): Promise<unknown>;
+};
+
+type ProxyChannelError = { code: string; message: string };
+
+class ProxyRequestError extends Error {
+  constructor(readonly code: string, message: string) {
+    super(message);
+  }
+}
+
 function showHelp(): void {
-  console.log(`i3pm herdr-proxy <snapshot|events|focus> [--json|--jsonl]
+  console.log(`i3pm herdr-proxy <snapshot|events|focus|serve> [--json|--jsonl]
 
 Ryzen-side Herdr proxy used by remote dashboard aggregation.
 
 Commands:
   snapshot [--refresh] [--json]       Emit one local-only Herdr proxy snapshot
   events [--jsonl]                    Stream Herdr proxy event envelopes
-  focus <pane_id> [--json]            Focus one local Herdr pane through the daemon`);
+  focus <pane_id> [--json]            Focus one local Herdr pane through the daemon
+  serve [--stdio]                     Answer line-delimited JSON requests on stdin
+                                      (ping, snapshot, focus, events.subscribe)`);
 }
 
 function printResult(result: unknown, json: boolean): void {
@@ -120,9 +134,146 @@ export function buildHerdrProxyEvent(
   };
 }
 
+/**
+ * Answer one request on the \`serve --stdio\` channel. Method names mirror the
+ * one-shot subcommands so the remote daemon can fall back to those.
+ */
+export async function handleHerdrProxyRequest(
+  client: ProxyRequestClient,
+  method: string,
+  params: Record<string, unknown>,
+): Promise<unknown> {
+  if (method === "ping") {
+    return { pong: true, timestamp: Date.now() };
+  }
+  if (method === "snapshot") {
+    return await client.request("herdr.proxy.snapshot", {
+      refresh: Boolean(params.refresh),
+    });
+  }
+  if (method === "focus") {
+    const paneId = String(params.pane_id || "").trim();
+    if (!paneId) {
+      throw new ProxyRequestError("invalid_params", "focus requires pane_id");
+    }
+    return await client.request("herdr.proxy.pane.focus", { pane_id: paneId });
+  }
+  throw new ProxyRequestError("method_not_found", `Unknown herdr-proxy method: ${method}`);
+}
+
+function channelError(error: unknown): ProxyChannelError {
+  if (error instanceof ProxyRequestError) {
+    return { code: error.code, message: error.message };
+  }
+  return {
+    code: "daemon_error",
+    message: error instanceof Error ? error.message : String(error),
+  };
+}
+
+/**
+ * Serve proxy requests over stdin/stdout for one long-lived ssh session.
+ *
+ * Each line on stdin is \`{id, method, params}\` and is answered with
+ * \`{id, result}\` or \`{id, error}\`, possibly out of order. After
+ * \`events.subscribe\`, proxy event envelopes are written as id-less lines.
+ * The process exits on stdin EOF, when the daemon event stream ends, or when
+ * the parent ssh goes away, so the remote daemon reconnects cleanly.
+ */
+async function serveStdio(): Promise<number> {
+  const encoder = new TextEncoder();
+  const writer = Deno.stdout.writable.getWriter();
+  let writes = Promise.resolve();
+  const emit = (message: Record<string, unknown>) => {
+    const line = encoder.encode(JSON.stringify(message) + "\n");
+    writes = writes.then(() => writer.write(line)).catch(() => Deno.exit(0));
+    return writes;
+  };
+
+  const initialPpid = Deno.ppid;
+  const ppidInterval = setInterval(() => {
+    if (Deno.ppid !== initialPpid) {
+      clearInterval(ppidInterval);
+      Deno.exit(0);
+    }
+  }, 5000);
+  Deno.unrefTimer(ppidInterval);
+
+  let events: DaemonClient | null = null;
+  const streamEvents = async (client: DaemonClient) => {
+    try {
+      for await (const event of client.subscribeToStateChanges()) {
+        const proxyEvent = buildHerdrProxyEvent(event);
+        if (proxyEvent) {
+          await emit(proxyEvent);
+        }
+      }
+    } catch (error) {
+      console.error(`herdr-proxy event stream failed: ${error instanceof Error ? error.message : error}`);
+    } finally {
+      client.disconnect();
+    }
+    await writes;
+    Deno.exit(0);
+  };
+
+  const answer = async (request: Record<string, unknown>) => {
+    const id = request.id;
+    const method = String(request.method || "");
+    const params = asRecord(request.params);
+    if (method === "events.subscribe") {
+      if (!events) {
+        events = new DaemonClient();
+        await events.connect();
+        streamEvents(events);
+      }
+      await emit({ id, result: { type: "subscription_started" } });
+      return;
+    }
+    // DaemonClient reads one response per request, so concurrent requests
+    // each get their own daemon connection.
+    const client = new DaemonClient();
+    try {
+      await emit({ id, result: await handleHerdrProxyRequest(client, method, params) });
+    } catch (error) {
+      await emit({ id, error: channelError(error) });
+    } finally {
+      client.disconnect();
+    }
+  };
+
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for await (const chunk of Deno.stdin.readable) {
+    buffer += decoder.decode(chunk, { stream: true });
+    let newline = buffer.indexOf("\n");
+    while (newline >= 0) {
+      const line = buffer.slice(0, newline).trim();
+      buffer = buffer.slice(newline + 1);
+      newline = buffer.indexOf("\n");
+      if (!line) {
+        continue;
+      }
+      let request: Record<string, unknown>;
+      try {
+        request = asRecord(JSON.parse(line));
+      } catch {
+        continue;
+      }
+      answer(request).catch((error) => emit({ id: request.id, error: channelError(error) }));
+    }
+  }
+
+  await writes;
+  if (events) {
+    (events as DaemonClient).disconnect();
+  }
+  return 0;
+}
+
 export async function herdrProxyCommand(args: string[], _flags: CommandOptions): Promise<number> {
   const parsed = parseArgs(args, {
-    boolean: ["help", "json", "jsonl", "refresh"],
+    boolean: ["help", "json", "jsonl", "refresh", "stdio"],
     alias: { h: "help" },
   });
   const subcommand = String(parsed._[0] || "");
@@ -131,6 +282,10 @@ export async function herdrProxyCommand(args: string[], _flags: CommandOptions):
     return 0;
   }
 
+  if (subcommand === "serve") {
+    return await serveStdio();
+  }
+
   const client = new DaemonClient();
   try {
     if (subcommand === "snapshot") {
@@ -1,5 +1,5 @@
-import { assertEquals } from "jsr:@std/assert";
-import { buildHerdrProxyEvent } from "./herdr-proxy.ts";
+import { assertEquals, assertRejects } from "jsr:@std/assert";
+import { buildHerdrProxyEvent, handleHerdrProxyRequest } from "./herdr-proxy.ts";
 
 Deno.test("buildHerdrProxyEvent emits compact payload for Herdr events", () => {
   const event = buildHerdrProxyEvent({
@@ -141,3 +141,33 @@ Deno.test("buildHerdrProxyEvent drops sessions this daemon considers remote", ()
     ],
   );
 });
+
+Deno.test("handleHerdrProxyRequest maps channel methods to daemon calls", async () => {
+  const calls: Array<[string, unknown]> = [];
+  const client = {
+    request(method: string, params?: unknown) {
+      calls.push([method, params]);
+      return Promise.resolve({ success: true, method });
+    },
+  };
+
+  assertEquals(
+    await handleHerdrProxyRequest(client, "snapshot", { refresh: true }),
+    { success: true, method: "herdr.proxy.snapshot" },
+  );
+  await handleHerdrProxyRequest(client, "focus", { pane_id: " pane-a " });
+  const pong = await handleHerdrProxyRequest(client, "ping", {}) as Record<string, unknown>;
+
+  assertEquals(pong.pong, true);
+  assertEquals(calls, [
+    ["herdr.proxy.snapshot", { refresh: true }],
+    ["herdr.proxy.pane.focus", { pane_id: "pane-a" }],
+  ]);
+});
+
+Deno.test("handleHerdrProxyRequest rejects unknown methods and missing pane ids", async () => {
+  const client = { request: () => Promise.resolve({}) };
+
+  await assertRejects(() => handleHerdrProxyRequest(client, "focus", {}), Error, "pane_id");
+  await assertRejects(() => handleHerdrProxyRequest(client, "restart", {}), Error, "restart");
+});
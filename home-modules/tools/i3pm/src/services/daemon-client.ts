@@ -147,6 +147,65 @@ export class DaemonClient {
     const encoder = new TextEncoder();
     await this.conn.write(encoder.encode(requestData));
 
+    const responseText = await this.readResponseLine();
+    const response: JsonRpcResponse = JSON.parse(responseText);
+
+    if (isJsonRpcError(response)) {
+      throw new DaemonError(response.error.message, response.error.code);
+    }
+
+    return response.result as T;
+  }
+
+  /**
+   * Send several JSON-RPC requests as one batch array and return their
+   * results in call order. One socket round trip; the daemon runs
+   * independent read-only calls concurrently. A failed member rejects the
+   * whole call with its DaemonError.
+   */
+  async batch(calls: Array<{ method: string; params?: unknown }>): Promise<unknown[]> {
+    await this.connect();
+
+    if (!this.conn) {
+      throw new DaemonError("Not connected to daemon");
+    }
+
+    const requests: JsonRpcRequest[] = calls.map(({ method, params }) => ({
+      jsonrpc: "2.0",
+      method,
+      params,
+      id: ++this.requestId,
+    }));
+    const encoder = new TextEncoder();
+    await this.conn.write(encoder.encode(JSON.stringify(requests) + "\n"));
+
+    const parsed = JSON.parse(await this.readResponseLine());
+    if (!Array.isArray(parsed)) {
+      if (isJsonRpcError(parsed)) {
+        throw new DaemonError(parsed.error.message, parsed.error.code);
+      }
+      throw new DaemonError("Invalid batch response from daemon");
+    }
+    const responses = new Map<unknown, JsonRpcResponse>(
+      (parsed as JsonRpcResponse[]).map((response) => [response.id, response]),
+    );
+    return requests.map((request) => {
+      const response = responses.get(request.id);
+      if (!response) {
+        throw new DaemonError(`Missing batch response for ${request.method}`);
+      }
+      if (isJsonRpcError(response)) {
+        throw new DaemonError(response.error.message, response.error.code);
+      }
+      return response.result;
+    });
+  }
+
+  private async readResponseLine(): Promise<string> {
+    if (!this.conn) {
+      throw new DaemonError("Not connected to daemon");
+    }
+
     // Read one newline-delimited JSON response. Large dashboard payloads routinely
     // exceed 64KB, so a single fixed-size read is not reliable.
     const decoder = new TextDecoder();
@@ -182,18 +241,9 @@ export class DaemonClient {
 
       responseText += decoder.decode(buffer.subarray(0, bytesRead));
       if (responseText.includes("\n")) {
-        responseText = responseText.split("\n", 1)[0];
-        break;
+        return responseText.split("\n", 1)[0];
       }
     }
-
-    const response: JsonRpcResponse = JSON.parse(responseText);
-
-    if (isJsonRpcError(response)) {
-      throw new DaemonError(response.error.message, response.error.code);
-    }
-
-    return response.result as T;
   }
 
   /**
@@ -356,6 +406,8 @@ export class DaemonClient {
     session_generation?: number;
     display_generation?: number;
     focus_generation?: number;
+    coalesced_from_generation?: number;
+    coalesced_events?: number;
   }> {
     if (!this.conn) {
       throw new DaemonError("Not connected to daemon");